@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark sklearn vs the compiled tree evaluator, per quote.
+
+Times price predict and risk predict_proba for single rows and for
+batches of several sizes, reporting microseconds per quote.
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+
+from src.models.compiled_trees import compile_models  # noqa: E402
+from src.models.trained_predictor import (  # noqa: E402
+    TrainedPredictor, RISK_FEATURE_INDEX, sample_quotes,
+)
+
+
+def per_quote_us(fn, X: np.ndarray, batch_size: int, min_time: float) -> float:
+    """Best-of-3 microseconds per row for calling fn on batch_size-row slices."""
+    batches = [X[i:i + batch_size] for i in range(0, len(X) - batch_size + 1, batch_size)]
+    best = float('inf')
+    for _ in range(3):
+        rows, start = 0, time.perf_counter()
+        while time.perf_counter() - start < min_time:
+            for batch in batches:
+                fn(batch)
+                rows += len(batch)
+        best = min(best, (time.perf_counter() - start) / rows * 1e6)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled tree evaluator")
+    parser.add_argument("--rows", type=int, default=4096)
+    parser.add_argument("--batch-sizes", default="1,16,64,256,4096")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per measurement")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    predictor = TrainedPredictor(compiled=False)
+    # No sklearn fallback: time the compiled evaluator at every batch size
+    compiled = compile_models(predictor.models, fallback=False)
+    X = predictor.encode_features(sample_quotes(n=args.rows, seed=1))
+
+    cases = [
+        ("price", predictor.models['price_model'].predict, compiled['price_model'].predict, X),
+        ("risk", predictor.models['risk_model'].predict_proba,
+         compiled['risk_model'].predict_proba, X[:, RISK_FEATURE_INDEX]),
+    ]
+
+    print(f"\n{'model':<6} {'batch':>6} {'sklearn us/quote':>17} {'compiled us/quote':>18} {'gain':>8}")
+    print("-" * 60)
+    for name, sklearn_fn, compiled_fn, features in cases:
+        for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+            if batch_size > len(features):
+                continue
+            base = per_quote_us(sklearn_fn, features, batch_size, args.min_time)
+            fast = per_quote_us(compiled_fn, features, batch_size, args.min_time)
+            print(f"{name:<6} {batch_size:>6} {base:>17.2f} {fast:>18.2f} {base / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch scoring throughput, in-process vs the process-pool backend.
+
+Several client threads score fixed-size batches of quotes through
+TrainedPredictor.predict_quote_batch (the micro-batch / streaming path)
+for a fixed time. The in-process run is limited by the GIL; each process
+pool run should scale with its worker count up to the number of cores.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import warnings
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+
+from src.models.process_pool import ProcessScorer  # noqa: E402
+from src.models.trained_predictor import TrainedPredictor, sample_quotes  # noqa: E402
+
+
+def quotes_per_second(predictor: TrainedPredictor, batches: list, threads: int, seconds: float) -> float:
+    """Quotes scored per second by ``threads`` clients looping over ``batches``."""
+    stop = time.perf_counter() + seconds
+    counts = [0] * threads
+
+    def client(i: int):
+        while time.perf_counter() < stop:
+            for batch in batches[i::threads]:
+                predictor.predict_quote_batch(batch)
+                counts[i] += len(batch)
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=client, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the process-pool inference backend")
+    parser.add_argument("--workers", default=None,
+                        help="comma-separated worker counts (default: 1,2,4,... up to the CPU count)")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--chunk-rows", type=int, default=256)
+    parser.add_argument("--threads", type=int, default=8, help="concurrent client threads")
+    parser.add_argument("--seconds", type=float, default=3.0, help="duration of each run")
+    parser.add_argument("--compiled", action="store_true", help="use the compiled tree evaluator")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    cpus = os.cpu_count() or 1
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(",")]
+    else:
+        worker_counts = [w for w in (1, 2, 4, 8, 16, 32, 64) if w < cpus] + [cpus]
+
+    predictor = TrainedPredictor(compiled=args.compiled)
+    quotes = sample_quotes(n=args.batch_size * args.threads * 4, seed=11)
+    batches = [quotes[i:i + args.batch_size] for i in range(0, len(quotes), args.batch_size)]
+
+    print(f"CPUs: {cpus}, batch {args.batch_size}, {args.threads} client threads, "
+          f"{'compiled' if args.compiled else 'sklearn'} models\n")
+    print(f"{'backend':<18} {'quotes/s':>12} {'speedup':>8}")
+    print("-" * 40)
+    base = quotes_per_second(predictor, batches, args.threads, args.seconds)
+    print(f"{'in-process':<18} {base:>12,.0f} {1.0:>7.2f}x")
+
+    for workers in worker_counts:
+        scorer = ProcessScorer(workers=workers, chunk_rows=args.chunk_rows, min_rows=1)
+        try:
+            scorer.warm(predictor)
+            predictor.scorer = scorer
+            rate = quotes_per_second(predictor, batches, args.threads, args.seconds)
+        finally:
+            predictor.scorer = None
+            scorer.close()
+        print(f"{f'process x{workers}':<18} {rate:>12,.0f} {rate / base:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
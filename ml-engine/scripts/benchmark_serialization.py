@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-response serialization cost of the quote, risk and health routes.
+
+For each response type, times everything between the route having its
+values and the response bytes being ready:
+
+- model + json.dumps: response model, jsonable_encoder, stdlib json.dumps
+  (what FastAPI does with a custom response class)
+- validated: response model, FastAPI's response_model re-validation and
+  Pydantic serialize_json (the FAST_RESPONSES=false path)
+- fast: trusted dict encoded by json_bytes (orjson when installed,
+  otherwise pydantic-core) into a FastJSONResponse
+
+Then times whole /api/v1/quote requests in-process in both modes.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from src.api import responses  # noqa: E402
+from src.api.responses import FastJSONResponse  # noqa: E402
+from src.api.routes import router  # noqa: E402
+from src.config import get_settings  # noqa: E402
+from src.main import app  # noqa: E402
+from src.models.schemas import HealthResponse, QuoteResponse, RiskAssessment  # noqa: E402
+from src.models.trained_predictor import start_warm_up, wait_ready  # noqa: E402
+
+BODIES = {
+    '/quote': (QuoteResponse, {
+        'base_price': 1234.5678,
+        'risk_multiplier': 1.2345,
+        'final_price': 1342.56,
+        'risk_level': "medium",
+        'confidence_score': 0.91,
+        'breakdown': {
+            'model_used': "GradientBoostingRegressor",
+            'risk_factors': ["Large crowd (1500)", "Night event", "Holiday weekend"],
+            'num_guards': 6,
+            'hours': 8.0,
+            'is_armed': True,
+            'has_vehicle': False,
+        },
+        'model_version': "2.2.0",
+    }),
+    '/risk-assessment': (RiskAssessment, {
+        'risk_level': "high",
+        'risk_score': 0.734,
+        'factors': ["Large crowd (1500)", "Night event"],
+        'recommendations': ["Consider additional guards for high-risk scenario"],
+        'model_version': "2.2.0",
+    }),
+    '/health': (HealthResponse, {
+        'status': "healthy", 'version': "1.0.0", 'model_loaded': True, 'ready': True,
+    }),
+}
+
+QUOTE = {
+    'event_type': "concert", 'location_zip': "90210", 'num_guards': 6, 'hours': 8,
+    'date': "2026-07-04T21:00:00", 'is_armed': True, 'crowd_size': 1500,
+}
+
+
+def microseconds(fn, n: int) -> float:
+    for _ in range(min(n, 1000)):
+        fn()
+    started = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def serialization(n: int):
+    fields = {route.path: route.response_field for route in router.routes if route.path in BODIES}
+    encoder = "orjson" if responses.orjson is not None else "pydantic-core"
+    print(f"{'response':<18} {'model+json.dumps':>17} {'validated':>10} {'fast':>8}"
+          f"   (us per response, fast = {encoder})")
+    for path, (model, body) in BODIES.items():
+        def stdlib():
+            return json.dumps(jsonable_encoder(model.model_validate(body))).encode()
+
+        def validated():
+            # serialize_response() for a coroutine route, minus the await
+            field = fields[path]
+            value, _ = field.validate(model.model_validate(body), {}, loc=("response",))
+            return field.serialize_json(value)
+
+        def fast():
+            return FastJSONResponse(body).body
+
+        assert json.loads(fast()) == json.loads(validated()) == json.loads(stdlib())
+        print(f"{model.__name__:<18} {microseconds(stdlib, n):>17.2f} "
+              f"{microseconds(validated, n):>10.2f} {microseconds(fast, n):>8.2f}")
+
+
+def requests(n: int):
+    start_warm_up()
+    assert wait_ready(timeout=60)
+    client = TestClient(app)
+    settings = get_settings()
+    for fast in (False, True):
+        settings.fast_responses = fast
+        per_request = microseconds(lambda: client.post("/api/v1/quote", json=QUOTE), n)
+        print(f"POST /api/v1/quote FAST_RESPONSES={str(fast).lower():<5} "
+              f"{per_request:8.1f} us/request")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark REST response serialization")
+    parser.add_argument("-n", type=int, default=20000, help="responses per measurement")
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="whole /quote requests per mode (0 skips)")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    serialization(args.n)
+    if args.requests:
+        requests(args.requests)
+
+
+if __name__ == "__main__":
+    main()
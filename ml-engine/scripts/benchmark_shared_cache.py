@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared-memory score cache against per-process caches.
+
+A stream of quote requests with Zipf-distributed popularity is spread
+round-robin over N forked worker processes, as the pre-fork server's
+workers share incoming connections. Each worker scores its requests one at
+a time through a score cache: its own ScoreCache (QUOTE_CACHE_BACKEND=process)
+or the one SharedScoreCache created before the fork (shared). Reports the
+overall hit rate and the latency of cache hits and of whole requests, then
+the lookup latency of batches that hit entirely.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+
+from src.models.quote_cache import ScoreCache  # noqa: E402
+from src.models.shared_cache import SharedScoreCache  # noqa: E402
+from src.models.trained_predictor import (  # noqa: E402
+    RISK_FEATURE_INDEX, get_predictor, sample_quotes,
+)
+
+
+def serve(predictor, features, requests, cache, results):
+    """Score ``requests`` (row indexes) one by one; report (hits, misses, hit times, all times)."""
+    cache = cache if cache is not None else ScoreCache(max_size=results['size'])
+    queue = results['queue']
+    hit_times, times = [], []
+    for index in requests:
+        row = features[index:index + 1]
+        hits = cache.hits
+        started = time.perf_counter()
+        cache.scores(predictor.version, row, True, True, predictor._score_uncached, RISK_FEATURE_INDEX)
+        elapsed = time.perf_counter() - started
+        times.append(elapsed)
+        if cache.hits - hits == 2:
+            hit_times.append(elapsed)
+    queue.put((cache.hits, cache.misses, hit_times, times))
+
+
+def run(predictor, features, stream, workers: int, backend: str, size: int) -> dict:
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    shared = SharedScoreCache(max_size=size) if backend == 'shared' else None
+    try:
+        processes = [
+            context.Process(
+                target=serve,
+                args=(predictor, features, stream[i::workers], shared, {'size': size, 'queue': queue}),
+            )
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        reports = [queue.get() for _ in processes]
+        for process in processes:
+            process.join()
+    finally:
+        if shared is not None:
+            shared.close()
+    hits = sum(r[0] for r in reports)
+    misses = sum(r[1] for r in reports)
+    hit_times = np.concatenate([r[2] for r in reports]) * 1e6
+    times = np.concatenate([r[3] for r in reports]) * 1e6
+    return {
+        'hit_rate': hits / (hits + misses),
+        'hit_p50_us': float(np.percentile(hit_times, 50)) if len(hit_times) else float('nan'),
+        'request_mean_us': float(times.mean()),
+    }
+
+
+def batch_lookup_us(cache, predictor, features: np.ndarray, repeats: int) -> float:
+    """Mean µs to look up ``features`` when every row hits."""
+    score = predictor._score_uncached
+    cache.scores(predictor.version, features, True, True, score, RISK_FEATURE_INDEX)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        cache.scores(predictor.version, features, True, True, score, RISK_FEATURE_INDEX)
+    return (time.perf_counter() - started) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared-memory score cache")
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    parser.add_argument("--requests", type=int, default=20000, help="requests in the stream")
+    parser.add_argument("--distinct", type=int, default=20000, help="distinct quote configs")
+    parser.add_argument("--zipf", type=float, default=1.2, help="Zipf exponent of popularity")
+    parser.add_argument("--cache-size", type=int, default=4096, help="entries per cache")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    predictor = get_predictor()
+    features = predictor.encode_features(sample_quotes(args.distinct, seed=7))
+    rng = np.random.default_rng(7)
+    stream = (rng.zipf(args.zipf, args.requests) - 1) % args.distinct
+
+    print(f"{args.requests} requests over {args.distinct} configs (Zipf {args.zipf}), "
+          f"{args.cache_size} entries per cache\n")
+    print(f"{'workers':>7}  {'backend':<8} {'hit rate':>8}  {'hit p50':>9}  {'request mean':>12}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        for backend in ('process', 'shared'):
+            result = run(predictor, features, stream, workers, backend, args.cache_size)
+            print(f"{workers:>7}  {backend:<8} {result['hit_rate']:>8.1%}  "
+                  f"{result['hit_p50_us']:>7.1f}µs  {result['request_mean_us']:>10.1f}µs")
+
+    print(f"\n{'batch':>5}  {'process':>10}  {'shared':>10}   (lookup, every row a hit)")
+    for rows in (1, 16, 256):
+        batch = features[:rows]
+        local = batch_lookup_us(ScoreCache(max_size=4 * rows), predictor, batch, 200)
+        shared = SharedScoreCache(max_size=8 * rows)
+        try:
+            remote = batch_lookup_us(shared, predictor, batch, 200)
+        finally:
+            shared.close()
+        print(f"{rows:>5}  {local:>8.1f}µs  {remote:>8.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Export the pickled models as a memory-mappable artifact directory.
+
+Writes models/trained/guardquote_models.artifact (manifest.json + .npy
+arrays), which TrainedPredictor maps in preference to the pickle, then
+reports load times for both formats.
+"""
+import argparse
+import os
+import pickle
+import subprocess
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(SCRIPT_DIR, "..")
+sys.path.insert(0, ROOT_DIR)
+
+from src.models.artifact import export_artifact  # noqa: E402
+
+MODEL_DIR = os.path.join(ROOT_DIR, "models", "trained")
+
+# Fresh interpreter per measurement so import costs (sklearn) are included
+LOAD_PICKLE = """
+import pickle, sys, time
+start = time.perf_counter()
+with open(sys.argv[1], 'rb') as f:
+    pickle.load(f)
+print(time.perf_counter() - start)
+"""
+LOAD_ARTIFACT = """
+import sys, time
+sys.path.insert(0, sys.argv[2])
+start = time.perf_counter()
+from src.models.artifact import load_artifact
+load_artifact(sys.argv[1])
+print(time.perf_counter() - start)
+"""
+
+
+def _time_load(script: str, path: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", script, path, ROOT_DIR],
+        capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a memory-mappable GuardQuote model artifact")
+    parser.add_argument("--models", default=os.path.join(MODEL_DIR, "guardquote_models.pkl"))
+    parser.add_argument("--output", default=os.path.join(MODEL_DIR, "guardquote_models.artifact"))
+    parser.add_argument("--no-report", action="store_true", help="Skip the load-time comparison")
+    args = parser.parse_args()
+
+    with open(args.models, 'rb') as f:
+        models = pickle.load(f)
+
+    manifest = export_artifact(models, args.output)
+
+    total = sum(os.path.getsize(os.path.join(args.output, name)) for name in os.listdir(args.output))
+    for name, spec in manifest['models'].items():
+        print(f"  {name}: {spec['n_trees']} trees, {spec['n_nodes']} nodes, depth {spec['depth']}")
+    print(f"  ✓ Saved {len(manifest['arrays'])} arrays to: {args.output} ({total / 1024:.1f} KB)")
+
+    if not args.no_report:
+        pickle_s = _time_load(LOAD_PICKLE, args.models)
+        artifact_s = _time_load(LOAD_ARTIFACT, args.output)
+        print(f"  Cold load: pickle {pickle_s * 1000:.1f} ms, artifact {artifact_s * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
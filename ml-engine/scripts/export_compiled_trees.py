@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Export the pickled price/risk models as flat NumPy node arrays.
+
+Writes models/trained/guardquote_trees.npz (feature, threshold, left, right,
+value, ... per model), loadable with src.models.compiled_trees.load_compiled.
+"""
+import argparse
+import os
+import pickle
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+
+from src.models.compiled_trees import compile_models, save_compiled  # noqa: E402
+
+MODEL_DIR = os.path.join(SCRIPT_DIR, "..", "models", "trained")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export compiled tree arrays for GuardQuote ML")
+    parser.add_argument("--models", default=os.path.join(MODEL_DIR, "guardquote_models.pkl"))
+    parser.add_argument("--output", default=os.path.join(MODEL_DIR, "guardquote_trees.npz"))
+    args = parser.parse_args()
+
+    with open(args.models, 'rb') as f:
+        models = pickle.load(f)
+
+    compiled = compile_models(models)
+    save_compiled(args.output, compiled)
+
+    for name, model in compiled.items():
+        ensemble = model.ensemble
+        print(f"  {name}: {ensemble.n_trees} trees, {ensemble.n_nodes} nodes, depth {ensemble.depth}")
+    print(f"  ✓ Saved to: {args.output} ({os.path.getsize(args.output) / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
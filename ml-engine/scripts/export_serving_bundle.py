@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Export a slim serving bundle from the training pickle.
+
+Writes models/trained/guardquote_serving.pkl holding only what
+TrainedPredictor reads (price/risk models and model-info metadata), then
+reports size, cold load time and load RSS for both pickles.
+"""
+import argparse
+import os
+import pickle
+import subprocess
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+
+from src.models.serving_bundle import export_serving_bundle  # noqa: E402
+
+MODEL_DIR = os.path.join(SCRIPT_DIR, "..", "models", "trained")
+
+# Fresh interpreter per measurement so import costs (sklearn) are included.
+# RSS is read from /proc (ru_maxrss is inherited from this process on Linux).
+LOAD_PICKLE = """
+import os, pickle, sys, time
+def rss():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+before = rss()
+start = time.perf_counter()
+with open(sys.argv[1], 'rb') as f:
+    pickle.load(f)
+elapsed = time.perf_counter() - start
+print(elapsed, rss() - before)
+"""
+
+
+def measure_load(path: str) -> tuple[float, float]:
+    """Cold load seconds and RSS growth in bytes (Linux) for one pickle."""
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", LOAD_PICKLE, path],
+        capture_output=True, text=True, check=True,
+    )
+    seconds, rss_kb = result.stdout.split()
+    return float(seconds), float(rss_kb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a slim GuardQuote serving bundle")
+    parser.add_argument("--models", default=os.path.join(MODEL_DIR, "guardquote_models.pkl"))
+    parser.add_argument("--output", default=os.path.join(MODEL_DIR, "guardquote_serving.pkl"))
+    parser.add_argument("--no-report", action="store_true", help="Skip the load-time comparison")
+    args = parser.parse_args()
+
+    with open(args.models, 'rb') as f:
+        models = pickle.load(f)
+
+    result = export_serving_bundle(models, args.output)
+    print(f"  ✓ Saved to: {result['path']}")
+    print(f"  Dropped: {', '.join(result['dropped_keys'])}")
+
+    if not args.no_report:
+        print(f"\n  {'':10} {'size KB':>10} {'load ms':>10} {'load RSS MB':>12}")
+        for label, path in (("full", args.models), ("serving", args.output)):
+            seconds, rss_bytes = measure_load(path)
+            print(f"  {label:10} {os.path.getsize(path) / 1024:10.1f} "
+                  f"{seconds * 1000:10.1f} {rss_bytes / 2 ** 20:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
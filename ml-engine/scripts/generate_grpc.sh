@@ -27,9 +27,13 @@ cat > "$PROJECT_DIR/src/grpc_generated/__init__.py" << 'EOF'
 from .ml_engine_pb2 import (
     EventType,
     RiskLevel,
+    TableFormat,
     QuoteRequest,
     QuoteResponse,
     QuoteBreakdown,
+    ColumnarQuoteRequest,
+    ColumnarQuoteResponse,
+    TableChunk,
     RiskRequest,
     RiskResponse,
     HealthRequest,
@@ -39,6 +43,8 @@ from .ml_engine_pb2 import (
     EventTypesRequest,
     EventTypesResponse,
     EventTypeInfo,
+    ReloadModelRequest,
+    ReloadModelResponse,
 )
 
 from .ml_engine_pb2_grpc import (
@@ -57,10 +63,14 @@ __all__ = [
     # Enums
     "EventType",
     "RiskLevel",
+    "TableFormat",
     # Quote messages
     "QuoteRequest",
     "QuoteResponse",
     "QuoteBreakdown",
+    "ColumnarQuoteRequest",
+    "ColumnarQuoteResponse",
+    "TableChunk",
     # Risk messages
     "RiskRequest",
     "RiskResponse",
@@ -72,6 +82,8 @@ __all__ = [
     "EventTypesRequest",
     "EventTypesResponse",
     "EventTypeInfo",
+    "ReloadModelRequest",
+    "ReloadModelResponse",
     # Service stubs
     "QuoteServiceServicer",
     "QuoteServiceStub",
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Startup profile for the ML engine.
+
+Reports, each in a fresh interpreter:
+  1. import time of src.server, broken down by top-level package
+     (python -X importtime)
+  2. time from process start to ready (background load + warm-up) and
+     latency of the first quotes served after that
+
+Usage:
+    python scripts/profile_startup.py [--top 15] [--model-format auto|artifact|pickle]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+STARTUP = """
+import json, time
+started = time.perf_counter()
+import src.server
+from src.models.trained_predictor import sample_quotes, start_warm_up, startup_timings, wait_ready
+from src.serving import get_quote_batcher
+imported = time.perf_counter()
+start_warm_up()
+wait_ready()
+ready = time.perf_counter()
+quotes = sample_quotes(n=21, seed=3)
+latencies = []
+for quote in quotes:
+    t = time.perf_counter()
+    get_quote_batcher()(quote)
+    latencies.append((time.perf_counter() - t) * 1000)
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'ready_ms': (ready - started) * 1000,
+    'load_ms': startup_timings.get('load_ms'),
+    'warm_up_ms': startup_timings.get('warm_up_ms'),
+    'first_quote_ms': latencies[0],
+    'next_quotes_median_ms': sorted(latencies[1:])[len(latencies[1:]) // 2],
+}))
+"""
+
+
+def import_profile(top: int) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.server"],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+    )
+    packages = defaultdict(int)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue  # header line
+        self_us, name = int(fields[0]), fields[2].strip()
+        packages[name.split(".")[0]] += self_us
+        if name == "src.server":
+            total_us = int(fields[1])
+
+    print(f"Import src.server: {total_us / 1000:.1f} ms")
+    print(f"  {'package':24} {'self ms':>9}")
+    for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {name:24} {us / 1000:9.1f}")
+
+
+def startup_profile(model_format: str | None) -> None:
+    env = dict(os.environ)
+    if model_format:
+        env["MODEL_FORMAT"] = model_format
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", STARTUP],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    print("\nStartup (process start -> ready -> first quotes)")
+    print(f"  import:              {report['import_ms']:8.1f} ms")
+    print(f"  model load:          {report['load_ms']:8.1f} ms")
+    print(f"  warm-up:             {report['warm_up_ms']:8.1f} ms")
+    print(f"  ready:               {report['ready_ms']:8.1f} ms")
+    print(f"  first quote:         {report['first_quote_ms']:8.2f} ms")
+    print(f"  next quotes (p50):   {report['next_quotes_median_ms']:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile ML engine import and startup time")
+    parser.add_argument("--top", type=int, default=15, help="Packages to list in the import profile")
+    parser.add_argument("--model-format", choices=["auto", "artifact", "pickle"])
+    args = parser.parse_args()
+
+    import_profile(args.top)
+    startup_profile(args.model_format)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Fast training for demo and CI runs.
 """
 import os
 import pickle
+import sys
 from datetime import datetime
 import numpy as np
 import pandas as pd
@@ -15,6 +16,10 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import mean_absolute_error, r2_score, accuracy_score
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, ".."))
+
+from src.models.serving_bundle import export_serving_bundle  # noqa: E402
+
 DATA_PATH = os.path.join(SCRIPT_DIR, "..", "data", "processed", "training_data_2026.csv")
 MODEL_DIR = os.path.join(SCRIPT_DIR, "..", "models", "trained")
 
@@ -196,6 +201,10 @@ def main():
     print(f"  ✓ Saved to: {model_path}")
     print(f"  ✓ Size: {size_kb:.1f} KB")
     
+    # Serving bundle: only what TrainedPredictor reads
+    serving = export_serving_bundle(artifacts, os.path.join(MODEL_DIR, 'guardquote_serving.pkl'))
+    print(f"  ✓ Serving bundle: {serving['path']} ({serving['size_bytes'] / 1024:.1f} KB)")
+    
     # Update metadata
     meta_path = os.path.join(MODEL_DIR, 'model_metadata.txt')
     with open(meta_path, 'w') as f:
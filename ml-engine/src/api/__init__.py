@@ -1,3 +1,4 @@
+from .health import health_router
 from .routes import router
 
-__all__ = ["router"]
+__all__ = ["router", "health_router"]
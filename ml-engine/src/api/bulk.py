@@ -0,0 +1,271 @@
+"""
+Bulk quote scoring over REST (POST /api/v1/quotes/batch).
+
+The body is a JSON array of quote requests or NDJSON (one quote per line),
+parsed incrementally as it arrives. Rows are grouped into chunks of
+``STREAM_CHUNK_SIZE``; each chunk is validated, scored with one vectorized
+predictor call and serialized on the inference executor, and its NDJSON
+result lines are sent as soon as it is done. Only a bounded read-ahead of
+rows is held at any time, so memory stays flat however large the upload.
+
+Every output line carries the row's ``index`` in the upload. Rows that fail
+to parse or validate get an ``errors`` line instead of failing the request.
+"""
+
+import asyncio
+import codecs
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+
+import numpy as np
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+
+from ..config import get_settings
+from ..models.schemas import QuoteRequest
+from ..models.trained_predictor import RISK_LEVELS, TrainedPredictor
+from ..serving import InferenceQueueFull, aiter_chunks, run_inference
+from .responses import json_bytes
+
+# Longest accepted row; a longer NDJSON line is reported and skipped
+MAX_ROW_BYTES = 64 * 1024
+
+_QUOTE_LIST = TypeAdapter(list[QuoteRequest])
+
+
+class InvalidRow:
+    """A row that failed to parse or validate, with its error details."""
+
+    def __init__(self, errors: list[dict]):
+        self.errors = errors
+
+    @classmethod
+    def parse_error(cls, msg: str, type: str = 'json_invalid') -> 'InvalidRow':
+        return cls([{'loc': [], 'msg': msg, 'type': type}])
+
+
+# ============================================================================
+# Parsing
+# ============================================================================
+
+async def iter_rows(body: AsyncIterable[bytes]) -> AsyncIterator:
+    """JSON values (or InvalidRow) of a JSON-array or NDJSON body, as they arrive.
+
+    The format is chosen by the first non-blank byte: ``[`` starts a JSON
+    array, anything else is NDJSON.
+    """
+    chunks = aiter(body)
+    first = b''
+    async for chunk in chunks:
+        first += chunk
+        if first.strip():
+            break
+    if not first.strip():
+        return
+
+    async def rest():
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    parse = _array_rows if first.lstrip()[:1] == b'[' else _ndjson_rows
+    async for row in parse(rest()):
+        yield row
+
+
+async def _ndjson_rows(body: AsyncIterable[bytes]) -> AsyncIterator:
+    buffer = b''
+    skipping = False  # inside an oversized line, dropping bytes up to its newline
+    async for chunk in body:
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            if skipping:
+                skipping = False
+                continue
+            if len(line) > MAX_ROW_BYTES:
+                yield _too_long()
+            elif line.strip():
+                yield _parse_line(line)
+        if len(buffer) > MAX_ROW_BYTES:
+            if not skipping:
+                yield _too_long()
+            skipping, buffer = True, b''
+    if buffer.strip() and not skipping:
+        yield _parse_line(buffer)
+
+
+async def _array_rows(body: AsyncIterable[bytes]) -> AsyncIterator:
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    text = ''
+    pos = 0
+    expect = '['  # next token: '[' then a value, then ',' or ']'
+    final = False
+    chunks = aiter(body)
+    while True:
+        try:
+            text = text[pos:] + text_decoder.decode(await anext(chunks))
+        except StopAsyncIteration:
+            text = text[pos:] + text_decoder.decode(b'', final=True)
+            final = True
+        except UnicodeDecodeError as e:
+            yield InvalidRow.parse_error(f"Invalid UTF-8: {e}")
+            return
+        pos = 0
+
+        while True:
+            while pos < len(text) and text[pos].isspace():
+                pos += 1
+            if pos == len(text):
+                break
+            if expect == '[':
+                if text[pos] != '[':
+                    yield InvalidRow.parse_error("Expected a JSON array")
+                    return
+                pos += 1
+                expect = 'first'
+            elif expect in ('first', 'value'):
+                if expect == 'first' and text[pos] == ']':
+                    return
+                try:
+                    value, end = decoder.raw_decode(text, pos)
+                except json.JSONDecodeError as e:
+                    if final or len(text) - pos > MAX_ROW_BYTES:
+                        # A malformed element cannot be skipped reliably
+                        yield InvalidRow.parse_error(f"Invalid JSON: {e.msg}")
+                        return
+                    break  # incomplete, wait for more bytes
+                if end == len(text) and not final:
+                    break  # a number or literal may continue in the next chunk
+                yield value
+                pos = end
+                expect = ','
+            else:
+                if text[pos] == ']':
+                    return
+                if text[pos] != ',':
+                    yield InvalidRow.parse_error(f"Expected ',' or ']' at character {pos}")
+                    return
+                pos += 1
+                expect = 'value'
+
+        if final:
+            if expect != '[':
+                yield InvalidRow.parse_error("Unterminated JSON array")
+            return
+
+
+def _parse_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return InvalidRow.parse_error(f"Invalid JSON: {e}")
+
+
+def _too_long() -> InvalidRow:
+    return InvalidRow.parse_error(f"Row exceeds {MAX_ROW_BYTES} bytes", type='row_too_long')
+
+
+# ============================================================================
+# Scoring
+# ============================================================================
+
+def validate_rows(rows: list) -> list:
+    """QuoteRequest for each valid row, InvalidRow for the others.
+
+    The chunk is validated with one call; only when it has invalid rows are
+    those split out and the rest validated again.
+    """
+    parsed = [i for i, row in enumerate(rows) if not isinstance(row, InvalidRow)]
+    results: list = list(rows)
+    try:
+        quotes = _QUOTE_LIST.validate_python([rows[i] for i in parsed])
+    except ValidationError as e:
+        errors: dict[int, list] = {}
+        for error in e.errors(include_url=False, include_input=False, include_context=False):
+            position, *loc = error['loc']
+            errors.setdefault(position, []).append(
+                {'loc': loc, 'msg': error['msg'], 'type': error['type']}
+            )
+        for position, row_errors in errors.items():
+            results[parsed[position]] = InvalidRow(row_errors)
+        parsed = [i for position, i in enumerate(parsed) if position not in errors]
+        quotes = _QUOTE_LIST.validate_python([rows[i] for i in parsed])
+    for i, quote in zip(parsed, quotes, strict=True):
+        results[i] = quote
+    return results
+
+
+def quote_columns(quotes: list[QuoteRequest]) -> dict:
+    """Columnar predictor inputs for validated quote requests (as /quote uses them)."""
+    return {
+        'event_type': np.array([q.event_type.value for q in quotes]),
+        'num_guards': np.array([q.num_guards for q in quotes], dtype=np.int64),
+        'hours': np.array([q.hours for q in quotes], dtype=np.float64),
+        'crowd_size': np.array([q.crowd_size for q in quotes], dtype=np.int64),
+        # Wall clock of the given date, as the single-quote path uses it
+        'event_date': np.array([q.date.replace(tzinfo=None) for q in quotes], dtype='datetime64[s]'),
+        'is_armed': np.array([q.is_armed for q in quotes], dtype=bool),
+        'has_vehicle': np.array([q.requires_vehicle for q in quotes], dtype=bool),
+    }
+
+
+def score_rows(predictor: TrainedPredictor, rows: list, start: int) -> bytes:
+    """NDJSON result lines for one chunk of parsed rows (``start`` = index of the first)."""
+    results = validate_rows(rows)
+    valid = [i for i, result in enumerate(results) if isinstance(result, QuoteRequest)]
+    lines: list = [None] * len(rows)
+    if valid:
+        arrays = predictor.predict_quote_arrays(quote_columns([results[i] for i in valid]))
+        for i, price, level, score, confidence in zip(
+            valid,
+            arrays.predicted_price.tolist(),
+            arrays.risk_level.tolist(),
+            arrays.risk_score.tolist(),
+            arrays.confidence.tolist(),
+            strict=True,
+        ):
+            lines[i] = {
+                'index': start + i,
+                'final_price': price,
+                'risk_level': RISK_LEVELS[level],
+                'risk_score': score,
+                'confidence_score': confidence,
+                'model_version': arrays.model_version,
+            }
+    for i, result in enumerate(results):
+        if lines[i] is None:
+            lines[i] = {'index': start + i, 'errors': result.errors}
+    return b''.join(json_bytes(line) + b'\n' for line in lines)
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """StreamingResponse that leaves ``receive`` to the upload it is answering.
+
+    StreamingResponse watches for client disconnects by reading
+    ``receive``, which would swallow the request body still being
+    uploaded. Here the body reader notices a disconnect instead
+    (ClientDisconnect), and once the upload is fully read only its last
+    read-ahead of rows remains to be scored.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+async def stream_quotes(body: AsyncIterable[bytes], predictor: TrainedPredictor) -> AsyncIterator[bytes]:
+    """Score an uploaded body chunk by chunk, yielding NDJSON result lines."""
+    settings = get_settings()
+    start = 0
+    async for chunk in aiter_chunks(iter_rows(body), settings.stream_chunk_size, settings.stream_flush_ms):
+        while True:
+            try:
+                lines = await run_inference(score_rows, predictor, chunk, start)
+                break
+            except InferenceQueueFull as e:
+                # The response has started, so wait for capacity instead of
+                # failing; reading the upload pauses meanwhile
+                await asyncio.sleep(e.retry_after_s)
+        start += len(chunk)
+        yield lines
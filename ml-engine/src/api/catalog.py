@@ -0,0 +1,90 @@
+"""
+ETag-cached REST catalog responses (/event-types, /model-info).
+
+The JSON body is serialized once per version key (src/serving/catalog.py)
+together with a strong ETag over its bytes. Being content-based, the ETag
+is the same in every pre-fork worker, so a client's ``If-None-Match``
+revalidates against whichever worker answers. A match is a 304 with no body.
+"""
+
+import hashlib
+from typing import NamedTuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from ..models.pricing_engine import PricingEngine
+from ..models.schemas import EventType
+from ..serving.catalog import Cached, model_key, rates_key
+from .responses import json_bytes
+
+
+class CatalogEntry(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def catalog_entry(content) -> CatalogEntry:
+    body = json_bytes(content)
+    return CatalogEntry(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+def event_types_body(_key=None) -> dict:
+    """Event types with their base rates and risk weights."""
+    return {
+        event_type.value: {
+            "name": event_type.value.title(),
+            "base_rate": PricingEngine.BASE_RATES[event_type],
+            "risk_weight": PricingEngine.EVENT_RISK_WEIGHTS[event_type],
+        }
+        for event_type in EventType
+    }
+
+
+def model_info_body(predictor) -> dict:
+    """Information about the served predictor's models."""
+    if not predictor.loaded:
+        return {
+            "status": "not_loaded",
+            "message": "Models not loaded - using rule-based fallback",
+            "model_version": predictor.version,
+        }
+
+    models = predictor.models
+    price_metrics = models.get('price_metrics', {})
+    risk_metrics = models.get('risk_metrics', {})
+    return {
+        "status": "loaded",
+        "version": models.get('version', 'unknown'),
+        "model_version": predictor.version,
+        "model_type": (
+            f"{models.get('price_model_name', 'Unknown')} + {models.get('risk_model_name', 'Unknown')}"
+        ),
+        "last_trained": models.get('trained_at', None),
+        "training_samples": models.get('training_samples', 0),
+        "accuracy": price_metrics.get('r2', 0),
+        "risk_accuracy": risk_metrics.get('accuracy', 0),
+        "price_features": len(models.get('price_features', [])),
+        "risk_features": len(models.get('risk_features', [])),
+    }
+
+
+event_types_entry = Cached(rates_key, lambda key: catalog_entry(event_types_body(key)))
+model_info_entry = Cached(model_key, lambda predictor: catalog_entry(model_info_body(predictor)))
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored
+    tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in tags
+
+
+def catalog_response(request: Request, entry: CatalogEntry) -> Response:
+    """The cached body, or 304 when the client's If-None-Match has its ETag."""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
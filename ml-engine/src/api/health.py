@@ -0,0 +1,57 @@
+"""
+Liveness and readiness endpoints.
+
+- ``/health/live``: the process is up (never touches the model)
+- ``/health/ready``: 503 until the startup warm-up has loaded and warmed
+  the model, so no traffic is routed to a cold instance
+- ``/health``: legacy combined check, always 200
+"""
+
+import os
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from ..models.trained_predictor import get_predictor, is_ready, startup_timings
+from .. import __version__
+
+health_router = APIRouter()
+
+
+def readiness() -> dict:
+    """Readiness details; only touches the predictor once it is warm."""
+    if not is_ready():
+        return {"status": "starting", "version": __version__, "model_loaded": False}
+    predictor = get_predictor()
+    return {
+        "status": "ready",
+        "version": __version__,
+        "model_loaded": predictor.loaded,
+        "model_version": predictor.version,
+        "startup": startup_timings,
+    }
+
+
+@health_router.get("/health/live")
+async def liveness():
+    """Liveness probe (``pid`` tells pre-fork workers apart)."""
+    return {"status": "alive", "version": __version__, "pid": os.getpid()}
+
+
+@health_router.get("/health/ready")
+async def ready():
+    """Readiness probe: 503 until the model is loaded and warm."""
+    body = readiness()
+    return JSONResponse(body, status_code=200 if body["status"] == "ready" else 503)
+
+
+@health_router.get("/health")
+async def health():
+    """Top-level health check (liveness plus readiness details)."""
+    body = readiness()
+    return {
+        "status": "healthy" if body["status"] == "ready" else "starting",
+        "version": __version__,
+        "model_loaded": body["model_loaded"],
+        "ready": body["status"] == "ready",
+    }
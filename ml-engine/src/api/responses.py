@@ -0,0 +1,62 @@
+"""
+Fast JSON responses for the per-quote REST routes.
+
+With ``FAST_RESPONSES=true`` (default) the quote, risk and health routes
+build their response bodies as plain dicts from trusted predictor output
+and return them as :class:`FastJSONResponse`. That skips constructing the
+Pydantic response model, FastAPI's re-validation against
+``response_model`` and its serializer. The body is encoded by orjson when
+it is installed (``pip install guardquote-ml[fast]``), otherwise by
+pydantic-core's Rust encoder. The ``response_model`` declarations stay for
+the OpenAPI schema, and tests check that both modes return the same bodies.
+
+With ``FAST_RESPONSES=false`` the routes return validated models as before.
+"""
+
+from typing import Any
+
+import numpy as np
+import pydantic_core
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from ..config import get_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _plain(value: Any) -> Any:
+    """Fallback for values pydantic-core cannot encode (NumPy scalars)."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def json_bytes(content: Any) -> bytes:
+    """Compact JSON for dicts / lists of plain values, enums and NumPy scalars."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    return pydantic_core.to_json(content, fallback=_plain)
+
+
+class FastJSONResponse(Response):
+    """JSONResponse encoded with :func:`json_bytes`."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return json_bytes(content)
+
+
+def respond(model: type[BaseModel], body: dict) -> FastJSONResponse | BaseModel:
+    """Response for a body with ``model``'s fields, built from trusted values.
+
+    Fast mode sends the dict as-is; otherwise it is validated into ``model``
+    and FastAPI serializes it through the route's ``response_model``.
+    """
+    if get_settings().fast_responses:
+        return FastJSONResponse(body)
+    return model.model_validate(body)
@@ -1,104 +1,350 @@
-from fastapi import APIRouter, HTTPException
-from ..models.schemas import QuoteRequest, QuoteResponse, RiskAssessment, HealthResponse
+import asyncio
+import os
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from ..config import get_settings
+from ..models.schemas import (
+    QuoteRequest, QuoteResponse, RiskAssessment, HealthResponse, JobRequest,
+)
 from ..models.pricing_engine import get_pricing_engine
-from ..models.trained_predictor import get_predictor
+from ..models.manager import get_model_manager
+from ..models.quote_cache import score_cache_stats
+from ..models.registry import UnknownModelVersion
+from ..models.trained_predictor import get_predictor, get_registry
+from ..serving import (
+    get_quote_batcher, get_risk_batcher, batching_stats, VERSION_KEY, CACHE_BYPASS_KEY,
+    InferenceQueueFull, idempotency_stats, inference_stats, run_inference, submit_async,
+)
+from ..serving.jobs import JobNotFinished, JobNotFound, get_job_manager
+from ..serving.tables import MEDIA_TYPES, RESPONSE_MEDIA_TYPES, ArrowUnavailable, TableSpool
 from .. import __version__
+from .health import readiness
+from .bulk import UploadStreamingResponse, stream_quotes
+from .catalog import catalog_response, event_types_entry, model_info_entry
+from .responses import respond
 
 router = APIRouter()
 
 
+def _with_version(
+    inputs: dict, model_version: str | None, client_id: str | None, cache_control: str | None = None
+) -> dict:
+    """Tag predictor inputs with the model version chosen by headers / client route.
+
+    ``Cache-Control: no-cache`` (or ``no-store``) also tags them to skip the score cache.
+    """
+    version = get_model_manager().resolve(requested=model_version, client_id=client_id)
+    if version is not None:
+        inputs[VERSION_KEY] = version
+    if cache_control and {'no-cache', 'no-store'} & {
+        directive.strip().lower() for directive in cache_control.split(',')
+    }:
+        inputs[CACHE_BYPASS_KEY] = True
+    return inputs
+
+
+def _serving_version() -> str:
+    """Version of the serving predictor (loads it if cold; call off the event loop)."""
+    return get_predictor().version
+
+
+def _overloaded(error: InferenceQueueFull) -> HTTPException:
+    """503 with Retry-After for a request rejected by the inference queue."""
+    return HTTPException(
+        status_code=503, detail=str(error), headers={"Retry-After": error.retry_after}
+    )
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
-    predictor = get_predictor()
-    return HealthResponse(
-        status="healthy",
-        version=__version__,
-        model_loaded=predictor.loaded,
-    )
+    body = readiness()
+    return respond(HealthResponse, {
+        'status': "healthy" if body["status"] == "ready" else "starting",
+        'version': __version__,
+        'model_loaded': body["model_loaded"],
+        'ready': body["status"] == "ready",
+    })
 
 
 @router.post("/quote", response_model=QuoteResponse)
-async def generate_quote(request: QuoteRequest):
+async def generate_quote(
+    request: QuoteRequest,
+    x_model_version: str | None = Header(default=None),
+    x_client_id: str | None = Header(default=None),
+    cache_control: str | None = Header(default=None),
+):
     """Generate a price quote using trained ML model."""
     try:
-        predictor = get_predictor()
-
-        # Get ML predictions
-        price_result = predictor.predict_price(
-            event_type=request.event_type.value,
-            state="CA",  # TODO: extract from zip
-            zip_code=request.location_zip,
-            risk_zone="medium",  # TODO: lookup from DB
-            num_guards=request.num_guards,
-            hours=request.hours,
-            crowd_size=request.crowd_size,
-            event_date=request.date,
-            is_armed=request.is_armed,
-            has_vehicle=request.requires_vehicle,
-        )
+        # Get ML predictions (micro-batched with concurrent requests, off the event loop)
+        prediction = await submit_async(get_quote_batcher(), _with_version({
+            'event_type': request.event_type.value,
+            'state': "CA",  # TODO: extract from zip
+            'zip_code': request.location_zip,
+            'risk_zone': "medium",  # TODO: lookup from DB
+            'num_guards': request.num_guards,
+            'hours': request.hours,
+            'crowd_size': request.crowd_size,
+            'event_date': request.date,
+            'is_armed': request.is_armed,
+            'has_vehicle': request.requires_vehicle,
+        }, x_model_version, x_client_id, cache_control))
 
-        risk_result = predictor.predict_risk(
-            event_type=request.event_type.value,
-            state="CA",
-            zip_code=request.location_zip,
-            num_guards=request.num_guards,
-            hours=request.hours,
-            crowd_size=request.crowd_size,
-            event_date=request.date,
-            is_armed=request.is_armed,
-        )
-
-        # Build response
-        from ..models.schemas import RiskLevel
-
-        return QuoteResponse(
-            base_price=price_result['predicted_price'] / 1.0875,  # pre-tax
-            risk_multiplier=1.0 + (risk_result['risk_score'] * 0.5),
-            final_price=price_result['predicted_price'],
-            risk_level=RiskLevel(risk_result['risk_level']),
-            confidence_score=price_result['confidence'],
-            breakdown={
-                'model_used': price_result['model_used'],
-                'risk_factors': risk_result['factors'],
+        return respond(QuoteResponse, {
+            'base_price': prediction.base_price,  # pre-tax
+            'risk_multiplier': prediction.risk_multiplier,
+            'final_price': prediction.predicted_price,
+            'risk_level': prediction.risk_level,
+            'confidence_score': prediction.confidence,
+            'breakdown': {
+                'model_used': prediction.model_used,
+                'risk_factors': prediction.factors,
                 'num_guards': request.num_guards,
                 'hours': request.hours,
                 'is_armed': request.is_armed,
                 'has_vehicle': request.requires_vehicle,
-            }
+            },
+            'model_version': prediction.model_version,
+        })
+    except UnknownModelVersion as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InferenceQueueFull as e:
+        raise _overloaded(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/quotes/batch")
+async def generate_quotes_batch(
+    request: Request,
+    x_model_version: str | None = Header(default=None),
+    x_client_id: str | None = Header(default=None),
+):
+    """Score a JSON array or NDJSON upload of quotes, streaming NDJSON results.
+
+    Rows are scored in vectorized chunks as the upload arrives; each result
+    line has the row's ``index`` and either the quote or its ``errors``.
+    """
+    manager = get_model_manager()
+    try:
+        version = manager.resolve(requested=x_model_version, client_id=x_client_id)
+        # May load the version from disk, so off the event loop
+        predictor = await run_inference(manager.get, version)
+    except UnknownModelVersion as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InferenceQueueFull as e:
+        raise _overloaded(e)
+
+    return UploadStreamingResponse(
+        stream_quotes(request.stream(), predictor), media_type="application/x-ndjson"
+    )
+
+
+@router.post("/quotes/table")
+async def score_quote_table(
+    request: Request,
+    content_type: str = Header(default=""),
+    x_model_version: str | None = Header(default=None),
+    x_client_id: str | None = Header(default=None),
+):
+    """Score an Arrow IPC stream or Parquet file; returns it with score columns added.
+
+    The upload is spooled to a temporary file and scored batch by batch on
+    the inference executor (one slot for the whole table).
+    """
+    fmt = MEDIA_TYPES.get(content_type.split(';')[0].strip().lower())
+    if fmt is None:
+        raise HTTPException(
+            status_code=415, detail=f"Content-Type must be one of: {', '.join(MEDIA_TYPES)}"
         )
+    try:
+        spool = await asyncio.to_thread(TableSpool, fmt)
+    except ArrowUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    try:
+        # Disk writes run off the event loop
+        async for chunk in request.stream():
+            await asyncio.to_thread(spool.write, chunk)
+        version = get_model_manager().resolve(requested=x_model_version, client_id=x_client_id)
+        await run_inference(lambda: spool.score(get_model_manager().get(version)))
+    except UnknownModelVersion as e:
+        spool.close()
+        raise HTTPException(status_code=404, detail=str(e))
+    except InferenceQueueFull as e:
+        spool.close()
+        raise _overloaded(e)
+    except ValueError as e:  # includes pyarrow.ArrowInvalid
+        spool.close()
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        spool.close()
         raise HTTPException(status_code=500, detail=str(e))
 
+    def output():
+        with spool:
+            yield from spool.iter_output()
+
+    return StreamingResponse(
+        output(), media_type=RESPONSE_MEDIA_TYPES[fmt], headers={"X-Rows-Scored": str(spool.rows)}
+    )
+
+
+def _job_error(error: Exception) -> HTTPException:
+    """HTTP error for a failed job request."""
+    if isinstance(error, (JobNotFound, FileNotFoundError, UnknownModelVersion)):
+        return HTTPException(status_code=404, detail=str(error))
+    if isinstance(error, PermissionError):
+        return HTTPException(status_code=403, detail=str(error))
+    if isinstance(error, JobNotFinished):
+        return HTTPException(status_code=409, detail=str(error))
+    if isinstance(error, ArrowUnavailable):
+        return HTTPException(status_code=501, detail=str(error))
+    if isinstance(error, ValueError):  # includes pyarrow.ArrowInvalid
+        return HTTPException(status_code=400, detail=str(error))
+    return HTTPException(status_code=500, detail=str(error))
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(
+    request: Request,
+    content_type: str = Header(default=""),
+    x_model_version: str | None = Header(default=None),
+    x_client_id: str | None = Header(default=None),
+):
+    """Queue a repricing job for an uploaded table or a file under JOB_INPUT_DIR.
+
+    Send an Arrow IPC stream / Parquet upload, or JSON ``{"path", "format",
+    "model_version"}``. The job is scored in the background with the model
+    version resolved now; poll ``GET /jobs/{job_id}`` for progress. 503 when
+    ``JOBS_ENABLED=false`` (no runner would ever pick the job up).
+    """
+    if not get_settings().jobs_enabled:
+        raise HTTPException(
+            status_code=503, detail="Repricing jobs are disabled (JOBS_ENABLED=false)"
+        )
+    manager = get_job_manager()
+    media_type = content_type.split(';')[0].strip().lower()
+    fmt = MEDIA_TYPES.get(media_type)
+    if fmt is None and media_type != "application/json":
+        raise HTTPException(
+            status_code=415,
+            detail=f"Content-Type must be application/json or one of: {', '.join(MEDIA_TYPES)}",
+        )
+
+    models = get_model_manager()
+    try:
+        if fmt is None:
+            body = JobRequest.model_validate_json(await request.body())
+            version = models.resolve(
+                requested=body.model_version or x_model_version, client_id=x_client_id
+            ) or await asyncio.to_thread(_serving_version)
+            await asyncio.to_thread(models.get, version)  # 404 for unknown versions
+            return await asyncio.to_thread(manager.submit_path, body.path, body.format, version)
+
+        version = models.resolve(
+            requested=x_model_version, client_id=x_client_id
+        ) or await asyncio.to_thread(_serving_version)
+        await asyncio.to_thread(models.get, version)
+        job_id, input_path = await asyncio.to_thread(manager.create, fmt)
+        try:
+            with open(input_path, 'wb') as f:
+                # Disk writes run off the event loop
+                async for chunk in request.stream():
+                    await asyncio.to_thread(f.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(manager.delete, job_id)
+            raise
+        return await asyncio.to_thread(manager.submit, job_id, fmt, version)
+    except Exception as e:
+        raise _job_error(e)
+
+
+@router.get("/jobs")
+async def list_jobs():
+    """Status of every repricing job, newest first."""
+    return {"jobs": await asyncio.to_thread(get_job_manager().list_jobs)}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status, progress (rows / chunks done) and throughput of the current run."""
+    try:
+        return await asyncio.to_thread(get_job_manager().get, job_id)
+    except Exception as e:
+        raise _job_error(e)
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str, partial: bool = False):
+    """Download a job's scored table (409 until it completes).
+
+    With ``partial=true``, returns the rows scored so far (in input order,
+    up to the first chunk not yet done); ``X-Rows-Scored`` gives their count.
+    """
+    manager = get_job_manager()
+    try:
+        job = await asyncio.to_thread(manager.get, job_id)
+        if partial and job['status'] != 'completed':
+            path, rows = await asyncio.to_thread(manager.partial_result, job_id)
+            cleanup = BackgroundTask(os.remove, path)
+        else:
+            path, rows, cleanup = manager.result_path(job_id), job['total_rows'], None
+    except Exception as e:
+        raise _job_error(e)
+
+    return FileResponse(
+        path,
+        media_type=RESPONSE_MEDIA_TYPES[job['format']],
+        filename=f"{job_id}.{'arrows' if job['format'] == 'arrow' else 'parquet'}",
+        headers={"X-Rows-Scored": str(rows)},
+        background=cleanup,
+    )
+
+
+@router.delete("/jobs/{job_id}")
+async def delete_job(job_id: str):
+    """Cancel a job and remove its files."""
+    try:
+        await asyncio.to_thread(get_job_manager().delete, job_id)
+    except Exception as e:
+        raise _job_error(e)
+    return {"job_id": job_id, "status": "deleted"}
+
 
 @router.post("/quote/rule-based", response_model=QuoteResponse)
 async def generate_quote_rule_based(request: QuoteRequest):
     """Generate a price quote using rule-based engine (fallback)."""
     try:
         engine = get_pricing_engine()
-        return engine.calculate_quote(request)
+        return await run_inference(engine.calculate_quote, request)
+    except InferenceQueueFull as e:
+        raise _overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/risk-assessment", response_model=RiskAssessment)
-async def assess_risk(request: QuoteRequest):
+async def assess_risk(
+    request: QuoteRequest,
+    x_model_version: str | None = Header(default=None),
+    x_client_id: str | None = Header(default=None),
+    cache_control: str | None = Header(default=None),
+):
     """Get detailed risk assessment using trained ML model."""
     try:
-        predictor = get_predictor()
-
-        result = predictor.predict_risk(
-            event_type=request.event_type.value,
-            state="CA",
-            zip_code=request.location_zip,
-            num_guards=request.num_guards,
-            hours=request.hours,
-            crowd_size=request.crowd_size,
-            event_date=request.date,
-            is_armed=request.is_armed,
-        )
-
-        from ..models.schemas import RiskLevel
+        result = await submit_async(get_risk_batcher(), _with_version({
+            'event_type': request.event_type.value,
+            'state': "CA",
+            'zip_code': request.location_zip,
+            'num_guards': request.num_guards,
+            'hours': request.hours,
+            'crowd_size': request.crowd_size,
+            'event_date': request.date,
+            'is_armed': request.is_armed,
+        }, x_model_version, x_client_id, cache_control))
 
         # Generate recommendations based on risk level
         recommendations = []
@@ -113,54 +359,57 @@ async def assess_risk(request: QuoteRequest):
         if not recommendations:
             recommendations.append("Standard protocols apply")
 
-        return RiskAssessment(
-            risk_level=RiskLevel(result['risk_level']),
-            risk_score=result['risk_score'],
-            factors=result['factors'],
-            recommendations=recommendations,
-        )
+        return respond(RiskAssessment, {
+            'risk_level': result['risk_level'],
+            'risk_score': result['risk_score'],
+            'factors': result['factors'],
+            'recommendations': recommendations,
+            'model_version': result['model_version'],
+        })
+    except UnknownModelVersion as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InferenceQueueFull as e:
+        raise _overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/event-types")
-async def get_event_types():
-    """Get available event types and their base rates."""
-    from ..models.schemas import EventType
-    from ..models.pricing_engine import PricingEngine
-
-    return {
-        event_type.value: {
-            "name": event_type.value.title(),
-            "base_rate": PricingEngine.BASE_RATES[event_type],
-            "risk_weight": PricingEngine.EVENT_RISK_WEIGHTS[event_type],
-        }
-        for event_type in EventType
-    }
+async def get_event_types(request: Request):
+    """Get available event types and their base rates (ETag / If-None-Match)."""
+    return catalog_response(request, event_types_entry.get())
 
 
 @router.get("/model-info")
-async def get_model_info():
-    """Get information about loaded ML models."""
-    predictor = get_predictor()
+async def get_model_info(request: Request):
+    """Get information about loaded ML models (ETag / If-None-Match)."""
+    # The key is the serving predictor, which may still have to load
+    return catalog_response(request, await asyncio.to_thread(model_info_entry.get))
+
 
-    if not predictor.loaded:
-        return {
-            "status": "not_loaded",
-            "message": "Models not loaded - using rule-based fallback"
-        }
+@router.get("/models")
+async def list_models():
+    """List model versions in the registry and the one being served."""
+    return await asyncio.to_thread(_model_versions)
+
+
+def _model_versions() -> dict:
+    # Registry reads and a cold model load: run off the event loop
+    registry = get_registry()
+    return {
+        "serving": _serving_version(),
+        "current": registry.current() if registry else None,
+        "versions": registry.versions() if registry else [],
+    }
 
-    price_metrics = predictor.models.get('price_metrics', {})
-    risk_metrics = predictor.models.get('risk_metrics', {})
 
+@router.get("/stats")
+async def get_stats():
+    """Get serving statistics (inference queue, micro-batches, model use, caches)."""
     return {
-        "status": "loaded",
-        "version": predictor.models.get('version', 'unknown'),
-        "model_type": f"{predictor.models.get('price_model_name', 'Unknown')} + {predictor.models.get('risk_model_name', 'Unknown')}",
-        "last_trained": predictor.models.get('trained_at', None),
-        "training_samples": predictor.models.get('training_samples', 0),
-        "accuracy": price_metrics.get('r2', 0),
-        "risk_accuracy": risk_metrics.get('accuracy', 0),
-        "price_features": len(predictor.models.get('price_features', [])),
-        "risk_features": len(predictor.models.get('risk_features', [])),
+        "inference": inference_stats(),
+        "batching": batching_stats(),
+        "models": await asyncio.to_thread(get_model_manager().stats),
+        "score_cache": score_cache_stats(),
+        "idempotency": idempotency_stats(),
     }
@@ -10,6 +10,97 @@ class Settings(BaseSettings):
     model_path: str = "./models/trained"
     log_level: str = "INFO"
 
+    # Versioned model registry (one directory per version, see src/models/registry.py).
+    # Falls back to model_path's models/trained layout when it has no versions.
+    model_registry_path: str = "./models/registry"
+    # Pin a registry version (disables the watcher); empty serves CURRENT / latest
+    model_version: str = ""
+    # Poll the registry for a new current version every N seconds (0 disables)
+    registry_poll_s: float = 0.0
+
+    # Extra registry versions served alongside the default (A/B, per-tenant):
+    # LRU of up to N loaded versions, capped at this many MB of model files (0 = no cap)
+    model_cache_size: int = 4
+    model_cache_max_mb: float = 0.0
+    # client_id -> model version, as JSON: MODEL_ROUTES='{"acme": "2.3.0-west"}'
+    model_routes: dict[str, str] = {}
+
+    # Evaluate price/risk trees with the NumPy compiled evaluator instead of sklearn
+    compiled_trees: bool = False
+
+    # Model source: "auto" maps models/trained/guardquote_models.artifact when it
+    # exists (always compiled), "artifact" always tries it first, "pickle" skips it
+    model_format: str = "auto"
+
+    # Cache of price / risk model outputs per encoded feature row and model
+    # version (src/models/quote_cache.py); policy "lru" or "lfu", TTL 0 = none
+    quote_cache_enabled: bool = False
+    quote_cache_size: int = 10000
+    quote_cache_ttl_s: float = 3600.0
+    quote_cache_policy: str = "lru"
+    # "process" (one cache per worker) or "shared": one table in shared
+    # memory for all pre-fork workers (src/models/shared_cache.py), with
+    # writes locked per stripe of buckets
+    quote_cache_backend: str = "process"
+    quote_cache_stripes: int = 64
+    # Warm-start snapshot of the hottest entries ("" disables), written every
+    # interval (0 = only on shutdown) and reloaded at startup
+    quote_cache_snapshot_path: str = "./data/score_cache.snap"
+    quote_cache_snapshot_interval_s: float = 300.0
+    quote_cache_snapshot_entries: int = 5000
+
+    # Responses of unary gRPC quote / risk calls kept per (client id,
+    # request id) so backend retries replay or join them (serving/idempotency.py)
+    idempotency_enabled: bool = True
+    idempotency_size: int = 10000
+    idempotency_window_s: float = 120.0
+
+    # Cross-request micro-batching for unary quote/risk inference
+    batching_enabled: bool = False
+    batch_max_size: int = 64
+    batch_max_wait_ms: float = 2.0
+    # Identical in-flight quote/risk computations are shared (single flight)
+    singleflight_enabled: bool = True
+
+    # gRPC server mode: "thread" (grpc.server on a thread pool) or "aio"
+    # (grpc.aio on the uvicorn event loop, inference on a dedicated pool)
+    grpc_mode: str = "thread"
+    grpc_max_workers: int = 10
+    inference_workers: int = 4
+    # Calls allowed to wait beyond the running ones before REST answers 503
+    # (Retry-After) and gRPC RESOURCE_EXHAUSTED
+    inference_queue_size: int = 64
+    inference_retry_after_s: float = 1.0
+
+    # Pre-fork workers sharing the master's warmed model copy-on-write
+    # (1 = single process; see src/prefork.py)
+    server_workers: int = 1
+
+    # Batch scoring backend: "thread" (in-process) or "process" (worker pool,
+    # features and results passed through shared memory; see process_pool.py)
+    inference_backend: str = "thread"
+    process_workers: int = 0  # 0 = one per CPU
+    process_chunk_rows: int = 1024
+    process_min_rows: int = 16
+
+    # Send quote / risk / health bodies as trusted dicts encoded by orjson
+    # (or pydantic-core) instead of validated response models (src/api/responses.py)
+    fast_responses: bool = True
+
+    # Chunking for GenerateQuotesBatch / AssessRiskBatch streams
+    stream_chunk_size: int = 256
+    stream_flush_ms: float = 10.0
+
+    # Repricing jobs (see src/serving/jobs.py): job state and results live in
+    # jobs_dir; jobs submitted by path may only read files under job_input_dir.
+    # Chunks are scored by job_workers processes at CPU priority job_nice.
+    jobs_enabled: bool = True
+    jobs_dir: str = "./data/jobs"
+    job_input_dir: str = "./data/exports"
+    job_workers: int = 1
+    job_chunk_rows: int = 50000
+    job_nice: int = 19
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,342 @@
+"""
+grpc.aio Servicers for GuardQuote ML Engine
+
+Asyncio versions of the services in grpc_servicer.py, served by a
+``grpc.aio`` server on the same event loop as uvicorn (``GRPC_MODE=aio``).
+An RPC waiting on its client or on the micro-batcher costs a coroutine
+instead of a pool thread; model calls run on the dedicated inference
+executor (serving/executor.py), so the loop itself never does inference.
+"""
+
+import asyncio
+import logging
+import time
+
+import grpc
+
+from .grpc_generated import (
+    QuoteRequest,
+    QuoteResponse,
+    ColumnarQuoteRequest,
+    ColumnarQuoteResponse,
+    RiskRequest,
+    RiskResponse,
+    HealthRequest,
+    HealthResponse,
+    ModelInfoRequest,
+    ModelInfoResponse,
+    EventTypesRequest,
+    EventTypesResponse,
+    ReloadModelRequest,
+    ReloadModelResponse,
+    add_QuoteServiceServicer_to_server,
+    add_RiskServiceServicer_to_server,
+    add_ModelServiceServicer_to_server,
+)
+from .grpc_servicer import (
+    QuoteServiceImpl,
+    RiskServiceImpl,
+    ModelServiceImpl,
+    build_quote_response,
+    build_risk_response,
+    quote_inputs,
+    requested_version,
+    risk_inputs,
+    iter_table_output,
+    open_table_spool,
+    score_columnar,
+    score_table_spool,
+    table_status,
+    with_version,
+)
+from .models.manager import get_model_manager
+from .models.registry import UnknownModelVersion
+from .models.trained_predictor import start_registry_watcher, start_warm_up
+from .serving import (
+    InferenceQueueFull,
+    aiter_chunks,
+    get_quote_batcher,
+    get_risk_batcher,
+    idempotent_async,
+    run_inference,
+    submit_async,
+)
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _overloaded(context, error: InferenceQueueFull):
+    """Mark a unary call rejected by the inference queue."""
+    context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+    context.set_details(str(error))
+    context.set_trailing_metadata((('retry-after', error.retry_after),))
+
+
+async def _abort_overloaded(context, error: InferenceQueueFull):
+    """End a stream rejected by the inference queue."""
+    await context.abort(
+        grpc.StatusCode.RESOURCE_EXHAUSTED, str(error), (('retry-after', error.retry_after),)
+    )
+
+
+async def _stream_predictor(context):
+    """Predictor for a streaming call, aborting with NOT_FOUND for unknown versions."""
+    try:
+        # May load the version from disk, so off the loop
+        return await run_inference(get_model_manager().get, requested_version(context))
+    except UnknownModelVersion as e:
+        await context.abort(grpc.StatusCode.NOT_FOUND, str(e))
+    except InferenceQueueFull as e:
+        await _abort_overloaded(context, e)
+
+
+# ============================================================================
+# Quote Service Implementation
+# ============================================================================
+
+class AioQuoteServiceImpl(QuoteServiceImpl):
+    """QuoteService on grpc.aio."""
+
+    async def GenerateQuote(self, request: QuoteRequest, context) -> QuoteResponse:
+        """Generate a price quote using trained ML model."""
+        start_time = time.time()
+
+        try:
+            return await idempotent_async(
+                context, 'GenerateQuote', request,
+                lambda: self._generate_quote_async(request, context, start_time), request.client_id,
+            )
+
+        except UnknownModelVersion as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return QuoteResponse()
+        except InferenceQueueFull as e:
+            _overloaded(context, e)
+            return QuoteResponse()
+        except Exception as e:
+            logger.error(f"Quote generation failed: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return QuoteResponse()
+
+    async def _generate_quote_async(
+        self, request: QuoteRequest, context, start_time: float
+    ) -> QuoteResponse:
+        version = requested_version(context, request.client_id)
+        prediction = await submit_async(
+            get_quote_batcher(), with_version(quote_inputs(request), version, context)
+        )
+
+        processing_time = int((time.time() - start_time) * 1000)
+        return build_quote_response(request, prediction, processing_time)
+
+    async def GenerateQuoteRuleBased(self, request: QuoteRequest, context) -> QuoteResponse:
+        """Generate a price quote using rule-based engine (cheap, runs inline)."""
+        return super().GenerateQuoteRuleBased(request, context)
+
+    async def GenerateQuotesBatch(self, request_iterator, context):
+        """Streaming batch quote generation, scored in read-ahead chunks."""
+        settings = get_settings()
+        predictor = await _stream_predictor(context)
+        chunks = aiter_chunks(request_iterator, settings.stream_chunk_size, settings.stream_flush_ms)
+        async for chunk in chunks:
+            start_time = time.time()
+            try:
+                predictions = await run_inference(
+                    predictor.predict_quote_batch, [quote_inputs(request) for request in chunk]
+                )
+            except InferenceQueueFull as e:
+                await _abort_overloaded(context, e)
+            except Exception as e:
+                logger.error(f"Batch quote generation failed: {e}")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                for _ in chunk:
+                    yield QuoteResponse()
+                continue
+
+            processing_time = int((time.time() - start_time) * 1000)
+            for request, prediction in zip(chunk, predictions, strict=True):
+                yield build_quote_response(request, prediction, processing_time)
+
+    async def ScoreQuotesColumnar(
+        self, request: ColumnarQuoteRequest, context
+    ) -> ColumnarQuoteResponse:
+        """Score packed quote arrays with one vectorized model call."""
+        try:
+            response = await run_inference(
+                score_columnar, request, requested_version(context, request.client_id)
+            )
+        except UnknownModelVersion as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return ColumnarQuoteResponse()
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return ColumnarQuoteResponse()
+        except InferenceQueueFull as e:
+            _overloaded(context, e)
+            return ColumnarQuoteResponse()
+        except Exception as e:
+            logger.error(f"Columnar scoring failed: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return ColumnarQuoteResponse()
+
+        if request.compress_response:
+            context.set_compression(grpc.Compression.Gzip)
+        return response
+
+    async def ScoreTable(self, request_iterator, context):
+        """Score an Arrow IPC stream / Parquet file sent in pieces, streaming the result back."""
+        spool = None
+        try:
+            client_id = ''
+            async for chunk in request_iterator:
+                if spool is None:
+                    spool = open_table_spool(chunk)
+                    client_id = chunk.client_id
+                spool.write(chunk.data)
+            if spool is None:
+                raise ValueError("Empty table upload")
+            await run_inference(score_table_spool, spool, requested_version(context, client_id))
+        except InferenceQueueFull as e:
+            spool.close()
+            await _abort_overloaded(context, e)
+        except Exception as e:
+            if spool is not None:
+                spool.close()
+            logger.error(f"Table scoring failed: {e}")
+            await context.abort(table_status(e), str(e))
+
+        for chunk in iter_table_output(spool):
+            yield chunk
+
+
+# ============================================================================
+# Risk Service Implementation
+# ============================================================================
+
+class AioRiskServiceImpl(RiskServiceImpl):
+    """RiskService on grpc.aio."""
+
+    async def AssessRisk(self, request: RiskRequest, context) -> RiskResponse:
+        """Get detailed risk assessment."""
+        start_time = time.time()
+
+        try:
+            return await idempotent_async(
+                context, 'AssessRisk', request,
+                lambda: self._assess_risk_async(request, context, start_time),
+            )
+
+        except UnknownModelVersion as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return RiskResponse()
+        except InferenceQueueFull as e:
+            _overloaded(context, e)
+            return RiskResponse()
+        except Exception as e:
+            logger.error(f"Risk assessment failed: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return RiskResponse()
+
+    async def _assess_risk_async(
+        self, request: RiskRequest, context, start_time: float
+    ) -> RiskResponse:
+        inputs = risk_inputs(request)
+        result = await submit_async(
+            get_risk_batcher(), with_version(inputs, requested_version(context), context)
+        )
+
+        processing_time = int((time.time() - start_time) * 1000)
+        return build_risk_response(request, result, inputs['event_date'], processing_time)
+
+    async def AssessRiskBatch(self, request_iterator, context):
+        """Streaming batch risk assessment, scored in read-ahead chunks."""
+        settings = get_settings()
+        predictor = await _stream_predictor(context)
+        chunks = aiter_chunks(request_iterator, settings.stream_chunk_size, settings.stream_flush_ms)
+        async for chunk in chunks:
+            start_time = time.time()
+            try:
+                inputs = [risk_inputs(request) for request in chunk]
+                results = await run_inference(predictor.predict_risk_batch, inputs)
+            except InferenceQueueFull as e:
+                await _abort_overloaded(context, e)
+            except Exception as e:
+                logger.error(f"Batch risk assessment failed: {e}")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                for _ in chunk:
+                    yield RiskResponse()
+                continue
+
+            processing_time = int((time.time() - start_time) * 1000)
+            for request, row, result in zip(chunk, inputs, results, strict=True):
+                yield build_risk_response(request, result, row['event_date'], processing_time)
+
+
+# ============================================================================
+# Model Service Implementation
+# ============================================================================
+
+class AioModelServiceImpl(ModelServiceImpl):
+    """ModelService on grpc.aio.
+
+    Calls that may wait on a model load run in a worker thread; the rest
+    are cheap and run inline.
+    """
+
+    async def HealthCheck(self, request: HealthRequest, context) -> HealthResponse:
+        return super().HealthCheck(request, context)
+
+    async def GetModelInfo(self, request: ModelInfoRequest, context) -> ModelInfoResponse:
+        return await asyncio.to_thread(super().GetModelInfo, request, context)
+
+    async def GetEventTypes(self, request: EventTypesRequest, context) -> EventTypesResponse:
+        return super().GetEventTypes(request, context)
+
+    async def ReloadModel(self, request: ReloadModelRequest, context) -> ReloadModelResponse:
+        return await asyncio.to_thread(super().ReloadModel, request, context)
+
+
+# ============================================================================
+# Server Setup
+# ============================================================================
+
+def create_aio_grpc_server(port: int = 50051) -> grpc.aio.Server:
+    """Create a grpc.aio server; call from the event loop that will run it."""
+    server = grpc.aio.server()
+
+    add_QuoteServiceServicer_to_server(AioQuoteServiceImpl(), server)
+    add_RiskServiceServicer_to_server(AioRiskServiceImpl(), server)
+    add_ModelServiceServicer_to_server(AioModelServiceImpl(), server)
+
+    server.add_insecure_port(f'[::]:{port}')
+
+    return server
+
+
+async def serve_aio(port: int = 50051):
+    """Start the grpc.aio server and run until it terminates."""
+    start_warm_up()
+    server = create_aio_grpc_server(port)
+    await server.start()
+    logger.info(f"gRPC (asyncio) server started on port {port}")
+    watcher = start_registry_watcher()
+    try:
+        await server.wait_for_termination()
+    finally:
+        if watcher is not None:
+            watcher.stop()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve_aio())
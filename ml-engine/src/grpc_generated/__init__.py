@@ -3,9 +3,13 @@
 from .ml_engine_pb2 import (
     EventType,
     RiskLevel,
+    TableFormat,
     QuoteRequest,
     QuoteResponse,
     QuoteBreakdown,
+    ColumnarQuoteRequest,
+    ColumnarQuoteResponse,
+    TableChunk,
     RiskRequest,
     RiskResponse,
     HealthRequest,
@@ -15,6 +19,8 @@ from .ml_engine_pb2 import (
     EventTypesRequest,
     EventTypesResponse,
     EventTypeInfo,
+    ReloadModelRequest,
+    ReloadModelResponse,
 )
 
 from .ml_engine_pb2_grpc import (
@@ -30,13 +36,21 @@ from .ml_engine_pb2_grpc import (
 )
 
 __all__ = [
+    # Enums
     "EventType",
     "RiskLevel",
+    "TableFormat",
+    # Quote messages
     "QuoteRequest",
     "QuoteResponse",
     "QuoteBreakdown",
+    "ColumnarQuoteRequest",
+    "ColumnarQuoteResponse",
+    "TableChunk",
+    # Risk messages
     "RiskRequest",
     "RiskResponse",
+    # Model messages
     "HealthRequest",
     "HealthResponse",
     "ModelInfoRequest",
@@ -44,12 +58,16 @@ __all__ = [
     "EventTypesRequest",
     "EventTypesResponse",
     "EventTypeInfo",
+    "ReloadModelRequest",
+    "ReloadModelResponse",
+    # Service stubs
     "QuoteServiceServicer",
     "QuoteServiceStub",
     "RiskServiceServicer",
     "RiskServiceStub",
     "ModelServiceServicer",
     "ModelServiceStub",
+    # Server registration
     "add_QuoteServiceServicer_to_server",
     "add_RiskServiceServicer_to_server",
     "add_ModelServiceServicer_to_server",
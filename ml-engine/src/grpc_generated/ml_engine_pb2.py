@@ -25,45 +25,57 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0fml_engine.proto\x12\rguardquote.ml\x1a\x1fgoogle/protobuf/timestamp.proto\"\x8c\x02\n\x0cQuoteRequest\x12,\n\nevent_type\x18\x01 \x01(\x0e\x32\x18.guardquote.ml.EventType\x12\x14\n\x0clocation_zip\x18\x02 \x01(\t\x12\x12\n\nnum_guards\x18\x03 \x01(\x05\x12\r\n\x05hours\x18\x04 \x01(\x02\x12.\n\nevent_date\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x08is_armed\x18\x06 \x01(\x08\x12\x18\n\x10requires_vehicle\x18\x07 \x01(\x08\x12\x12\n\ncrowd_size\x18\x08 \x01(\x05\x12\x12\n\nrequest_id\x18\n \x01(\t\x12\x11\n\tclient_id\x18\x0b \x01(\t\"\xfb\x01\n\rQuoteResponse\x12\x12\n\nbase_price\x18\x01 \x01(\x02\x12\x17\n\x0frisk_multiplier\x18\x02 \x01(\x02\x12\x13\n\x0b\x66inal_price\x18\x03 \x01(\x02\x12,\n\nrisk_level\x18\x04 \x01(\x0e\x32\x18.guardquote.ml.RiskLevel\x12\x18\n\x10\x63onfidence_score\x18\x05 \x01(\x02\x12\x30\n\tbreakdown\x18\x06 \x01(\x0b\x32\x1d.guardquote.ml.QuoteBreakdown\x12\x12\n\nrequest_id\x18\n \x01(\t\x12\x1a\n\x12processing_time_ms\x18\x0b \x01(\x03\"\x84\x01\n\x0eQuoteBreakdown\x12\x12\n\nmodel_used\x18\x01 \x01(\t\x12\x14\n\x0crisk_factors\x18\x02 \x03(\t\x12\x12\n\nnum_guards\x18\x03 \x01(\x05\x12\r\n\x05hours\x18\x04 \x01(\x02\x12\x10\n\x08is_armed\x18\x05 \x01(\x08\x12\x13\n\x0bhas_vehicle\x18\x06 \x01(\x08\"\xde\x01\n\x0bRiskRequest\x12,\n\nevent_type\x18\x01 \x01(\x0e\x32\x18.guardquote.ml.EventType\x12\x14\n\x0clocation_zip\x18\x02 \x01(\t\x12\x12\n\nnum_guards\x18\x03 \x01(\x05\x12\r\n\x05hours\x18\x04 \x01(\x02\x12.\n\nevent_date\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x08is_armed\x18\x06 \x01(\x08\x12\x12\n\ncrowd_size\x18\x07 \x01(\x05\x12\x12\n\nrequest_id\x18\n \x01(\t\"\xaa\x01\n\x0cRiskResponse\x12,\n\nrisk_level\x18\x01 \x01(\x0e\x32\x18.guardquote.ml.RiskLevel\x12\x12\n\nrisk_score\x18\x02 \x01(\x02\x12\x0f\n\x07\x66\x61\x63tors\x18\x03 \x03(\t\x12\x17\n\x0frecommendations\x18\x04 \x03(\t\x12\x12\n\nrequest_id\x18\n \x01(\t\x12\x1a\n\x12processing_time_ms\x18\x0b \x01(\x03\"\x0f\n\rHealthRequest\"G\n\x0eHealthResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x14\n\x0cmodel_loaded\x18\x03 \x01(\x08\"\x12\n\x10ModelInfoRequest\"\x9d\x01\n\x11ModelInfoResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x18\n\x10price_model_name\x18\x02 \x01(\t\x12\x12\n\ntrained_at\x18\x03 \x01(\t\x12\x1c\n\x14price_features_count\x18\x04 \x01(\x05\x12\x1b\n\x13risk_features_count\x18\x05 \x01(\x05\x12\x0f\n\x07message\x18\x06 \x01(\t\"\x13\n\x11\x45ventTypesRequest\"G\n\x12\x45ventTypesResponse\x12\x31\n\x0b\x65vent_types\x18\x01 \x03(\x0b\x32\x1c.guardquote.ml.EventTypeInfo\"m\n\rEventTypeInfo\x12&\n\x04type\x18\x01 \x01(\x0e\x32\x18.guardquote.ml.EventType\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x11\n\tbase_rate\x18\x03 \x01(\x02\x12\x13\n\x0brisk_weight\x18\x04 \x01(\x02*\xd8\x01\n\tEventType\x12\x1a\n\x16\x45VENT_TYPE_UNSPECIFIED\x10\x00\x12\x18\n\x14\x45VENT_TYPE_CORPORATE\x10\x01\x12\x16\n\x12\x45VENT_TYPE_CONCERT\x10\x02\x12\x15\n\x11\x45VENT_TYPE_SPORTS\x10\x03\x12\x16\n\x12\x45VENT_TYPE_PRIVATE\x10\x04\x12\x1b\n\x17\x45VENT_TYPE_CONSTRUCTION\x10\x05\x12\x15\n\x11\x45VENT_TYPE_RETAIL\x10\x06\x12\x1a\n\x16\x45VENT_TYPE_RESIDENTIAL\x10\x07*\x80\x01\n\tRiskLevel\x12\x1a\n\x16RISK_LEVEL_UNSPECIFIED\x10\x00\x12\x12\n\x0eRISK_LEVEL_LOW\x10\x01\x12\x15\n\x11RISK_LEVEL_MEDIUM\x10\x02\x12\x13\n\x0fRISK_LEVEL_HIGH\x10\x03\x12\x17\n\x13RISK_LEVEL_CRITICAL\x10\x04\x32\x85\x02\n\x0cQuoteService\x12J\n\rGenerateQuote\x12\x1b.guardquote.ml.QuoteRequest\x1a\x1c.guardquote.ml.QuoteResponse\x12S\n\x16GenerateQuoteRuleBased\x12\x1b.guardquote.ml.QuoteRequest\x1a\x1c.guardquote.ml.QuoteResponse\x12T\n\x13GenerateQuotesBatch\x12\x1b.guardquote.ml.QuoteRequest\x1a\x1c.guardquote.ml.QuoteResponse(\x01\x30\x01\x32\xa4\x01\n\x0bRiskService\x12\x45\n\nAssessRisk\x12\x1a.guardquote.ml.RiskRequest\x1a\x1b.guardquote.ml.RiskResponse\x12N\n\x0f\x41ssessRiskBatch\x12\x1a.guardquote.ml.RiskRequest\x1a\x1b.guardquote.ml.RiskResponse(\x01\x30\x01\x32\x83\x02\n\x0cModelService\x12J\n\x0bHealthCheck\x12\x1c.guardquote.ml.HealthRequest\x1a\x1d.guardquote.ml.HealthResponse\x12Q\n\x0cGetModelInfo\x12\x1f.guardquote.ml.ModelInfoRequest\x1a .guardquote.ml.ModelInfoResponse\x12T\n\rGetEventTypes\x12 .guardquote.ml.EventTypesRequest\x1a!.guardquote.ml.EventTypesResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0fml_engine.proto\x12\rguardquote.ml\x1a\x1fgoogle/protobuf/timestamp.proto\"\x8c\x02\n\x0cQuoteRequest\x12,\n\nevent_type\x18\x01 \x01(\x0e\x32\x18.guardquote.ml.EventType\x12\x14\n\x0clocation_zip\x18\x02 \x01(\t\x12\x12\n\nnum_guards\x18\x03 \x01(\x05\x12\r\n\x05hours\x18\x04 \x01(\x02\x12.\n\nevent_date\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x08is_armed\x18\x06 \x01(\x08\x12\x18\n\x10requires_vehicle\x18\x07 \x01(\x08\x12\x12\n\ncrowd_size\x18\x08 \x01(\x05\x12\x12\n\nrequest_id\x18\n \x01(\t\x12\x11\n\tclient_id\x18\x0b \x01(\t\"\x92\x02\n\rQuoteResponse\x12\x12\n\nbase_price\x18\x01 \x01(\x02\x12\x17\n\x0frisk_multiplier\x18\x02 \x01(\x02\x12\x13\n\x0b\x66inal_price\x18\x03 \x01(\x02\x12,\n\nrisk_level\x18\x04 \x01(\x0e\x32\x18.guardquote.ml.RiskLevel\x12\x18\n\x10\x63onfidence_score\x18\x05 \x01(\x02\x12\x30\n\tbreakdown\x18\x06 \x01(\x0b\x32\x1d.guardquote.ml.QuoteBreakdown\x12\x12\n\nrequest_id\x18\n \x01(\t\x12\x1a\n\x12processing_time_ms\x18\x0b \x01(\x03\x12\x15\n\rmodel_version\x18\x0c \x01(\t\"\x84\x01\n\x0eQuoteBreakdown\x12\x12\n\nmodel_used\x18\x01 \x01(\t\x12\x14\n\x0crisk_factors\x18\x02 \x03(\t\x12\x12\n\nnum_guards\x18\x03 \x01(\x05\x12\r\n\x05hours\x18\x04 \x01(\x02\x12\x10\n\x08is_armed\x18\x05 \x01(\x08\x12\x13\n\x0bhas_vehicle\x18\x06 \x01(\x08\"\x93\x02\n\x14\x43olumnarQuoteRequest\x12,\n\nevent_type\x18\x01 \x03(\x0e\x32\x18.guardquote.ml.EventType\x12\x14\n\x0clocation_zip\x18\x02 \x03(\t\x12\x12\n\nnum_guards\x18\x03 \x03(\x05\x12\r\n\x05hours\x18\x04 \x03(\x02\x12\x12\n\nevent_time\x18\x05 \x03(\x03\x12\x10\n\x08is_armed\x18\x06 \x03(\x08\x12\x18\n\x10requires_vehicle\x18\x07 \x03(\x08\x12\x12\n\ncrowd_size\x18\x08 \x03(\x05\x12\x12\n\nrequest_id\x18\n \x01(\t\x12\x11\n\tclient_id\x18\x0b \x01(\t\x12\x19\n\x11\x63ompress_response\x18\x0c \x01(\x08\"\xdd\x01\n\x15\x43olumnarQuoteResponse\x12\x13\n\x0b\x66inal_price\x18\x01 \x03(\x02\x12,\n\nrisk_level\x18\x02 \x03(\x0e\x32\x18.guardquote.ml.RiskLevel\x12\x12\n\nrisk_score\x18\x03 \x03(\x02\x12\x12\n\nconfidence\x18\x04 \x03(\x02\x12\x12\n\nrequest_id\x18\n \x01(\t\x12\x1a\n\x12processing_time_ms\x18\x0b \x01(\x03\x12\x15\n\rmodel_version\x18\x0c \x01(\t\x12\x12\n\nmodel_used\x18\r \x01(\t\"g\n\nTableChunk\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12*\n\x06\x66ormat\x18\x02 \x01(\x0e\x32\x1a.guardquote.ml.TableFormat\x12\x11\n\tclient_id\x18\x03 \x01(\t\x12\x0c\n\x04rows\x18\x04 \x01(\x03\"\xde\x01\n\x0bRiskRequest\x12,\n\nevent_type\x18\x01 \x01(\x0e\x32\x18.guardquote.ml.EventType\x12\x14\n\x0clocation_zip\x18\x02 \x01(\t\x12\x12\n\nnum_guards\x18\x03 \x01(\x05\x12\r\n\x05hours\x18\x04 \x01(\x02\x12.\n\nevent_date\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x08is_armed\x18\x06 \x01(\x08\x12\x12\n\ncrowd_size\x18\x07 \x01(\x05\x12\x12\n\nrequest_id\x18\n \x01(\t\"\xc1\x01\n\x0cRiskResponse\x12,\n\nrisk_level\x18\x01 \x01(\x0e\x32\x18.guardquote.ml.RiskLevel\x12\x12\n\nrisk_score\x18\x02 \x01(\x02\x12\x0f\n\x07\x66\x61\x63tors\x18\x03 \x03(\t\x12\x17\n\x0frecommendations\x18\x04 \x03(\t\x12\x12\n\nrequest_id\x18\n \x01(\t\x12\x1a\n\x12processing_time_ms\x18\x0b \x01(\x03\x12\x15\n\rmodel_version\x18\x0c \x01(\t\"\x0f\n\rHealthRequest\"G\n\x0eHealthResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x14\n\x0cmodel_loaded\x18\x03 \x01(\x08\"\x12\n\x10ModelInfoRequest\"\xb4\x01\n\x11ModelInfoResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x18\n\x10price_model_name\x18\x02 \x01(\t\x12\x12\n\ntrained_at\x18\x03 \x01(\t\x12\x1c\n\x14price_features_count\x18\x04 \x01(\x05\x12\x1b\n\x13risk_features_count\x18\x05 \x01(\x05\x12\x0f\n\x07message\x18\x06 \x01(\t\x12\x15\n\rmodel_version\x18\x07 \x01(\t\"\x13\n\x11\x45ventTypesRequest\"G\n\x12\x45ventTypesResponse\x12\x31\n\x0b\x65vent_types\x18\x01 \x03(\x0b\x32\x1c.guardquote.ml.EventTypeInfo\"m\n\rEventTypeInfo\x12&\n\x04type\x18\x01 \x01(\x0e\x32\x18.guardquote.ml.EventType\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x11\n\tbase_rate\x18\x03 \x01(\x02\x12\x13\n\x0brisk_weight\x18\x04 \x01(\x02\"%\n\x12ReloadModelRequest\x12\x0f\n\x07version\x18\x01 \x01(\t\"}\n\x13ReloadModelResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x15\n\rmodel_version\x18\x02 \x01(\t\x12\x18\n\x10previous_version\x18\x03 \x01(\t\x12\x14\n\x0cload_time_ms\x18\x04 \x01(\x03\x12\x0f\n\x07message\x18\x05 \x01(\t*\xd8\x01\n\tEventType\x12\x1a\n\x16\x45VENT_TYPE_UNSPECIFIED\x10\x00\x12\x18\n\x14\x45VENT_TYPE_CORPORATE\x10\x01\x12\x16\n\x12\x45VENT_TYPE_CONCERT\x10\x02\x12\x15\n\x11\x45VENT_TYPE_SPORTS\x10\x03\x12\x16\n\x12\x45VENT_TYPE_PRIVATE\x10\x04\x12\x1b\n\x17\x45VENT_TYPE_CONSTRUCTION\x10\x05\x12\x15\n\x11\x45VENT_TYPE_RETAIL\x10\x06\x12\x1a\n\x16\x45VENT_TYPE_RESIDENTIAL\x10\x07*\x80\x01\n\tRiskLevel\x12\x1a\n\x16RISK_LEVEL_UNSPECIFIED\x10\x00\x12\x12\n\x0eRISK_LEVEL_LOW\x10\x01\x12\x15\n\x11RISK_LEVEL_MEDIUM\x10\x02\x12\x13\n\x0fRISK_LEVEL_HIGH\x10\x03\x12\x17\n\x13RISK_LEVEL_CRITICAL\x10\x04*d\n\x0bTableFormat\x12\x1c\n\x18TABLE_FORMAT_UNSPECIFIED\x10\x00\x12\x1d\n\x19TABLE_FORMAT_ARROW_STREAM\x10\x01\x12\x18\n\x14TABLE_FORMAT_PARQUET\x10\x02\x32\xaf\x03\n\x0cQuoteService\x12J\n\rGenerateQuote\x12\x1b.guardquote.ml.QuoteRequest\x1a\x1c.guardquote.ml.QuoteResponse\x12S\n\x16GenerateQuoteRuleBased\x12\x1b.guardquote.ml.QuoteRequest\x1a\x1c.guardquote.ml.QuoteResponse\x12T\n\x13GenerateQuotesBatch\x12\x1b.guardquote.ml.QuoteRequest\x1a\x1c.guardquote.ml.QuoteResponse(\x01\x30\x01\x12`\n\x13ScoreQuotesColumnar\x12#.guardquote.ml.ColumnarQuoteRequest\x1a$.guardquote.ml.ColumnarQuoteResponse\x12\x46\n\nScoreTable\x12\x19.guardquote.ml.TableChunk\x1a\x19.guardquote.ml.TableChunk(\x01\x30\x01\x32\xa4\x01\n\x0bRiskService\x12\x45\n\nAssessRisk\x12\x1a.guardquote.ml.RiskRequest\x1a\x1b.guardquote.ml.RiskResponse\x12N\n\x0f\x41ssessRiskBatch\x12\x1a.guardquote.ml.RiskRequest\x1a\x1b.guardquote.ml.RiskResponse(\x01\x30\x01\x32\xd9\x02\n\x0cModelService\x12J\n\x0bHealthCheck\x12\x1c.guardquote.ml.HealthRequest\x1a\x1d.guardquote.ml.HealthResponse\x12Q\n\x0cGetModelInfo\x12\x1f.guardquote.ml.ModelInfoRequest\x1a .guardquote.ml.ModelInfoResponse\x12T\n\rGetEventTypes\x12 .guardquote.ml.EventTypesRequest\x1a!.guardquote.ml.EventTypesResponse\x12T\n\x0bReloadModel\x12!.guardquote.ml.ReloadModelRequest\x1a\".guardquote.ml.ReloadModelResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'ml_engine_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_EVENTTYPE']._serialized_start=1601
-  _globals['_EVENTTYPE']._serialized_end=1817
-  _globals['_RISKLEVEL']._serialized_start=1820
-  _globals['_RISKLEVEL']._serialized_end=1948
+  _globals['_EVENTTYPE']._serialized_start=2443
+  _globals['_EVENTTYPE']._serialized_end=2659
+  _globals['_RISKLEVEL']._serialized_start=2662
+  _globals['_RISKLEVEL']._serialized_end=2790
+  _globals['_TABLEFORMAT']._serialized_start=2792
+  _globals['_TABLEFORMAT']._serialized_end=2892
   _globals['_QUOTEREQUEST']._serialized_start=68
   _globals['_QUOTEREQUEST']._serialized_end=336
   _globals['_QUOTERESPONSE']._serialized_start=339
-  _globals['_QUOTERESPONSE']._serialized_end=590
-  _globals['_QUOTEBREAKDOWN']._serialized_start=593
-  _globals['_QUOTEBREAKDOWN']._serialized_end=725
-  _globals['_RISKREQUEST']._serialized_start=728
-  _globals['_RISKREQUEST']._serialized_end=950
-  _globals['_RISKRESPONSE']._serialized_start=953
-  _globals['_RISKRESPONSE']._serialized_end=1123
-  _globals['_HEALTHREQUEST']._serialized_start=1125
-  _globals['_HEALTHREQUEST']._serialized_end=1140
-  _globals['_HEALTHRESPONSE']._serialized_start=1142
-  _globals['_HEALTHRESPONSE']._serialized_end=1213
-  _globals['_MODELINFOREQUEST']._serialized_start=1215
-  _globals['_MODELINFOREQUEST']._serialized_end=1233
-  _globals['_MODELINFORESPONSE']._serialized_start=1236
-  _globals['_MODELINFORESPONSE']._serialized_end=1393
-  _globals['_EVENTTYPESREQUEST']._serialized_start=1395
-  _globals['_EVENTTYPESREQUEST']._serialized_end=1414
-  _globals['_EVENTTYPESRESPONSE']._serialized_start=1416
-  _globals['_EVENTTYPESRESPONSE']._serialized_end=1487
-  _globals['_EVENTTYPEINFO']._serialized_start=1489
-  _globals['_EVENTTYPEINFO']._serialized_end=1598
-  _globals['_QUOTESERVICE']._serialized_start=1951
-  _globals['_QUOTESERVICE']._serialized_end=2212
-  _globals['_RISKSERVICE']._serialized_start=2215
-  _globals['_RISKSERVICE']._serialized_end=2379
-  _globals['_MODELSERVICE']._serialized_start=2382
-  _globals['_MODELSERVICE']._serialized_end=2641
+  _globals['_QUOTERESPONSE']._serialized_end=613
+  _globals['_QUOTEBREAKDOWN']._serialized_start=616
+  _globals['_QUOTEBREAKDOWN']._serialized_end=748
+  _globals['_COLUMNARQUOTEREQUEST']._serialized_start=751
+  _globals['_COLUMNARQUOTEREQUEST']._serialized_end=1026
+  _globals['_COLUMNARQUOTERESPONSE']._serialized_start=1029
+  _globals['_COLUMNARQUOTERESPONSE']._serialized_end=1250
+  _globals['_TABLECHUNK']._serialized_start=1252
+  _globals['_TABLECHUNK']._serialized_end=1355
+  _globals['_RISKREQUEST']._serialized_start=1358
+  _globals['_RISKREQUEST']._serialized_end=1580
+  _globals['_RISKRESPONSE']._serialized_start=1583
+  _globals['_RISKRESPONSE']._serialized_end=1776
+  _globals['_HEALTHREQUEST']._serialized_start=1778
+  _globals['_HEALTHREQUEST']._serialized_end=1793
+  _globals['_HEALTHRESPONSE']._serialized_start=1795
+  _globals['_HEALTHRESPONSE']._serialized_end=1866
+  _globals['_MODELINFOREQUEST']._serialized_start=1868
+  _globals['_MODELINFOREQUEST']._serialized_end=1886
+  _globals['_MODELINFORESPONSE']._serialized_start=1889
+  _globals['_MODELINFORESPONSE']._serialized_end=2069
+  _globals['_EVENTTYPESREQUEST']._serialized_start=2071
+  _globals['_EVENTTYPESREQUEST']._serialized_end=2090
+  _globals['_EVENTTYPESRESPONSE']._serialized_start=2092
+  _globals['_EVENTTYPESRESPONSE']._serialized_end=2163
+  _globals['_EVENTTYPEINFO']._serialized_start=2165
+  _globals['_EVENTTYPEINFO']._serialized_end=2274
+  _globals['_RELOADMODELREQUEST']._serialized_start=2276
+  _globals['_RELOADMODELREQUEST']._serialized_end=2313
+  _globals['_RELOADMODELRESPONSE']._serialized_start=2315
+  _globals['_RELOADMODELRESPONSE']._serialized_end=2440
+  _globals['_QUOTESERVICE']._serialized_start=2895
+  _globals['_QUOTESERVICE']._serialized_end=3326
+  _globals['_RISKSERVICE']._serialized_start=3329
+  _globals['_RISKSERVICE']._serialized_end=3493
+  _globals['_MODELSERVICE']._serialized_start=3496
+  _globals['_MODELSERVICE']._serialized_end=3841
 # @@protoc_insertion_point(module_scope)
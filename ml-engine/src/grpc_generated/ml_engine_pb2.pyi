@@ -28,6 +28,12 @@ class RiskLevel(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
     RISK_LEVEL_MEDIUM: _ClassVar[RiskLevel]
     RISK_LEVEL_HIGH: _ClassVar[RiskLevel]
     RISK_LEVEL_CRITICAL: _ClassVar[RiskLevel]
+
+class TableFormat(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    TABLE_FORMAT_UNSPECIFIED: _ClassVar[TableFormat]
+    TABLE_FORMAT_ARROW_STREAM: _ClassVar[TableFormat]
+    TABLE_FORMAT_PARQUET: _ClassVar[TableFormat]
 EVENT_TYPE_UNSPECIFIED: EventType
 EVENT_TYPE_CORPORATE: EventType
 EVENT_TYPE_CONCERT: EventType
@@ -41,6 +47,9 @@ RISK_LEVEL_LOW: RiskLevel
 RISK_LEVEL_MEDIUM: RiskLevel
 RISK_LEVEL_HIGH: RiskLevel
 RISK_LEVEL_CRITICAL: RiskLevel
+TABLE_FORMAT_UNSPECIFIED: TableFormat
+TABLE_FORMAT_ARROW_STREAM: TableFormat
+TABLE_FORMAT_PARQUET: TableFormat
 
 class QuoteRequest(_message.Message):
     __slots__ = ("event_type", "location_zip", "num_guards", "hours", "event_date", "is_armed", "requires_vehicle", "crowd_size", "request_id", "client_id")
@@ -67,7 +76,7 @@ class QuoteRequest(_message.Message):
     def __init__(self, event_type: _Optional[_Union[EventType, str]] = ..., location_zip: _Optional[str] = ..., num_guards: _Optional[int] = ..., hours: _Optional[float] = ..., event_date: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., is_armed: bool = ..., requires_vehicle: bool = ..., crowd_size: _Optional[int] = ..., request_id: _Optional[str] = ..., client_id: _Optional[str] = ...) -> None: ...
 
 class QuoteResponse(_message.Message):
-    __slots__ = ("base_price", "risk_multiplier", "final_price", "risk_level", "confidence_score", "breakdown", "request_id", "processing_time_ms")
+    __slots__ = ("base_price", "risk_multiplier", "final_price", "risk_level", "confidence_score", "breakdown", "request_id", "processing_time_ms", "model_version")
     BASE_PRICE_FIELD_NUMBER: _ClassVar[int]
     RISK_MULTIPLIER_FIELD_NUMBER: _ClassVar[int]
     FINAL_PRICE_FIELD_NUMBER: _ClassVar[int]
@@ -76,6 +85,7 @@ class QuoteResponse(_message.Message):
     BREAKDOWN_FIELD_NUMBER: _ClassVar[int]
     REQUEST_ID_FIELD_NUMBER: _ClassVar[int]
     PROCESSING_TIME_MS_FIELD_NUMBER: _ClassVar[int]
+    MODEL_VERSION_FIELD_NUMBER: _ClassVar[int]
     base_price: float
     risk_multiplier: float
     final_price: float
@@ -84,7 +94,8 @@ class QuoteResponse(_message.Message):
     breakdown: QuoteBreakdown
     request_id: str
     processing_time_ms: int
-    def __init__(self, base_price: _Optional[float] = ..., risk_multiplier: _Optional[float] = ..., final_price: _Optional[float] = ..., risk_level: _Optional[_Union[RiskLevel, str]] = ..., confidence_score: _Optional[float] = ..., breakdown: _Optional[_Union[QuoteBreakdown, _Mapping]] = ..., request_id: _Optional[str] = ..., processing_time_ms: _Optional[int] = ...) -> None: ...
+    model_version: str
+    def __init__(self, base_price: _Optional[float] = ..., risk_multiplier: _Optional[float] = ..., final_price: _Optional[float] = ..., risk_level: _Optional[_Union[RiskLevel, str]] = ..., confidence_score: _Optional[float] = ..., breakdown: _Optional[_Union[QuoteBreakdown, _Mapping]] = ..., request_id: _Optional[str] = ..., processing_time_ms: _Optional[int] = ..., model_version: _Optional[str] = ...) -> None: ...
 
 class QuoteBreakdown(_message.Message):
     __slots__ = ("model_used", "risk_factors", "num_guards", "hours", "is_armed", "has_vehicle")
@@ -102,6 +113,64 @@ class QuoteBreakdown(_message.Message):
     has_vehicle: bool
     def __init__(self, model_used: _Optional[str] = ..., risk_factors: _Optional[_Iterable[str]] = ..., num_guards: _Optional[int] = ..., hours: _Optional[float] = ..., is_armed: bool = ..., has_vehicle: bool = ...) -> None: ...
 
+class ColumnarQuoteRequest(_message.Message):
+    __slots__ = ("event_type", "location_zip", "num_guards", "hours", "event_time", "is_armed", "requires_vehicle", "crowd_size", "request_id", "client_id", "compress_response")
+    EVENT_TYPE_FIELD_NUMBER: _ClassVar[int]
+    LOCATION_ZIP_FIELD_NUMBER: _ClassVar[int]
+    NUM_GUARDS_FIELD_NUMBER: _ClassVar[int]
+    HOURS_FIELD_NUMBER: _ClassVar[int]
+    EVENT_TIME_FIELD_NUMBER: _ClassVar[int]
+    IS_ARMED_FIELD_NUMBER: _ClassVar[int]
+    REQUIRES_VEHICLE_FIELD_NUMBER: _ClassVar[int]
+    CROWD_SIZE_FIELD_NUMBER: _ClassVar[int]
+    REQUEST_ID_FIELD_NUMBER: _ClassVar[int]
+    CLIENT_ID_FIELD_NUMBER: _ClassVar[int]
+    COMPRESS_RESPONSE_FIELD_NUMBER: _ClassVar[int]
+    event_type: _containers.RepeatedScalarFieldContainer[EventType]
+    location_zip: _containers.RepeatedScalarFieldContainer[str]
+    num_guards: _containers.RepeatedScalarFieldContainer[int]
+    hours: _containers.RepeatedScalarFieldContainer[float]
+    event_time: _containers.RepeatedScalarFieldContainer[int]
+    is_armed: _containers.RepeatedScalarFieldContainer[bool]
+    requires_vehicle: _containers.RepeatedScalarFieldContainer[bool]
+    crowd_size: _containers.RepeatedScalarFieldContainer[int]
+    request_id: str
+    client_id: str
+    compress_response: bool
+    def __init__(self, event_type: _Optional[_Iterable[_Union[EventType, str]]] = ..., location_zip: _Optional[_Iterable[str]] = ..., num_guards: _Optional[_Iterable[int]] = ..., hours: _Optional[_Iterable[float]] = ..., event_time: _Optional[_Iterable[int]] = ..., is_armed: _Optional[_Iterable[bool]] = ..., requires_vehicle: _Optional[_Iterable[bool]] = ..., crowd_size: _Optional[_Iterable[int]] = ..., request_id: _Optional[str] = ..., client_id: _Optional[str] = ..., compress_response: bool = ...) -> None: ...
+
+class ColumnarQuoteResponse(_message.Message):
+    __slots__ = ("final_price", "risk_level", "risk_score", "confidence", "request_id", "processing_time_ms", "model_version", "model_used")
+    FINAL_PRICE_FIELD_NUMBER: _ClassVar[int]
+    RISK_LEVEL_FIELD_NUMBER: _ClassVar[int]
+    RISK_SCORE_FIELD_NUMBER: _ClassVar[int]
+    CONFIDENCE_FIELD_NUMBER: _ClassVar[int]
+    REQUEST_ID_FIELD_NUMBER: _ClassVar[int]
+    PROCESSING_TIME_MS_FIELD_NUMBER: _ClassVar[int]
+    MODEL_VERSION_FIELD_NUMBER: _ClassVar[int]
+    MODEL_USED_FIELD_NUMBER: _ClassVar[int]
+    final_price: _containers.RepeatedScalarFieldContainer[float]
+    risk_level: _containers.RepeatedScalarFieldContainer[RiskLevel]
+    risk_score: _containers.RepeatedScalarFieldContainer[float]
+    confidence: _containers.RepeatedScalarFieldContainer[float]
+    request_id: str
+    processing_time_ms: int
+    model_version: str
+    model_used: str
+    def __init__(self, final_price: _Optional[_Iterable[float]] = ..., risk_level: _Optional[_Iterable[_Union[RiskLevel, str]]] = ..., risk_score: _Optional[_Iterable[float]] = ..., confidence: _Optional[_Iterable[float]] = ..., request_id: _Optional[str] = ..., processing_time_ms: _Optional[int] = ..., model_version: _Optional[str] = ..., model_used: _Optional[str] = ...) -> None: ...
+
+class TableChunk(_message.Message):
+    __slots__ = ("data", "format", "client_id", "rows")
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    FORMAT_FIELD_NUMBER: _ClassVar[int]
+    CLIENT_ID_FIELD_NUMBER: _ClassVar[int]
+    ROWS_FIELD_NUMBER: _ClassVar[int]
+    data: bytes
+    format: TableFormat
+    client_id: str
+    rows: int
+    def __init__(self, data: _Optional[bytes] = ..., format: _Optional[_Union[TableFormat, str]] = ..., client_id: _Optional[str] = ..., rows: _Optional[int] = ...) -> None: ...
+
 class RiskRequest(_message.Message):
     __slots__ = ("event_type", "location_zip", "num_guards", "hours", "event_date", "is_armed", "crowd_size", "request_id")
     EVENT_TYPE_FIELD_NUMBER: _ClassVar[int]
@@ -123,20 +192,22 @@ class RiskRequest(_message.Message):
     def __init__(self, event_type: _Optional[_Union[EventType, str]] = ..., location_zip: _Optional[str] = ..., num_guards: _Optional[int] = ..., hours: _Optional[float] = ..., event_date: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., is_armed: bool = ..., crowd_size: _Optional[int] = ..., request_id: _Optional[str] = ...) -> None: ...
 
 class RiskResponse(_message.Message):
-    __slots__ = ("risk_level", "risk_score", "factors", "recommendations", "request_id", "processing_time_ms")
+    __slots__ = ("risk_level", "risk_score", "factors", "recommendations", "request_id", "processing_time_ms", "model_version")
     RISK_LEVEL_FIELD_NUMBER: _ClassVar[int]
     RISK_SCORE_FIELD_NUMBER: _ClassVar[int]
     FACTORS_FIELD_NUMBER: _ClassVar[int]
     RECOMMENDATIONS_FIELD_NUMBER: _ClassVar[int]
     REQUEST_ID_FIELD_NUMBER: _ClassVar[int]
     PROCESSING_TIME_MS_FIELD_NUMBER: _ClassVar[int]
+    MODEL_VERSION_FIELD_NUMBER: _ClassVar[int]
     risk_level: RiskLevel
     risk_score: float
     factors: _containers.RepeatedScalarFieldContainer[str]
     recommendations: _containers.RepeatedScalarFieldContainer[str]
     request_id: str
     processing_time_ms: int
-    def __init__(self, risk_level: _Optional[_Union[RiskLevel, str]] = ..., risk_score: _Optional[float] = ..., factors: _Optional[_Iterable[str]] = ..., recommendations: _Optional[_Iterable[str]] = ..., request_id: _Optional[str] = ..., processing_time_ms: _Optional[int] = ...) -> None: ...
+    model_version: str
+    def __init__(self, risk_level: _Optional[_Union[RiskLevel, str]] = ..., risk_score: _Optional[float] = ..., factors: _Optional[_Iterable[str]] = ..., recommendations: _Optional[_Iterable[str]] = ..., request_id: _Optional[str] = ..., processing_time_ms: _Optional[int] = ..., model_version: _Optional[str] = ...) -> None: ...
 
 class HealthRequest(_message.Message):
     __slots__ = ()
@@ -157,20 +228,22 @@ class ModelInfoRequest(_message.Message):
     def __init__(self) -> None: ...
 
 class ModelInfoResponse(_message.Message):
-    __slots__ = ("status", "price_model_name", "trained_at", "price_features_count", "risk_features_count", "message")
+    __slots__ = ("status", "price_model_name", "trained_at", "price_features_count", "risk_features_count", "message", "model_version")
     STATUS_FIELD_NUMBER: _ClassVar[int]
     PRICE_MODEL_NAME_FIELD_NUMBER: _ClassVar[int]
     TRAINED_AT_FIELD_NUMBER: _ClassVar[int]
     PRICE_FEATURES_COUNT_FIELD_NUMBER: _ClassVar[int]
     RISK_FEATURES_COUNT_FIELD_NUMBER: _ClassVar[int]
     MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    MODEL_VERSION_FIELD_NUMBER: _ClassVar[int]
     status: str
     price_model_name: str
     trained_at: str
     price_features_count: int
     risk_features_count: int
     message: str
-    def __init__(self, status: _Optional[str] = ..., price_model_name: _Optional[str] = ..., trained_at: _Optional[str] = ..., price_features_count: _Optional[int] = ..., risk_features_count: _Optional[int] = ..., message: _Optional[str] = ...) -> None: ...
+    model_version: str
+    def __init__(self, status: _Optional[str] = ..., price_model_name: _Optional[str] = ..., trained_at: _Optional[str] = ..., price_features_count: _Optional[int] = ..., risk_features_count: _Optional[int] = ..., message: _Optional[str] = ..., model_version: _Optional[str] = ...) -> None: ...
 
 class EventTypesRequest(_message.Message):
     __slots__ = ()
@@ -193,3 +266,23 @@ class EventTypeInfo(_message.Message):
     base_rate: float
     risk_weight: float
     def __init__(self, type: _Optional[_Union[EventType, str]] = ..., name: _Optional[str] = ..., base_rate: _Optional[float] = ..., risk_weight: _Optional[float] = ...) -> None: ...
+
+class ReloadModelRequest(_message.Message):
+    __slots__ = ("version",)
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    version: str
+    def __init__(self, version: _Optional[str] = ...) -> None: ...
+
+class ReloadModelResponse(_message.Message):
+    __slots__ = ("status", "model_version", "previous_version", "load_time_ms", "message")
+    STATUS_FIELD_NUMBER: _ClassVar[int]
+    MODEL_VERSION_FIELD_NUMBER: _ClassVar[int]
+    PREVIOUS_VERSION_FIELD_NUMBER: _ClassVar[int]
+    LOAD_TIME_MS_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    status: str
+    model_version: str
+    previous_version: str
+    load_time_ms: int
+    message: str
+    def __init__(self, status: _Optional[str] = ..., model_version: _Optional[str] = ..., previous_version: _Optional[str] = ..., load_time_ms: _Optional[int] = ..., message: _Optional[str] = ...) -> None: ...
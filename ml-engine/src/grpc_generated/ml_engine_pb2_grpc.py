@@ -53,6 +53,16 @@ class QuoteServiceStub(object):
                 request_serializer=ml__engine__pb2.QuoteRequest.SerializeToString,
                 response_deserializer=ml__engine__pb2.QuoteResponse.FromString,
                 _registered_method=True)
+        self.ScoreQuotesColumnar = channel.unary_unary(
+                '/guardquote.ml.QuoteService/ScoreQuotesColumnar',
+                request_serializer=ml__engine__pb2.ColumnarQuoteRequest.SerializeToString,
+                response_deserializer=ml__engine__pb2.ColumnarQuoteResponse.FromString,
+                _registered_method=True)
+        self.ScoreTable = channel.stream_stream(
+                '/guardquote.ml.QuoteService/ScoreTable',
+                request_serializer=ml__engine__pb2.TableChunk.SerializeToString,
+                response_deserializer=ml__engine__pb2.TableChunk.FromString,
+                _registered_method=True)
 
 
 class QuoteServiceServicer(object):
@@ -83,6 +93,21 @@ class QuoteServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ScoreQuotesColumnar(self, request, context):
+        """High-volume scoring: one message of packed arrays in, one out
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ScoreTable(self, request_iterator, context):
+        """Bulk repricing: an Arrow IPC stream or Parquet file in, the same table
+        with predicted_price, risk_level, risk_score and confidence columns out
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_QuoteServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -101,6 +126,16 @@ def add_QuoteServiceServicer_to_server(servicer, server):
                     request_deserializer=ml__engine__pb2.QuoteRequest.FromString,
                     response_serializer=ml__engine__pb2.QuoteResponse.SerializeToString,
             ),
+            'ScoreQuotesColumnar': grpc.unary_unary_rpc_method_handler(
+                    servicer.ScoreQuotesColumnar,
+                    request_deserializer=ml__engine__pb2.ColumnarQuoteRequest.FromString,
+                    response_serializer=ml__engine__pb2.ColumnarQuoteResponse.SerializeToString,
+            ),
+            'ScoreTable': grpc.stream_stream_rpc_method_handler(
+                    servicer.ScoreTable,
+                    request_deserializer=ml__engine__pb2.TableChunk.FromString,
+                    response_serializer=ml__engine__pb2.TableChunk.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'guardquote.ml.QuoteService', rpc_method_handlers)
@@ -197,6 +232,60 @@ class QuoteService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def ScoreQuotesColumnar(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/guardquote.ml.QuoteService/ScoreQuotesColumnar',
+            ml__engine__pb2.ColumnarQuoteRequest.SerializeToString,
+            ml__engine__pb2.ColumnarQuoteResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ScoreTable(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/guardquote.ml.QuoteService/ScoreTable',
+            ml__engine__pb2.TableChunk.SerializeToString,
+            ml__engine__pb2.TableChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
 
 class RiskServiceStub(object):
     """============================================================================
@@ -355,6 +444,11 @@ class ModelServiceStub(object):
                 request_serializer=ml__engine__pb2.EventTypesRequest.SerializeToString,
                 response_deserializer=ml__engine__pb2.EventTypesResponse.FromString,
                 _registered_method=True)
+        self.ReloadModel = channel.unary_unary(
+                '/guardquote.ml.ModelService/ReloadModel',
+                request_serializer=ml__engine__pb2.ReloadModelRequest.SerializeToString,
+                response_deserializer=ml__engine__pb2.ReloadModelResponse.FromString,
+                _registered_method=True)
 
 
 class ModelServiceServicer(object):
@@ -385,6 +479,13 @@ class ModelServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ReloadModel(self, request, context):
+        """Load, warm and atomically swap in a model version from the registry
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ModelServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -403,6 +504,11 @@ def add_ModelServiceServicer_to_server(servicer, server):
                     request_deserializer=ml__engine__pb2.EventTypesRequest.FromString,
                     response_serializer=ml__engine__pb2.EventTypesResponse.SerializeToString,
             ),
+            'ReloadModel': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReloadModel,
+                    request_deserializer=ml__engine__pb2.ReloadModelRequest.FromString,
+                    response_serializer=ml__engine__pb2.ReloadModelResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'guardquote.ml.ModelService', rpc_method_handlers)
@@ -498,3 +604,30 @@ class ModelService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ReloadModel(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/guardquote.ml.ModelService/ReloadModel',
+            ml__engine__pb2.ReloadModelRequest.SerializeToString,
+            ml__engine__pb2.ReloadModelResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
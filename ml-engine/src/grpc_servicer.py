@@ -11,6 +11,7 @@ from datetime import datetime
 from concurrent import futures
 
 import grpc
+import numpy as np
 
 from .grpc_generated import (
     # Enums
@@ -20,6 +21,10 @@ from .grpc_generated import (
     QuoteRequest,
     QuoteResponse,
     QuoteBreakdown,
+    ColumnarQuoteRequest,
+    ColumnarQuoteResponse,
+    TableChunk,
+    TableFormat,
     # Risk types
     RiskRequest,
     RiskResponse,
@@ -31,6 +36,8 @@ from .grpc_generated import (
     EventTypesRequest,
     EventTypesResponse,
     EventTypeInfo,
+    ReloadModelRequest,
+    ReloadModelResponse,
     # Servicers
     QuoteServiceServicer,
     RiskServiceServicer,
@@ -41,7 +48,24 @@ from .grpc_generated import (
 )
 from .models.schemas import EventType, RiskLevel
 from .models.pricing_engine import get_pricing_engine, PricingEngine
-from .models.trained_predictor import get_predictor
+from .models.manager import get_model_manager
+from .models.registry import UnknownModelVersion
+from .models.trained_predictor import (
+    RISK_LEVELS,
+    QuotePrediction,
+    get_predictor,
+    is_ready,
+    local_wall_clock,
+    reload_predictor,
+    start_registry_watcher,
+    start_warm_up,
+)
+from .serving import (
+    get_quote_batcher, get_risk_batcher, iter_chunks, idempotent, VERSION_KEY, CACHE_BYPASS_KEY,
+)
+from .serving.catalog import Cached, model_key, rates_key
+from .serving.tables import ARROW_STREAM, PARQUET, ArrowUnavailable, TableSpool
+from .config import get_settings
 from . import __version__
 
 logger = logging.getLogger(__name__)
@@ -90,6 +114,218 @@ def event_type_to_proto(event_type: EventType) -> ProtoEventType:
     return mapping.get(event_type, ProtoEventType.EVENT_TYPE_CORPORATE)
 
 
+# ============================================================================
+# Request / Response Builders
+# ============================================================================
+
+def quote_inputs(request: QuoteRequest) -> dict:
+    """Predictor inputs for a QuoteRequest."""
+    return {
+        'event_type': proto_to_event_type(request.event_type).value,
+        'state': "CA",  # TODO: extract from zip
+        'zip_code': request.location_zip,
+        'risk_zone': "medium",  # TODO: lookup from DB
+        'num_guards': request.num_guards,
+        'hours': request.hours,
+        'crowd_size': request.crowd_size,
+        'event_date': datetime.fromtimestamp(request.event_date.seconds),
+        'is_armed': request.is_armed,
+        'has_vehicle': request.requires_vehicle,
+    }
+
+
+def risk_inputs(request: RiskRequest) -> dict:
+    """Predictor inputs for a RiskRequest."""
+    return {
+        'event_type': proto_to_event_type(request.event_type).value,
+        'state': "CA",
+        'zip_code': request.location_zip,
+        'num_guards': request.num_guards,
+        'hours': request.hours,
+        'crowd_size': request.crowd_size,
+        'event_date': datetime.fromtimestamp(request.event_date.seconds),
+        'is_armed': request.is_armed,
+    }
+
+
+def requested_version(context, client_id: str = "") -> str | None:
+    """Model version selected by ``x-model-version`` metadata or the client's route.
+
+    None selects the default (serving) version.
+    """
+    metadata = dict(context.invocation_metadata() or ())
+    return get_model_manager().resolve(
+        requested=metadata.get('x-model-version'),
+        client_id=client_id or metadata.get('x-client-id'),
+    )
+
+
+def with_version(inputs: dict, version: str | None, context=None) -> dict:
+    """Tag predictor inputs with a model version for the batchers.
+
+    With a ``context`` whose ``cache-control`` metadata is ``no-cache`` (or
+    ``no-store``), also tag them to skip the score cache.
+    """
+    if version is not None:
+        inputs[VERSION_KEY] = version
+    if context is not None:
+        cache_control = dict(context.invocation_metadata() or ()).get('cache-control', '')
+        if {'no-cache', 'no-store'} & {d.strip().lower() for d in cache_control.split(',')}:
+            inputs[CACHE_BYPASS_KEY] = True
+    return inputs
+
+
+def build_quote_response(
+    request: QuoteRequest, prediction: QuotePrediction, processing_time: int
+) -> QuoteResponse:
+    """Assemble a QuoteResponse from a fused quote prediction."""
+    return QuoteResponse(
+        base_price=prediction.base_price,
+        risk_multiplier=prediction.risk_multiplier,
+        final_price=prediction.predicted_price,
+        risk_level=risk_level_to_proto(RiskLevel(prediction.risk_level)),
+        confidence_score=prediction.confidence,
+        breakdown=QuoteBreakdown(
+            model_used=prediction.model_used,
+            risk_factors=prediction.factors,
+            num_guards=request.num_guards,
+            hours=request.hours,
+            is_armed=request.is_armed,
+            has_vehicle=request.requires_vehicle,
+        ),
+        request_id=request.request_id,
+        processing_time_ms=processing_time,
+        model_version=prediction.model_version,
+    )
+
+
+def build_risk_response(
+    request: RiskRequest, result: dict, event_date: datetime, processing_time: int
+) -> RiskResponse:
+    """Assemble a RiskResponse, adding recommendations for the risk level."""
+    recommendations = []
+    if result['risk_level'] in ['high', 'critical']:
+        recommendations.append("Consider additional guards for high-risk scenario")
+    if request.crowd_size > 500 and not request.is_armed:
+        recommendations.append("Armed security recommended for large crowds")
+    if event_date.hour >= 22 or event_date.hour < 6:
+        recommendations.append("Ensure proper lighting and communication equipment")
+    if result['risk_level'] == 'critical':
+        recommendations.append("Coordinate with local law enforcement")
+    if not recommendations:
+        recommendations.append("Standard protocols apply")
+
+    return RiskResponse(
+        risk_level=risk_level_to_proto(RiskLevel(result['risk_level'])),
+        risk_score=result['risk_score'],
+        factors=result['factors'],
+        recommendations=recommendations,
+        request_id=request.request_id,
+        processing_time_ms=processing_time,
+        model_version=result.get('model_version', ''),
+    )
+
+
+# ============================================================================
+# Columnar Batches
+# ============================================================================
+
+# Proto EventType code -> predictor label (unknown codes score as corporate)
+PROTO_EVENT_NAMES = np.array([proto_to_event_type(code).value for code in ProtoEventType.values()])
+# RISK_LEVELS index -> proto RiskLevel code
+PROTO_RISK_CODES = np.array([risk_level_to_proto(RiskLevel(level)) for level in RISK_LEVELS])
+
+
+def columnar_inputs(request: ColumnarQuoteRequest) -> dict:
+    """Predictor column inputs for a ColumnarQuoteRequest (no per-quote objects).
+
+    Raises ValueError if the arrays disagree in length.
+    """
+    n = len(request.num_guards)
+    columns = {
+        'event_type': request.event_type, 'hours': request.hours,
+        'event_time': request.event_time, 'is_armed': request.is_armed,
+        'requires_vehicle': request.requires_vehicle, 'crowd_size': request.crowd_size,
+    }
+    mismatched = [name for name, values in columns.items() if len(values) != n]
+    if request.location_zip and len(request.location_zip) != n:
+        mismatched.append('location_zip')
+    if mismatched:
+        raise ValueError(f"Columns {', '.join(mismatched)} do not match num_guards length {n}")
+
+    codes = np.fromiter(request.event_type, dtype=np.intp, count=n)
+    codes[(codes < 0) | (codes >= len(PROTO_EVENT_NAMES))] = 0
+    return {
+        'event_type': PROTO_EVENT_NAMES[codes],
+        'num_guards': np.fromiter(request.num_guards, dtype=np.int64, count=n),
+        'hours': np.fromiter(request.hours, dtype=np.float64, count=n),
+        'crowd_size': np.fromiter(request.crowd_size, dtype=np.int64, count=n),
+        'event_date': local_wall_clock(np.fromiter(request.event_time, dtype=np.int64, count=n)),
+        'is_armed': np.fromiter(request.is_armed, dtype=bool, count=n),
+        'has_vehicle': np.fromiter(request.requires_vehicle, dtype=bool, count=n),
+    }
+
+
+def score_columnar(request: ColumnarQuoteRequest, version: str | None) -> ColumnarQuoteResponse:
+    """Score a columnar batch with one vectorized predictor call."""
+    start_time = time.time()
+    columns = columnar_inputs(request)
+    arrays = get_model_manager().get(version).predict_quote_arrays(columns)
+    return ColumnarQuoteResponse(
+        final_price=arrays.predicted_price.tolist(),
+        risk_level=PROTO_RISK_CODES[arrays.risk_level].tolist(),
+        risk_score=arrays.risk_score.tolist(),
+        confidence=arrays.confidence.tolist(),
+        request_id=request.request_id,
+        processing_time_ms=int((time.time() - start_time) * 1000),
+        model_version=arrays.model_version,
+        model_used=arrays.model_used,
+    )
+
+
+# ============================================================================
+# Table Scoring
+# ============================================================================
+
+TABLE_FORMATS = {
+    TableFormat.TABLE_FORMAT_ARROW_STREAM: ARROW_STREAM,
+    TableFormat.TABLE_FORMAT_PARQUET: PARQUET,
+}
+
+
+def open_table_spool(first: TableChunk) -> TableSpool:
+    """Spool for a ScoreTable upload, from its first message."""
+    fmt = TABLE_FORMATS.get(first.format)
+    if fmt is None:
+        raise ValueError("The first TableChunk must set format")
+    return TableSpool(fmt)
+
+
+def table_status(error: Exception) -> grpc.StatusCode:
+    """Status code for a failed ScoreTable call."""
+    if isinstance(error, UnknownModelVersion):
+        return grpc.StatusCode.NOT_FOUND
+    if isinstance(error, ArrowUnavailable):
+        return grpc.StatusCode.UNIMPLEMENTED
+    if isinstance(error, ValueError):  # includes pyarrow.ArrowInvalid
+        return grpc.StatusCode.INVALID_ARGUMENT
+    return grpc.StatusCode.INTERNAL
+
+
+def score_table_spool(spool: TableSpool, version: str | None) -> int:
+    return spool.score(get_model_manager().get(version))
+
+
+def iter_table_output(spool: TableSpool):
+    """Scored file in TableChunk pieces, then the row count; removes the spool."""
+    try:
+        for block in spool.iter_output():
+            yield TableChunk(data=block)
+        yield TableChunk(rows=spool.rows)
+    finally:
+        spool.close()
+
+
 # ============================================================================
 # Quote Service Implementation
 # ============================================================================
@@ -102,61 +338,30 @@ class QuoteServiceImpl(QuoteServiceServicer):
         start_time = time.time()
         
         try:
-            predictor = get_predictor()
-            event_type = proto_to_event_type(request.event_type)
-            event_date = datetime.fromtimestamp(request.event_date.seconds)
-
-            # Get ML predictions
-            price_result = predictor.predict_price(
-                event_type=event_type.value,
-                state="CA",  # TODO: extract from zip
-                zip_code=request.location_zip,
-                risk_zone="medium",  # TODO: lookup from DB
-                num_guards=request.num_guards,
-                hours=request.hours,
-                crowd_size=request.crowd_size,
-                event_date=event_date,
-                is_armed=request.is_armed,
-                has_vehicle=request.requires_vehicle,
-            )
-
-            risk_result = predictor.predict_risk(
-                event_type=event_type.value,
-                state="CA",
-                zip_code=request.location_zip,
-                num_guards=request.num_guards,
-                hours=request.hours,
-                crowd_size=request.crowd_size,
-                event_date=event_date,
-                is_armed=request.is_armed,
-            )
-
-            processing_time = int((time.time() - start_time) * 1000)
-
-            return QuoteResponse(
-                base_price=price_result['predicted_price'] / 1.0875,
-                risk_multiplier=1.0 + (risk_result['risk_score'] * 0.5),
-                final_price=price_result['predicted_price'],
-                risk_level=risk_level_to_proto(RiskLevel(risk_result['risk_level'])),
-                confidence_score=price_result['confidence'],
-                breakdown=QuoteBreakdown(
-                    model_used=price_result['model_used'],
-                    risk_factors=risk_result['factors'],
-                    num_guards=request.num_guards,
-                    hours=request.hours,
-                    is_armed=request.is_armed,
-                    has_vehicle=request.requires_vehicle,
-                ),
-                request_id=request.request_id,
-                processing_time_ms=processing_time,
+            # Retries of a call already scored (or being scored) are not scored again
+            return idempotent(
+                context, 'GenerateQuote', request,
+                lambda: self._generate_quote(request, context, start_time), request.client_id,
             )
 
+        except UnknownModelVersion as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return QuoteResponse()
         except Exception as e:
             logger.error(f"Quote generation failed: {e}")
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             return QuoteResponse()
 
+    def _generate_quote(self, request: QuoteRequest, context, start_time: float) -> QuoteResponse:
+        # Get ML predictions (micro-batched with concurrent requests)
+        version = requested_version(context, request.client_id)
+        prediction = get_quote_batcher()(with_version(quote_inputs(request), version, context))
+
+        processing_time = int((time.time() - start_time) * 1000)
+        return build_quote_response(request, prediction, processing_time)
+
     def GenerateQuoteRuleBased(self, request: QuoteRequest, context) -> QuoteResponse:
         """Generate a price quote using rule-based engine."""
         start_time = time.time()
@@ -206,9 +411,80 @@ class QuoteServiceImpl(QuoteServiceServicer):
             return QuoteResponse()
 
     def GenerateQuotesBatch(self, request_iterator, context):
-        """Streaming batch quote generation."""
-        for request in request_iterator:
-            yield self.GenerateQuote(request, context)
+        """Streaming batch quote generation.
+
+        Incoming messages are read ahead and grouped into chunks; each chunk
+        is scored with one vectorized model call and answered in order. The
+        model version is resolved once from the call metadata, and the whole
+        stream is served by it even if a reload happens meanwhile.
+        """
+        settings = get_settings()
+        try:
+            predictor = get_model_manager().get(requested_version(context))
+        except UnknownModelVersion as e:
+            context.abort(grpc.StatusCode.NOT_FOUND, str(e))
+        chunks = iter_chunks(request_iterator, settings.stream_chunk_size, settings.stream_flush_ms)
+        for chunk in chunks:
+            start_time = time.time()
+            try:
+                predictions = predictor.predict_quote_batch(
+                    [quote_inputs(request) for request in chunk]
+                )
+            except Exception as e:
+                logger.error(f"Batch quote generation failed: {e}")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                yield from (QuoteResponse() for _ in chunk)
+                continue
+
+            processing_time = int((time.time() - start_time) * 1000)
+            for request, prediction in zip(chunk, predictions, strict=True):
+                yield build_quote_response(request, prediction, processing_time)
+
+    def ScoreQuotesColumnar(
+        self, request: ColumnarQuoteRequest, context
+    ) -> ColumnarQuoteResponse:
+        """Score packed quote arrays with one vectorized model call."""
+        try:
+            response = score_columnar(request, requested_version(context, request.client_id))
+        except UnknownModelVersion as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return ColumnarQuoteResponse()
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return ColumnarQuoteResponse()
+        except Exception as e:
+            logger.error(f"Columnar scoring failed: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return ColumnarQuoteResponse()
+
+        if request.compress_response:
+            context.set_compression(grpc.Compression.Gzip)
+        return response
+
+    def ScoreTable(self, request_iterator, context):
+        """Score an Arrow IPC stream / Parquet file sent in pieces, streaming the result back."""
+        spool = None
+        try:
+            client_id = ''
+            for chunk in request_iterator:
+                if spool is None:
+                    spool = open_table_spool(chunk)
+                    client_id = chunk.client_id
+                spool.write(chunk.data)
+            if spool is None:
+                raise ValueError("Empty table upload")
+            score_table_spool(spool, requested_version(context, client_id))
+        except Exception as e:
+            if spool is not None:
+                spool.close()
+            logger.error(f"Table scoring failed: {e}")
+            context.abort(table_status(e), str(e))
+
+        yield from iter_table_output(spool)
 
 
 # ============================================================================
@@ -223,55 +499,90 @@ class RiskServiceImpl(RiskServiceServicer):
         start_time = time.time()
         
         try:
-            predictor = get_predictor()
-            event_type = proto_to_event_type(request.event_type)
-            event_date = datetime.fromtimestamp(request.event_date.seconds)
-
-            result = predictor.predict_risk(
-                event_type=event_type.value,
-                state="CA",
-                zip_code=request.location_zip,
-                num_guards=request.num_guards,
-                hours=request.hours,
-                crowd_size=request.crowd_size,
-                event_date=event_date,
-                is_armed=request.is_armed,
-            )
-
-            # Generate recommendations
-            recommendations = []
-            if result['risk_level'] in ['high', 'critical']:
-                recommendations.append("Consider additional guards for high-risk scenario")
-            if request.crowd_size > 500 and not request.is_armed:
-                recommendations.append("Armed security recommended for large crowds")
-            if event_date.hour >= 22 or event_date.hour < 6:
-                recommendations.append("Ensure proper lighting and communication equipment")
-            if result['risk_level'] == 'critical':
-                recommendations.append("Coordinate with local law enforcement")
-            if not recommendations:
-                recommendations.append("Standard protocols apply")
-
-            processing_time = int((time.time() - start_time) * 1000)
-
-            return RiskResponse(
-                risk_level=risk_level_to_proto(RiskLevel(result['risk_level'])),
-                risk_score=result['risk_score'],
-                factors=result['factors'],
-                recommendations=recommendations,
-                request_id=request.request_id,
-                processing_time_ms=processing_time,
+            return idempotent(
+                context, 'AssessRisk', request,
+                lambda: self._assess_risk(request, context, start_time),
             )
 
+        except UnknownModelVersion as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return RiskResponse()
         except Exception as e:
             logger.error(f"Risk assessment failed: {e}")
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             return RiskResponse()
 
+    def _assess_risk(self, request: RiskRequest, context, start_time: float) -> RiskResponse:
+        inputs = risk_inputs(request)
+        result = get_risk_batcher()(with_version(inputs, requested_version(context), context))
+
+        processing_time = int((time.time() - start_time) * 1000)
+        return build_risk_response(request, result, inputs['event_date'], processing_time)
+
     def AssessRiskBatch(self, request_iterator, context):
-        """Streaming batch risk assessment."""
-        for request in request_iterator:
-            yield self.AssessRisk(request, context)
+        """Streaming batch risk assessment, scored in read-ahead chunks."""
+        settings = get_settings()
+        try:
+            predictor = get_model_manager().get(requested_version(context))
+        except UnknownModelVersion as e:
+            context.abort(grpc.StatusCode.NOT_FOUND, str(e))
+        chunks = iter_chunks(request_iterator, settings.stream_chunk_size, settings.stream_flush_ms)
+        for chunk in chunks:
+            start_time = time.time()
+            try:
+                inputs = [risk_inputs(request) for request in chunk]
+                results = predictor.predict_risk_batch(inputs)
+            except Exception as e:
+                logger.error(f"Batch risk assessment failed: {e}")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                context.set_details(str(e))
+                yield from (RiskResponse() for _ in chunk)
+                continue
+
+            processing_time = int((time.time() - start_time) * 1000)
+            for request, row, result in zip(chunk, inputs, results, strict=True):
+                yield build_risk_response(request, result, row['event_date'], processing_time)
+
+
+# ============================================================================
+# Catalog Messages
+# ============================================================================
+
+def build_model_info_response(predictor) -> ModelInfoResponse:
+    if not predictor.loaded:
+        return ModelInfoResponse(
+            status="not_loaded",
+            message="Models not loaded - using rule-based fallback",
+            model_version=predictor.version,
+        )
+
+    return ModelInfoResponse(
+        status="loaded",
+        price_model_name=predictor.models.get('price_model_name', 'Unknown'),
+        trained_at=predictor.models.get('trained_at', 'Unknown'),
+        price_features_count=len(predictor.models.get('price_features', [])),
+        risk_features_count=len(predictor.models.get('risk_features', [])),
+        model_version=predictor.version,
+    )
+
+
+def build_event_types_response(_key=None) -> EventTypesResponse:
+    return EventTypesResponse(event_types=[
+        EventTypeInfo(
+            type=event_type_to_proto(event_type),
+            name=event_type.value.title(),
+            base_rate=PricingEngine.BASE_RATES[event_type],
+            risk_weight=PricingEngine.EVENT_RISK_WEIGHTS[event_type],
+        )
+        for event_type in EventType
+    ])
+
+
+# Shared by every call (and the aio servicer); never mutate the returned messages
+_model_info_response = Cached(model_key, build_model_info_response)
+_event_types_response = Cached(rates_key, build_event_types_response)
 
 
 # ============================================================================
@@ -282,52 +593,65 @@ class ModelServiceImpl(ModelServiceServicer):
     """Implementation of the ModelService gRPC service."""
 
     def HealthCheck(self, request: HealthRequest, context) -> HealthResponse:
-        """Health check endpoint."""
-        predictor = get_predictor()
+        """Readiness check: "starting" until the model is loaded and warm."""
+        if not is_ready():
+            return HealthResponse(status="starting", version=__version__, model_loaded=False)
         return HealthResponse(
             status="healthy",
             version=__version__,
-            model_loaded=predictor.loaded,
+            model_loaded=get_predictor().loaded,
         )
 
     def GetModelInfo(self, request: ModelInfoRequest, context) -> ModelInfoResponse:
-        """Get information about loaded ML models."""
-        predictor = get_predictor()
+        """Get information about loaded ML models (prebuilt per served model)."""
+        return _model_info_response.get()
 
-        if not predictor.loaded:
-            return ModelInfoResponse(
-                status="not_loaded",
-                message="Models not loaded - using rule-based fallback",
-            )
+    def GetEventTypes(self, request: EventTypesRequest, context) -> EventTypesResponse:
+        """Get available event types and their base rates (prebuilt per rate table)."""
+        return _event_types_response.get()
 
-        return ModelInfoResponse(
-            status="loaded",
-            price_model_name=predictor.models.get('price_model_name', 'Unknown'),
-            trained_at=predictor.models.get('trained_at', 'Unknown'),
-            price_features_count=len(predictor.models.get('price_features', [])),
-            risk_features_count=len(predictor.models.get('risk_features', [])),
-        )
+    def ReloadModel(self, request: ReloadModelRequest, context) -> ReloadModelResponse:
+        """Load, warm and swap in a registry model version."""
+        start_time = time.time()
+        try:
+            predictor, previous = reload_predictor(request.version or None)
+        except UnknownModelVersion as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return ReloadModelResponse(status="not_found", message=str(e))
+        except Exception as e:
+            logger.error(f"Model reload failed: {e}")
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return ReloadModelResponse(status="failed", message=str(e))
 
-    def GetEventTypes(self, request: EventTypesRequest, context) -> EventTypesResponse:
-        """Get available event types and their base rates."""
-        event_types = []
-        for event_type in EventType:
-            event_types.append(EventTypeInfo(
-                type=event_type_to_proto(event_type),
-                name=event_type.value.title(),
-                base_rate=PricingEngine.BASE_RATES[event_type],
-                risk_weight=PricingEngine.EVENT_RISK_WEIGHTS[event_type],
-            ))
-        return EventTypesResponse(event_types=event_types)
+        return ReloadModelResponse(
+            status="reloaded",
+            model_version=predictor.version,
+            previous_version=previous.version if previous is not None else "",
+            load_time_ms=int((time.time() - start_time) * 1000),
+        )
 
 
 # ============================================================================
 # Server Setup
 # ============================================================================
 
-def create_grpc_server(port: int = 50051, max_workers: int = 10) -> grpc.Server:
-    """Create and configure the gRPC server."""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+def create_grpc_server(port: int = 50051, max_workers: int | None = None) -> grpc.Server:
+    """Create and configure the gRPC server.
+
+    Each in-flight RPC (including an open stream) holds one of
+    ``max_workers`` threads; see grpc_aio_servicer for the asyncio server.
+    At most ``inference_queue_size`` more RPCs wait for a thread; beyond
+    that gRPC rejects calls with RESOURCE_EXHAUSTED.
+    """
+    settings = get_settings()
+    if max_workers is None:
+        max_workers = settings.grpc_max_workers
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=max_workers),
+        maximum_concurrent_rpcs=max_workers + settings.inference_queue_size,
+    )
     
     # Register services
     add_QuoteServiceServicer_to_server(QuoteServiceImpl(), server)
@@ -342,10 +666,16 @@ def create_grpc_server(port: int = 50051, max_workers: int = 10) -> grpc.Server:
 
 def serve(port: int = 50051):
     """Start the gRPC server."""
+    start_warm_up()
     server = create_grpc_server(port)
     server.start()
     logger.info(f"gRPC server started on port {port}")
-    server.wait_for_termination()
+    watcher = start_registry_watcher()
+    try:
+        server.wait_for_termination()
+    finally:
+        if watcher is not None:
+            watcher.stop()
 
 
 if __name__ == '__main__':
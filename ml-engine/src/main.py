@@ -1,15 +1,33 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .api import router
+from .api import router, health_router
 from .config import get_settings
+from .models.trained_predictor import start_score_snapshots, start_warm_up
+from .serving.jobs import start_job_runner, stop_job_runner
 from . import __version__
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load and warm the model in the background before taking traffic."""
+    start_warm_up()
+    start_job_runner()
+    snapshots = start_score_snapshots()
+    yield
+    stop_job_runner()
+    if snapshots is not None:
+        snapshots.stop()
+
+
 app = FastAPI(
     title="GuardQuote ML Engine",
     description="ML-powered pricing and risk assessment for security guard services",
     version=__version__,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -21,6 +39,7 @@ app.add_middleware(
 )
 
 app.include_router(router, prefix="/api/v1", tags=["ML Engine"])
+app.include_router(health_router, tags=["Health"])
 
 
 @app.get("/")
@@ -32,18 +51,6 @@ async def root():
     }
 
 
-@app.get("/health")
-async def health():
-    """Top-level health check (alias for /api/v1/health)."""
-    from .models.trained_predictor import get_predictor
-    predictor = get_predictor()
-    return {
-        "status": "healthy",
-        "version": __version__,
-        "model_loaded": predictor.loaded,
-    }
-
-
 if __name__ == "__main__":
     import uvicorn
 
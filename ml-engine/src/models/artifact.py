@@ -0,0 +1,196 @@
+"""
+Memory-mappable model artifact for GuardQuote.
+
+An artifact is a directory holding a small ``manifest.json`` plus one raw
+``.npy`` file per array:
+
+    guardquote_models.artifact/
+        manifest.json
+        price_model.<field>.npy     compiled tree arrays (see compiled_trees)
+        risk_model.<field>.npy
+        risk_model.classes.npy
+        encoders.<name>.npy         LabelEncoder classes_
+        <scaler>.mean.npy           StandardScaler mean_ / scale_
+        <scaler>.scale.npy
+
+Arrays are opened with ``np.load(mmap_mode='r')``: loading reads only the
+manifest and the .npy headers, sklearn is never imported, and every worker
+process maps the same page-cache pages instead of holding a private copy.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from .compiled_trees import (
+    ARRAY_FIELDS,
+    CompiledClassifier,
+    CompiledRegressor,
+    TreeEnsemble,
+    compile_models,
+)
+
+ARTIFACT_FORMAT = "guardquote-artifact"
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# Plain metadata copied from the pickle into the manifest
+METADATA_KEYS = (
+    'version', 'trained_at', 'training_samples',
+    'price_model_name', 'risk_model_name',
+    'price_features', 'risk_features', 'accept_features',
+    'price_metrics', 'risk_metrics',
+)
+SCALER_KEYS = ('price_scaler', 'risk_scaler', 'accept_scaler')
+
+
+def _json_default(value):
+    """Serialize NumPy scalars found in metrics dicts."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialize {type(value).__name__} in artifact manifest")
+
+
+def _compiled(models: dict) -> dict:
+    """``models`` with price/risk compiled (a no-op if they already are)."""
+    if isinstance(models.get('price_model'), CompiledRegressor):
+        return models
+    return {**models, **compile_models(models)}
+
+
+def collect_arrays(models: dict) -> dict[str, np.ndarray]:
+    """Flatten a pickled (or compiled) models dict into named arrays."""
+    compiled = _compiled(models)
+    arrays = {}
+    for prefix in ('price_model', 'risk_model'):
+        for name in ARRAY_FIELDS:
+            arrays[f"{prefix}.{name}"] = getattr(compiled[prefix].ensemble, name)
+    arrays['risk_model.classes'] = np.asarray(compiled['risk_model'].classes_)
+
+    for name, encoder in models.get('encoders', {}).items():
+        arrays[f"encoders.{name}"] = np.asarray(encoder.classes_).astype(str)
+    for key in SCALER_KEYS:
+        scaler = models.get(key)
+        if scaler is not None:
+            arrays[f"{key}.mean"] = np.asarray(scaler.mean_, dtype=np.float64)
+            arrays[f"{key}.scale"] = np.asarray(scaler.scale_, dtype=np.float64)
+    return arrays
+
+
+def export_artifact(models: dict, path: str) -> dict:
+    """Write ``models`` as an artifact directory at ``path``; returns the manifest.
+
+    The directory is assembled next to ``path`` and renamed into place, so
+    readers never observe a half-written artifact. An existing artifact is
+    renamed aside first and only deleted once the new one is in place.
+    """
+    compiled = _compiled(models)
+    arrays = collect_arrays(compiled)
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'exported_at': datetime.now().isoformat(),
+        'metadata': {key: models[key] for key in METADATA_KEYS if key in models},
+        'models': {
+            prefix: {
+                'depth': compiled[prefix].ensemble.depth,
+                'input_dtype': compiled[prefix].ensemble.input_dtype.str,
+                'n_trees': compiled[prefix].ensemble.n_trees,
+                'n_nodes': compiled[prefix].ensemble.n_nodes,
+            }
+            for prefix in ('price_model', 'risk_model')
+        },
+        'arrays': {
+            name: {'file': f"{name}.npy", 'dtype': array.dtype.str, 'shape': list(array.shape)}
+            for name, array in arrays.items()
+        },
+    }
+
+    path = os.path.abspath(path)
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".artifact-", dir=parent)
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(staging, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=2, default=_json_default)
+        retired = None
+        if os.path.isdir(path):
+            retired = f"{staging}.old"
+            os.rename(path, retired)
+        try:
+            os.rename(staging, path)
+        except BaseException:
+            if retired:
+                os.rename(retired, path)
+            raise
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    if retired:
+        shutil.rmtree(retired, ignore_errors=True)
+    return manifest
+
+
+def _ensemble(arrays: dict, prefix: str, spec: dict) -> TreeEnsemble:
+    """Rebuild one compiled ensemble from flat artifact arrays."""
+    return TreeEnsemble.from_arrays({
+        **{name: arrays[f"{prefix}.{name}"] for name in ARRAY_FIELDS},
+        'depth': spec['depth'],
+        'input_dtype': spec['input_dtype'],
+    })
+
+
+def read_manifest(path: str) -> dict:
+    """Read and validate an artifact's manifest."""
+    with open(os.path.join(path, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} is not a GuardQuote model artifact")
+    if manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported artifact format version {manifest.get('format_version')} "
+            f"(expected {ARTIFACT_FORMAT_VERSION})"
+        )
+    return manifest
+
+
+def load_artifact(path: str, mmap: bool = True) -> dict:
+    """Load an artifact directory into a models dict for TrainedPredictor.
+
+    ``price_model`` / ``risk_model`` are compiled evaluators backed by the
+    mapped arrays; ``encoder_classes`` and ``scalers`` hold the raw encoder
+    and scaler arrays; manifest metadata appears as top-level keys, as in
+    the pickle.
+    """
+    manifest = read_manifest(path)
+    arrays = {}
+    for name, spec in manifest['arrays'].items():
+        array = np.load(os.path.join(path, spec['file']), mmap_mode='r' if mmap else None)
+        if array.dtype.str != spec['dtype'] or list(array.shape) != spec['shape']:
+            raise ValueError(f"Artifact array {name} does not match its manifest entry")
+        # Plain ndarray view of the map: no copy, and no np.memmap wrapping
+        # of every intermediate result on the hot path
+        arrays[name] = np.asarray(array)
+
+    models = dict(manifest['metadata'])
+    models['price_model'] = CompiledRegressor(
+        _ensemble(arrays, 'price_model', manifest['models']['price_model'])
+    )
+    models['risk_model'] = CompiledClassifier(
+        _ensemble(arrays, 'risk_model', manifest['models']['risk_model']),
+        arrays['risk_model.classes'],
+    )
+    models['encoder_classes'] = {
+        name.split('.', 1)[1]: array for name, array in arrays.items() if name.startswith('encoders.')
+    }
+    models['scalers'] = {
+        key: {'mean': arrays[f"{key}.mean"], 'scale': arrays[f"{key}.scale"]}
+        for key in SCALER_KEYS if f"{key}.mean" in arrays
+    }
+    return models
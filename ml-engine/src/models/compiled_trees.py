@@ -0,0 +1,334 @@
+"""
+Compiled tree-ensemble evaluator for GuardQuote models.
+
+Flattens the pickled GradientBoostingRegressor (price) and
+HistGradientBoostingClassifier (risk) into plain NumPy node arrays and
+evaluates them without sklearn's per-call validation machinery:
+
+- single-row path: every tree of the ensemble advances one level per step
+- batch path: level-synchronous traversal of all rows x all trees at once
+
+Leaves point back at themselves, so both paths simply run ``depth`` steps.
+Leaf values are accumulated tree by tree in sklearn's order, so outputs
+match ``predict`` / ``predict_proba`` exactly. Only NumPy is needed at
+inference time; sklearn is touched by the ``compile_*`` exporters alone.
+
+Past a few hundred rows sklearn's C loop is faster than the NumPy traversal,
+so models compiled from the sklearn estimators keep them and hand batches
+larger than ``max_rows`` back to sklearn. Models mapped from an artifact
+have no estimator to fall back to and always use the compiled evaluator.
+"""
+
+import numpy as np
+
+# Rows per level-synchronous pass (bounds the rows x trees node matrix)
+BATCH_CHUNK_ROWS = 256
+# Largest batch still evaluated compiled when the sklearn estimator is kept.
+# From scripts/benchmark_compiled_trees.py (1 CPU): price breaks even at
+# ~192 rows, risk at ~2048 (sklearn is ~4% faster at 4096).
+PRICE_MAX_ROWS = 192
+RISK_MAX_ROWS = 2048
+
+ARRAY_FIELDS = (
+    'feature', 'threshold', 'left', 'right', 'missing_left', 'value', 'roots', 'base', 'children',
+)
+
+
+class TreeEnsemble:
+    """Flat node arrays for an additive ensemble of binary decision trees.
+
+    Tree ``t`` contributes to output ``t % n_outputs``; the raw prediction
+    of output ``k`` is ``base[k]`` plus its trees' leaf values.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        missing_left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        base: np.ndarray,
+        depth: int,
+        input_dtype: str = 'float64',
+        children: np.ndarray | None = None,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.base = base
+        self.depth = int(depth)
+        self.input_dtype = np.dtype(input_dtype)
+        self.n_outputs = len(base)
+        self.n_trees = len(roots)
+        # Index arrays as intp so take() needs no conversion; a no-op (and so
+        # still memory-mapped) for arrays exported by _concat_trees
+        self._feature = np.asarray(feature, dtype=np.intp)
+        self._roots = np.asarray(roots, dtype=np.intp)
+        # children[2 * node + went_left] -> next node, for flat take() lookups
+        if children is None:
+            children = np.empty(2 * len(left), dtype=np.intp)
+            children[0::2] = right
+            children[1::2] = left
+        self.children = np.asarray(children, dtype=np.intp)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Node arrays plus scalar metadata, ready for ``np.savez``."""
+        arrays = {name: getattr(self, name) for name in ARRAY_FIELDS}
+        arrays['depth'] = np.array(self.depth)
+        arrays['input_dtype'] = np.array(self.input_dtype.str)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays) -> 'TreeEnsemble':
+        """Rebuild from ``to_arrays`` output (dict, NpzFile or memory maps)."""
+        return cls(
+            **{name: arrays[name] for name in ARRAY_FIELDS},
+            depth=int(arrays['depth']),
+            input_dtype=str(arrays['input_dtype']),
+        )
+
+    def _leaf_values_one(self, x: np.ndarray) -> np.ndarray:
+        """Leaf value of every tree for one feature row, shape (n_trees,)."""
+        nodes = self._roots
+        has_nan = bool(np.isnan(x).any())
+        for _ in range(self.depth):
+            values = x.take(self._feature.take(nodes))
+            go_left = values <= self.threshold.take(nodes)
+            if has_nan:
+                go_left |= np.isnan(values) & self.missing_left.take(nodes)
+            nodes = self.children.take(2 * nodes + go_left)
+        return self.value.take(nodes)
+
+    def _leaf_values(self, X: np.ndarray) -> np.ndarray:
+        """Leaf value of every tree for every row, shape (n_rows, n_trees)."""
+        n, n_features = X.shape
+        flat = np.ascontiguousarray(X).reshape(-1)
+        row_offsets = (np.arange(n, dtype=np.intp) * n_features)[:, None]
+        nodes = np.broadcast_to(self._roots, (n, self.n_trees))
+        has_nan = bool(np.isnan(flat).any())
+        for _ in range(self.depth):
+            values = flat.take(row_offsets + self._feature.take(nodes))
+            go_left = values <= self.threshold.take(nodes)
+            if has_nan:
+                go_left |= np.isnan(values) & self.missing_left.take(nodes)
+            nodes = self.children.take(2 * nodes + go_left)
+        return self.value.take(nodes)
+
+    def raw_predict_one(self, x: np.ndarray) -> np.ndarray:
+        """Raw (link-space) prediction for one row, shape (n_outputs,)."""
+        x = np.asarray(x, dtype=self.input_dtype).reshape(-1)
+        leaves = self._leaf_values_one(x).reshape(-1, self.n_outputs)
+        # Python's sum is strictly left to right, like sklearn's += per tree
+        return np.array([
+            sum(leaves[:, k].tolist(), float(self.base[k])) for k in range(self.n_outputs)
+        ])
+
+    def raw_predict(self, X: np.ndarray) -> np.ndarray:
+        """Raw (link-space) predictions, shape (n_rows, n_outputs)."""
+        X = np.asarray(X, dtype=self.input_dtype)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if len(X) == 1:
+            return self.raw_predict_one(X[0]).reshape(1, -1)
+
+        out = np.empty((len(X), self.n_outputs), dtype=np.float64)
+        for start in range(0, len(X), BATCH_CHUNK_ROWS):
+            chunk = X[start:start + BATCH_CHUNK_ROWS]
+            leaves = self._leaf_values(chunk).reshape(len(chunk), -1, self.n_outputs)
+            base = np.broadcast_to(self.base, (len(chunk), 1, self.n_outputs))
+            # cumsum accumulates sequentially (np.sum would reorder additions)
+            out[start:start + len(chunk)] = np.cumsum(
+                np.concatenate([base, leaves], axis=1), axis=1
+            )[:, -1]
+        return out
+
+
+class CompiledRegressor:
+    """Drop-in ``predict`` for a compiled GradientBoostingRegressor.
+
+    With ``fallback`` (the source estimator), batches over ``max_rows`` rows
+    are predicted by sklearn instead.
+    """
+
+    def __init__(self, ensemble: TreeEnsemble, fallback=None, max_rows: int = PRICE_MAX_ROWS):
+        self.ensemble = ensemble
+        self.fallback = fallback
+        self.max_rows = max_rows
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        if self.fallback is not None and len(X) > self.max_rows:
+            return self.fallback.predict(X)
+        return self.ensemble.raw_predict(X)[:, 0]
+
+
+class CompiledClassifier:
+    """Drop-in ``predict`` / ``predict_proba`` for a compiled multiclass model.
+
+    With ``fallback`` (the source estimator), batches over ``max_rows`` rows
+    are predicted by sklearn instead.
+    """
+
+    def __init__(
+        self, ensemble: TreeEnsemble, classes: np.ndarray, fallback=None, max_rows: int = RISK_MAX_ROWS
+    ):
+        self.ensemble = ensemble
+        self.classes_ = np.asarray(classes)
+        self.fallback = fallback
+        self.max_rows = max_rows
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        if self.fallback is not None and len(X) > self.max_rows:
+            return self.fallback.predict_proba(X)
+        # Softmax exactly as sklearn.utils.extmath.softmax computes it
+        proba = self.ensemble.raw_predict(X)
+        proba -= proba.max(axis=1).reshape(-1, 1)
+        np.exp(proba, out=proba)
+        proba /= proba.sum(axis=1).reshape(-1, 1)
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+# ============================================================================
+# Exporters (require the fitted sklearn estimators)
+# ============================================================================
+
+def _tree_depth(left: np.ndarray, right: np.ndarray, root: int = 0) -> int:
+    """Depth of a tree given local child arrays (leaves marked by left == -1)."""
+    depth, level = 0, [root]
+    while True:
+        level = [child for node in level if left[node] != -1 for child in (left[node], right[node])]
+        if not level:
+            return depth
+        depth += 1
+
+
+def _concat_trees(trees: list[dict], base: np.ndarray, input_dtype: str) -> TreeEnsemble:
+    """Concatenate per-tree local arrays into one self-looping node table."""
+    feature, threshold, left, right, missing_left, value, roots = [], [], [], [], [], [], []
+    offset, depth = 0, 0
+    for tree in trees:
+        n = len(tree['left'])
+        local = np.arange(n)
+        is_leaf = tree['left'] == -1
+        roots.append(offset)
+        feature.append(np.where(is_leaf, 0, tree['feature']))
+        threshold.append(np.where(is_leaf, np.inf, tree['threshold']))
+        left.append(np.where(is_leaf, local, tree['left']) + offset)
+        right.append(np.where(is_leaf, local, tree['right']) + offset)
+        missing_left.append(tree['missing_left'] & ~is_leaf)
+        value.append(tree['value'])
+        depth = max(depth, _tree_depth(tree['left'], tree['right']))
+        offset += n
+
+    return TreeEnsemble(
+        feature=np.concatenate(feature).astype(np.intp),
+        threshold=np.concatenate(threshold).astype(np.float64),
+        left=np.concatenate(left).astype(np.intp),
+        right=np.concatenate(right).astype(np.intp),
+        missing_left=np.concatenate(missing_left).astype(bool),
+        value=np.concatenate(value).astype(np.float64),
+        roots=np.array(roots, dtype=np.intp),
+        base=np.asarray(base, dtype=np.float64).reshape(-1),
+        depth=depth,
+        input_dtype=input_dtype,
+    )
+
+
+def compile_gradient_boosting(model, fallback: bool = True) -> CompiledRegressor:
+    """Compile a fitted single-output GradientBoostingRegressor.
+
+    ``fallback`` keeps ``model`` for batches over ``PRICE_MAX_ROWS`` rows.
+    """
+    trees = []
+    for estimator in model.estimators_[:, 0]:
+        tree = estimator.tree_
+        missing = getattr(tree, 'missing_go_to_left', None)
+        trees.append({
+            'feature': tree.feature,
+            'threshold': tree.threshold,
+            'left': tree.children_left,
+            'right': tree.children_right,
+            'missing_left': (
+                np.zeros(tree.node_count, dtype=bool) if missing is None else missing.astype(bool)
+            ),
+            # sklearn adds learning_rate * value per stage; pre-scale identically
+            'value': model.learning_rate * tree.value[:, 0, 0],
+        })
+    base = model._raw_predict_init(np.zeros((1, model.n_features_in_)))[0]
+    # sklearn evaluates the trees on float32 input
+    return CompiledRegressor(
+        _concat_trees(trees, base, 'float32'), fallback=model if fallback else None
+    )
+
+
+def compile_hist_gradient_boosting(model, fallback: bool = True) -> CompiledClassifier:
+    """Compile a fitted HistGradientBoostingClassifier (numerical features only).
+
+    ``fallback`` keeps ``model`` for batches over ``RISK_MAX_ROWS`` rows.
+    """
+    trees = []
+    for predictors in model._predictors:
+        for predictor in predictors:
+            nodes = predictor.nodes
+            if nodes['is_categorical'].any():
+                raise ValueError("Categorical splits are not supported by the compiled evaluator")
+            is_leaf = nodes['is_leaf'].astype(bool)
+            trees.append({
+                'feature': nodes['feature_idx'],
+                'threshold': nodes['num_threshold'],
+                'left': np.where(is_leaf, -1, nodes['left'].astype(np.int64)),
+                'right': np.where(is_leaf, -1, nodes['right'].astype(np.int64)),
+                'missing_left': nodes['missing_go_to_left'].astype(bool),
+                'value': nodes['value'],
+            })
+    return CompiledClassifier(
+        _concat_trees(trees, model._baseline_prediction, 'float64'), model.classes_,
+        fallback=model if fallback else None,
+    )
+
+
+def compile_models(models: dict, fallback: bool = True) -> dict:
+    """Compiled replacements for ``price_model`` and ``risk_model``.
+
+    ``fallback=False`` evaluates every batch size compiled (benchmarks, parity tests).
+    """
+    return {
+        'price_model': compile_gradient_boosting(models['price_model'], fallback),
+        'risk_model': compile_hist_gradient_boosting(models['risk_model'], fallback),
+    }
+
+
+def save_compiled(path: str, compiled: dict):
+    """Write compiled price/risk models to one ``.npz`` of flat node arrays."""
+    arrays = {}
+    for prefix in ('price_model', 'risk_model'):
+        for name, array in compiled[prefix].ensemble.to_arrays().items():
+            arrays[f"{prefix}.{name}"] = array
+    arrays['risk_model.classes'] = compiled['risk_model'].classes_
+    np.savez(path, **arrays)
+
+
+def load_compiled(path: str) -> dict:
+    """Load models written by ``save_compiled``."""
+    with np.load(path) as data:
+        def ensemble(prefix):
+            return TreeEnsemble.from_arrays(
+                {name: data[f"{prefix}.{name}"] for name in (*ARRAY_FIELDS, 'depth', 'input_dtype')}
+            )
+        return {
+            'price_model': CompiledRegressor(ensemble('price_model')),
+            'risk_model': CompiledClassifier(ensemble('risk_model'), data['risk_model.classes']),
+        }
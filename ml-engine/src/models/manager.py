@@ -0,0 +1,206 @@
+"""
+Multi-version model manager for GuardQuote.
+
+Serves several registry versions from one process (A/B candidates,
+per-tenant or region-specific models) next to the default predictor:
+
+- versions are chosen per request, by explicit request metadata or by
+  the ``client_id`` -> version map in ``MODEL_ROUTES``
+- non-default versions load lazily on first use; concurrent first
+  requests for a version share a single load (single-flight)
+- loaded versions are kept in an LRU bounded by ``MODEL_CACHE_SIZE``
+  versions and ``MODEL_CACHE_MAX_MB`` of model files on disk
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+from ..config import get_settings
+from .registry import UnknownModelVersion
+from .trained_predictor import TrainedPredictor, get_predictor, load_predictor, warm_up
+
+
+@dataclass
+class VersionStats:
+    """Per-version counters."""
+
+    hits: int = 0            # requests served from an already loaded predictor
+    loads: int = 0           # successful loads
+    coalesced: int = 0       # requests that waited on another request's load
+    load_errors: int = 0
+    evictions: int = 0
+    last_load_ms: float = 0.0
+
+
+@dataclass
+class _Entry:
+    predictor: TrainedPredictor
+    nbytes: int
+
+
+@dataclass
+class _Pending:
+    """A load in progress and the requests waiting on it."""
+
+    future: Future
+    coalesced: int = 0
+
+
+def model_nbytes(predictor: TrainedPredictor) -> int:
+    """Size on disk of the file or artifact directory a predictor was loaded from."""
+    path = predictor.source_path
+    if path is None:
+        return 0
+    if os.path.isdir(path):
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+    return os.path.getsize(path)
+
+
+class ModelManager:
+    """LRU cache of loaded model versions with single-flight loading."""
+
+    def __init__(
+        self,
+        max_versions: int = 4,
+        max_bytes: int = 0,
+        routes: dict[str, str] | None = None,
+        loader=None,
+    ):
+        self.max_versions = max(1, max_versions)
+        self.max_bytes = max_bytes  # 0 = no memory cap
+        self.routes = dict(routes or {})
+        self._loader = loader or load_predictor
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, _Entry] = OrderedDict()
+        self._loading: dict[str, _Pending] = {}
+        # Only versions that were served or found; requests for unknown
+        # versions (arbitrary client strings) share one counter
+        self._stats: dict[str, VersionStats] = {}
+        self.unknown_requests = 0
+
+    def resolve(self, requested: str | None = None, client_id: str | None = None) -> str | None:
+        """Version for a request: explicit request, then client route, else default (None)."""
+        if requested:
+            return requested
+        if client_id:
+            return self.routes.get(client_id)
+        return None
+
+    def get(self, version: str | None = None) -> TrainedPredictor:
+        """Predictor for ``version`` (None or the serving version: the default predictor)."""
+        default = get_predictor()
+        if version is None or version == default.version:
+            with self._lock:
+                self._version_stats(default.version).hits += 1
+            return default
+
+        with self._lock:
+            entry = self._cache.get(version)
+            if entry is not None:
+                self._cache.move_to_end(version)
+                self._version_stats(version).hits += 1
+                return entry.predictor
+            pending = self._loading.get(version)
+            owner = pending is None
+            if owner:
+                pending = self._loading[version] = _Pending(Future())
+            else:
+                pending.coalesced += 1
+
+        if not owner:
+            return pending.future.result()
+        return self._load(version, pending)
+
+    def _load(self, version: str, pending: _Pending) -> TrainedPredictor:
+        started = time.perf_counter()
+        try:
+            predictor = self._loader(version)
+            if not predictor.loaded:
+                raise RuntimeError(f"Model version {version} failed to load")
+            warm_up(predictor)
+        except UnknownModelVersion as e:
+            with self._lock:
+                self.unknown_requests += 1 + pending.coalesced
+                del self._loading[version]
+            pending.future.set_exception(e)
+            raise
+        except Exception as e:
+            with self._lock:
+                stats = self._version_stats(version)
+                stats.load_errors += 1
+                stats.coalesced += pending.coalesced
+                del self._loading[version]
+            pending.future.set_exception(e)
+            raise
+
+        with self._lock:
+            stats = self._version_stats(version)
+            stats.loads += 1
+            stats.coalesced += pending.coalesced
+            stats.last_load_ms = round((time.perf_counter() - started) * 1000, 1)
+            self._cache[version] = _Entry(predictor, model_nbytes(predictor))
+            self._evict()
+            del self._loading[version]
+        pending.future.set_result(predictor)
+        return predictor
+
+    def _evict(self):
+        """Drop least recently used versions over the count or memory cap (lock held)."""
+        while len(self._cache) > 1 and (
+            len(self._cache) > self.max_versions
+            or (self.max_bytes and self.cached_bytes > self.max_bytes)
+        ):
+            version, _ = self._cache.popitem(last=False)
+            self._version_stats(version).evictions += 1
+
+    def _version_stats(self, version: str) -> VersionStats:
+        stats = self._stats.get(version)
+        if stats is None:
+            stats = self._stats[version] = VersionStats()
+        return stats
+
+    @property
+    def cached_bytes(self) -> int:
+        return sum(entry.nbytes for entry in self._cache.values())
+
+    def loaded_versions(self) -> list[str]:
+        """Cached (non-default) versions, least recently used first."""
+        with self._lock:
+            return list(self._cache)
+
+    def stats(self) -> dict:
+        """Cache counters; may load the default model, so keep it off the event loop."""
+        with self._lock:
+            stats = {
+                'cached_versions': list(self._cache),
+                'cached_mb': round(self.cached_bytes / 2 ** 20, 2),
+                'max_versions': self.max_versions,
+                'max_mb': round(self.max_bytes / 2 ** 20, 2) if self.max_bytes else None,
+                'versions': {version: vars(stats).copy() for version, stats in self._stats.items()},
+                'unknown_version_requests': self.unknown_requests,
+            }
+        # Outside the lock: a cold default model must not block get() callers
+        return {'default_version': get_predictor().version, **stats}
+
+
+_manager: ModelManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_model_manager() -> ModelManager:
+    """Get singleton model manager, configured from settings."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                settings = get_settings()
+                _manager = ModelManager(
+                    max_versions=settings.model_cache_size,
+                    max_bytes=int(settings.model_cache_max_mb * 2 ** 20),
+                    routes=settings.model_routes,
+                )
+    return _manager
@@ -0,0 +1,357 @@
+"""
+Process-pool inference backend for GuardQuote.
+
+Tree evaluation holds the GIL, so one process scores on about one core no
+matter how many request threads it has. With ``INFERENCE_BACKEND=process``
+the batch paths of TrainedPredictor (micro-batches, streaming chunks, bulk
+scoring) hand their encoded feature matrices to a pool of worker
+processes instead:
+
+- each worker loads the same model version once (with the memory-mapped
+  artifact, all workers share the page-cache copy of the node arrays)
+- the front process copies features into a shared-memory slot and sends
+  only the slot names; the worker writes prices and risk probabilities
+  into the slot's output block, so no arrays are pickled either way
+- large batches are split into ``chunk_rows`` pieces scored in parallel;
+  batches under ``min_rows`` are cheaper to score in-process
+
+Encoding, post-processing and the rule-based fallback stay in the front
+process, so results are identical to in-process scoring.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..config import get_settings
+from .trained_predictor import RISK_LEVELS, TrainedPredictor, score_features
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 15
+# Output block per row: price, then up to len(RISK_LEVELS) class probabilities
+OUTPUT_COLUMNS = 1 + len(RISK_LEVELS)
+# Model versions a worker keeps loaded (old versions linger after a reload)
+WORKER_CACHE_SIZE = 2
+
+
+class _Slot:
+    """Shared-memory input/output blocks for one in-flight chunk."""
+
+    def __init__(self, rows: int):
+        self.rows = rows
+        self.input = shared_memory.SharedMemory(create=True, size=rows * N_FEATURES * 8)
+        self.output = shared_memory.SharedMemory(create=True, size=rows * OUTPUT_COLUMNS * 8)
+        self.features = np.ndarray((rows, N_FEATURES), dtype=np.float64, buffer=self.input.buf)
+        self.results = np.ndarray((rows, OUTPUT_COLUMNS), dtype=np.float64, buffer=self.output.buf)
+
+    def close(self):
+        # Drop the views before closing, or the mmap refuses to close
+        self.features = self.results = None
+        for block in (self.input, self.output):
+            block.close()
+            block.unlink()
+
+
+# ============================================================================
+# Worker side
+# ============================================================================
+
+_worker_predictors: OrderedDict = OrderedDict()
+_worker_blocks: dict[str, shared_memory.SharedMemory] = {}
+_worker_barrier = None
+
+
+def _init_worker(barrier):
+    global _worker_barrier
+    _worker_barrier = barrier
+
+
+def worker_predictor(spec: tuple) -> TrainedPredictor:
+    predictor = _worker_predictors.get(spec)
+    if predictor is None:
+        model_dir, version, compiled, model_format, _ = spec
+        predictor = TrainedPredictor(
+            compiled=compiled, model_format=model_format, model_dir=model_dir, version=version
+        )
+        if not predictor.loaded:
+            raise RuntimeError(f"Worker {os.getpid()} could not load model version {version}")
+        _worker_predictors[spec] = predictor
+        while len(_worker_predictors) > WORKER_CACHE_SIZE:
+            _worker_predictors.popitem(last=False)
+    _worker_predictors.move_to_end(spec)
+    return predictor
+
+
+def _worker_block(name: str) -> shared_memory.SharedMemory:
+    block = _worker_blocks.get(name)
+    if block is None:
+        block = _worker_blocks[name] = shared_memory.SharedMemory(name=name)
+    return block
+
+
+def _worker_load(spec: tuple, timeout: float) -> int:
+    """Load ``spec``, then wait for the other workers (one task per worker)."""
+    worker_predictor(spec)
+    try:
+        _worker_barrier.wait(timeout)
+    except threading.BrokenBarrierError:
+        pass
+    return os.getpid()
+
+
+def _worker_score(spec: tuple, input_name: str, output_name: str, n: int, price: bool, risk: bool):
+    """Score ``n`` feature rows from one shared-memory slot into its output block."""
+    predictor = worker_predictor(spec)
+    features = np.ndarray((n, N_FEATURES), dtype=np.float64, buffer=_worker_block(input_name).buf)
+    out = np.ndarray((n, OUTPUT_COLUMNS), dtype=np.float64, buffer=_worker_block(output_name).buf)
+    prices, proba = score_features(predictor.models, features, price=price, risk=risk)
+    if price:
+        out[:, 0] = prices
+    if risk:
+        out[:, 1:1 + proba.shape[1]] = proba
+
+
+# ============================================================================
+# Front side
+# ============================================================================
+
+def worker_spec(predictor: TrainedPredictor) -> tuple:
+    """Constructor arguments that make a worker load exactly ``predictor``'s models.
+
+    The fingerprint is part of the spec (it is not passed to the constructor)
+    so a model retrained under the same version is reloaded, not served from
+    the worker's cache.
+    """
+    from_artifact = predictor.source_path == predictor.artifact_path
+    return (
+        predictor.model_dir,
+        predictor.version,
+        predictor.compiled,
+        'artifact' if from_artifact else 'pickle',
+        predictor.fingerprint,
+    )
+
+
+class _Pool:
+    """One generation of workers with their barrier and shared-memory slots.
+
+    A pool broken by a dead worker is retired; its slots are freed once the
+    last call still using them returns.
+    """
+
+    def __init__(self, workers: int, chunk_rows: int):
+        # spawn: the serving process runs gRPC/uvicorn threads, which fork() would corrupt
+        context = multiprocessing.get_context('spawn')
+        self.barrier = context.Barrier(workers)
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=context,
+            initializer=_init_worker, initargs=(self.barrier,),
+        )
+        # Two slots per worker keep every worker busy while results are copied out
+        self.slots = [_Slot(chunk_rows) for _ in range(2 * workers)]
+        self.free: queue.SimpleQueue = queue.SimpleQueue()
+        for slot in self.slots:
+            self.free.put(slot)
+        self.users = 0
+        self.retired = False
+        self._lock = threading.Lock()
+
+    def enter(self):
+        with self._lock:
+            if self.retired:
+                raise BrokenProcessPool("process pool was replaced")
+            self.users += 1
+
+    def leave(self):
+        with self._lock:
+            self.users -= 1
+            release = self.retired and self.users == 0
+        if release:
+            self._close_slots()
+
+    def retire(self, wait: bool = False):
+        """Stop the workers; the slots are freed when no call is using them."""
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+        with self._lock:
+            self.retired = True
+            release = self.users == 0
+        if release:
+            self._close_slots()
+
+    def _close_slots(self):
+        slots, self.slots = self.slots, []
+        for slot in slots:
+            slot.close()
+
+
+class ProcessScorer:
+    """Scores feature matrices on a pool of worker processes.
+
+    Attach to a predictor as ``predictor.scorer``; one scorer serves every
+    model version (workers load versions on first use, see ``warm``). A
+    worker that dies breaks the pool: it is replaced by a fresh one and the
+    batch that saw the crash is scored in-process.
+    """
+
+    def __init__(self, workers: int = 0, chunk_rows: int = 1024, min_rows: int = 16):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_rows = max(1, chunk_rows)
+        self.min_rows = min_rows
+        self._pool = _Pool(self.workers, self.chunk_rows)
+        self._pool_lock = threading.Lock()
+        self._warm_lock = threading.Lock()
+        self.closed = False
+        self.pool_restarts = 0
+
+    def warm(self, predictor: TrainedPredictor, timeout: float = 120.0):
+        """Load ``predictor``'s version in every worker before it takes traffic."""
+        spec = worker_spec(predictor)
+        with self._warm_lock:
+            pool = self._pool
+            # A load that timed out leaves the barrier broken for every later warm
+            if pool.barrier.broken:
+                pool.barrier.reset()
+            try:
+                futures = [pool.executor.submit(_worker_load, spec, timeout) for _ in range(self.workers)]
+                for future in futures:
+                    future.result()
+            except BrokenProcessPool as e:
+                # The fresh pool loads the version on first use
+                self._reset_pool(pool, e)
+
+    def score(
+        self, predictor: TrainedPredictor, features: np.ndarray, price: bool = True, risk: bool = True
+    ) -> tuple[np.ndarray | None, np.ndarray | None]:
+        """Same outputs as ``score_features(predictor.models, features, ...)``."""
+        n = len(features)
+        if self.closed or n < self.min_rows:
+            return score_features(predictor.models, features, price=price, risk=risk)
+
+        pool = self._pool
+        try:
+            return self._score(pool, predictor, features, price, risk)
+        except BrokenProcessPool as e:
+            self._reset_pool(pool, e)
+        except RuntimeError:
+            if not self.closed:
+                raise
+            # Closed while this call was submitting (shutdown); finish in-process
+        return score_features(predictor.models, features, price=price, risk=risk)
+
+    def _reset_pool(self, pool: _Pool, error: BaseException):
+        """Replace ``pool`` after a worker died (once, however many calls saw it)."""
+        with self._pool_lock:
+            if self.closed or pool is not self._pool:
+                return
+            logger.warning(f"Scoring worker died ({error}); restarting the process pool")
+            self._pool = _Pool(self.workers, self.chunk_rows)
+            self.pool_restarts += 1
+        pool.retire()
+
+    def _score(
+        self, pool: _Pool, predictor: TrainedPredictor, features: np.ndarray, price: bool, risk: bool
+    ) -> tuple[np.ndarray | None, np.ndarray | None]:
+        n = len(features)
+        spec = worker_spec(predictor)
+        n_classes = len(predictor.models['risk_model'].classes_)
+        prices = np.empty(n, dtype=np.float64) if price else None
+        proba = np.empty((n, n_classes), dtype=np.float64) if risk else None
+        pending: deque = deque()
+
+        def collect():
+            start, stop, slot, future = pending.popleft()
+            try:
+                future.result()
+                if price:
+                    prices[start:stop] = slot.results[:stop - start, 0]
+                if risk:
+                    proba[start:stop] = slot.results[:stop - start, 1:1 + n_classes]
+            finally:
+                pool.free.put(slot)
+
+        pool.enter()
+        try:
+            for start in range(0, n, self.chunk_rows):
+                stop = min(start + self.chunk_rows, n)
+                slot = self._acquire(pool, pending, collect)
+                slot.features[:stop - start] = features[start:stop]
+                try:
+                    future = pool.executor.submit(
+                        _worker_score, spec, slot.input.name, slot.output.name,
+                        stop - start, price, risk,
+                    )
+                except BaseException:
+                    pool.free.put(slot)
+                    raise
+                pending.append((start, stop, slot, future))
+            while pending:
+                collect()
+        finally:
+            # On error, wait for chunks already in workers before reusing their slots
+            while pending:
+                _, _, slot, future = pending.popleft()
+                future.exception()
+                pool.free.put(slot)
+            pool.leave()
+        return prices, proba
+
+    def _acquire(self, pool: _Pool, pending: deque, collect) -> _Slot:
+        """Take a free slot, finishing this call's own oldest chunk if none is free.
+
+        A call never blocks while holding slots, so concurrent calls cannot
+        deadlock waiting for each other's slots.
+        """
+        while True:
+            try:
+                return pool.free.get_nowait()
+            except queue.Empty:
+                if not pending:
+                    return pool.free.get()
+                collect()
+
+    def close(self):
+        """Stop the workers and free the shared memory (later calls score in-process)."""
+        with self._pool_lock:
+            if self.closed:
+                return
+            self.closed = True
+        self._pool.retire(wait=True)
+
+
+_scorer: ProcessScorer | None = None
+_scorer_lock = threading.Lock()
+
+
+def get_process_scorer() -> ProcessScorer:
+    """Shared process-pool scorer, sized from settings."""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                settings = get_settings()
+                _scorer = ProcessScorer(
+                    workers=settings.process_workers,
+                    chunk_rows=settings.process_chunk_rows,
+                    min_rows=settings.process_min_rows,
+                )
+                atexit.register(shutdown_process_scorer)
+    return _scorer
+
+
+def shutdown_process_scorer():
+    """Stop the shared scorer, if one was started."""
+    global _scorer
+    with _scorer_lock:
+        scorer, _scorer = _scorer, None
+    if scorer is not None:
+        scorer.close()
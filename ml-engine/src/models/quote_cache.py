@@ -0,0 +1,495 @@
+"""
+Score cache in front of the price and risk models.
+
+Keyed on the canonical encoded feature vector (TrainedPredictor builds the
+same row for every path) plus the predictor's ``cache_version``: the model
+version and a content fingerprint of the loaded models. The date only
+enters the features as weekday, hour and month, so quotes differing only by
+date within those buckets share an entry, as do exact repeats. Hot reloads,
+including a retrained model under an unchanged version string, change the
+key, so stale entries are never hit and age out.
+With ``QUOTE_CACHE_BACKEND=shared`` the cache is a SharedScoreCache
+(shared_cache.py) that all pre-fork workers use, instead of one per process.
+
+Price and risk are cached separately: price on the full 15-feature row,
+risk on its ``RISK_FEATURE_INDEX`` subset, so risk assessments ignoring
+risk zone and vehicle share entries with full quotes. Values are the raw
+model outputs; rounding, confidence and risk factors are still derived
+per request, so cached results are identical to uncached ones.
+
+Snapshots warm a restarted replica: the hottest entries of the serving
+version are written to a single binary file periodically and on shutdown
+(SnapshotWriter), and read back at startup, memory-mapped, when the
+snapshot's cache version (version and fingerprint) matches. The file is a
+small JSON header followed by raw float64 arrays (feature rows and outputs
+per model), replaced atomically, so concurrent writers such as pre-fork
+workers never leave a torn file.
+"""
+
+import atexit
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from datetime import datetime
+
+import numpy as np
+
+from ..config import get_settings
+from .shared_cache import SharedScoreCache
+
+logger = logging.getLogger(__name__)
+
+LRU = "lru"
+LFU = "lfu"
+# QUOTE_CACHE_BACKEND values
+PROCESS = "process"
+SHARED = "shared"
+
+SNAPSHOT_MAGIC = b"GQSCACHE"
+SNAPSHOT_FORMAT_VERSION = 2
+_ALIGN = 64
+
+_MISSING = object()
+
+
+class _LRUStore:
+    """Evicts the least recently used entry."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key):
+        entry = self._entries.get(key, _MISSING)
+        if entry is not _MISSING:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+    def pop(self, key):
+        del self._entries[key]
+
+    def evict(self):
+        self._entries.popitem(last=False)
+
+    def hottest(self) -> Iterator[tuple]:
+        """(key, entry) pairs, most recently used first."""
+        return reversed(self._entries.items())
+
+    def clear(self):
+        self._entries.clear()
+
+
+class _LFUStore:
+    """Evicts the least frequently used entry (oldest first among equals), in O(1)."""
+
+    def __init__(self):
+        self._entries = {}  # key -> (entry, uses)
+        self._by_uses: dict[int, OrderedDict] = {}
+        self._min_uses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def _unlink(self, key, uses: int):
+        bucket = self._by_uses[uses]
+        del bucket[key]
+        if not bucket:
+            del self._by_uses[uses]
+            if self._min_uses == uses:
+                self._min_uses = uses + 1
+
+    def get(self, key):
+        item = self._entries.get(key)
+        if item is None:
+            return _MISSING
+        entry, uses = item
+        self._unlink(key, uses)
+        self._by_uses.setdefault(uses + 1, OrderedDict())[key] = None
+        self._entries[key] = (entry, uses + 1)
+        return entry
+
+    def put(self, key, entry):
+        if key in self._entries:
+            self.pop(key)
+        self._entries[key] = (entry, 1)
+        self._by_uses.setdefault(1, OrderedDict())[key] = None
+        self._min_uses = 1
+
+    def pop(self, key):
+        _, uses = self._entries.pop(key)
+        self._unlink(key, uses)
+
+    def evict(self):
+        if self._min_uses not in self._by_uses:  # after pop() emptied the lowest bucket
+            self._min_uses = min(self._by_uses)
+        key, _ = self._by_uses[self._min_uses].popitem(last=False)
+        uses = self._entries.pop(key)[1]
+        if not self._by_uses[uses]:
+            del self._by_uses[uses]
+            self._min_uses = min(self._by_uses, default=0)
+
+    def hottest(self) -> Iterator[tuple]:
+        """(key, entry) pairs, most used first (most recent first among equals)."""
+        for uses in sorted(self._by_uses, reverse=True):
+            for key in reversed(self._by_uses[uses]):
+                yield key, self._entries[key][0]
+
+    def clear(self):
+        self._entries.clear()
+        self._by_uses.clear()
+        self._min_uses = 0
+
+
+class ScoreCache:
+    """Bounded, thread-safe cache of raw model outputs per feature row."""
+
+    def __init__(self, max_size: int = 10000, ttl_s: float = 0.0, policy: str = LRU):
+        if policy not in (LRU, LFU):
+            raise ValueError(f"Unknown cache policy {policy!r} (expected {LRU!r} or {LFU!r})")
+        self.max_size = max(1, max_size)
+        self.ttl_s = ttl_s
+        self.policy = policy
+        self._store = _LRUStore() if policy == LRU else _LFUStore()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Cached value for ``key``, or None."""
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is not _MISSING:
+                value, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self.hits += 1
+                    return value
+                self._store.pop(key)
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        expires = time.monotonic() + self.ttl_s if self.ttl_s > 0 else None
+        with self._lock:
+            # Evict before inserting, so LFU never evicts the new entry itself
+            if key not in self._store and len(self._store) >= self.max_size:
+                self._store.evict()
+                self.evictions += 1
+            self._store.put(key, (value, expires))
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+
+    def hottest(self, version: str, limit: int) -> list[tuple]:
+        """Up to ``limit`` unexpired (key, value) entries of ``version``, hottest first."""
+        now = time.monotonic()
+        entries = []
+        with self._lock:
+            for key, (value, expires) in self._store.hottest():
+                if len(entries) >= limit:
+                    break
+                if key[0] == version and (expires is None or expires > now):
+                    entries.append((key, value))
+        return entries
+
+    def scores(
+        self,
+        version: str,
+        features: np.ndarray,
+        price: bool,
+        risk: bool,
+        score: Callable[[np.ndarray, bool, bool], tuple],
+        risk_columns: list[int],
+    ) -> tuple[np.ndarray | None, np.ndarray | None]:
+        """``score(features, price, risk)``, computing only the rows not cached.
+
+        Misses are scored with one call on their sub-matrix and then cached.
+        """
+        n = len(features)
+        prices = np.empty(n, dtype=np.float64) if price else None
+        proba = None
+        price_keys = risk_keys = None
+        missing = set()
+        if price:
+            price_keys = [(version, 'price', row.tobytes()) for row in features]
+            for i, key in enumerate(price_keys):
+                value = self.get(key)
+                if value is None:
+                    missing.add(i)
+                else:
+                    prices[i] = value
+        cached_proba = {}
+        if risk:
+            risk_keys = [
+                (version, 'risk', row.tobytes()) for row in features[:, risk_columns]
+            ]
+            for i, key in enumerate(risk_keys):
+                value = self.get(key)
+                if value is None:
+                    missing.add(i)
+                else:
+                    cached_proba[i] = value
+
+        if missing:
+            rows = sorted(missing)
+            new_prices, new_proba = score(features[rows], price, risk)
+            for j, i in enumerate(rows):
+                if price:
+                    prices[i] = new_prices[j]
+                    self.put(price_keys[i], float(new_prices[j]))
+                if risk and i not in cached_proba:
+                    cached_proba[i] = new_proba[j].copy()
+                    self.put(risk_keys[i], cached_proba[i])
+        if risk:
+            proba = np.array([cached_proba[i] for i in range(n)]) if n else np.empty((0, 0))
+        return prices, proba
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'policy': self.policy,
+                'size': len(self._store),
+                'max_size': self.max_size,
+                'ttl_s': self.ttl_s,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+# ============================================================================
+# Snapshots
+# ============================================================================
+
+def _rows(keys: list[bytes]) -> np.ndarray:
+    width = len(keys[0]) // 8 if keys else 0
+    return np.frombuffer(b''.join(keys), dtype=np.float64).reshape(len(keys), width)
+
+
+def _padding(size: int) -> bytes:
+    return b'\0' * (-size % _ALIGN)
+
+
+def save_snapshot(cache: ScoreCache | SharedScoreCache, path: str, version: str, limit: int) -> int:
+    """Write the hottest ``limit`` entries of ``version``; returns the entry count.
+
+    Nothing is written without entries, so a replica restarted without
+    traffic keeps the previous snapshot.
+    """
+    entries = cache.hottest(version, limit)
+    if not entries:
+        return 0
+    price = [(key[2], value) for key, value in entries if key[1] == 'price']
+    risk = [(key[2], value) for key, value in entries if key[1] == 'risk']
+    arrays = {
+        'price_rows': _rows([key for key, _ in price]),
+        'price_values': np.array([value for _, value in price], dtype=np.float64),
+        'risk_rows': _rows([key for key, _ in risk]),
+        'risk_values': (
+            np.array([value for _, value in risk], dtype=np.float64) if risk else np.empty((0, 0))
+        ),
+    }
+    specs, offset = {}, 0
+    for name, array in arrays.items():
+        specs[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += array.nbytes + len(_padding(array.nbytes))
+    header = json.dumps({
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'cache_version': version,
+        'created_at': datetime.now().isoformat(),
+        'arrays': specs,
+    }).encode()
+
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, staging = tempfile.mkstemp(prefix=".score-cache-", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            preamble = SNAPSHOT_MAGIC + struct.pack('<I', len(header)) + header
+            f.write(preamble + _padding(len(preamble)))
+            for array in arrays.values():
+                f.write(np.ascontiguousarray(array).tobytes())
+                f.write(_padding(array.nbytes))
+        os.replace(staging, path)
+    except BaseException:
+        os.unlink(staging)
+        raise
+    return len(price) + len(risk)
+
+
+def read_snapshot(path: str) -> tuple[dict, dict[str, np.ndarray]]:
+    """(header, memory-mapped arrays) of a snapshot file."""
+    with open(path, 'rb') as f:
+        if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a score cache snapshot")
+        (length,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(length))
+    if header.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot format version {header.get('format_version')} "
+            f"(expected {SNAPSHOT_FORMAT_VERSION})"
+        )
+    preamble = len(SNAPSHOT_MAGIC) + 4 + length
+    data_start = preamble + len(_padding(preamble))
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        shape = tuple(spec['shape'])
+        if 0 in shape:
+            arrays[name] = np.empty(shape, dtype=spec['dtype'])
+        else:
+            arrays[name] = np.memmap(
+                path, dtype=spec['dtype'], mode='r', offset=data_start + spec['offset'], shape=shape
+            )
+    return header, arrays
+
+
+def load_snapshot(cache: ScoreCache | SharedScoreCache, path: str, version: str) -> int:
+    """Insert a snapshot's entries if it was written for ``version``; returns the count.
+
+    ``version`` is a predictor's ``cache_version``, so a snapshot of another
+    build of the same model version is ignored.
+    """
+    header, arrays = read_snapshot(path)
+    if header['cache_version'] != version:
+        logger.info(
+            f"Score cache snapshot is for model {header['cache_version']}, not {version}; ignored"
+        )
+        return 0
+    price_rows, prices = arrays['price_rows'], arrays['price_values']
+    risk_rows, risks = arrays['risk_rows'], arrays['risk_values']
+    # Coldest first (price and risk interleaved by rank), so the hottest
+    # entries end up most recently used
+    count = 0
+    for i in reversed(range(min(max(len(price_rows), len(risk_rows)), cache.max_size))):
+        if i < len(risk_rows):
+            cache.put((version, 'risk', risk_rows[i].tobytes()), np.array(risks[i]))
+            count += 1
+        if i < len(price_rows):
+            cache.put((version, 'price', price_rows[i].tobytes()), float(prices[i]))
+            count += 1
+    return count
+
+
+class SnapshotWriter:
+    """Calls ``save()`` every ``interval_s`` seconds (never with 0) and once more on stop."""
+
+    def __init__(self, save: Callable[[], None], interval_s: float):
+        self.save = save
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self.interval_s > 0:
+            self._thread = threading.Thread(
+                target=self._run, name="score-cache-snapshots", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+    def write(self):
+        try:
+            self.save()
+        except Exception as e:
+            logger.error(f"Score cache snapshot failed: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.write()
+
+
+_cache: ScoreCache | SharedScoreCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_score_cache() -> ScoreCache | SharedScoreCache | None:
+    """Shared score cache, or None when ``QUOTE_CACHE_ENABLED`` is off.
+
+    With ``QUOTE_CACHE_BACKEND=shared`` it must first be called before
+    forking workers (the pre-fork master does), so they all inherit it.
+    """
+    global _cache
+    settings = get_settings()
+    if not settings.quote_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if settings.quote_cache_backend == SHARED:
+                    _cache = SharedScoreCache(
+                        max_size=settings.quote_cache_size,
+                        ttl_s=settings.quote_cache_ttl_s,
+                        stripes=settings.quote_cache_stripes,
+                    )
+                    atexit.register(_cache.close)
+                elif settings.quote_cache_backend == PROCESS:
+                    _cache = ScoreCache(
+                        max_size=settings.quote_cache_size,
+                        ttl_s=settings.quote_cache_ttl_s,
+                        policy=settings.quote_cache_policy,
+                    )
+                else:
+                    raise ValueError(
+                        f"Unknown QUOTE_CACHE_BACKEND {settings.quote_cache_backend!r} "
+                        f"(expected {PROCESS!r} or {SHARED!r})"
+                    )
+    return _cache
+
+
+def save_score_snapshot(version: str) -> int | None:
+    """Snapshot the shared cache for ``version`` (None when caching or snapshots are off)."""
+    settings = get_settings()
+    cache = get_score_cache()
+    if cache is None or not settings.quote_cache_snapshot_path:
+        return None
+    return save_snapshot(
+        cache, settings.quote_cache_snapshot_path, version, settings.quote_cache_snapshot_entries
+    )
+
+
+def load_score_snapshot(version: str) -> int | None:
+    """Warm the shared cache from its snapshot (None when off or there is none)."""
+    settings = get_settings()
+    cache = get_score_cache()
+    path = settings.quote_cache_snapshot_path
+    if cache is None or not path or not os.path.exists(path):
+        return None
+    return load_snapshot(cache, path, version)
+
+
+def score_cache_stats() -> dict:
+    """Counters of the shared score cache (``enabled: False`` when it is off)."""
+    cache = get_score_cache()
+    if cache is None:
+        return {'enabled': False}
+    return {'enabled': True, **cache.stats()}
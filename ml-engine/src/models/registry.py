@@ -0,0 +1,135 @@
+"""
+Versioned model registry for GuardQuote.
+
+A registry is a directory with one subdirectory per model version, each laid
+out like ``models/trained`` (artifact directory, serving bundle and/or
+training pickle), plus an optional ``CURRENT`` file naming the version to
+serve:
+
+    models/registry/
+        CURRENT             "2.3.0" (omit to serve the highest version)
+        2.2.0/
+            guardquote_models.pkl
+        2.3.0/
+            guardquote_models.artifact/
+            guardquote_serving.pkl
+
+Deploy by copying a new version directory in and (optionally) rewriting
+``CURRENT``; roll back by pointing ``CURRENT`` at an older version.
+"""
+
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+
+
+class UnknownModelVersion(KeyError):
+    """Requested model version is not in the registry."""
+
+    def __str__(self) -> str:
+        return str(self.args[0]) if self.args else ""
+
+
+def version_key(version: str) -> tuple:
+    """Natural sort key, so 2.10.0 sorts after 2.9.0."""
+    return tuple(
+        (0, int(part), '') if part.isdigit() else (1, 0, part)
+        for part in re.split(r'(\d+)', version) if part
+    )
+
+
+class ModelRegistry:
+    """Filesystem view of versioned model directories."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def versions(self) -> list[str]:
+        """Available versions, oldest first (hidden/staging entries skipped)."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            (name for name in os.listdir(self.root)
+             if not name.startswith('.') and os.path.isdir(os.path.join(self.root, name))),
+            key=version_key,
+        )
+
+    def current(self) -> str | None:
+        """Version named by CURRENT, else the highest available version."""
+        versions = self.versions()
+        pointer = os.path.join(self.root, CURRENT_FILE)
+        if os.path.exists(pointer):
+            with open(pointer) as f:
+                version = f.read().strip()
+            if version in versions:
+                return version
+            logger.warning(f"{pointer} names unknown version {version!r}; using latest")
+        return versions[-1] if versions else None
+
+    def path(self, version: str) -> str:
+        """Directory of ``version``; UnknownModelVersion if it is not in the registry."""
+        if version not in self.versions():
+            raise UnknownModelVersion(f"Model version {version!r} not found in {self.root}")
+        return os.path.join(self.root, version)
+
+    def set_current(self, version: str):
+        """Atomically point CURRENT at ``version``."""
+        self.path(version)
+        fd, tmp_path = tempfile.mkstemp(prefix=".current-", dir=self.root)
+        with os.fdopen(fd, 'w') as f:
+            f.write(f"{version}\n")
+        os.replace(tmp_path, os.path.join(self.root, CURRENT_FILE))
+
+
+class RegistryWatcher:
+    """Polls a registry and calls ``on_change(version)`` when its current version changes.
+
+    A version whose ``on_change`` fails is not retried until the current
+    version changes again, so a broken deploy is logged once, not every poll.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        on_change: Callable[[str], None],
+        poll_s: float,
+        version: str | None = None,
+    ):
+        self.registry = registry
+        self.on_change = on_change
+        self.poll_s = poll_s
+        self.version = version
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="registry-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self):
+        """Run one poll: reload if the registry's current version changed."""
+        version = self.registry.current()
+        if version is None or version == self.version:
+            return
+        self.version = version
+        try:
+            self.on_change(version)
+        except Exception as e:
+            logger.error(f"Model reload to version {version} failed: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.poll_s):
+            self.check()
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from enum import Enum
 from datetime import datetime
+from typing import Literal
 
 
 class EventType(str, Enum):
@@ -38,6 +39,7 @@ class QuoteResponse(BaseModel):
     risk_level: RiskLevel
     confidence_score: float = Field(..., ge=0, le=1)
     breakdown: dict
+    model_version: str | None = None
 
 
 class RiskAssessment(BaseModel):
@@ -45,9 +47,17 @@ class RiskAssessment(BaseModel):
     risk_score: float = Field(..., ge=0, le=1)
     factors: list[str]
     recommendations: list[str]
+    model_version: str | None = None
 
 
 class HealthResponse(BaseModel):
     status: str
     version: str
     model_loaded: bool
+    ready: bool = False
+
+
+class JobRequest(BaseModel):
+    path: str  # relative to JOB_INPUT_DIR
+    format: Literal["arrow", "parquet"] = "parquet"
+    model_version: str | None = None  # None = version chosen by headers / client route
@@ -0,0 +1,87 @@
+"""
+Slim serving bundle for GuardQuote.
+
+The training pickle also carries objects inference never touches: the
+price/risk/accept scalers (price and risk models train on unscaled data),
+the acceptance model, fitted LabelEncoders (the predictor uses its own
+fixed encodings) and full metrics dicts. The serving bundle keeps only the
+keys TrainedPredictor and the model-info endpoints read, and drops fit-time
+state (training scores, RNGs) from the estimators themselves.
+
+Most of the bundle is still sklearn tree nodes, and loading it still
+imports sklearn; the memory-mapped artifact (artifact.py) avoids both.
+"""
+
+import copy
+import os
+import pickle
+
+import numpy as np
+
+# Keys read by TrainedPredictor, /model-info and GetModelInfo
+SERVING_KEYS = (
+    'price_model', 'risk_model',
+    'price_model_name', 'risk_model_name',
+    'price_features', 'risk_features',
+    'trained_at', 'training_samples', 'version',
+)
+# Metric values surfaced by /model-info (accuracy, risk_accuracy)
+SERVING_METRICS = {
+    'price_metrics': ('r2',),
+    'risk_metrics': ('accuracy',),
+}
+
+
+# Estimator attributes only used while fitting (predict never reads them)
+FIT_ONLY_ATTRIBUTES = (
+    'train_score_', 'validation_score_', 'oob_improvement_', 'oob_scores_', 'oob_score_',
+    '_rng', '_feature_subsample_rng', '_scorer',
+)
+
+
+def strip_estimator(estimator):
+    """Shallow copy of a fitted ensemble without fit-only attributes."""
+    stripped = copy.copy(estimator)
+    for attr in FIT_ONLY_ATTRIBUTES:
+        stripped.__dict__.pop(attr, None)
+    # GradientBoosting stage trees each hold the fit-time RandomState
+    estimators = getattr(stripped, 'estimators_', None)
+    if isinstance(estimators, np.ndarray):
+        stripped.estimators_ = np.empty_like(estimators)
+        for index, tree in np.ndenumerate(estimators):
+            tree = copy.copy(tree)
+            tree.random_state = None
+            stripped.estimators_[index] = tree
+    return stripped
+
+
+def slim_models(models: dict) -> dict:
+    """Subset of a training artifact dict needed for serving."""
+    missing = [key for key in ('price_model', 'risk_model') if key not in models]
+    if missing:
+        raise ValueError(f"Models dict is missing {', '.join(missing)}")
+    bundle = {key: models[key] for key in SERVING_KEYS if key in models}
+    bundle['price_model'] = strip_estimator(models['price_model'])
+    bundle['risk_model'] = strip_estimator(models['risk_model'])
+    for key, names in SERVING_METRICS.items():
+        metrics = models.get(key, {})
+        bundle[key] = {name: float(metrics[name]) for name in names if name in metrics}
+    return bundle
+
+
+def export_serving_bundle(models: dict, path: str) -> dict:
+    """Pickle the serving subset of ``models`` to ``path``.
+
+    Written to a temporary file and renamed into place. Returns the keys
+    dropped and the bundle size, for export reports.
+    """
+    bundle = slim_models(models)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(bundle, f, protocol=4)  # Same protocol as train_from_csv.py
+    os.replace(tmp_path, path)
+    return {
+        'path': path,
+        'size_bytes': os.path.getsize(path),
+        'dropped_keys': sorted(set(models) - set(bundle)),
+    }
@@ -0,0 +1,407 @@
+"""
+Cross-worker score cache in shared memory.
+
+A per-process ScoreCache in every pre-fork worker means each worker has to
+miss a quote before it can hit it, so hit rates fall as workers are added.
+With ``QUOTE_CACHE_BACKEND=shared`` the score cache is one fixed-size hash
+table in ``multiprocessing.shared_memory``, created by the pre-fork master
+before it forks, so every worker (REST and gRPC alike) reads and fills the
+same entries.
+
+Layout: ``slots`` fixed-width slots of ``SLOT_WORDS`` 64-bit words, grouped
+into ``WAYS``-slot buckets (set-associative open addressing; a key is only
+ever stored in the bucket its hash selects):
+
+    0  seq        even when stable, odd while a writer is in the slot
+    1  stamp      wall-clock ns of the write (TTL and replacement order)
+    2  count      number of values
+    3  key hash   64-bit hash of (model version, kind, feature row); 0 = empty
+    4  version    hash of the model version
+    5  meta       kind | row width << 8
+    6  row        the encoded feature row (up to N_FEATURES float64)
+    21 values     the raw model outputs (up to MAX_VALUES float64)
+
+The full row is stored and compared (words 3 up to the end of the row in
+one comparison), so a hash collision can never return another quote's
+scores. Reads take no lock: a batch of keys is looked up with one
+vectorized gather, and a slot counts as a hit only if its ``seq`` is even
+and unchanged across the read (a seqlock). Writers take the lock
+of the bucket's stripe (``multiprocessing`` locks, inherited across the
+fork), bump ``seq`` to odd, write, and bump it back to even. A full bucket
+replaces its oldest entry. A writer gives up on a stripe lock after
+``LOCK_TIMEOUT_S`` and skips the write (caching is optional), so a worker
+killed while holding one cannot hang the others; a slot it left mid-write
+stays a miss until it is written again.
+"""
+
+import functools
+import hashlib
+import multiprocessing
+import operator
+import os
+import struct
+import threading
+import time
+from collections.abc import Callable
+from multiprocessing import shared_memory
+
+import numpy as np
+
+N_FEATURES = 15
+MAX_VALUES = 8
+WAYS = 4
+# Longest a store waits for a stripe lock (writes take microseconds)
+LOCK_TIMEOUT_S = 0.02
+
+SEQ, STAMP, COUNT, KEY, VERSION, META = range(6)
+ROW = 6
+VALUES = ROW + N_FEATURES
+SLOT_WORDS = VALUES + MAX_VALUES
+SLOT_BYTES = SLOT_WORDS * 8
+
+KINDS = {'price': 1, 'risk': 2}
+KIND_NAMES = {code: name for name, code in KINDS.items()}
+
+_MASK = (1 << 64) - 1
+_MUL = 0x9E3779B97F4A7C15
+
+
+def _column_multipliers(n: int) -> np.ndarray:
+    """Fixed odd 64-bit constants (splitmix64), one per feature column."""
+    state, constants = 0, []
+    for _ in range(n):
+        state = (state + _MUL) & _MASK
+        z = ((state ^ (state >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+        constants.append((z ^ (z >> 31)) | 1)
+    return np.array(constants, dtype=np.uint64)
+
+
+_COLUMNS = _column_multipliers(N_FEATURES)
+_COLUMN_INTS = [int(c) for c in _COLUMNS]
+_HEADER = struct.Struct('=3Q')
+_WORD = struct.Struct('=Q')
+
+
+@functools.lru_cache(maxsize=64)
+def _tag(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little')
+
+
+def _row_hashes(words: np.ndarray, seed: int) -> np.ndarray:
+    """Deterministic 64-bit hash per row of uint64 words (never 0)."""
+    hashes = (words * _COLUMNS[:words.shape[1]]).sum(axis=1, dtype=np.uint64) + np.uint64(seed)
+    hashes ^= hashes >> np.uint64(32)
+    hashes *= np.uint64(_MUL)
+    hashes ^= hashes >> np.uint64(29)
+    return hashes | np.uint64(1)
+
+
+def _row_hash(row: bytes, seed: int) -> int:
+    """``_row_hashes`` of a single row, in Python integers."""
+    words = struct.unpack(f'={len(row) // 8}Q', row)
+    h = (sum(map(operator.mul, words, _COLUMN_INTS)) + seed) & _MASK
+    h ^= h >> 32
+    h = h * _MUL & _MASK
+    h ^= h >> 29
+    return h | 1
+
+
+class SharedScoreCache:
+    """Score cache shared by processes forked after it was created.
+
+    Same interface as ScoreCache (``scores``, ``put``, ``hottest``,
+    ``stats``); hit/miss counters are per process.
+    """
+
+    policy = "shared"
+
+    def __init__(self, max_size: int = 65536, ttl_s: float = 0.0, stripes: int = 64):
+        self.buckets = max(1, -(-max_size // WAYS))
+        self.max_size = self.buckets * WAYS
+        self.ttl_s = ttl_s
+        self._block = shared_memory.SharedMemory(create=True, size=self.max_size * SLOT_WORDS * 8)
+        self._owner = os.getpid()
+        self._table = np.ndarray((self.max_size, SLOT_WORDS), dtype=np.uint64, buffer=self._block.buf)
+        self._table[:] = 0
+        self._locks = [multiprocessing.Lock() for _ in range(max(1, stripes))]
+        self._ways = np.arange(WAYS)
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock_timeouts = 0
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _expiry_floor(self) -> int:
+        """Oldest stamp still live (0 without a TTL)."""
+        return time.time_ns() - int(self.ttl_s * 1e9) if self.ttl_s > 0 else 0
+
+    def lookup(
+        self, version: str, kind: str, rows: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(hit mask, values for hits, key hashes) for float64 feature ``rows``."""
+        words = np.ascontiguousarray(rows, dtype=np.float64).view(np.uint64)
+        if len(words) == 1:
+            values, key_hash = self._lookup_row(version, kind, words[0])
+            hashes = np.array([key_hash], dtype=np.uint64)
+            if values is None:
+                return np.zeros(1, dtype=bool), np.empty((0, 0)), hashes
+            return np.ones(1, dtype=bool), np.array([values]), hashes
+        width = words.shape[1]
+        version_tag = _tag(version)
+        hashes = _row_hashes(words, version_tag ^ KINDS[kind])
+        slots = (hashes >> np.uint64(17)) % np.uint64(self.buckets) * np.uint64(WAYS)
+        candidates = slots.astype(np.int64)[:, None] + self._ways
+
+        expected = np.empty((len(words), ROW - KEY + width), dtype=np.uint64)
+        expected[:, KEY - KEY] = hashes
+        expected[:, VERSION - KEY] = version_tag
+        expected[:, META - KEY] = KINDS[kind] | width << 8
+        expected[:, ROW - KEY:] = words
+
+        # The copy reads each slot's seq before its other words; a slot
+        # written meanwhile has a different seq afterwards
+        table = self._table
+        data = table[candidates]
+        seq = data[..., SEQ]
+        match = (
+            (data[..., KEY:ROW + width] == expected[:, None, :]).all(axis=-1)
+            & (seq == table[candidates, SEQ])
+            & ((seq & np.uint64(1)) == 0)
+        )
+        floor = self._expiry_floor()
+        if floor:
+            match &= data[..., STAMP] >= np.uint64(floor)
+
+        hit = match.any(axis=1)
+        way = match.argmax(axis=1)
+        found = data[np.flatnonzero(hit), way[hit]]
+        count = int(found[0, COUNT]) if len(found) else 0
+        values = found[:, VALUES:VALUES + count].view(np.float64)
+        with self._stats_lock:
+            self.hits += int(hit.sum())
+            self.misses += len(hit) - int(hit.sum())
+        return hit, values, hashes
+
+    def _lookup_row(self, version: str, kind: str, words: np.ndarray) -> tuple[tuple | None, int]:
+        """(values or None, key hash) of one row, reading the buffer directly.
+
+        A single quote would otherwise pay the fixed cost of every numpy
+        call in the vectorized path for a one-row gather.
+        """
+        row = words.tobytes()
+        version_tag = _tag(version)
+        key_hash = _row_hash(row, version_tag ^ KINDS[kind])
+        expected = _HEADER.pack(key_hash, version_tag, KINDS[kind] | len(words) << 8) + row
+        floor = self._expiry_floor()
+        buf = self._block.buf
+        first = (key_hash >> 17) % self.buckets * WAYS
+        values = None
+        for slot in range(first, first + WAYS):
+            offset = slot * SLOT_BYTES
+            seq, stamp, count = _HEADER.unpack_from(buf, offset)
+            if seq & 1 or stamp < floor or buf[offset + KEY * 8:offset + KEY * 8 + len(expected)] != expected:
+                continue
+            found = struct.unpack_from(f'={count}d', buf, offset + VALUES * 8)
+            if _HEADER.unpack_from(buf, offset)[0] == seq:
+                values = found
+                break
+        with self._stats_lock:
+            if values is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return values, key_hash
+
+    def store(self, version: str, kind: str, row: np.ndarray, values, key_hash: int | None = None):
+        """Write one entry.
+
+        Skipped for rows or values too wide for a slot, and when the
+        stripe lock is not acquired within ``LOCK_TIMEOUT_S``.
+        """
+        row = np.ascontiguousarray(row, dtype=np.float64).tobytes()
+        value = np.atleast_1d(np.asarray(values, dtype=np.float64)).tobytes()
+        width, count = len(row) // 8, len(value) // 8
+        if width > N_FEATURES or count > MAX_VALUES:
+            return
+        version_tag = _tag(version)
+        if key_hash is None:
+            key_hash = _row_hash(row, version_tag ^ KINDS[kind])
+        expected = _HEADER.pack(key_hash, version_tag, KINDS[kind] | width << 8) + row
+        bucket = (key_hash >> 17) % self.buckets
+        first = bucket * WAYS
+
+        buf = self._block.buf
+        lock = self._locks[bucket % len(self._locks)]
+        if not lock.acquire(timeout=LOCK_TIMEOUT_S):
+            with self._stats_lock:
+                self.lock_timeouts += 1
+            return
+        try:
+            slot = empty = oldest = None
+            for candidate in range(first, first + WAYS):
+                offset = candidate * SLOT_BYTES
+                if buf[offset + KEY * 8:offset + KEY * 8 + len(expected)] == expected:
+                    slot = candidate
+                    break
+                stamp = _WORD.unpack_from(buf, offset + STAMP * 8)[0]
+                key = _WORD.unpack_from(buf, offset + KEY * 8)[0]
+                if key == 0 and empty is None:
+                    empty = candidate
+                if oldest is None or stamp < oldest[0]:
+                    oldest = (stamp, candidate)
+            if slot is None and empty is not None:
+                slot = empty
+            elif slot is None:
+                slot = oldest[1]
+                with self._stats_lock:
+                    self.evictions += 1
+
+            offset = slot * SLOT_BYTES
+            body = (
+                _WORD.pack(time.time_ns()) + _WORD.pack(count) + expected
+                + bytes((N_FEATURES - width) * 8) + value + bytes((MAX_VALUES - count) * 8)
+            )
+            # Odd already if a writer died mid-write; it stays odd until done
+            seq = _WORD.unpack_from(buf, offset)[0] | 1
+            _WORD.pack_into(buf, offset, seq)
+            buf[offset + 8:offset + SLOT_BYTES] = body
+            _WORD.pack_into(buf, offset, seq + 1)
+        finally:
+            lock.release()
+
+    # ------------------------------------------------------------------
+    # ScoreCache interface
+    # ------------------------------------------------------------------
+
+    def put(self, key: tuple, value):
+        """Store a ScoreCache-style ``(version, kind, row bytes)`` entry."""
+        version, kind, row = key
+        self.store(version, kind, np.frombuffer(row, dtype=np.float64), value)
+
+    def scores(
+        self,
+        version: str,
+        features: np.ndarray,
+        price: bool,
+        risk: bool,
+        score: Callable[[np.ndarray, bool, bool], tuple],
+        risk_columns: list[int],
+    ) -> tuple[np.ndarray | None, np.ndarray | None]:
+        """``score(features, price, risk)``, computing only the rows not in the table."""
+        n = len(features)
+        features = np.ascontiguousarray(features, dtype=np.float64)
+        if n == 1:
+            return self._score_row(version, features, price, risk, score, risk_columns)
+        missing = np.zeros(n, dtype=bool)
+        prices = proba = None
+        if price:
+            price_hit, price_values, price_hashes = self.lookup(version, 'price', features)
+            prices = np.empty(n, dtype=np.float64)
+            if price_hit.any():
+                prices[price_hit] = price_values[:, 0]
+            missing |= ~price_hit
+        if risk:
+            risk_rows = np.ascontiguousarray(features[:, risk_columns])
+            risk_hit, risk_values, risk_hashes = self.lookup(version, 'risk', risk_rows)
+            missing |= ~risk_hit
+
+        rows = np.flatnonzero(missing)
+        new_prices = new_proba = None
+        if len(rows):
+            new_prices, new_proba = score(features[rows], price, risk)
+            for j, i in enumerate(rows):
+                if price and not price_hit[i]:
+                    self.store(version, 'price', features[i], new_prices[j], int(price_hashes[i]))
+                if risk and not risk_hit[i]:
+                    self.store(version, 'risk', risk_rows[i], new_proba[j], int(risk_hashes[i]))
+        if price and len(rows):
+            prices[rows] = new_prices
+        if risk:
+            width = new_proba.shape[1] if new_proba is not None else risk_values.shape[1]
+            proba = np.empty((n, width), dtype=np.float64)
+            if risk_hit.any():
+                proba[risk_hit] = risk_values
+            if len(rows):
+                proba[rows] = new_proba
+        return prices, proba
+
+    def _score_row(self, version, features, price, risk, score, risk_columns):
+        """``scores`` of a single row, without the batch bookkeeping."""
+        price_values = risk_values = None
+        if price:
+            price_values, price_hash = self._lookup_row(version, 'price', features[0].view(np.uint64))
+        if risk:
+            risk_row = np.ascontiguousarray(features[0, risk_columns])
+            risk_values, risk_hash = self._lookup_row(version, 'risk', risk_row.view(np.uint64))
+        if (price and price_values is None) or (risk and risk_values is None):
+            new_prices, new_proba = score(features, price, risk)
+            if price and price_values is None:
+                self.store(version, 'price', features[0], new_prices[0], price_hash)
+            if risk and risk_values is None:
+                self.store(version, 'risk', risk_row, new_proba[0], risk_hash)
+            return new_prices, new_proba
+        return (
+            np.array(price_values[:1]) if price else None,
+            np.array([risk_values]) if risk else None,
+        )
+
+    def hottest(self, version: str, limit: int) -> list[tuple]:
+        """Up to ``limit`` live entries of ``version``, most recently written first."""
+        table = self._table.copy()
+        live = (
+            (table[:, KEY] != 0)
+            & ((table[:, SEQ] & np.uint64(1)) == 0)
+            & (table[:, VERSION] == np.uint64(_tag(version)))
+            & (table[:, STAMP] >= np.uint64(self._expiry_floor()))
+        )
+        order = np.flatnonzero(live)
+        order = order[np.argsort(table[order, STAMP])[::-1][:limit]]
+        entries = []
+        for slot in order:
+            meta, count = int(table[slot, META]), int(table[slot, COUNT])
+            kind, width = meta & 0xFF, meta >> 8
+            row = table[slot, ROW:ROW + width].tobytes()
+            values = table[slot, VALUES:VALUES + count].view(np.float64)
+            value = float(values[0]) if KIND_NAMES[kind] == 'price' else values.copy()
+            entries.append(((version, KIND_NAMES[kind], row), value))
+        return entries
+
+    def clear(self):
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            self._table[:] = 0
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                'policy': self.policy,
+                'size': int(np.count_nonzero(self._table[:, KEY])),
+                'max_size': self.max_size,
+                'ttl_s': self.ttl_s,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'lock_timeouts': self.lock_timeouts,
+                'segment_bytes': self._block.size,
+            }
+
+    def close(self):
+        """Release the segment (only the creating process unlinks it)."""
+        self._table = None
+        self._block.close()
+        if os.getpid() == self._owner:
+            try:
+                self._block.unlink()
+            except FileNotFoundError:
+                pass
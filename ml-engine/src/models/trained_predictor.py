@@ -2,73 +2,273 @@
 Trained ML Model Predictor for GuardQuote
 Uses trained models for price and risk predictions.
 """
+import hashlib
 import os
 import pickle
-from datetime import datetime
+import random
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
+from typing import NamedTuple
 import numpy as np
 
-MODEL_PATH = os.path.join(
-    os.path.dirname(__file__), "..", "..", "models", "trained", "guardquote_models.pkl"
-)
+from ..config import get_settings
+from .artifact import MANIFEST_NAME, load_artifact
+from .compiled_trees import compile_models
+from .quote_cache import SnapshotWriter, get_score_cache, load_score_snapshot, save_score_snapshot
+from .registry import ModelRegistry, RegistryWatcher, UnknownModelVersion
+
+# File names inside a model directory (models/trained or a registry version)
+MODEL_FILE = "guardquote_models.pkl"
+# Serving-only subset of MODEL_FILE (scripts/export_serving_bundle.py)
+SERVING_MODEL_FILE = "guardquote_serving.pkl"
+# Memory-mappable export of MODEL_FILE (scripts/export_artifact.py)
+ARTIFACT_DIR = "guardquote_models.artifact"
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "models", "trained")
+MODEL_PATH = os.path.join(MODEL_DIR, MODEL_FILE)
+SERVING_MODEL_PATH = os.path.join(MODEL_DIR, SERVING_MODEL_FILE)
+ARTIFACT_PATH = os.path.join(MODEL_DIR, ARTIFACT_DIR)
+
+# Version reported by predictors without trained models
+FALLBACK_VERSION = "rule-based"
+# ``model_used`` of rule-based fallback predictions
+FALLBACK_MODEL = "Rule-based fallback"
+
+
+def model_fingerprint(models: Mapping, source_path: str | None) -> str:
+    """Short content hash of loaded models, for keys that must change on retrain.
+
+    Registry-less deployments reuse the version recorded at training time,
+    so a retrained model can carry the same version string. The hash covers
+    ``trained_at`` and the loaded file (for an artifact, its manifest, which
+    is rewritten with a new export time on every export).
+    """
+    digest = hashlib.blake2b(str(models.get('trained_at', '')).encode(), digest_size=8)
+    if source_path is not None:
+        path = (
+            os.path.join(source_path, 'manifest.json') if os.path.isdir(source_path) else source_path
+        )
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
 
 # Risk level mappings
 RISK_LEVELS = ['low', 'medium', 'high', 'critical']
 
+# Label encodings — must match the LabelEncoder classes in train_from_csv.py
+EVENT_TYPES = ['concert', 'construction', 'corporate', 'private', 'residential', 'retail', 'sports']
+STATES = ['AZ', 'CA', 'CO', 'FL', 'GA', 'IL', 'MA', 'NV', 'NY', 'TX', 'WA']
+RISK_ZONES = ['critical', 'high', 'low', 'medium']
+
+# Columns of the price feature matrix that make up the risk feature matrix
+# (risk model drops risk_zone_encoded, total_guard_hours, has_vehicle and tier)
+RISK_FEATURE_INDEX = [0, 1, 3, 4, 6, 7, 8, 9, 10, 11, 12]
+
+# Batch input: a sequence of row mappings, or a column mapping / structured array
+BatchInput = Sequence[Mapping] | Mapping[str, Sequence] | np.ndarray
+
+# Defaults applied to batch inputs that omit optional fields
+BATCH_DEFAULTS = {
+    'state': 'CA',
+    'zip_code': '',
+    'risk_zone': 'medium',
+    'crowd_size': 0,
+    'is_armed': False,
+    'has_vehicle': False,
+}
+
+
+class LabelColumn(NamedTuple):
+    """Dictionary-encoded string column: row i is ``labels[codes[i]]``.
+
+    Columnar callers (e.g. Arrow input) pass this instead of an array of
+    strings, so labels are encoded once per distinct value, not per row.
+    """
+
+    codes: np.ndarray
+    labels: Sequence[str]
+
+    def tolist(self) -> list[str]:
+        return [self.labels[code] for code in self.codes.tolist()]
+
+
+class QuotePrediction(NamedTuple):
+    """Fused price + risk prediction for one quote."""
+
+    predicted_price: float   # final price, tax included
+    confidence: float        # price confidence
+    model_used: str
+    risk_level: str
+    risk_score: float
+    risk_confidence: float
+    factors: list[str]
+    model_version: str = ''
+
+    @property
+    def base_price(self) -> float:
+        """Pre-tax price."""
+        return self.predicted_price / 1.0875
+
+    @property
+    def risk_multiplier(self) -> float:
+        return 1.0 + (self.risk_score * 0.5)
+
+
+class QuoteArrays(NamedTuple):
+    """Fused price + risk predictions for a batch, one array per field.
+
+    Values match :class:`QuotePrediction` row by row (``risk_level`` holds
+    indexes into ``RISK_LEVELS``); risk factors are not produced.
+    """
+
+    predicted_price: np.ndarray
+    confidence: np.ndarray
+    risk_level: np.ndarray
+    risk_score: np.ndarray
+    risk_confidence: np.ndarray
+    model_used: str
+    model_version: str
+
 
 class TrainedPredictor:
     """ML-based predictor using trained models."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        compiled: bool | None = None,
+        model_format: str | None = None,
+        model_dir: str | None = None,
+        version: str | None = None,
+    ):
+        settings = get_settings()
         self.models = None
         self.loaded = False
-        self._load_models()
+        self.source_path = None  # file or artifact directory the models came from
+        self.model_dir = model_dir
+        # Optional out-of-process scorer for batch paths (see process_pool.py)
+        self.scorer = None
+        self.compiled = settings.compiled_trees if compiled is None else compiled
+        if model_dir is None:
+            self.artifact_path, self.serving_path, self.model_path = (
+                ARTIFACT_PATH, SERVING_MODEL_PATH, MODEL_PATH
+            )
+        else:
+            self.artifact_path = os.path.join(model_dir, ARTIFACT_DIR)
+            self.serving_path = os.path.join(model_dir, SERVING_MODEL_FILE)
+            self.model_path = os.path.join(model_dir, MODEL_FILE)
+        model_format = model_format or settings.model_format
+        # The artifact only holds compiled trees, so compiled=False forces the pickle
+        use_artifact = compiled is not False and (
+            model_format == 'artifact'
+            or (model_format == 'auto' and os.path.isdir(self.artifact_path)
+                and self._artifact_is_current())
+        )
+        if use_artifact:
+            self._load_artifact()
+        if not self.loaded:
+            self._load_models()
+            if self.loaded and self.compiled:
+                self._compile_models()
+        # Registry version name, else the version recorded at training time
+        if not self.loaded:
+            self.version = FALLBACK_VERSION
+            self.fingerprint = ''
+        else:
+            self.version = version or str(self.models.get('version', 'unknown'))
+            self.fingerprint = model_fingerprint(self.models, self.source_path)
+
+    @property
+    def cache_version(self) -> str:
+        """Score cache key of these models: version plus content fingerprint."""
+        return f"{self.version}@{self.fingerprint}" if self.fingerprint else self.version
+
+    def _is_current(self, path: str) -> bool:
+        """False if ``path`` is older than the training pickle (retrained without re-export)."""
+        return not os.path.exists(self.model_path) or (
+            os.path.getmtime(path) >= os.path.getmtime(self.model_path)
+        )
+
+    def _artifact_is_current(self) -> bool:
+        manifest = os.path.join(self.artifact_path, MANIFEST_NAME)
+        if os.path.exists(manifest) and not self._is_current(manifest):
+            print(f"[fail] Model artifact is older than {self.model_path}; loading the pickle")
+            return False
+        return True
+
+    def _load_artifact(self):
+        """Map the exported artifact; no unpickling and no sklearn import."""
+        try:
+            self.models = load_artifact(self.artifact_path)
+            self.loaded = True
+            self.source_path = self.artifact_path
+            self.compiled = True
+            print(f"[ok] Mapped model artifact from {self.artifact_path}")
+            print(f"     Price model: {self.models.get('price_model_name', 'Unknown')}")
+            print(f"     Trained at: {self.models.get('trained_at', 'Unknown')}")
+        except Exception as e:
+            print(f"[fail] Error loading model artifact, falling back to pickle: {e}")
+            self.loaded = False
 
     def _load_models(self):
-        """Load trained models from disk."""
-        if os.path.exists(MODEL_PATH):
+        """Load trained models from disk, preferring the slim serving bundle."""
+        model_path = self.model_path
+        # Ignore a bundle older than the training pickle
+        if os.path.exists(self.serving_path) and self._is_current(self.serving_path):
+            model_path = self.serving_path
+        if os.path.exists(model_path):
             try:
-                with open(MODEL_PATH, 'rb') as f:
+                with open(model_path, 'rb') as f:
                     self.models = pickle.load(f)
                 self.loaded = True
-                print(f"[ok] Loaded trained models from {MODEL_PATH}")
+                self.source_path = model_path
+                print(f"[ok] Loaded trained models from {model_path}")
                 print(f"     Price model: {self.models.get('price_model_name', 'Unknown')}")
                 print(f"     Trained at: {self.models.get('trained_at', 'Unknown')}")
             except Exception as e:
                 print(f"[fail] Error loading models: {e}")
                 self.loaded = False
         else:
-            print(f"[fail] Model file not found: {MODEL_PATH}")
+            print(f"[fail] Model file not found: {self.model_path}")
             self.loaded = False
 
+    def _compile_models(self):
+        """Swap the sklearn price/risk models for compiled tree evaluators."""
+        try:
+            self.models = {**self.models, **compile_models(self.models)}
+            print("[ok] Using compiled tree evaluator for price/risk models")
+        except Exception as e:
+            print(f"[fail] Could not compile models, using sklearn: {e}")
+            self.compiled = False
+
     def _encode_event_type(self, event_type: str) -> int:
         """Encode event type to numeric value."""
-        event_types = ['concert', 'construction', 'corporate', 'private', 'residential', 'retail', 'sports']
         try:
-            return event_types.index(event_type.lower())
+            return EVENT_TYPES.index(event_type.lower())
         except ValueError:
             return 3  # default to 'private'
 
     def _encode_state(self, state: str) -> int:
         """Encode state to numeric value."""
-        states = ['AZ', 'CA', 'CO', 'FL', 'GA', 'IL', 'MA', 'NV', 'NY', 'TX', 'WA']
         try:
-            return states.index(state.upper())
+            return STATES.index(state.upper())
         except ValueError:
             return 1  # default to CA
 
     def _encode_risk_zone(self, risk_zone: str) -> int:
         """Encode risk zone to numeric value."""
-        zones = ['critical', 'high', 'low', 'medium']
         try:
-            return zones.index(risk_zone.lower())
+            return RISK_ZONES.index(risk_zone.lower())
         except ValueError:
             return 3  # default to medium
 
-    def predict_price(
+    def _feature_row(
         self,
         event_type: str,
         state: str,
-        zip_code: str,
         risk_zone: str,
         num_guards: int,
         hours: float,
@@ -76,17 +276,10 @@ class TrainedPredictor:
         event_date: datetime,
         is_armed: bool = False,
         has_vehicle: bool = False,
-    ) -> dict:
-        """Predict price using trained model."""
-
-        if not self.loaded:
-            # Fallback to rule-based pricing
-            return self._fallback_price(
-                event_type, num_guards, hours, is_armed, has_vehicle
-            )
-
-        # Prepare features — must match price_features order in train_from_csv.py
-        features = np.array([[
+    ) -> list:
+        """Build one price feature row; risk rows are a column subset of it."""
+        # Order must match price_features in train_from_csv.py
+        return [
             self._encode_event_type(event_type),                       # [0] event_type_encoded
             self._encode_state(state),                                 # [1] state_encoded
             self._encode_risk_zone(risk_zone),                         # [2] risk_zone_encoded
@@ -102,11 +295,37 @@ class TrainedPredictor:
             1 if is_armed else 0,                                      # [12] is_armed
             1 if has_vehicle else 0,                                   # [13] has_vehicle
             0,                                                         # [14] tier (default)
-        ]])
+        ]
+
+    def predict_price(
+        self,
+        event_type: str,
+        state: str,
+        zip_code: str,
+        risk_zone: str,
+        num_guards: int,
+        hours: float,
+        crowd_size: int,
+        event_date: datetime,
+        is_armed: bool = False,
+        has_vehicle: bool = False,
+        use_cache: bool = True,
+    ) -> dict:
+        """Predict price using trained model."""
+
+        if not self.loaded:
+            # Fallback to rule-based pricing
+            return self._fallback_price(
+                event_type, num_guards, hours, is_armed, has_vehicle
+            )
+
+        features = np.array([self._feature_row(
+            event_type, state, risk_zone, num_guards, hours,
+            crowd_size, event_date, is_armed, has_vehicle,
+        )], dtype=np.float64)
 
         # Predict
-        price_model = self.models['price_model']
-        predicted_price = price_model.predict(features)[0]
+        predicted_price = self._raw_scores(features, risk=False, use_cache=use_cache)[0][0]
 
         # Calculate confidence based on feature completeness
         confidence = 0.95 if crowd_size > 0 else 0.88
@@ -115,6 +334,7 @@ class TrainedPredictor:
             'predicted_price': round(max(predicted_price, 100), 2),
             'confidence': confidence,
             'model_used': self.models.get('price_model_name', 'Trained Model'),
+            'model_version': self.version,
         }
 
     def predict_risk(
@@ -127,31 +347,23 @@ class TrainedPredictor:
         crowd_size: int,
         event_date: datetime,
         is_armed: bool = False,
+        use_cache: bool = True,
     ) -> dict:
         """Predict risk level using trained model."""
 
         if not self.loaded:
             return self._fallback_risk(event_type, crowd_size, event_date)
 
-        # Prepare features (must match trained model: 11 features, no zip_region)
-        features = np.array([[
-            self._encode_event_type(event_type),
-            self._encode_state(state),
-            num_guards,
-            hours,
-            crowd_size,
-            event_date.weekday(),
-            event_date.hour,
-            event_date.month,
-            1 if event_date.weekday() >= 5 else 0,
-            1 if event_date.hour >= 22 or event_date.hour < 6 else 0,
-            1 if is_armed else 0,
-        ]])
+        # Risk model uses 11 of the 15 price features (no zip_region)
+        features = np.array([self._feature_row(
+            event_type, state, 'medium', num_guards, hours,
+            crowd_size, event_date, is_armed,
+        )], dtype=np.float64)
 
-        # Predict
+        # Predict (class is the argmax of the probabilities, as in risk_model.predict)
         risk_model = self.models['risk_model']
-        risk_class = risk_model.predict(features)[0]
-        risk_proba = risk_model.predict_proba(features)[0]
+        risk_proba = self._raw_scores(features, price=False, use_cache=use_cache)[1][0]
+        risk_class = risk_model.classes_[np.argmax(risk_proba)]
 
         risk_level = RISK_LEVELS[risk_class]
         risk_score = risk_proba[risk_class]
@@ -166,8 +378,259 @@ class TrainedPredictor:
             'risk_score': round(float(risk_score), 3),
             'confidence': round(float(max(risk_proba)), 3),
             'factors': factors,
+            'model_version': self.version,
         }
 
+    def predict_quote(
+        self,
+        event_type: str,
+        state: str,
+        zip_code: str,
+        risk_zone: str,
+        num_guards: int,
+        hours: float,
+        crowd_size: int,
+        event_date: datetime,
+        is_armed: bool = False,
+        has_vehicle: bool = False,
+        use_cache: bool = True,
+    ) -> QuotePrediction:
+        """Predict price and risk in one pass over shared features.
+
+        Equivalent to :meth:`predict_price` plus :meth:`predict_risk`, but
+        encodes the features once and calls ``predict_proba`` once.
+        """
+        quote = {
+            'event_type': event_type, 'state': state, 'zip_code': zip_code,
+            'risk_zone': risk_zone, 'num_guards': num_guards, 'hours': hours,
+            'crowd_size': crowd_size, 'event_date': event_date,
+            'is_armed': is_armed, 'has_vehicle': has_vehicle,
+        }
+        if not self.loaded:
+            return self._fallback_quote(quote)
+
+        features = np.array([self._feature_row(
+            event_type, state, risk_zone, num_guards, hours,
+            crowd_size, event_date, is_armed, has_vehicle,
+        )], dtype=np.float64)
+        return self._predict_quotes(features, [quote], use_cache)[0]
+
+    # ------------------------------------------------------------------
+    # Batch prediction
+    # ------------------------------------------------------------------
+
+    def encode_features(self, quotes: BatchInput) -> np.ndarray:
+        """Encode many quotes into one (n, 15) price feature matrix.
+
+        ``quotes`` is either a sequence of mappings keyed like the
+        :meth:`predict_price` arguments, or a columnar mapping / structured
+        array with one array per argument. Risk features are the
+        ``RISK_FEATURE_INDEX`` columns of the result.
+        """
+        if _is_columnar(quotes):
+            return self._encode_columns(quotes)
+        rows = [self._feature_row(*_feature_args(q)) for q in quotes]
+        return np.array(rows, dtype=np.float64).reshape(len(rows), 15)
+
+    def _encode_columns(self, columns: Mapping | np.ndarray) -> np.ndarray:
+        """Vectorized feature encoding for columnar input."""
+        guards = _column(columns, 'num_guards').astype(np.float64)
+        n = len(guards)
+        hours = _column(columns, 'hours', n).astype(np.float64)
+
+        # event_date: datetime64 values, datetimes or epoch seconds (wall clock)
+        dates = _column(columns, 'event_date', n).astype('datetime64[s]')
+        days = dates.astype('datetime64[D]')
+        weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        hour = (dates - days).astype('timedelta64[h]').astype(np.int64)
+
+        X = np.empty((n, 15), dtype=np.float64)
+        X[:, 0] = _encode_labels(_column(columns, 'event_type', n), EVENT_TYPES, 3, str.lower)
+        X[:, 1] = _encode_labels(_column(columns, 'state', n), STATES, 1, str.upper)
+        X[:, 2] = _encode_labels(_column(columns, 'risk_zone', n), RISK_ZONES, 3, str.lower)
+        X[:, 3] = guards
+        X[:, 4] = hours
+        X[:, 5] = guards * hours
+        X[:, 6] = _column(columns, 'crowd_size', n)
+        X[:, 7] = weekday
+        X[:, 8] = hour
+        X[:, 9] = dates.astype('datetime64[M]').astype(np.int64) % 12 + 1
+        X[:, 10] = weekday >= 5
+        X[:, 11] = (hour >= 22) | (hour < 6)
+        X[:, 12] = _column(columns, 'is_armed', n).astype(bool)
+        X[:, 13] = _column(columns, 'has_vehicle', n).astype(bool)
+        X[:, 14] = 0
+        return X
+
+    def predict_price_batch(self, quotes: BatchInput, use_cache: bool = True) -> list[dict]:
+        """Predict prices for many quotes with a single model call.
+
+        Returns one dict per quote, identical to :meth:`predict_price`.
+        """
+        if not self.loaded:
+            return [
+                self._fallback_price(
+                    q['event_type'], q['num_guards'], q['hours'],
+                    q['is_armed'], q['has_vehicle'],
+                )
+                for q in _as_rows(quotes)
+            ]
+
+        features = self.encode_features(quotes)
+        if not len(features):
+            return []
+        predicted, _ = self._raw_scores(features, risk=False, use_cache=use_cache)
+        model_used = self.models.get('price_model_name', 'Trained Model')
+
+        return [
+            {
+                'predicted_price': round(max(price, 100), 2),
+                'confidence': 0.95 if crowd_size > 0 else 0.88,
+                'model_used': model_used,
+                'model_version': self.version,
+            }
+            for price, crowd_size in zip(predicted, features[:, 6], strict=True)
+        ]
+
+    def predict_risk_batch(self, quotes: BatchInput, use_cache: bool = True) -> list[dict]:
+        """Predict risk for many quotes with a single predict_proba call.
+
+        Returns one dict per quote, identical to :meth:`predict_risk`.
+        """
+        rows = _as_rows(quotes)
+        if not self.loaded:
+            return [
+                self._fallback_risk(q['event_type'], q['crowd_size'], q['event_date'])
+                for q in rows
+            ]
+
+        if not rows:
+            return []
+        _, risk_proba = self._raw_scores(
+            self.encode_features(quotes), price=False, use_cache=use_cache
+        )
+        risk_classes = self.models['risk_model'].classes_[np.argmax(risk_proba, axis=1)]
+
+        results = []
+        for q, risk_class, proba in zip(rows, risk_classes, risk_proba, strict=True):
+            risk_level = RISK_LEVELS[risk_class]
+            results.append({
+                'risk_level': risk_level,
+                'risk_score': round(float(proba[risk_class]), 3),
+                'confidence': round(float(max(proba)), 3),
+                'factors': self._generate_risk_factors(
+                    q['event_type'], q['crowd_size'], q['event_date'],
+                    q['is_armed'], risk_level,
+                ),
+                'model_version': self.version,
+            })
+        return results
+
+    def predict_quote_batch(
+        self, quotes: BatchInput, use_cache: bool = True
+    ) -> list[QuotePrediction]:
+        """Fused price + risk predictions for many quotes.
+
+        One ``predict`` and one ``predict_proba`` call for the whole batch;
+        results are identical to :meth:`predict_quote` per quote.
+        """
+        rows = _as_rows(quotes)
+        if not self.loaded:
+            return [self._fallback_quote(q) for q in rows]
+        if not rows:
+            return []
+        return self._predict_quotes(self.encode_features(quotes), rows, use_cache)
+
+    def predict_quote_arrays(self, quotes: BatchInput) -> QuoteArrays:
+        """Fused price + risk predictions as arrays, for columnar callers.
+
+        Same model calls as :meth:`predict_quote_batch`, but no per-quote
+        Python objects are built, so columnar input stays vectorized end
+        to end.
+        """
+        if not self.loaded:
+            predictions = self.predict_quote_batch(quotes)
+            return QuoteArrays(
+                predicted_price=np.array([p.predicted_price for p in predictions], dtype=np.float64),
+                confidence=np.array([p.confidence for p in predictions], dtype=np.float64),
+                risk_level=np.array(
+                    [RISK_LEVELS.index(p.risk_level) for p in predictions], dtype=np.intp
+                ),
+                risk_score=np.array([p.risk_score for p in predictions], dtype=np.float64),
+                risk_confidence=np.array([p.risk_confidence for p in predictions], dtype=np.float64),
+                model_used=FALLBACK_MODEL,
+                model_version=self.version,
+            )
+
+        features = self.encode_features(quotes)
+        if len(features):
+            # Bulk callers scan whole tables: the score cache would only churn
+            prices, risk_proba = self._raw_scores(features, use_cache=False)
+        else:
+            prices, risk_proba = np.empty(0), np.empty((0, len(RISK_LEVELS)))
+        risk_model = self.models['risk_model']
+        best = np.argmax(risk_proba, axis=1)
+        rows = np.arange(len(features))
+        return QuoteArrays(
+            predicted_price=np.round(np.maximum(prices, 100), 2),
+            confidence=np.where(features[:, 6] > 0, 0.95, 0.88),
+            risk_level=np.asarray(risk_model.classes_, dtype=np.intp)[best],
+            risk_score=np.round(risk_proba[rows, best], 3),
+            risk_confidence=np.round(risk_proba.max(axis=1, initial=0.0), 3),
+            model_used=self.models.get('price_model_name', 'Trained Model'),
+            model_version=self.version,
+        )
+
+    def _raw_scores(
+        self, features: np.ndarray, price: bool = True, risk: bool = True, use_cache: bool = False
+    ) -> tuple[np.ndarray | None, np.ndarray | None]:
+        """Price predictions and risk class probabilities for a feature matrix.
+
+        With ``use_cache`` and the score cache enabled (quote_cache.py),
+        only rows not cached for these models (``cache_version``) are scored. Scoring
+        runs on the attached process-pool scorer when there is one, else
+        in-process; either way the outputs are identical.
+        """
+        cache = get_score_cache() if use_cache else None
+        if cache is not None:
+            return cache.scores(
+                self.cache_version, features, price, risk, self._score_uncached, RISK_FEATURE_INDEX
+            )
+        return self._score_uncached(features, price, risk)
+
+    def _score_uncached(
+        self, features: np.ndarray, price: bool, risk: bool
+    ) -> tuple[np.ndarray | None, np.ndarray | None]:
+        if self.scorer is not None:
+            return self.scorer.score(self, features, price=price, risk=risk)
+        return score_features(self.models, features, price=price, risk=risk)
+
+    def _predict_quotes(
+        self, features: np.ndarray, rows: list[dict], use_cache: bool = True
+    ) -> list[QuotePrediction]:
+        """Score price features (and their risk column subset) for row inputs."""
+        prices, risk_proba = self._raw_scores(features, use_cache=use_cache)
+        risk_classes = self.models['risk_model'].classes_[np.argmax(risk_proba, axis=1)]
+        model_used = self.models.get('price_model_name', 'Trained Model')
+
+        results = []
+        for q, price, risk_class, proba in zip(rows, prices, risk_classes, risk_proba, strict=True):
+            risk_level = RISK_LEVELS[risk_class]
+            results.append(QuotePrediction(
+                predicted_price=round(max(price, 100), 2),
+                confidence=0.95 if q['crowd_size'] > 0 else 0.88,
+                model_used=model_used,
+                risk_level=risk_level,
+                risk_score=round(float(proba[risk_class]), 3),
+                risk_confidence=round(float(max(proba)), 3),
+                factors=self._generate_risk_factors(
+                    q['event_type'], q['crowd_size'], q['event_date'],
+                    q['is_armed'], risk_level,
+                ),
+                model_version=self.version,
+            ))
+        return results
+
     def _generate_risk_factors(
         self, event_type: str, crowd_size: int, event_date: datetime,
         is_armed: bool, risk_level: str
@@ -197,6 +660,24 @@ class TrainedPredictor:
 
         return factors
 
+    def _fallback_quote(self, quote: dict) -> QuotePrediction:
+        """Fallback rule-based quote combining price and risk fallbacks."""
+        price = self._fallback_price(
+            quote['event_type'], quote['num_guards'], quote['hours'],
+            quote['is_armed'], quote['has_vehicle'],
+        )
+        risk = self._fallback_risk(quote['event_type'], quote['crowd_size'], quote['event_date'])
+        return QuotePrediction(
+            predicted_price=price['predicted_price'],
+            confidence=price['confidence'],
+            model_used=price['model_used'],
+            risk_level=risk['risk_level'],
+            risk_score=risk['risk_score'],
+            risk_confidence=risk['confidence'],
+            factors=risk['factors'],
+            model_version=self.version,
+        )
+
     def _fallback_price(
         self, event_type: str, num_guards: int, hours: float,
         is_armed: bool, has_vehicle: bool
@@ -218,7 +699,8 @@ class TrainedPredictor:
         return {
             'predicted_price': round(subtotal * 1.0875, 2),  # with tax
             'confidence': 0.75,
-            'model_used': 'Rule-based fallback',
+            'model_used': FALLBACK_MODEL,
+            'model_version': self.version,
         }
 
     def _fallback_risk(
@@ -255,16 +737,308 @@ class TrainedPredictor:
             'risk_score': round(score, 3),
             'confidence': 0.70,
             'factors': ['Rule-based assessment'],
+            'model_version': self.version,
         }
 
 
-# Singleton instance
+# ============================================================================
+# Batch input helpers
+# ============================================================================
+
+def score_features(
+    models: dict, features: np.ndarray, price: bool = True, risk: bool = True
+) -> tuple[np.ndarray | None, np.ndarray | None]:
+    """Raw model outputs for an (n, 15) price feature matrix."""
+    prices = models['price_model'].predict(features) if price else None
+    proba = models['risk_model'].predict_proba(features[:, RISK_FEATURE_INDEX]) if risk else None
+    return prices, proba
+
+
+# Positional order of TrainedPredictor._feature_row arguments
+_FEATURE_ARGS = (
+    'event_type', 'state', 'risk_zone', 'num_guards', 'hours',
+    'crowd_size', 'event_date', 'is_armed', 'has_vehicle',
+)
+
+
+def _is_columnar(quotes: BatchInput) -> bool:
+    """True for a column mapping or structured array, False for a row sequence."""
+    if isinstance(quotes, np.ndarray):
+        return quotes.dtype.names is not None
+    return isinstance(quotes, Mapping)
+
+
+def _feature_args(quote: Mapping) -> list:
+    """Feature-row arguments for one row-style quote, filling optional defaults."""
+    return [quote[k] if k in quote else BATCH_DEFAULTS[k] for k in _FEATURE_ARGS]
+
+
+def _column(columns: Mapping | np.ndarray, name: str, n: int = 0) -> np.ndarray:
+    """Fetch one input column, broadcasting the batch default when absent."""
+    names = columns.dtype.names if isinstance(columns, np.ndarray) else columns
+    if name in names:
+        values = columns[name]
+        return values if isinstance(values, LabelColumn) else np.asarray(values)
+    if name in BATCH_DEFAULTS:
+        return np.full(n, BATCH_DEFAULTS[name])
+    raise KeyError(name)
+
+
+def _encode_labels(
+    values: np.ndarray | LabelColumn, labels: list, default: int, normalize
+) -> np.ndarray:
+    """Label-encode a string column, encoding each distinct value only once."""
+    if isinstance(values, LabelColumn):
+        uniques, inverse = values.labels, values.codes
+    else:
+        uniques, inverse = np.unique(values, return_inverse=True)
+    index = {label: i for i, label in enumerate(labels)}
+    codes = np.array(
+        [index.get(normalize(str(u)), default) for u in uniques], dtype=np.float64
+    )
+    return codes[np.asarray(inverse).reshape(-1)]
+
+
+def _as_rows(quotes: BatchInput) -> list[dict]:
+    """Normalize batch input to a list of row dicts with defaults applied."""
+    if not _is_columnar(quotes):
+        return [{**BATCH_DEFAULTS, **q} for q in quotes]
+    n = len(_column(quotes, 'num_guards'))
+    columns = {
+        name: _column(quotes, name, n).tolist()
+        for name in _FEATURE_ARGS if name != 'event_date'
+    }
+    columns['event_date'] = _column(quotes, 'event_date', n).astype('datetime64[s]').tolist()
+    return [{name: values[i] for name, values in columns.items()} for i in range(n)]
+
+
+def local_wall_clock(seconds: np.ndarray) -> np.ndarray:
+    """Epoch seconds as local wall-clock datetime64 values.
+
+    Matches ``datetime.fromtimestamp`` (the gRPC unary path); the UTC offset is
+    looked up once per distinct hour rather than once per quote.
+    """
+    hours, inverse = np.unique(seconds // 3600, return_inverse=True)
+    offsets = np.array([time.localtime(int(h) * 3600).tm_gmtoff for h in hours], dtype=np.int64)
+    return (seconds + offsets[inverse.reshape(-1)]).astype('datetime64[s]')
+
+
+def sample_quotes(n: int = 100, seed: int = 0) -> list[dict]:
+    """Synthetic batch inputs for warm-up, benchmarks and tests.
+
+    Covers unknown labels, mixed casing, night shifts and weekends.
+    """
+    rng = random.Random(seed)
+    quotes = []
+    for _ in range(n):
+        quotes.append({
+            'event_type': rng.choice(['concert', 'corporate', 'Sports', 'retail', 'unknown']),
+            'state': rng.choice(['CA', 'ny', 'TX', 'ZZ']),
+            'zip_code': '90210',
+            'risk_zone': rng.choice(['low', 'medium', 'high', 'bogus']),
+            'num_guards': rng.randint(1, 50),
+            'hours': rng.choice([4, 8.0, 12.5]),
+            'crowd_size': rng.choice([0, 100, 600, 5000]),
+            'event_date': datetime(2026, 1, 1) + timedelta(minutes=rng.randint(0, 500_000)),
+            'is_armed': rng.random() < 0.5,
+            'has_vehicle': rng.random() < 0.5,
+        })
+    return quotes
+
+
+# ============================================================================
+# Serving instance and hot reload
+# ============================================================================
+
+# Singleton instance; replaced wholesale by reload_predictor
 _predictor: TrainedPredictor | None = None
+_predictor_lock = threading.Lock()
+_reload_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry | None:
+    """The configured model registry, or None if it has no versions."""
+    registry = ModelRegistry(get_settings().model_registry_path)
+    return registry if registry.versions() else None
+
+
+def load_predictor(version: str | None = None) -> TrainedPredictor:
+    """Build a predictor for a registry version.
+
+    Defaults to the pinned ``MODEL_VERSION`` setting, then the registry's
+    current version; without a registry, loads models/trained.
+    """
+    registry = get_registry()
+    if registry is None:
+        if version:
+            raise UnknownModelVersion(
+                f"Model version {version!r} requested but no model registry is configured"
+            )
+        predictor = TrainedPredictor()
+    else:
+        version = version or get_settings().model_version or registry.current()
+        predictor = TrainedPredictor(model_dir=registry.path(version), version=version)
+    if predictor.loaded and get_settings().inference_backend == 'process':
+        from .process_pool import get_process_scorer
+        predictor.scorer = get_process_scorer()
+    return predictor
+
+
+def warm_up(predictor: TrainedPredictor, n: int = 32):
+    """Run synthetic predictions so first real requests hit warm code paths."""
+    if predictor.scorer is not None:
+        predictor.scorer.warm(predictor)
+    quotes = sample_quotes(n=n, seed=1)
+    predictor.predict_quote_batch(quotes)
+    predictor.predict_risk_batch(quotes)
+    predictor.predict_quote(**quotes[0])
 
 
 def get_predictor() -> TrainedPredictor:
     """Get singleton predictor instance."""
     global _predictor
     if _predictor is None:
-        _predictor = TrainedPredictor()
+        with _predictor_lock:
+            if _predictor is None:
+                _predictor = load_predictor()
     return _predictor
+
+
+def reload_predictor(version: str | None = None) -> tuple[TrainedPredictor, TrainedPredictor | None]:
+    """Load and warm a model version, then swap it in; returns (new, previous).
+
+    The new predictor is fully built before the swap, and requests that
+    already hold the previous predictor finish on it. Raises if the
+    version is unknown or fails to load, leaving the current one serving.
+    """
+    with _reload_lock:
+        started = time.perf_counter()
+        predictor = load_predictor(version)
+        if not predictor.loaded:
+            raise RuntimeError(f"Model version {version or 'current'} failed to load")
+        warm_up(predictor)
+        global _predictor
+        with _predictor_lock:
+            previous, _predictor = _predictor, predictor
+        print(f"[ok] Serving model version {predictor.version} "
+              f"(loaded in {(time.perf_counter() - started) * 1000:.0f} ms)")
+        return predictor, previous
+
+
+# ============================================================================
+# Startup warm-up and readiness
+# ============================================================================
+
+# Set once the startup warm-up has loaded and exercised the predictor
+_ready = threading.Event()
+_warm_up_thread: threading.Thread | None = None
+_warm_up_lock = threading.Lock()
+# Load / warm-up durations of the startup warm-up, for health and profiling
+startup_timings: dict[str, float] = {}
+
+
+def is_ready() -> bool:
+    """Whether the startup warm-up has finished (the model is loaded and warm)."""
+    return _ready.is_set()
+
+
+def wait_ready(timeout: float | None = None) -> bool:
+    """Block until ready or ``timeout`` seconds pass; returns is_ready()."""
+    return _ready.wait(timeout)
+
+
+def start_warm_up() -> threading.Thread | None:
+    """Load and warm the predictor on a background thread (idempotent).
+
+    Keeps model loading (and, for pickles, the sklearn import) off request
+    threads; readiness probes report ready once it finishes. A no-op when
+    already ready (e.g. in pre-fork workers, warmed by the master).
+    """
+    global _warm_up_thread
+    with _warm_up_lock:
+        if _warm_up_thread is None and not _ready.is_set():
+            _warm_up_thread = threading.Thread(target=run_warm_up, name="model-warm-up", daemon=True)
+            _warm_up_thread.start()
+    return _warm_up_thread
+
+
+def run_warm_up() -> bool:
+    """Load and warm the predictor in the calling thread, then mark ready.
+
+    start_warm_up runs this in the background; the pre-fork master calls it
+    directly so the model is warm before workers are forked.
+    """
+    started = time.perf_counter()
+    try:
+        predictor = get_predictor()
+        loaded = time.perf_counter()
+        warm_up(predictor)
+    except Exception as e:
+        # Stay not-ready: orchestrators restart pods that never become ready
+        print(f"[fail] Model warm-up failed: {e}")
+        return False
+    finished = time.perf_counter()
+    restore_score_cache(predictor.cache_version)
+    startup_timings.update(
+        load_ms=round((loaded - started) * 1000, 1),
+        warm_up_ms=round((finished - loaded) * 1000, 1),
+    )
+    print(f"[ok] Model {predictor.version} ready "
+          f"(load {startup_timings['load_ms']} ms, warm-up {startup_timings['warm_up_ms']} ms)")
+    _ready.set()
+    return True
+
+
+def restore_score_cache(cache_version: str) -> int | None:
+    """Warm the score cache from its snapshot before reporting ready.
+
+    A missing, unreadable or other-model snapshot only means a cold cache.
+    """
+    started = time.perf_counter()
+    try:
+        restored = load_score_snapshot(cache_version)
+    except Exception as e:
+        print(f"[fail] Score cache snapshot not restored: {e}")
+        return None
+    if restored is not None:
+        startup_timings['cache_restore_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        print(f"[ok] Score cache restored {restored} entries "
+              f"({startup_timings['cache_restore_ms']} ms)")
+    return restored
+
+
+def start_score_snapshots() -> SnapshotWriter | None:
+    """Snapshot the score cache periodically; ``stop()`` writes a final one.
+
+    Returns None when the score cache or its snapshots are disabled.
+    """
+    settings = get_settings()
+    if get_score_cache() is None or not settings.quote_cache_snapshot_path:
+        return None
+    writer = SnapshotWriter(
+        lambda: is_ready() and save_score_snapshot(get_predictor().cache_version),
+        interval_s=settings.quote_cache_snapshot_interval_s,
+    )
+    writer.start()
+    return writer
+
+
+def start_registry_watcher() -> RegistryWatcher | None:
+    """Hot-reload when the registry's current version changes.
+
+    Returns None when polling is disabled (``REGISTRY_POLL_S=0``), no
+    registry is configured, or a version is pinned with ``MODEL_VERSION``.
+    """
+    settings = get_settings()
+    registry = get_registry()
+    if settings.registry_poll_s <= 0 or registry is None or settings.model_version:
+        return None
+    watcher = RegistryWatcher(registry, on_change=_reload_if_changed, poll_s=settings.registry_poll_s)
+    watcher.start()
+    return watcher
+
+
+def _reload_if_changed(version: str):
+    """Watcher callback; runs on the watcher thread, so it may wait for the first load."""
+    if get_predictor().version != version:
+        reload_predictor(version)
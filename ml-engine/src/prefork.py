@@ -0,0 +1,337 @@
+"""
+GuardQuote ML Engine - Pre-fork Multi-worker Server
+
+The master process loads and warms the model once, freezes the GC and
+forks ``SERVER_WORKERS`` workers. Each worker runs the usual dual server
+(FastAPI + gRPC) from server.create_app:
+
+- REST: every worker accepts on one listening socket opened by the master
+- gRPC: every worker binds the gRPC port itself; grpcio sets SO_REUSEPORT,
+  so the kernel spreads connections across workers
+
+Model arrays and the interpreter state live in pages shared copy-on-write
+with the master. ``gc.freeze()`` moves everything allocated before the fork
+out of the collector's reach, so collections in a worker do not touch (and
+copy) those pages.
+With ``QUOTE_CACHE_BACKEND=shared`` the master also creates the score
+cache's shared-memory table, so all workers read and fill one cache.
+
+The master supervises: crashed workers are replaced, SIGHUP (or a new
+registry version, when REGISTRY_POLL_S > 0) reloads the model in the
+master and rolls workers one at a time, and SIGTERM/SIGINT stop everyone
+gracefully. Reload a pre-fork deployment through the master, not through
+the ReloadModel RPC (that only reloads the worker that handled it).
+"""
+
+import gc
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+
+from .config import get_settings
+from .models.quote_cache import get_score_cache
+from .models.registry import RegistryWatcher
+from .models.trained_predictor import get_registry, reload_predictor, run_warm_up
+from .server import FASTAPI_PORT, GRPC_PORT
+from . import __version__
+
+logger = logging.getLogger(__name__)
+
+# Seconds a new worker has to report ready during a roll before we move on
+WORKER_READY_TIMEOUT_S = 30.0
+# Seconds a stopping worker gets before SIGKILL
+WORKER_STOP_TIMEOUT_S = 15.0
+# Back off this long before replacing a worker that crashed soon after starting
+CRASH_BACKOFF_S = 1.0
+
+
+def open_listener(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Listening TCP socket inherited by every worker."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkMaster:
+    """Forks and supervises dual-server workers sharing the master's model."""
+
+    def __init__(
+        self,
+        workers: int,
+        host: str = "0.0.0.0",
+        rest_port: int = FASTAPI_PORT,
+        grpc_port: int = GRPC_PORT,
+    ):
+        self.workers = max(1, workers)
+        self.host = host
+        self.rest_port = rest_port
+        self.grpc_port = grpc_port
+        self.listener: socket.socket | None = None
+        # pid -> (started_at, ready pipe read end or None once ready)
+        self.children: dict[int, tuple[float, int | None]] = {}
+        self._stopping: set[int] = set()
+        # Successors started by roll(): not replaced if they exit before ready
+        self._probation: set[int] = set()
+        self._stop = False
+        self._roll = False
+
+    # ------------------------------------------------------------------
+    # Master
+    # ------------------------------------------------------------------
+
+    def run(self) -> int:
+        """Warm the model, fork the workers and supervise until stopped."""
+        if get_settings().inference_backend == 'process':
+            raise ValueError("INFERENCE_BACKEND=process cannot be combined with pre-fork workers")
+        if not run_warm_up():
+            logger.error("Model warm-up failed; not starting workers")
+            return 1
+        # With QUOTE_CACHE_BACKEND=shared, workers inherit the master's table
+        get_score_cache()
+        self._freeze()
+
+        self.listener = open_listener(self.host, self.rest_port)
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_hup)
+
+        logger.info(f"Pre-fork master {os.getpid()}: {self.workers} workers, "
+                    f"REST :{self.rest_port}, gRPC :{self.grpc_port}")
+        for _ in range(self.workers):
+            self._spawn()
+
+        watcher = self._watcher()
+        next_poll = time.monotonic() + (watcher.poll_s if watcher else 0)
+        while not self._stop:
+            self._reap()
+            self._collect_ready()
+            if self._roll:
+                self._roll = False
+                self.reload()
+            if watcher is not None and time.monotonic() >= next_poll:
+                watcher.check()
+                next_poll = time.monotonic() + watcher.poll_s
+            time.sleep(0.2)
+
+        self._shutdown()
+        return 0
+
+    def reload(self, version: str | None = None):
+        """Load ``version`` (default: registry current) in the master, then roll the workers."""
+        gc.unfreeze()
+        try:
+            predictor, _ = reload_predictor(version)
+        except Exception as e:
+            logger.error(f"Model reload failed, workers keep serving: {e}")
+            return
+        finally:
+            self._freeze()
+        logger.info(f"Rolling workers onto model version {predictor.version}")
+        self.roll()
+
+    def roll(self) -> bool:
+        """Replace workers one at a time, each after its successor is ready.
+
+        A successor that exits or does not report ready in time aborts the
+        roll: it is stopped and the workers not yet replaced keep serving.
+        """
+        for pid in list(self.children):
+            if self._stop:
+                return False
+            if pid not in self.children:
+                continue  # died meanwhile (already replaced by _reap)
+            new_pid = self._spawn()
+            self._probation.add(new_pid)
+            try:
+                ready = self._wait_ready(new_pid, WORKER_READY_TIMEOUT_S)
+            finally:
+                self._probation.discard(new_pid)
+            if not ready:
+                logger.error(f"Roll aborted: worker {new_pid} did not become ready; "
+                             f"the remaining workers keep serving")
+                if new_pid in self.children:
+                    self._terminate(new_pid)
+                return False
+            self._terminate(pid)
+        return True
+
+    def _watcher(self) -> RegistryWatcher | None:
+        """Registry watcher polled by the master loop (workers never poll)."""
+        settings = get_settings()
+        registry = get_registry()
+        if settings.registry_poll_s <= 0 or registry is None or settings.model_version:
+            return None
+        from .models.trained_predictor import get_predictor
+        return RegistryWatcher(
+            registry, on_change=self.reload, poll_s=settings.registry_poll_s,
+            version=get_predictor().version,
+        )
+
+    def _freeze(self):
+        gc.collect()
+        gc.freeze()
+
+    def _on_stop(self, signum, frame):
+        self._stop = True
+
+    def _on_hup(self, signum, frame):
+        self._roll = True
+
+    def _spawn(self) -> int:
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            self._worker_main(ready_w)  # never returns
+        os.close(ready_w)
+        self.children[pid] = (time.monotonic(), ready_r)
+        logger.info(f"Started worker {pid}")
+        return pid
+
+    def _read_ready(self, pid: int) -> bool:
+        """Consume a readable ready pipe; True if the worker reported ready.
+
+        The pipe is also readable (at EOF) when the worker exited first.
+        """
+        started, ready_r = self.children[pid]
+        ready = os.read(ready_r, 1) == b"1"
+        os.close(ready_r)
+        self.children[pid] = (started, None)
+        if not ready:
+            logger.error(f"Worker {pid} exited before reporting ready")
+        return ready
+
+    def _collect_ready(self):
+        """Close ready pipes of workers that have reported ready (or exited)."""
+        for pid, (_, ready_r) in list(self.children.items()):
+            if ready_r is not None and select.select([ready_r], [], [], 0)[0]:
+                self._read_ready(pid)
+
+    def _wait_ready(self, pid: int, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and pid in self.children:
+            _, ready_r = self.children[pid]
+            if ready_r is None:
+                return True
+            if select.select([ready_r], [], [], 0.2)[0]:
+                return self._read_ready(pid)
+            self._reap()
+        if pid in self.children:
+            logger.warning(f"Worker {pid} did not report ready within {timeout:.0f} s")
+        return False
+
+    def _reap(self):
+        """Collect exited workers; replace those that were not asked to stop."""
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            started, ready_r = self.children.pop(pid, (time.monotonic(), None))
+            if ready_r is not None:
+                os.close(ready_r)
+            if pid in self._stopping:
+                self._stopping.discard(pid)
+                continue
+            if pid in self._probation:
+                logger.error(f"Worker {pid} exited before it was ready ({_describe(status)})")
+                continue
+            logger.error(f"Worker {pid} exited unexpectedly ({_describe(status)}); replacing it")
+            if time.monotonic() - started < CRASH_BACKOFF_S:
+                time.sleep(CRASH_BACKOFF_S)
+            if not self._stop:
+                self._spawn()
+
+    def _terminate(self, pid: int):
+        self._stopping.add(pid)
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _shutdown(self):
+        logger.info("Stopping workers...")
+        for pid in list(self.children):
+            self._terminate(pid)
+        deadline = time.monotonic() + WORKER_STOP_TIMEOUT_S
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in list(self.children):
+            logger.warning(f"Worker {pid} did not stop in time; killing it")
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self.children.pop(pid, None)
+        self.listener.close()
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _worker_main(self, ready_w: int):
+        """Serve REST + gRPC in a forked worker; exits the process when done."""
+        code = 0
+        try:
+            import uvicorn
+            from .server import create_app
+
+            for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+                signal.signal(signum, signal.SIG_DFL)
+            for _, child_ready in self.children.values():
+                if child_ready is not None:
+                    os.close(child_ready)
+            # The master owns registry polling and rolls workers on reload
+            get_settings().registry_poll_s = 0
+
+            server = uvicorn.Server(uvicorn.Config(
+                create_app(grpc_port=self.grpc_port), log_level="info",
+            ))
+
+            def notify_ready():
+                while not server.started and not server.should_exit:
+                    time.sleep(0.05)
+                # A worker that failed to start only closes the pipe (EOF)
+                if server.started:
+                    os.write(ready_w, b"1")
+                os.close(ready_w)
+
+            threading.Thread(target=notify_ready, name="worker-ready", daemon=True).start()
+            server.run(sockets=[self.listener])
+        except BaseException:
+            logger.exception(f"Worker {os.getpid()} failed")
+            code = 1
+        finally:
+            # Never fall back into the master's code (or its atexit handlers)
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+
+def _describe(status: int) -> str:
+    if os.WIFSIGNALED(status):
+        return f"signal {os.WTERMSIG(status)}"
+    return f"exit code {os.waitstatus_to_exitcode(status)}"
+
+
+def run_prefork(workers: int | None = None):
+    """Run the pre-fork master (``SERVER_WORKERS`` workers by default)."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s"
+    )
+    logger.info(f"Starting GuardQuote ML Engine v{__version__} (pre-fork)")
+    sys.exit(PreforkMaster(workers or get_settings().server_workers).run())
+
+
+if __name__ == "__main__":
+    run_prefork()
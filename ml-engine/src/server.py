@@ -12,11 +12,14 @@ import sys
 import threading
 from contextlib import asynccontextmanager
 
-import uvicorn
 from fastapi import FastAPI
 
-from .api import router
+from .api import router, health_router
+from .config import get_settings
 from .grpc_servicer import create_grpc_server
+from .models.trained_predictor import start_registry_watcher, start_score_snapshots, start_warm_up
+from .serving import shutdown_inference_executor
+from .serving.jobs import start_job_runner, stop_job_runner
 from . import __version__
 
 logger = logging.getLogger(__name__)
@@ -29,20 +32,51 @@ GRPC_PORT = 50051
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle - start/stop gRPC server with FastAPI."""
-    # Start gRPC server in background thread
-    grpc_server = create_grpc_server(port=GRPC_PORT)
-    grpc_server.start()
-    logger.info(f"gRPC server started on port {GRPC_PORT}")
+    # Load and warm the model in the background; /health/ready and gRPC
+    # HealthCheck report ready once it is done
+    start_warm_up()
+
+    # GRPC_MODE=aio serves gRPC from this event loop; otherwise a thread pool
+    grpc_port = app.state.grpc_port
+    aio = get_settings().grpc_mode == "aio"
+    if aio:
+        from .grpc_aio_servicer import create_aio_grpc_server
+        grpc_server = create_aio_grpc_server(port=grpc_port)
+        await grpc_server.start()
+    else:
+        grpc_server = create_grpc_server(port=grpc_port)
+        grpc_server.start()
+    logger.info(f"gRPC server started on port {grpc_port} ({'asyncio' if aio else 'threads'})")
+
+    # Hot-reload models when the registry's current version changes
+    watcher = start_registry_watcher()
+
+    # Run queued repricing jobs (and resume interrupted ones) in the background
+    await asyncio.to_thread(start_job_runner)
+
+    # Snapshot the hottest score cache entries for the next start
+    snapshots = start_score_snapshots()
     
     yield
     
+    await asyncio.to_thread(stop_job_runner)
+    if watcher is not None:
+        watcher.stop()
+
     # Shutdown gRPC server
     logger.info("Stopping gRPC server...")
-    grpc_server.stop(grace=5)
+    if aio:
+        await grpc_server.stop(grace=5)
+        shutdown_inference_executor(wait=False)
+    else:
+        grpc_server.stop(grace=5)
     logger.info("gRPC server stopped")
 
+    if snapshots is not None:
+        await asyncio.to_thread(snapshots.stop)
+
 
-def create_app() -> FastAPI:
+def create_app(grpc_port: int = GRPC_PORT) -> FastAPI:
     """Create FastAPI application with gRPC lifecycle management."""
     app = FastAPI(
         title="GuardQuote ML Engine",
@@ -50,8 +84,10 @@ def create_app() -> FastAPI:
         version=__version__,
         lifespan=lifespan,
     )
+    app.state.grpc_port = grpc_port
     
     app.include_router(router, prefix="/api/v1")
+    app.include_router(health_router)
     
     @app.get("/")
     async def root():
@@ -60,26 +96,21 @@ def create_app() -> FastAPI:
             "version": __version__,
             "endpoints": {
                 "rest": f"http://localhost:{FASTAPI_PORT}/api/v1",
-                "grpc": f"localhost:{GRPC_PORT}",
+                "grpc": f"localhost:{grpc_port}",
             }
         }
 
-    @app.get("/health")
-    async def health():
-        """Top-level health check."""
-        from .models.trained_predictor import get_predictor
-        predictor = get_predictor()
-        return {
-            "status": "healthy",
-            "version": __version__,
-            "model_loaded": predictor.loaded,
-        }
-
     return app
 
 
 def run_dual_server():
-    """Run both FastAPI and gRPC servers."""
+    """Run both FastAPI and gRPC servers (pre-forked when SERVER_WORKERS > 1)."""
+    if get_settings().server_workers > 1:
+        from .prefork import run_prefork
+        return run_prefork()
+
+    import uvicorn
+
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -0,0 +1,55 @@
+from .batching import (
+    MicroBatcher,
+    ItemError,
+    iter_chunks,
+    aiter_chunks,
+    get_quote_batcher,
+    get_risk_batcher,
+    batching_stats,
+    score_quotes,
+    score_risks,
+    VERSION_KEY,
+    CACHE_BYPASS_KEY,
+)
+from .executor import (
+    InferenceExecutor,
+    InferenceQueueFull,
+    get_inference_executor,
+    inference_stats,
+    run_inference,
+    submit_async,
+    shutdown_inference_executor,
+)
+from .idempotency import (
+    IdempotencyCache,
+    get_idempotency_cache,
+    idempotency_stats,
+    idempotent,
+    idempotent_async,
+)
+
+__all__ = [
+    "MicroBatcher",
+    "ItemError",
+    "iter_chunks",
+    "aiter_chunks",
+    "get_quote_batcher",
+    "get_risk_batcher",
+    "batching_stats",
+    "score_quotes",
+    "score_risks",
+    "VERSION_KEY",
+    "CACHE_BYPASS_KEY",
+    "InferenceExecutor",
+    "InferenceQueueFull",
+    "get_inference_executor",
+    "inference_stats",
+    "run_inference",
+    "submit_async",
+    "shutdown_inference_executor",
+    "IdempotencyCache",
+    "get_idempotency_cache",
+    "idempotency_stats",
+    "idempotent",
+    "idempotent_async",
+]
@@ -0,0 +1,524 @@
+"""
+Micro-batching for unary and streaming inference.
+
+Concurrent GenerateQuote / AssessRisk / REST quote calls submit their inputs
+to a MicroBatcher. A dispatcher thread collects submissions until the batch
+is full or the oldest one has waited ``max_wait_ms``, runs one vectorized
+predict for the group and resolves each caller's future.
+
+Identical submissions are coalesced (single flight): while one is queued
+or being scored, a submission with the same normalized inputs waits on
+that computation instead of adding another, so a burst of identical quote
+configs from many sessions costs one predict. Each caller still gets its
+own future, so one caller cancelling does not affect the others.
+
+Streaming RPCs use iter_chunks (aiter_chunks under grpc.aio) to read ahead
+on the request stream and score it chunk by chunk.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections.abc import (
+    AsyncIterable, AsyncIterator, Callable, Hashable, Iterable, Iterator, Sequence,
+)
+from concurrent.futures import Future
+from enum import Enum
+from functools import partial
+from typing import Any
+
+from ..config import get_settings
+from ..models.manager import get_model_manager
+from ..models.trained_predictor import QuotePrediction
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+_END = object()
+
+
+class BatchStats:
+    """Running counters for batch sizes and queue wait."""
+
+    def __init__(self, max_batch_size: int):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.errors = 0
+        self.coalesced = 0
+        self.max_batch = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+        # size_histogram[i] counts batches with size in (2**(i-1), 2**i]
+        self.size_histogram = [0] * (max(max_batch_size, 1).bit_length() + 1)
+
+    def record(self, size: int, waits: Sequence[float], failed: bool = False):
+        with self._lock:
+            self.batches += 1
+            self.items += size
+            self.errors += int(failed)
+            self.max_batch = max(self.max_batch, size)
+            self.total_wait_s += sum(waits)
+            self.max_wait_s = max(self.max_wait_s, max(waits, default=0.0))
+            self.size_histogram[min((size - 1).bit_length(), len(self.size_histogram) - 1)] += 1
+
+    def record_coalesced(self):
+        with self._lock:
+            self.coalesced += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'items': self.items,
+                'errors': self.errors,
+                'coalesced': self.coalesced,
+                'avg_batch_size': round(self.items / self.batches, 2) if self.batches else 0.0,
+                'max_batch_size': self.max_batch,
+                'avg_queue_wait_ms': (
+                    round(self.total_wait_s / self.items * 1000, 3) if self.items else 0.0
+                ),
+                'max_queue_wait_ms': round(self.max_wait_s * 1000, 3),
+                'batch_size_histogram': {
+                    f"<={2 ** i}": count for i, count in enumerate(self.size_histogram) if count
+                },
+            }
+
+
+class ItemError:
+    """A batch result slot holding the exception for that item only.
+
+    ``batch_fn`` returns one in place of a result when an item (or its
+    group) fails, so the rest of the batch still resolves.
+    """
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+def _follow(leader: Future) -> Future:
+    """A new future resolved with the outcome of ``leader``."""
+    follower: Future = Future()
+
+    def resolve(done: Future):
+        if not follower.set_running_or_notify_cancel():
+            return
+        error = done.exception()
+        if error is not None:
+            follower.set_exception(error)
+        else:
+            follower.set_result(done.result())
+
+    leader.add_done_callback(resolve)
+    return follower
+
+
+class MicroBatcher:
+    """Groups concurrent single-item submissions into batched calls.
+
+    ``batch_fn`` takes a list of items and returns a list of results in the
+    same order; an ItemError result fails only that item's future. With
+    ``enabled=False`` each submission runs inline as a batch of one, so
+    callers use the same code path either way.
+
+    With a ``coalesce_key``, submissions whose key equals that of an item
+    still in flight share its result instead of being scored again (a None
+    key is never coalesced).
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list], list],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        enabled: bool = True,
+        name: str = "micro-batcher",
+        coalesce_key: Callable[[Any], Hashable | None] | None = None,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max(0.0, max_wait_ms) / 1000
+        self.enabled = enabled
+        self.name = name
+        self.coalesce_key = coalesce_key
+        self.stats = BatchStats(self.max_batch_size)
+        self._in_flight: dict[Hashable, Future] = {}
+        self._in_flight_lock = threading.Lock()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item; the returned future resolves to its result."""
+        key = self.coalesce_key(item) if self.coalesce_key is not None else None
+        if key is None:
+            future: Future = Future()
+            self._enqueue(item, future)
+            return future
+
+        with self._in_flight_lock:
+            leader = self._in_flight.get(key)
+            joined = leader is not None
+            if not joined:
+                leader = self._in_flight[key] = Future()
+                leader.add_done_callback(partial(self._forget, key))
+        if joined:
+            self.stats.record_coalesced()
+            return _follow(leader)
+        follower = _follow(leader)
+        self._enqueue(item, leader)
+        return follower
+
+    def join(self, item: Any) -> Future | None:
+        """A future for an identical item already in flight, or None (nothing queued)."""
+        if self.coalesce_key is None:
+            return None
+        key = self.coalesce_key(item)
+        if key is None:
+            return None
+        with self._in_flight_lock:
+            leader = self._in_flight.get(key)
+        if leader is None:
+            return None
+        self.stats.record_coalesced()
+        return _follow(leader)
+
+    def _enqueue(self, item: Any, future: Future):
+        if not self.enabled:
+            self._execute([(item, future, time.perf_counter())])
+            return
+        self._ensure_started()
+        self._queue.put((item, future, time.perf_counter()))
+
+    def _forget(self, key: Hashable, leader: Future):
+        with self._in_flight_lock:
+            if self._in_flight.get(key) is leader:
+                del self._in_flight[key]
+
+    def __call__(self, item: Any) -> Any:
+        """Submit one item and block until its result is ready."""
+        return self.submit(item).result()
+
+    def close(self):
+        """Stop the dispatcher after it drains queued submissions."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = first[2] + self.max_wait_s
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    if timeout > 0:
+                        pending = self._queue.get(timeout=timeout)
+                    else:
+                        pending = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if pending is _STOP:
+                    stopping = True
+                    break
+                batch.append(pending)
+            self._execute(batch)
+
+    def _execute(self, batch: list):
+        started = time.perf_counter()
+        waits = [started - enqueued for _, _, enqueued in batch]
+        # Cancelled futures still get scored with the batch but are not resolved
+        running = [future.set_running_or_notify_cancel() for _, future, _ in batch]
+        try:
+            results = self.batch_fn([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"batch_fn returned {len(results)} results for {len(batch)} items"
+                )
+        except Exception as e:
+            logger.error(f"{self.name}: batch of {len(batch)} failed: {e}")
+            self.stats.record(len(batch), waits, failed=True)
+            for (_, future, _), is_running in zip(batch, running):
+                if is_running:
+                    future.set_exception(e)
+            return
+
+        self.stats.record(len(batch), waits)
+        for (_, future, _), is_running, result in zip(batch, running, results):
+            if not is_running:
+                continue
+            if isinstance(result, ItemError):
+                future.set_exception(result.error)
+            else:
+                future.set_result(result)
+
+
+# ============================================================================
+# Stream chunking
+# ============================================================================
+
+class _StreamError:
+    """Wraps an exception raised by the source iterator of iter_chunks."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def iter_chunks(
+    source: Iterable, max_size: int, flush_ms: float, read_ahead: int | None = None
+) -> Iterator[list]:
+    """Group a (possibly slow) iterator into lists, preserving order.
+
+    A reader thread consumes ``source`` ahead of the caller into a bounded
+    buffer of ``read_ahead`` items (default ``4 * max_size``). A chunk is
+    emitted when it holds ``max_size`` items or ``flush_ms`` has passed since
+    its first item arrived, so slow streams still get timely responses.
+    Errors raised by ``source`` are re-raised after the pending chunk.
+    """
+    max_size = max(1, max_size)
+    flush_s = max(0.0, flush_ms) / 1000
+    buffer: queue.Queue = queue.Queue(maxsize=read_ahead or 4 * max_size)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def reader():
+        try:
+            for item in source:
+                if not put(item):
+                    return
+            put(_END)
+        except BaseException as e:
+            put(_StreamError(e))
+
+    threading.Thread(target=reader, name="stream-reader", daemon=True).start()
+    try:
+        error = None
+        while error is None:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, _StreamError):
+                raise item.error
+
+            chunk = [item]
+            deadline = time.perf_counter() + flush_s
+            finished = False
+            while len(chunk) < max_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    item = buffer.get(timeout=timeout) if timeout > 0 else buffer.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _END:
+                    finished = True
+                    break
+                if isinstance(item, _StreamError):
+                    error = item.error
+                    break
+                chunk.append(item)
+
+            yield chunk
+            if finished:
+                return
+        raise error
+    finally:
+        # Unblocks the reader if the consumer stops early (e.g. cancelled RPC)
+        stop.set()
+
+
+async def aiter_chunks(
+    source: AsyncIterable, max_size: int, flush_ms: float, read_ahead: int | None = None
+) -> AsyncIterator[list]:
+    """Asyncio counterpart of iter_chunks, for grpc.aio request streams.
+
+    Same chunking rules; the read-ahead runs as a task on the caller's event
+    loop, so an idle stream holds no thread while it waits for messages.
+    """
+    max_size = max(1, max_size)
+    flush_s = max(0.0, flush_ms) / 1000
+    buffer: asyncio.Queue = asyncio.Queue(maxsize=read_ahead or 4 * max_size)
+
+    async def reader():
+        try:
+            async for item in source:
+                await buffer.put(item)
+            await buffer.put(_END)
+        except Exception as e:
+            await buffer.put(_StreamError(e))
+
+    loop = asyncio.get_running_loop()
+    reader_task = asyncio.create_task(reader())
+    try:
+        error = None
+        while error is None:
+            item = await buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, _StreamError):
+                raise item.error
+
+            chunk = [item]
+            deadline = loop.time() + flush_s
+            finished = False
+            while len(chunk) < max_size:
+                timeout = deadline - loop.time()
+                try:
+                    item = (
+                        await asyncio.wait_for(buffer.get(), timeout) if timeout > 0
+                        else buffer.get_nowait()
+                    )
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if item is _END:
+                    finished = True
+                    break
+                if isinstance(item, _StreamError):
+                    error = item.error
+                    break
+                chunk.append(item)
+
+            yield chunk
+            if finished:
+                return
+        raise error
+    finally:
+        reader_task.cancel()
+
+
+# ============================================================================
+# Quote / risk batchers
+# ============================================================================
+
+# Optional key in quote inputs selecting a model version (see ModelManager)
+VERSION_KEY = 'model_version'
+# Input key: True skips the score cache for this request (Cache-Control: no-cache)
+CACHE_BYPASS_KEY = 'cache_bypass'
+
+
+def quote_key(quote: dict) -> tuple | None:
+    """Normalized, hashable form of quote inputs for coalescing (None if unhashable).
+
+    Enum members compare as their values, so a route passing
+    ``EventType.CONCERT`` and one passing ``"concert"`` share a computation.
+    """
+    try:
+        key = tuple(sorted(
+            (name, value.value if isinstance(value, Enum) else value)
+            for name, value in quote.items()
+        ))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _by_version(quotes: list[dict], score: Callable) -> list:
+    """Score quotes grouped by requested model version, preserving input order.
+
+    ``score(predictor, group, use_cache)`` runs once per distinct version
+    (and cache bypass flag) in the batch. A group that fails, e.g. on an
+    unknown version, gets ItemError results, so only its callers see the error.
+    """
+    groups: dict[tuple[str | None, bool], list[int]] = {}
+    for i, quote in enumerate(quotes):
+        key = (quote.get(VERSION_KEY), bool(quote.get(CACHE_BYPASS_KEY)))
+        groups.setdefault(key, []).append(i)
+
+    manager = get_model_manager()
+    results: list = [None] * len(quotes)
+    for (version, bypass), indexes in groups.items():
+        group = [quotes[i] for i in indexes]
+        if version is not None or bypass:
+            group = [
+                {k: v for k, v in q.items() if k not in (VERSION_KEY, CACHE_BYPASS_KEY)}
+                for q in group
+            ]
+        try:
+            scored = score(manager.get(version), group, not bypass)
+        except Exception as e:
+            logger.warning(f"Scoring {len(group)} item(s) for version {version!r} failed: {e}")
+            scored = [ItemError(e)] * len(group)
+        for i, result in zip(indexes, scored, strict=True):
+            results[i] = result
+    return results
+
+
+def score_quotes(quotes: list[dict]) -> list[QuotePrediction]:
+    """Batch function for quotes: one fused price + risk pass per model version."""
+    return _by_version(
+        quotes, lambda predictor, group, use_cache: predictor.predict_quote_batch(group, use_cache)
+    )
+
+
+def score_risks(quotes: list[dict]) -> list[dict]:
+    """Batch function for standalone risk assessments."""
+    return _by_version(
+        quotes, lambda predictor, group, use_cache: predictor.predict_risk_batch(group, use_cache)
+    )
+
+
+_quote_batcher: MicroBatcher | None = None
+_risk_batcher: MicroBatcher | None = None
+_batchers_lock = threading.Lock()
+
+
+def _make_batcher(batch_fn: Callable[[list], list], name: str) -> MicroBatcher:
+    settings = get_settings()
+    return MicroBatcher(
+        batch_fn,
+        max_batch_size=settings.batch_max_size,
+        max_wait_ms=settings.batch_max_wait_ms,
+        enabled=settings.batching_enabled,
+        name=name,
+        coalesce_key=quote_key if settings.singleflight_enabled else None,
+    )
+
+
+def get_quote_batcher() -> MicroBatcher:
+    """Batcher resolving a quote dict to a QuotePrediction."""
+    global _quote_batcher
+    if _quote_batcher is None:
+        with _batchers_lock:
+            if _quote_batcher is None:
+                _quote_batcher = _make_batcher(score_quotes, "quote-batcher")
+    return _quote_batcher
+
+
+def get_risk_batcher() -> MicroBatcher:
+    """Batcher resolving a quote dict to a risk result."""
+    global _risk_batcher
+    if _risk_batcher is None:
+        with _batchers_lock:
+            if _risk_batcher is None:
+                _risk_batcher = _make_batcher(score_risks, "risk-batcher")
+    return _risk_batcher
+
+
+def batching_stats() -> dict:
+    """Stats for every batcher created so far."""
+    return {
+        batcher.name: {'enabled': batcher.enabled, **batcher.stats.snapshot()}
+        for batcher in (_quote_batcher, _risk_batcher) if batcher is not None
+    }
@@ -0,0 +1,60 @@
+"""
+Precomputed catalog responses (event types, model info).
+
+Clients poll these constantly, but they only change when the rate tables
+or the served model change. Each response is built once per version key
+and reused: REST keeps the serialized JSON and its ETag
+(src/api/catalog.py), gRPC keeps the prebuilt message (grpc_servicer.py).
+
+Keys:
+- event types: a snapshot of ``PricingEngine.BASE_RATES`` and
+  ``EVENT_RISK_WEIGHTS``, so any change to the rate tables rebuilds them
+- model info: the serving predictor object, which a reload replaces
+"""
+
+import threading
+from collections.abc import Callable
+from typing import Any, Generic, TypeVar
+
+from ..models.pricing_engine import PricingEngine
+from ..models.trained_predictor import get_predictor
+
+T = TypeVar('T')
+
+
+def rates_key() -> tuple:
+    """Version key of the rate tables (a few dozen items; cheap to build per call)."""
+    return tuple(PricingEngine.BASE_RATES.items()), tuple(PricingEngine.EVENT_RISK_WEIGHTS.items())
+
+
+def model_key():
+    """Version key of the model info: the predictor being served."""
+    return get_predictor()
+
+
+class Cached(Generic[T]):
+    """A value built from its version key, rebuilt only when the key changes.
+
+    Keys compare with ``==`` (objects without ``__eq__`` by identity); the
+    cached key is kept alive, so an identity cannot be reused meanwhile.
+    """
+
+    def __init__(self, key: Callable[[], Any], build: Callable[[Any], T]):
+        self._key = key
+        self._build = build
+        self._entry: tuple[Any, T] | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        key = self._key()
+        entry = self._entry
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        with self._lock:
+            entry = self._entry
+            if entry is None or entry[0] != key:
+                entry = self._entry = (key, self._build(key))
+            return entry[1]
+
+    def invalidate(self):
+        self._entry = None
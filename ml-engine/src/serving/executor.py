@@ -0,0 +1,190 @@
+"""
+Bounded executor for CPU-bound inference called from asyncio code.
+
+The REST routes and the grpc.aio servicers run on the event loop and must
+never block it: model calls are handed to a dedicated pool of
+``inference_workers`` threads instead. Admission is bounded: at most
+``inference_workers + inference_queue_size`` calls may be running or
+waiting, and the next one is rejected at once with InferenceQueueFull
+(REST 503 + Retry-After, gRPC RESOURCE_EXHAUSTED), so a load spike turns
+into fast rejections rather than an ever-growing queue, and health probes
+are never stuck behind inference.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from ..config import get_settings
+
+
+class InferenceQueueFull(Exception):
+    """The inference queue is at capacity; retry after ``retry_after_s``."""
+
+    def __init__(self, capacity: int, retry_after_s: float):
+        super().__init__(f"Inference queue full ({capacity} requests in flight), retry later")
+        self.capacity = capacity
+        self.retry_after_s = retry_after_s
+
+    @property
+    def retry_after(self) -> str:
+        """Retry-After header value (whole seconds, at least 1)."""
+        return str(max(1, math.ceil(self.retry_after_s)))
+
+
+class InferenceExecutor:
+    """Thread pool with bounded admission and queue statistics.
+
+    A call is "in flight" from admission until its work finishes (or is
+    cancelled before starting), whichever path it takes: ``run`` on the
+    pool, or ``submit`` to an enabled MicroBatcher whose dispatcher thread
+    does the work.
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 64, retry_after_s: float = 1.0):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.capacity = self.workers + self.max_queue
+        self.retry_after_s = retry_after_s
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_in_flight = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+
+    def _admit(self):
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise InferenceQueueFull(self.capacity, self.retry_after_s)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _release(self, _future=None):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def _timed(self, fn: Callable, enqueued: float) -> Callable:
+        def call():
+            waited = time.perf_counter() - enqueued
+            with self._lock:
+                self.running += 1
+                self.total_wait_s += waited
+                self.max_wait_s = max(self.max_wait_s, waited)
+            try:
+                return fn()
+            finally:
+                with self._lock:
+                    self.running -= 1
+        return call
+
+    def submit_call(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """Admit ``fn(*args, **kwargs)`` onto the pool (InferenceQueueFull if at capacity)."""
+        self._admit()
+        try:
+            future = self._pool.submit(
+                self._timed(lambda: fn(*args, **kwargs), time.perf_counter())
+            )
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn`` on the pool and await its result."""
+        return await asyncio.wrap_future(self.submit_call(fn, *args, **kwargs))
+
+    async def submit(self, batcher, item: Any) -> Any:
+        """Await a MicroBatcher result without holding a thread while queued.
+
+        With batching enabled the batcher's dispatcher thread does the work
+        and the caller only awaits its future; disabled batchers score
+        inline, so that call goes to the pool instead. A call identical to
+        one already in flight just awaits that one's result, without
+        admission or a thread.
+        """
+        joined = batcher.join(item)
+        if joined is not None:
+            return await asyncio.wrap_future(joined)
+        if not batcher.enabled:
+            return await self.run(batcher, item)
+        self._admit()
+        try:
+            future = batcher.submit(item)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            started = self.completed + self.running
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'in_flight': self.in_flight,
+                'running': self.running,
+                'queue_depth': max(0, self.in_flight - self.running),
+                'max_in_flight': self.max_in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'avg_queue_wait_ms': round(self.total_wait_s / started * 1000, 3) if started else 0.0,
+                'max_queue_wait_ms': round(self.max_wait_s * 1000, 3),
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+
+_executor: InferenceExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Shared inference executor, sized from settings."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                settings = get_settings()
+                _executor = InferenceExecutor(
+                    workers=settings.inference_workers,
+                    max_queue=settings.inference_queue_size,
+                    retry_after_s=settings.inference_retry_after_s,
+                )
+    return _executor
+
+
+async def run_inference(fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    """Run ``fn(*args, **kwargs)`` on the inference executor and await its result."""
+    return await get_inference_executor().run(fn, *args, **kwargs)
+
+
+async def submit_async(batcher, item: Any) -> Any:
+    """Submit one item to ``batcher`` through the inference executor's admission."""
+    return await get_inference_executor().submit(batcher, item)
+
+
+def inference_stats() -> dict:
+    """Queue depth, wait time and rejections of the inference executor."""
+    return get_inference_executor().stats()
+
+
+def shutdown_inference_executor(wait: bool = True):
+    """Stop the inference executor (a later call to get_inference_executor makes a new one)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
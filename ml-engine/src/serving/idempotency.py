@@ -0,0 +1,213 @@
+"""
+Request-id idempotency cache for unary gRPC calls.
+
+The backend's gRPC client retries a quote or risk call that timed out,
+and during incidents those retries multiply the load exactly when the
+engine is slowest. Responses are kept for ``IDEMPOTENCY_WINDOW_S`` keyed
+by (method, client id, request id): a retry gets the stored response
+without inference, and a retry arriving while the original is still being
+scored joins it instead of scoring the quote again.
+
+Each entry also records a digest of the request. A request id reused with
+a different payload is scored normally and neither reads nor replaces the
+entry. Failures are not stored (the retry is scored afresh), but callers
+already waiting on the failed call receive its error. Calls without a
+request id are never cached.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from concurrent.futures import CancelledError, Future
+from typing import NamedTuple, TypeVar
+
+from ..config import get_settings
+
+T = TypeVar('T')
+
+
+class _Entry(NamedTuple):
+    digest: bytes
+    future: Future
+    expires: float
+
+
+class IdempotencyCache:
+    """Bounded, time-windowed store of responses and in-flight calls."""
+
+    def __init__(self, max_size: int = 10000, window_s: float = 120.0):
+        self.max_size = max(1, max_size)
+        self.window_s = window_s
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.replayed = 0
+        self.joined = 0
+        self.computed = 0
+        self.conflicts = 0
+
+    def _claim(self, key: tuple, digest: bytes) -> tuple[Future | None, bool]:
+        """(future, owner): a new future to fulfil, an existing one to wait on,
+        or (None, True) for a conflicting payload that must not touch the entry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.expires <= now or entry.future.cancelled()):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                if entry.digest != digest:
+                    self.conflicts += 1
+                    return None, True
+                if entry.future.done():
+                    self.replayed += 1
+                else:
+                    self.joined += 1
+                return entry.future, False
+
+            self.computed += 1
+            future = Future()
+            self._entries[key] = _Entry(digest, future, now + self.window_s)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return future, True
+
+    def _finish(self, key: tuple, future: Future, value=None, error: BaseException | None = None):
+        if error is None:
+            future.set_result(value)
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.future is future:
+                del self._entries[key]
+        if isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            # Cancelled or interrupted: waiting callers score the request themselves
+            future.cancel()
+
+    def run(self, key: tuple | None, digest: bytes, compute: Callable[[], T]) -> T:
+        """``compute()``, or the stored / in-flight result of the same call."""
+        if key is None:
+            return compute()
+        while True:
+            future, owner = self._claim(key, digest)
+            if future is None:
+                return compute()
+            if owner:
+                break
+            try:
+                return future.result()
+            except CancelledError:
+                continue
+        try:
+            value = compute()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, value)
+        return value
+
+    async def run_async(
+        self, key: tuple | None, digest: bytes, compute: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Asyncio counterpart of ``run``, for grpc.aio handlers."""
+        if key is None:
+            return await compute()
+        while True:
+            future, owner = self._claim(key, digest)
+            if future is None:
+                return await compute()
+            if owner:
+                break
+            try:
+                # Shielded: a waiter giving up must not cancel the owner's future
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+        try:
+            value = await compute()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'window_s': self.window_s,
+                'computed': self.computed,
+                'replayed': self.replayed,
+                'joined': self.joined,
+                'conflicts': self.conflicts,
+            }
+
+
+def request_key(context, method: str, request, client_id: str = "") -> tuple[tuple | None, bytes]:
+    """(key, digest) of a unary call; the key is None when it cannot be deduplicated.
+
+    The client id is the request's own, else the ``x-client-id`` metadata.
+    The digest covers the request and the metadata that changes its result.
+    """
+    if not request.request_id or get_idempotency_cache() is None:
+        return None, b''
+    metadata = dict(context.invocation_metadata() or ()) if context is not None else {}
+    client_id = client_id or metadata.get('x-client-id', '')
+    digest = hashlib.blake2b(request.SerializeToString(deterministic=True), digest_size=16)
+    digest.update(metadata.get('x-model-version', '').encode())
+    return (method, client_id, request.request_id), digest.digest()
+
+
+_cache: IdempotencyCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_idempotency_cache() -> IdempotencyCache | None:
+    """Shared idempotency cache, or None when ``IDEMPOTENCY_ENABLED`` is off."""
+    global _cache
+    settings = get_settings()
+    if not settings.idempotency_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = IdempotencyCache(
+                    max_size=settings.idempotency_size, window_s=settings.idempotency_window_s
+                )
+    return _cache
+
+
+def idempotent(context, method: str, request, compute: Callable[[], T], client_id: str = "") -> T:
+    """``compute()`` for a unary call, deduplicated by its request id."""
+    key, digest = request_key(context, method, request, client_id)
+    if key is None:
+        return compute()
+    return get_idempotency_cache().run(key, digest, compute)
+
+
+async def idempotent_async(
+    context, method: str, request, compute: Callable[[], Awaitable[T]], client_id: str = ""
+) -> T:
+    """Asyncio counterpart of ``idempotent``."""
+    key, digest = request_key(context, method, request, client_id)
+    if key is None:
+        return await compute()
+    return await get_idempotency_cache().run_async(key, digest, compute)
+
+
+def idempotency_stats() -> dict:
+    """Counters of the shared idempotency cache (``enabled: False`` when it is off)."""
+    cache = get_idempotency_cache()
+    if cache is None:
+        return {'enabled': False}
+    return {'enabled': True, **cache.stats()}
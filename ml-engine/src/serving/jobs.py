@@ -0,0 +1,522 @@
+"""
+Asynchronous repricing jobs with chunked, resumable execution.
+
+A job scores one table file (Arrow IPC stream or Parquet, uploaded or read
+from ``JOB_INPUT_DIR``) with the model version pinned at submission. All
+state lives on disk, one directory per job:
+
+    data/jobs/<job id>/
+        job.json            status, chunk ranges, timings, error
+        input               uploaded table (path jobs read their source)
+        parts/00000.arrows  scored chunks, each renamed into place when done
+        result.parquet      final result, assembled when every chunk is done
+        lock                flock held by the process running the job
+
+The input is split into chunks of about ``JOB_CHUNK_ROWS`` rows (Parquet
+chunks follow row groups). Scored chunks are checkpoints: after a restart
+the runner skips chunks whose part file exists and resumes with the rest.
+Any server process can answer status polls and downloads; the ``lock``
+file makes sure only one (e.g. of several pre-fork workers) runs a job.
+
+Chunks are scored by ``JOB_WORKERS`` spawned processes running at CPU
+priority ``JOB_NICE``. They share neither the GIL nor the inference
+executor with the serving process, and the OS scheduler runs interactive
+quote traffic first whenever it needs the CPU.
+"""
+
+import fcntl
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from ..config import get_settings
+from ..models.manager import get_model_manager
+from ..models.process_pool import worker_predictor, worker_spec
+from .tables import (
+    ARROW_STREAM,
+    PARQUET,
+    check_columns,
+    output_schema,
+    read_rows,
+    require_arrow,
+    score_batch,
+    table_info,
+    write_table,
+)
+
+logger = logging.getLogger(__name__)
+
+JOB_FILE = "job.json"
+LOCK_FILE = "lock"
+PARTS_DIR = "parts"
+INPUT_FILE = "input"
+RESULT_FILES = {ARROW_STREAM: "result.arrows", PARQUET: "result.parquet"}
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+ACTIVE = (QUEUED, RUNNING)
+
+# Seconds between runner checks for new jobs (e.g. submitted to another worker)
+POLL_S = 2.0
+# Runs of a job that may lose a chunk worker (e.g. OOM-killed) before it fails
+MAX_WORKER_CRASHES = 3
+
+
+class JobNotFound(KeyError):
+    """No job with this id."""
+
+    def __str__(self) -> str:
+        return str(self.args[0]) if self.args else ""
+
+
+class JobNotFinished(Exception):
+    """The requested result is not available yet."""
+
+
+def chunk_ranges(fmt: str, sizes: list[int], chunk_rows: int) -> list[list[int]]:
+    """[start, stop) row ranges for a table with these row group / batch sizes."""
+    total = sum(sizes)
+    if fmt == ARROW_STREAM:  # record batches can be sliced anywhere
+        return [[start, min(start + chunk_rows, total)] for start in range(0, total, chunk_rows)]
+    # Parquet is read by row group, so chunks are runs of whole groups
+    ranges, start, stop = [], 0, 0
+    for size in sizes:
+        stop += size
+        if stop - start >= chunk_rows:
+            ranges.append([start, stop])
+            start = stop
+    if stop > start:
+        ranges.append([start, stop])
+    return ranges
+
+
+# ============================================================================
+# Worker side
+# ============================================================================
+
+def _init_job_worker(nice: int):
+    os.nice(nice)
+
+
+def _score_chunk(spec: tuple, input_path: str, fmt: str, start: int, stop: int, part_path: str):
+    """Score rows [start, stop) of the input into ``part_path`` (Arrow IPC stream)."""
+    predictor = worker_predictor(spec)
+    batches = read_rows(input_path, fmt, start, stop)
+    schema = output_schema(batches[0].schema)
+    tmp_path = f"{part_path}.tmp"
+    write_table(
+        (score_batch(predictor, batch, schema) for batch in batches), schema, tmp_path, ARROW_STREAM
+    )
+    os.replace(tmp_path, part_path)
+
+
+def assemble(part_paths: list[str], output_path: str, fmt: str):
+    """Concatenate scored part files into one table file in ``fmt``."""
+    pa = require_arrow()
+    readers = [pa.ipc.open_stream(pa.memory_map(path)) for path in part_paths]
+    tmp_path = f"{output_path}.tmp"
+    write_table(
+        (batch for reader in readers for batch in reader), readers[0].schema, tmp_path, fmt
+    )
+    os.replace(tmp_path, output_path)
+
+
+# ============================================================================
+# Job store and runner
+# ============================================================================
+
+class JobManager:
+    """Creates jobs on disk and runs them on a pool of low-priority processes."""
+
+    def __init__(
+        self,
+        root: str,
+        input_dir: str = "",
+        workers: int = 1,
+        chunk_rows: int = 50000,
+        nice: int = 19,
+    ):
+        self.root = root
+        self.input_dir = input_dir
+        self.workers = max(1, workers)
+        self.chunk_rows = max(1, chunk_rows)
+        self.nice = nice
+        os.makedirs(root, exist_ok=True)
+        self._executor: ProcessPoolExecutor | None = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # Job records
+    # ------------------------------------------------------------------
+
+    def _dir(self, job_id: str) -> str:
+        if not job_id.isalnum():
+            raise JobNotFound(f"Job {job_id!r} not found")
+        return os.path.join(self.root, job_id)
+
+    def _read(self, job_id: str) -> dict:
+        try:
+            with open(os.path.join(self._dir(job_id), JOB_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise JobNotFound(f"Job {job_id!r} not found") from None
+
+    def _write(self, job: dict):
+        job_dir = self._dir(job['id'])
+        fd, tmp_path = tempfile.mkstemp(prefix=".job-", dir=job_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(job, f)
+        os.replace(tmp_path, os.path.join(job_dir, JOB_FILE))
+
+    def get(self, job_id: str) -> dict:
+        """Job status with progress and this run's throughput."""
+        job = self._read(job_id)
+        done = self._done_chunks(job)
+        rows_done = sum(job['chunks'][k][1] - job['chunks'][k][0] for k in done)
+        elapsed = 0.0
+        if job['run_started_at']:
+            elapsed = (job['finished_at'] or time.time()) - job['run_started_at']
+        run_rows = rows_done - job['run_start_rows']
+        return {
+            'job_id': job['id'],
+            'status': job['status'],
+            'format': job['format'],
+            'model_version': job['model_version'],
+            'total_rows': job['total_rows'],
+            'rows_done': rows_done,
+            'chunks_total': len(job['chunks']),
+            'chunks_done': len(done),
+            'progress': round(rows_done / job['total_rows'], 4) if job['total_rows'] else 1.0,
+            'rows_per_s': round(run_rows / elapsed, 1) if elapsed > 0 else 0.0,
+            'created_at': job['created_at'],
+            'started_at': job['started_at'],
+            'finished_at': job['finished_at'],
+            'error': job['error'],
+        }
+
+    def list_jobs(self) -> list[dict]:
+        """Status of every job, newest first."""
+        jobs = []
+        for name in os.listdir(self.root):
+            try:
+                jobs.append(self.get(name))
+            except JobNotFound:
+                continue
+        return sorted(jobs, key=lambda job: job['created_at'], reverse=True)
+
+    def _part_path(self, job: dict, k: int) -> str:
+        return os.path.join(self._dir(job['id']), PARTS_DIR, f"{k:05d}.arrows")
+
+    def _done_chunks(self, job: dict) -> list[int]:
+        if job['status'] == COMPLETED:
+            return list(range(len(job['chunks'])))
+        return [k for k in range(len(job['chunks'])) if os.path.exists(self._part_path(job, k))]
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def create(self, fmt: str) -> tuple[str, str]:
+        """New job directory: returns (job id, path to write an upload to).
+
+        Call :meth:`submit` once the upload is written.
+        """
+        if fmt not in RESULT_FILES:
+            raise ValueError(f"Unknown table format {fmt!r}")
+        require_arrow()
+        job_id = uuid.uuid4().hex
+        os.makedirs(os.path.join(self.root, job_id, PARTS_DIR))
+        return job_id, os.path.join(self.root, job_id, INPUT_FILE)
+
+    def submit(self, job_id: str, fmt: str, model_version: str, source: str | None = None) -> dict:
+        """Queue a created job; ``source`` is its input file (default: the upload).
+
+        Reads only the table's metadata; ValueError if it cannot be scored.
+        """
+        input_path = os.path.abspath(source or os.path.join(self._dir(job_id), INPUT_FILE))
+        try:
+            schema, sizes = table_info(input_path, fmt)
+            check_columns(schema)
+        except Exception:
+            self.delete(job_id)
+            raise
+        stat = os.stat(input_path)
+        self._write({
+            'id': job_id,
+            'status': QUEUED,
+            'format': fmt,
+            'input_path': input_path,
+            'input_size': stat.st_size,
+            'input_mtime': stat.st_mtime,
+            'model_version': model_version,
+            'total_rows': sum(sizes),
+            'chunks': chunk_ranges(fmt, sizes, self.chunk_rows),
+            'created_at': time.time(),
+            'started_at': None,
+            'run_started_at': None,
+            'run_start_rows': 0,
+            'finished_at': None,
+            'error': None,
+        })
+        self._wake.set()
+        return self.get(job_id)
+
+    def submit_path(self, path: str, fmt: str, model_version: str) -> dict:
+        """Queue a job reading ``path``, which must lie under the job input directory."""
+        if not self.input_dir:
+            raise PermissionError("Jobs from server-side paths are disabled (JOB_INPUT_DIR is empty)")
+        root = os.path.realpath(self.input_dir)
+        real = os.path.realpath(os.path.join(root, path))
+        if os.path.commonpath([root, real]) != root:
+            raise PermissionError(f"{path!r} is outside the job input directory")
+        if not os.path.isfile(real):
+            raise FileNotFoundError(f"{path!r} not found in the job input directory")
+        job_id, _ = self.create(fmt)
+        return self.submit(job_id, fmt, model_version, source=real)
+
+    def delete(self, job_id: str):
+        """Cancel a job (its runner stops after the chunks in flight) and remove its files."""
+        job_dir = self._dir(job_id)
+        if not os.path.isdir(job_dir):
+            raise JobNotFound(f"Job {job_id!r} not found")
+        shutil.rmtree(job_dir, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def result_path(self, job_id: str) -> str:
+        """Final result file (JobNotFinished until the job has completed)."""
+        job = self._read(job_id)
+        if job['status'] != COMPLETED:
+            raise JobNotFinished(f"Job {job_id} is {job['status']}")
+        return os.path.join(self._dir(job_id), RESULT_FILES[job['format']])
+
+    def partial_result(self, job_id: str) -> tuple[str, int]:
+        """Assemble the leading run of scored chunks into a temporary file: (path, rows).
+
+        Rows are in input order, up to the first chunk not done yet. The
+        caller removes the file.
+        """
+        job = self._read(job_id)
+        if job['status'] == COMPLETED:
+            return self.result_path(job_id), job['total_rows']
+        parts, rows = [], 0
+        for k, (start, stop) in enumerate(job['chunks']):
+            path = self._part_path(job, k)
+            if not os.path.exists(path):
+                break
+            parts.append(path)
+            rows += stop - start
+        if not parts:
+            raise JobNotFinished(f"Job {job_id} has no scored chunks yet")
+        fd, tmp_path = tempfile.mkstemp(prefix=".partial-", dir=self._dir(job_id))
+        os.close(fd)
+        assemble(parts, tmp_path, job['format'])
+        return tmp_path, rows
+
+    # ------------------------------------------------------------------
+    # Runner
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the runner thread (resumes queued and interrupted jobs)."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="job-runner", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the runner; chunks in flight finish, the rest resume on the next start."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            ran = False
+            for job in self._active_jobs():
+                if self._stop.is_set():
+                    return
+                lock = self._try_lock(job['id'])
+                if lock is None:
+                    continue  # another process is running it
+                try:
+                    self._process(job['id'])
+                    ran = True
+                except Exception:
+                    # Keep the runner alive for the other jobs
+                    logger.exception(f"Job {job['id']}: runner error")
+                finally:
+                    os.close(lock)
+            if not ran:
+                self._wake.wait(POLL_S)
+
+    def _active_jobs(self) -> list[dict]:
+        """Queued and interrupted jobs, oldest first."""
+        jobs = []
+        for name in os.listdir(self.root):
+            try:
+                job = self._read(name)
+            except (JobNotFound, OSError, ValueError):
+                continue
+            if job['status'] in ACTIVE:
+                jobs.append(job)
+        return sorted(jobs, key=lambda job: job['created_at'])
+
+    def _try_lock(self, job_id: str) -> int | None:
+        try:
+            fd = os.open(os.path.join(self._dir(job_id), LOCK_FILE), os.O_CREAT | os.O_RDWR)
+        except OSError:
+            return None  # deleted meanwhile
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_job_worker, initargs=(self.nice,),
+            )
+        return self._executor
+
+    def _reset_pool(self):
+        """Drop a pool broken by a dead worker; the next _pool() starts a fresh one."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _process(self, job_id: str):
+        try:
+            job = self._read(job_id)
+        except JobNotFound:
+            return
+        if job['status'] not in ACTIVE:
+            return  # finished by another process before we took the lock
+        try:
+            self._check_input(job)
+            spec = worker_spec(get_model_manager().get(job['model_version']))
+            pending = [k for k in range(len(job['chunks']))
+                       if not os.path.exists(self._part_path(job, k))]
+            now = time.time()
+            job.update(
+                status=RUNNING, run_started_at=now, started_at=job['started_at'] or now,
+                run_start_rows=self.get(job_id)['rows_done'],
+            )
+            self._write(job)
+            logger.info(f"Job {job_id}: {len(pending)} of {len(job['chunks'])} chunks to score")
+
+            in_flight = set()
+            while pending or in_flight:
+                if self._stop.is_set() or not os.path.isdir(self._dir(job_id)):
+                    # Stopped: resume from the checkpoints on the next start; deleted: drop it
+                    wait(in_flight)
+                    return
+                while pending and len(in_flight) < self.workers:
+                    k = pending.pop(0)
+                    start, stop = job['chunks'][k]
+                    in_flight.add(self._pool().submit(
+                        _score_chunk, spec, job['input_path'], job['format'],
+                        start, stop, self._part_path(job, k),
+                    ))
+                done, in_flight = wait(in_flight, timeout=POLL_S, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+
+            result = os.path.join(self._dir(job_id), RESULT_FILES[job['format']])
+            if job['chunks']:
+                parts = [self._part_path(job, k) for k in range(len(job['chunks']))]
+                self._pool().submit(assemble, parts, result, job['format']).result()
+            else:
+                schema, _ = table_info(job['input_path'], job['format'])
+                write_table([], output_schema(schema), result, job['format'])
+            shutil.rmtree(os.path.join(self._dir(job_id), PARTS_DIR), ignore_errors=True)
+            job.update(status=COMPLETED, finished_at=time.time())
+            logger.info(f"Job {job_id} completed ({job['total_rows']} rows)")
+        except BrokenProcessPool as e:
+            self._reset_pool()
+            if not os.path.isdir(self._dir(job_id)):
+                return
+            crashes = job.get('worker_crashes', 0) + 1
+            if crashes < MAX_WORKER_CRASHES:
+                # Scored chunks are checkpoints: the next run resumes after them
+                logger.warning(f"Job {job_id}: a chunk worker died ({e}); requeued")
+                job.update(status=QUEUED, worker_crashes=crashes)
+            else:
+                logger.error(f"Job {job_id} failed: chunk workers died {crashes} times")
+                job.update(
+                    status=FAILED, finished_at=time.time(), worker_crashes=crashes,
+                    error=f"Chunk worker died {crashes} times: {e}",
+                )
+        except Exception as e:
+            if not os.path.isdir(self._dir(job_id)):
+                return
+            logger.error(f"Job {job_id} failed: {e}")
+            job.update(status=FAILED, finished_at=time.time(), error=str(e))
+        try:
+            self._write(job)
+        except FileNotFoundError:
+            pass  # deleted while it ran
+
+    def _check_input(self, job: dict):
+        stat = os.stat(job['input_path'])
+        if (stat.st_size, stat.st_mtime) != (job['input_size'], job['input_mtime']):
+            raise ValueError(f"Input {job['input_path']} changed since the job was submitted")
+
+
+_manager: JobManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Shared job manager, configured from settings."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                settings = get_settings()
+                _manager = JobManager(
+                    root=settings.jobs_dir,
+                    input_dir=settings.job_input_dir,
+                    workers=settings.job_workers,
+                    chunk_rows=settings.job_chunk_rows,
+                    nice=settings.job_nice,
+                )
+    return _manager
+
+
+def start_job_runner() -> JobManager | None:
+    """Start running queued and interrupted jobs, if jobs are enabled."""
+    if not get_settings().jobs_enabled:
+        return None
+    manager = get_job_manager()
+    manager.start()
+    return manager
+
+
+def stop_job_runner():
+    """Stop the shared job runner, if one was started."""
+    if _manager is not None:
+        _manager.stop()
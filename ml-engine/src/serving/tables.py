@@ -0,0 +1,317 @@
+"""
+Arrow IPC / Parquet table scoring for bulk repricing.
+
+A table upload is spooled to a temporary file, memory-mapped and read one
+record batch at a time. Each batch's columns become predictor inputs
+without per-row Python objects: numeric and timestamp buffers are viewed
+zero-copy as NumPy arrays, strings are dictionary-encoded by Arrow and
+passed as a LabelColumn. The output is the input table in the same format
+with ``predicted_price``, ``risk_level``, ``risk_score`` and ``confidence``
+columns added (replacing any input columns of those names).
+
+pyarrow is an optional dependency (``pip install guardquote-ml[arrow]``)
+and is only imported when a table is scored.
+"""
+
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+
+import numpy as np
+
+from ..models.trained_predictor import RISK_LEVELS, LabelColumn, TrainedPredictor, local_wall_clock
+
+ARROW_STREAM = 'arrow'
+PARQUET = 'parquet'
+
+# Content types accepted by the REST endpoint
+MEDIA_TYPES = {
+    'application/vnd.apache.arrow.stream': ARROW_STREAM,
+    'application/vnd.apache.parquet': PARQUET,
+    'application/x-parquet': PARQUET,
+}
+RESPONSE_MEDIA_TYPES = {
+    ARROW_STREAM: 'application/vnd.apache.arrow.stream',
+    PARQUET: 'application/vnd.apache.parquet',
+}
+
+# Input column aliases (quotes table export names -> predictor inputs)
+COLUMN_ALIASES = {
+    'hours_per_guard': 'hours',
+    'requires_vehicle': 'has_vehicle',
+}
+REQUIRED_COLUMNS = ['event_type', 'num_guards', 'hours', 'event_date']
+LABEL_COLUMNS = ['event_type', 'state', 'risk_zone']
+NUMERIC_COLUMNS = {'num_guards': 'int64', 'hours': 'float64', 'crowd_size': 'int64'}
+FLAG_COLUMNS = ['is_armed', 'has_vehicle']
+OUTPUT_COLUMNS = ['predicted_price', 'risk_level', 'risk_score', 'confidence']
+
+# Rows per batch when reading Parquet (Arrow streams keep the writer's batches)
+PARQUET_BATCH_ROWS = 64 * 1024
+# Bytes per piece when streaming the scored file back
+OUTPUT_BLOCK_BYTES = 1 << 20
+
+
+class ArrowUnavailable(ImportError):
+    """pyarrow is not installed."""
+
+
+def require_arrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ArrowUnavailable(
+            "Arrow/Parquet scoring needs pyarrow: pip install guardquote-ml[arrow]"
+        ) from e
+    return pyarrow
+
+
+def arrow_available() -> bool:
+    try:
+        require_arrow()
+    except ArrowUnavailable:
+        return False
+    return True
+
+
+# ============================================================================
+# Batch scoring
+# ============================================================================
+
+def check_columns(schema):
+    """ValueError unless ``schema`` has every required input column."""
+    names = {COLUMN_ALIASES.get(name, name) for name in schema.names}
+    missing = [name for name in REQUIRED_COLUMNS if name not in names]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+
+def table_columns(batch) -> dict:
+    """Predictor inputs for one record batch (ValueError if a column is missing or invalid)."""
+    pa = require_arrow()
+    pc = pa.compute
+    check_columns(batch.schema)
+    names = {COLUMN_ALIASES.get(name, name): name for name in batch.schema.names}
+
+    def column(name):
+        values = batch.column(names[name])
+        if values.null_count:
+            raise ValueError(f"Column {names[name]} has null values")
+        return values
+
+    columns = {}
+    for name in LABEL_COLUMNS:
+        if name in names:
+            values = column(name)
+            if not pa.types.is_dictionary(values.type):
+                values = pc.dictionary_encode(values)
+            columns[name] = LabelColumn(
+                codes=values.indices.to_numpy(zero_copy_only=False),
+                labels=values.dictionary.cast(pa.string()).to_pylist(),
+            )
+    for name, dtype in NUMERIC_COLUMNS.items():
+        if name in names:
+            values = column(name)
+            if not pa.types.is_integer(values.type) and not pa.types.is_floating(values.type):
+                values = values.cast(pa.from_numpy_dtype(np.dtype(dtype)))  # e.g. DECIMAL
+            columns[name] = values.to_numpy(zero_copy_only=False)
+    for name in FLAG_COLUMNS:
+        if name in names:
+            columns[name] = column(name).to_numpy(zero_copy_only=False).astype(bool, copy=False)
+    columns['event_date'] = _wall_clock(pa, column('event_date'))
+    return columns
+
+
+def _wall_clock(pa, values) -> np.ndarray:
+    """Event dates as naive datetime64 wall-clock values (as the single-quote path sees them)."""
+    if pa.types.is_timestamp(values.type):
+        if values.type.tz is not None:
+            values = pa.compute.local_timestamp(values)
+    elif pa.types.is_date(values.type):
+        values = values.cast(pa.timestamp('s'))
+    elif pa.types.is_integer(values.type):
+        # Epoch seconds, converted in local time like the gRPC paths
+        return local_wall_clock(values.to_numpy(zero_copy_only=False).astype(np.int64, copy=False))
+    else:
+        raise ValueError(
+            f"Column event_date must be a timestamp, date or epoch seconds, not {values.type}"
+        )
+    return values.to_numpy(zero_copy_only=False)
+
+
+def output_schema(schema):
+    """Input schema with the score columns replaced / appended."""
+    pa = require_arrow()
+    fields = [field for field in schema if field.name not in OUTPUT_COLUMNS]
+    return pa.schema(fields + [
+        pa.field('predicted_price', pa.float64(), nullable=False),
+        pa.field('risk_level', pa.dictionary(pa.int8(), pa.string()), nullable=False),
+        pa.field('risk_score', pa.float64(), nullable=False),
+        pa.field('confidence', pa.float64(), nullable=False),
+    ], metadata=schema.metadata)
+
+
+def score_batch(predictor: TrainedPredictor, batch, schema=None):
+    """``batch`` with score columns, scored with one vectorized predictor call."""
+    pa = require_arrow()
+    schema = schema or output_schema(batch.schema)
+    arrays = predictor.predict_quote_arrays(table_columns(batch))
+    levels = pa.DictionaryArray.from_arrays(
+        pa.array(arrays.risk_level.astype(np.int8)), pa.array(RISK_LEVELS, pa.string())
+    )
+    scores = {
+        'predicted_price': pa.array(arrays.predicted_price),
+        'risk_level': levels,
+        'risk_score': pa.array(arrays.risk_score),
+        'confidence': pa.array(arrays.confidence),
+    }
+    kept = [name for name in batch.schema.names if name not in OUTPUT_COLUMNS]
+    return pa.RecordBatch.from_arrays(
+        [batch.column(name) for name in kept] + [scores[name] for name in OUTPUT_COLUMNS],
+        schema=schema,
+    )
+
+
+def score_file(predictor: TrainedPredictor, input_path: str, output_path: str, fmt: str) -> int:
+    """Score the table in ``input_path`` into ``output_path`` (same format); returns rows scored."""
+    pa = require_arrow()
+    rows = 0
+    with pa.memory_map(input_path) as source:
+        if fmt == ARROW_STREAM:
+            reader = pa.ipc.open_stream(source)
+            schema = output_schema(reader.schema)
+            with pa.ipc.new_stream(output_path, schema) as writer:
+                for batch in reader:
+                    writer.write_batch(score_batch(predictor, batch, schema))
+                    rows += batch.num_rows
+        elif fmt == PARQUET:
+            parquet = pa.parquet.ParquetFile(source)
+            schema = output_schema(parquet.schema_arrow)
+            with pa.parquet.ParquetWriter(output_path, schema) as writer:
+                for batch in parquet.iter_batches(batch_size=PARQUET_BATCH_ROWS):
+                    writer.write_batch(score_batch(predictor, batch, schema))
+                    rows += batch.num_rows
+        else:
+            raise ValueError(f"Unknown table format {fmt!r}")
+    return rows
+
+
+# ============================================================================
+# Table files
+# ============================================================================
+
+def table_info(path: str, fmt: str) -> tuple:
+    """(schema, rows per Parquet row group / Arrow record batch) of a table file.
+
+    Reads only metadata and batch headers.
+    """
+    pa = require_arrow()
+    with pa.memory_map(path) as source:
+        if fmt == PARQUET:
+            parquet = pa.parquet.ParquetFile(source)
+            metadata = parquet.metadata
+            return parquet.schema_arrow, [
+                metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)
+            ]
+        if fmt == ARROW_STREAM:
+            reader = pa.ipc.open_stream(source)
+            return reader.schema, [batch.num_rows for batch in reader]
+    raise ValueError(f"Unknown table format {fmt!r}")
+
+
+def read_rows(path: str, fmt: str, start: int, stop: int) -> list:
+    """Record batches holding rows [start, stop) of a table file (memory-mapped)."""
+    pa = require_arrow()
+    if fmt not in (PARQUET, ARROW_STREAM):
+        raise ValueError(f"Unknown table format {fmt!r}")
+    batches = []
+    # Batches keep the mapped region alive after the file is closed
+    with pa.memory_map(path) as source:
+        if fmt == PARQUET:
+            parquet = pa.parquet.ParquetFile(source)
+            groups, offset, first = [], 0, None
+            for i in range(parquet.metadata.num_row_groups):
+                rows = parquet.metadata.row_group(i).num_rows
+                if offset < stop and offset + rows > start:
+                    groups.append(i)
+                    first = offset if first is None else first
+                offset += rows
+            if groups:
+                table = parquet.read_row_groups(groups).slice(start - first, stop - start)
+                batches = table.to_batches()
+        else:
+            offset = 0
+            for batch in pa.ipc.open_stream(source):
+                if offset >= stop:
+                    break
+                if offset + batch.num_rows > start:
+                    lo = max(start - offset, 0)
+                    batches.append(batch.slice(lo, min(stop - offset, batch.num_rows) - lo))
+                offset += batch.num_rows
+    return batches
+
+
+def write_table(batches, schema, path: str, fmt: str):
+    """Write record batches to ``path`` in ``fmt``."""
+    pa = require_arrow()
+    if fmt == PARQUET:
+        with pa.parquet.ParquetWriter(path, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+    elif fmt == ARROW_STREAM:
+        with pa.ipc.new_stream(path, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+    else:
+        raise ValueError(f"Unknown table format {fmt!r}")
+
+
+# ============================================================================
+# Upload spooling
+# ============================================================================
+
+class TableSpool:
+    """Temporary files for one table upload and its scored output.
+
+    ``write`` the upload, ``score`` it, then stream ``iter_output``;
+    ``close`` (or the context manager) removes the files.
+    """
+
+    def __init__(self, fmt: str):
+        if fmt not in RESPONSE_MEDIA_TYPES:
+            raise ValueError(f"Unknown table format {fmt!r}")
+        require_arrow()  # fail before the upload is spooled
+        self.format = fmt
+        self.dir = tempfile.mkdtemp(prefix="guardquote-table-")
+        self.input_path = os.path.join(self.dir, "input")
+        self.output_path = os.path.join(self.dir, "output")
+        self._input = open(self.input_path, 'wb')
+        self.rows = 0
+
+    def write(self, data: bytes):
+        self._input.write(data)
+
+    def score(self, predictor: TrainedPredictor) -> int:
+        """Score the spooled upload (blocking; run it on the inference executor)."""
+        self._input.close()
+        self.rows = score_file(predictor, self.input_path, self.output_path, self.format)
+        return self.rows
+
+    def iter_output(self, block_bytes: int = OUTPUT_BLOCK_BYTES) -> Iterator[bytes]:
+        with open(self.output_path, 'rb') as f:
+            while block := f.read(block_bytes):
+                yield block
+
+    def close(self):
+        self._input.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,22 @@
+"""
+Shared test fixtures.
+"""
+
+import pytest
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.models.trained_predictor import start_warm_up, wait_ready
+
+
+@pytest.fixture(scope="module")
+def client():
+    """REST client for a warmed-up app."""
+    start_warm_up()
+    assert wait_ready(timeout=60)
+    return TestClient(app)
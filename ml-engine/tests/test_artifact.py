@@ -0,0 +1,128 @@
+"""
+Memory-mappable model artifact tests.
+"""
+
+import json
+import mmap
+import os
+
+import numpy as np
+import pytest
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from src.models import trained_predictor
+from src.models.artifact import MANIFEST_NAME, export_artifact, load_artifact
+from src.models.trained_predictor import TrainedPredictor, sample_quotes
+
+
+@pytest.fixture(scope="module")
+def sklearn_predictor():
+    predictor = TrainedPredictor(compiled=False)
+    if not predictor.loaded:
+        pytest.skip("trained models not available")
+    return predictor
+
+
+@pytest.fixture(scope="module")
+def artifact_path(sklearn_predictor, tmp_path_factory):
+    path = tmp_path_factory.mktemp("models") / "guardquote_models.artifact"
+    export_artifact(sklearn_predictor.models, str(path))
+    return path
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    base = array
+    while getattr(base, 'base', None) is not None:
+        base = base.base
+    return isinstance(base, mmap.mmap)
+
+
+def test_load_is_memory_mapped(artifact_path):
+    models = load_artifact(str(artifact_path))
+    ensemble = models['price_model'].ensemble
+    for array in (ensemble.threshold, ensemble.value, ensemble.children, ensemble._feature):
+        assert _is_mapped(array)
+    assert not ensemble.threshold.flags.writeable
+
+
+def test_metadata_and_encoders(sklearn_predictor, artifact_path):
+    models = load_artifact(str(artifact_path))
+    source = sklearn_predictor.models
+    for key in ('version', 'trained_at', 'price_model_name', 'risk_features'):
+        assert models[key] == source[key]
+    assert models['price_metrics']['mape'] == pytest.approx(float(source['price_metrics']['mape']))
+    for name, encoder in source['encoders'].items():
+        np.testing.assert_array_equal(models['encoder_classes'][name], encoder.classes_)
+    np.testing.assert_array_equal(models['scalers']['price_scaler']['mean'], source['price_scaler'].mean_)
+
+
+def test_predictor_from_artifact_matches_sklearn(sklearn_predictor, artifact_path, monkeypatch):
+    monkeypatch.setattr(trained_predictor, 'ARTIFACT_PATH', str(artifact_path))
+    predictor = TrainedPredictor(model_format='artifact')
+    assert predictor.loaded and predictor.compiled
+    assert 'encoder_classes' in predictor.models
+
+    quotes = sample_quotes(n=100, seed=5)
+    assert predictor.predict_quote_batch(quotes) == sklearn_predictor.predict_quote_batch(quotes)
+    assert predictor.predict_quote(**quotes[0]) == sklearn_predictor.predict_quote(**quotes[0])
+
+
+def test_compiled_false_ignores_artifact(artifact_path, monkeypatch):
+    monkeypatch.setattr(trained_predictor, 'ARTIFACT_PATH', str(artifact_path))
+    predictor = TrainedPredictor(compiled=False, model_format='auto')
+    assert not predictor.compiled
+    assert not hasattr(predictor.models['price_model'], 'ensemble')
+
+
+def test_auto_skips_artifact_older_than_pickle(sklearn_predictor, artifact_path, monkeypatch):
+    monkeypatch.setattr(trained_predictor, 'ARTIFACT_PATH', str(artifact_path))
+    assert TrainedPredictor(model_format='auto').source_path == str(artifact_path)
+
+    # Retrained without re-exporting: the pickle is newer than the artifact
+    manifest = artifact_path / MANIFEST_NAME
+    stale = os.path.getmtime(sklearn_predictor.model_path) - 60
+    os.utime(manifest, (stale, stale))
+    predictor = TrainedPredictor(model_format='auto')
+    assert predictor.loaded and predictor.source_path != str(artifact_path)
+    # An explicit MODEL_FORMAT=artifact still maps it
+    assert TrainedPredictor(model_format='artifact').source_path == str(artifact_path)
+
+
+def test_unsupported_format_version(artifact_path, tmp_path):
+    manifest = json.loads((artifact_path / MANIFEST_NAME).read_text())
+    manifest['format_version'] += 1
+    broken = tmp_path / "broken.artifact"
+    broken.mkdir()
+    (broken / MANIFEST_NAME).write_text(json.dumps(manifest))
+    with pytest.raises(ValueError):
+        load_artifact(str(broken))
+
+
+def test_reexport_replaces_artifact(sklearn_predictor, tmp_path, monkeypatch):
+    path = tmp_path / "models" / "guardquote_models.artifact"
+    export_artifact(sklearn_predictor.models, str(path))
+    mapped = load_artifact(str(path))['price_model'].ensemble.threshold
+    expected = np.array(mapped)
+
+    # A failed swap leaves the old artifact in place
+    rename = os.rename
+
+    def failing_rename(src, dst):
+        if dst == str(path) and not src.endswith(".old"):
+            raise OSError("rename failed")
+        rename(src, dst)
+
+    monkeypatch.setattr(os, 'rename', failing_rename)
+    with pytest.raises(OSError):
+        export_artifact(sklearn_predictor.models, str(path))
+    monkeypatch.undo()
+    assert os.listdir(path.parent) == [path.name]
+
+    manifest = export_artifact(sklearn_predictor.models, str(path))
+    assert json.loads((path / MANIFEST_NAME).read_text())['exported_at'] == manifest['exported_at']
+    assert os.listdir(path.parent) == [path.name]
+    # Arrays mapped from the replaced artifact stay readable
+    np.testing.assert_array_equal(mapped, expected)
@@ -0,0 +1,107 @@
+"""
+Batch prediction parity tests for TrainedPredictor.
+"""
+
+import numpy as np
+import pytest
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from src.models.trained_predictor import (
+    FALLBACK_MODEL, TrainedPredictor, get_predictor, sample_quotes,
+)
+
+
+def to_columns(quotes: list[dict]) -> dict:
+    columns = {key: np.array([q[key] for q in quotes]) for key in quotes[0]}
+    columns['event_date'] = columns['event_date'].astype('datetime64[s]')
+    return columns
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    return get_predictor()
+
+
+@pytest.fixture(scope="module")
+def quotes():
+    return sample_quotes(n=200, seed=7)
+
+
+def test_price_batch_matches_single(predictor, quotes):
+    single = [predictor.predict_price(**q) for q in quotes]
+    assert predictor.predict_price_batch(quotes) == single
+
+
+def test_risk_batch_matches_single(predictor, quotes):
+    single = [
+        predictor.predict_risk(**{k: v for k, v in q.items() if k not in ('risk_zone', 'has_vehicle')})
+        for q in quotes
+    ]
+    assert predictor.predict_risk_batch(quotes) == single
+
+
+def test_columnar_input_matches_rows(predictor, quotes):
+    columns = to_columns(quotes)
+    np.testing.assert_array_equal(
+        predictor.encode_features(columns), predictor.encode_features(quotes)
+    )
+    assert predictor.predict_price_batch(columns) == predictor.predict_price_batch(quotes)
+    assert predictor.predict_risk_batch(columns) == predictor.predict_risk_batch(quotes)
+
+
+def test_structured_array_input(predictor, quotes):
+    columns = to_columns(quotes)
+    structured = np.empty(len(quotes), dtype=[
+        ('event_type', 'U16'), ('num_guards', 'i4'), ('hours', 'f8'),
+        ('crowd_size', 'i4'), ('event_date', 'datetime64[s]'), ('is_armed', '?'),
+    ])
+    for name in structured.dtype.names:
+        structured[name] = columns[name]
+
+    # Omitted fields fall back to the batch defaults
+    rows = [{k: q[k] for k in structured.dtype.names} for q in quotes]
+    assert predictor.predict_price_batch(structured) == predictor.predict_price_batch(rows)
+
+
+def test_empty_batch(predictor):
+    assert predictor.predict_price_batch([]) == []
+    assert predictor.predict_risk_batch([]) == []
+
+
+def test_predict_quote_matches_price_and_risk(predictor, quotes):
+    for q in quotes[:50]:
+        price = predictor.predict_price(**q)
+        risk = predictor.predict_risk(
+            **{k: v for k, v in q.items() if k not in ('risk_zone', 'has_vehicle')}
+        )
+        prediction = predictor.predict_quote(**q)
+        assert prediction.predicted_price == price['predicted_price']
+        assert prediction.confidence == price['confidence']
+        assert prediction.model_used == price['model_used']
+        assert prediction.risk_level == risk['risk_level']
+        assert prediction.risk_score == risk['risk_score']
+        assert prediction.risk_confidence == risk['confidence']
+        assert prediction.factors == risk['factors']
+
+
+def test_predict_quote_batch_matches_single(predictor, quotes):
+    single = [predictor.predict_quote(**q) for q in quotes]
+    assert predictor.predict_quote_batch(quotes) == single
+    assert predictor.predict_quote_batch(to_columns(quotes)) == single
+
+
+def test_fallback_labels_match_across_paths(predictor, quotes, tmp_path):
+    assert predictor.predict_price(**quotes[0])['model_version'] == predictor.version
+
+    fallback = TrainedPredictor(model_dir=str(tmp_path))
+    assert not fallback.loaded
+    price = fallback.predict_price(**quotes[0])
+    assert price['model_used'] == FALLBACK_MODEL
+    assert price['model_version'] == fallback.predict_risk_batch(quotes[:1])[0]['model_version']
+    single = [fallback.predict_price(**q) for q in quotes[:5]]
+    assert fallback.predict_price_batch(quotes[:5]) == single
+    assert fallback.predict_quote_batch(quotes[:5])[0].model_used == FALLBACK_MODEL
+    assert fallback.predict_quote_arrays(quotes[:5]).model_used == FALLBACK_MODEL
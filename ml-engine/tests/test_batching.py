@@ -0,0 +1,244 @@
+"""
+Micro-batching scheduler tests.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from src.models.schemas import EventType
+from src.serving.batching import MicroBatcher, aiter_chunks, iter_chunks, quote_key, score_quotes
+from src.serving.executor import InferenceExecutor, InferenceQueueFull
+from src.models.trained_predictor import get_predictor
+
+
+def test_concurrent_submissions_are_batched():
+    calls = []
+
+    def double(items):
+        calls.append(len(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(double, max_batch_size=16, max_wait_ms=50)
+    barrier = threading.Barrier(16)
+    results = {}
+
+    def worker(i):
+        barrier.wait()
+        results[i] = batcher(i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.close()
+
+    assert results == {i: i * 2 for i in range(16)}
+    assert sum(calls) == 16
+    assert len(calls) < 16
+
+    stats = batcher.stats.snapshot()
+    assert stats['items'] == 16
+    assert stats['batches'] == len(calls)
+    assert stats['max_batch_size'] == max(calls)
+
+
+def test_max_batch_size_is_respected():
+    sizes = []
+    batcher = MicroBatcher(lambda items: sizes.append(len(items)) or items,
+                           max_batch_size=4, max_wait_ms=20)
+    futures = [batcher.submit(i) for i in range(10)]
+    assert [f.result() for f in futures] == list(range(10))
+    batcher.close()
+    assert max(sizes) <= 4
+
+
+def test_batch_errors_propagate_to_every_caller():
+    def fail(items):
+        raise ValueError("boom")
+
+    batcher = MicroBatcher(fail, max_wait_ms=5)
+    futures = [batcher.submit(i) for i in range(3)]
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result()
+    batcher.close()
+    assert batcher.stats.snapshot()['errors'] >= 1
+
+
+def test_wrong_result_count_fails_the_batch_not_the_dispatcher():
+    batcher = MicroBatcher(lambda items: items[1:] or [-1, -1], max_batch_size=1, max_wait_ms=5)
+    with pytest.raises(RuntimeError):
+        batcher.submit(1).result(timeout=5)
+    # The dispatcher survived and still serves later submissions
+    with pytest.raises(RuntimeError):
+        batcher.submit(2).result(timeout=5)
+    batcher.batch_fn = lambda items: [x * 2 for x in items]
+    assert batcher.submit(3).result(timeout=5) == 6
+    batcher.close()
+
+
+def test_disabled_batcher_runs_inline():
+    batcher = MicroBatcher(lambda items: [threading.current_thread().name for _ in items],
+                           enabled=False)
+    assert batcher(1) == threading.current_thread().name
+    assert batcher.stats.snapshot()['batches'] == 1
+
+
+def test_identical_submissions_share_one_computation():
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(double, max_batch_size=16, max_wait_ms=50, coalesce_key=lambda i: i)
+    futures = [batcher.submit(i % 2) for i in range(10)]
+    assert [f.result() for f in futures] == [i % 2 * 2 for i in range(10)]
+    batcher.close()
+    assert sorted(item for batch in calls for item in batch) == [0, 1]
+    assert batcher.stats.snapshot()['coalesced'] == 8
+
+    # One caller cancelling does not affect the others
+    batcher = MicroBatcher(double, max_wait_ms=50, coalesce_key=lambda i: i)
+    first, second = batcher.submit(3), batcher.submit(3)
+    assert first.cancel()
+    assert second.result() == 6
+    # Finished computations are not reused
+    assert batcher(3) == 6
+    batcher.close()
+    assert batcher.stats.snapshot()['items'] == 2
+
+
+def test_inline_batcher_coalesces_across_threads():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow(items):
+        calls.append(len(items))
+        started.set()
+        release.wait(5)
+        if items == ["bad"]:
+            raise ValueError("boom")
+        return items
+
+    batcher = MicroBatcher(slow, enabled=False, coalesce_key=lambda item: item)
+    for item in ("ok", "bad"):
+        started.clear()
+        results = []
+
+        def call():
+            try:
+                results.append(batcher(item))
+            except ValueError as e:
+                results.append(str(e))
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        threads[0].start()
+        assert started.wait(5)
+        for t in threads[1:]:
+            t.start()
+        while batcher.stats.snapshot()['coalesced'] < (3 if item == "ok" else 6):
+            time.sleep(0.001)
+        release.set()
+        for t in threads:
+            t.join()
+        release.clear()
+        assert results == ([item] * 4 if item == "ok" else ["boom"] * 4)
+    assert calls == [1, 1]
+
+
+async def test_async_joiners_skip_admission():
+    started, release = threading.Event(), threading.Event()
+
+    def slow(items):
+        started.set()
+        release.wait(5)
+        return items
+
+    batcher = MicroBatcher(slow, enabled=False, coalesce_key=lambda item: item)
+    executor = InferenceExecutor(workers=1, max_queue=0)
+    try:
+        first = asyncio.ensure_future(executor.submit(batcher, "quote"))
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        # At capacity, but identical calls wait on the running one
+        joined = [asyncio.ensure_future(executor.submit(batcher, "quote")) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert batcher.stats.snapshot()['coalesced'] == 3
+        with pytest.raises(InferenceQueueFull):
+            await executor.submit(batcher, "other")
+        release.set()
+        assert await asyncio.gather(first, *joined) == ["quote"] * 4
+        assert executor.stats()['completed'] == 1
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_quote_key_normalizes_enums():
+    quote = {'event_type': EventType.CONCERT, 'num_guards': 4, 'event_date': datetime(2026, 6, 6)}
+    assert quote_key(quote) == quote_key(dict(reversed(quote.items()), event_type="concert"))
+    assert quote_key(dict(quote, num_guards=5)) != quote_key(quote)
+    assert quote_key({'factors': ["unhashable"]}) is None
+
+
+def test_quote_batch_matches_single_path():
+    quote = {
+        'event_type': 'concert', 'state': 'CA', 'zip_code': '90210', 'risk_zone': 'medium',
+        'num_guards': 4, 'hours': 8.0, 'crowd_size': 1500,
+        'event_date': datetime(2026, 6, 6, 23, 0), 'is_armed': True, 'has_vehicle': False,
+    }
+    assert score_quotes([quote]) == [get_predictor().predict_quote(**quote)]
+
+
+def test_iter_chunks_preserves_order_and_size():
+    chunks = list(iter_chunks(iter(range(1000)), max_size=64, flush_ms=50))
+    assert [item for chunk in chunks for item in chunk] == list(range(1000))
+    assert max(len(chunk) for chunk in chunks) <= 64
+
+
+def test_iter_chunks_flushes_slow_streams():
+    def slow():
+        for i in range(3):
+            time.sleep(0.05)
+            yield i
+
+    chunks = list(iter_chunks(slow(), max_size=100, flush_ms=5))
+    assert chunks == [[0], [1], [2]]
+
+
+def test_iter_chunks_reraises_source_errors():
+    def broken():
+        yield 1
+        raise RuntimeError("stream reset")
+
+    seen = []
+    with pytest.raises(RuntimeError):
+        for chunk in iter_chunks(broken(), max_size=10, flush_ms=20):
+            seen.extend(chunk)
+    assert seen == [1]
+
+
+async def test_aiter_chunks_matches_iter_chunks():
+    async def slow():
+        for i in range(3):
+            await asyncio.sleep(0.05)
+            yield i
+
+    async def fast():
+        for i in range(1000):
+            yield i
+
+    assert [chunk async for chunk in aiter_chunks(slow(), max_size=100, flush_ms=5)] == [[0], [1], [2]]
+    chunks = [chunk async for chunk in aiter_chunks(fast(), max_size=64, flush_ms=50)]
+    assert [item for chunk in chunks for item in chunk] == list(range(1000))
+    assert max(len(chunk) for chunk in chunks) <= 64
@@ -0,0 +1,111 @@
+"""
+Bulk REST scoring tests (POST /api/v1/quotes/batch)
+"""
+
+import json
+
+import pytest
+
+from src.api.bulk import MAX_ROW_BYTES, InvalidRow, iter_rows
+from src.config import get_settings
+
+
+def quote(i: int) -> dict:
+    return {
+        'event_type': ['concert', 'retail', 'sports', 'construction'][i % 4],
+        'location_zip': "90210",
+        'num_guards': 1 + i % 12,
+        'hours': 4.0 + i % 8,
+        'date': f"2026-07-{1 + i % 7:02d}T{(i * 5) % 24:02d}:30:00",
+        'is_armed': i % 3 == 0,
+        'requires_vehicle': i % 4 == 0,
+        'crowd_size': 100 * i,
+    }
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(get_settings(), 'stream_chunk_size', 4)
+
+
+def result_lines(response) -> list[dict]:
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_json_array_matches_single_quotes(client, small_chunks):
+    quotes = [quote(i) for i in range(10)]
+    results = result_lines(client.post("/api/v1/quotes/batch", json=quotes))
+
+    assert [r['index'] for r in results] == list(range(10))
+    for body, result in zip(quotes, results):
+        single = client.post("/api/v1/quote", json=body).json()
+        assert result['final_price'] == single['final_price']
+        assert result['risk_level'] == single['risk_level']
+        assert result['confidence_score'] == single['confidence_score']
+        assert result['model_version'] == single['model_version']
+
+
+def test_ndjson_errors_are_reported_inline(client, small_chunks):
+    lines = [json.dumps(quote(0)), "{not json", json.dumps({**quote(2), 'num_guards': 0}),
+             "", json.dumps(quote(3))]
+    results = result_lines(client.post(
+        "/api/v1/quotes/batch", content="\n".join(lines) + "\n",
+        headers={'content-type': "application/x-ndjson"},
+    ))
+
+    assert [r['index'] for r in results] == [0, 1, 2, 3]
+    assert results[0]['final_price'] > 0 and results[3]['final_price'] > 0
+    assert results[1]['errors'][0]['type'] == "json_invalid"
+    assert results[2]['errors'][0]['loc'] == ['num_guards']
+
+
+def test_streamed_upload(client, small_chunks):
+    """A chunked (generator) upload is scored as it arrives."""
+    def body():
+        for i in range(25):
+            yield (json.dumps(quote(i)) + "\n").encode()
+
+    results = result_lines(client.post("/api/v1/quotes/batch", content=body()))
+    assert [r['index'] for r in results] == list(range(25))
+    assert all('final_price' in r for r in results)
+
+
+def test_unknown_version_is_404(client):
+    response = client.post(
+        "/api/v1/quotes/batch", json=[quote(0)], headers={'x-model-version': "0.0.0-missing"}
+    )
+    assert response.status_code == 404
+
+
+async def test_iter_rows_handles_split_chunks():
+    """Rows split at arbitrary byte boundaries parse the same in both formats."""
+    rows = [quote(i) for i in range(5)] + [12, "é"]
+
+    async def split(data: bytes, size: int):
+        for start in range(0, len(data), size):
+            yield data[start:start + size]
+
+    array = json.dumps(rows, ensure_ascii=False).encode()
+    ndjson = "\n".join(json.dumps(row, ensure_ascii=False) for row in rows).encode()
+    for data in (array, ndjson):
+        for size in (1, 7, len(data)):
+            assert [row async for row in iter_rows(split(data, size))] == rows
+
+
+async def test_iter_rows_malformed_input():
+    async def body(*chunks: bytes):
+        for chunk in chunks:
+            yield chunk
+
+    rows = [row async for row in iter_rows(body(b'[{"a": 1}, {"b": ', b'oops}]'))]
+    assert rows[0] == {'a': 1}
+    assert isinstance(rows[1], InvalidRow)
+
+    long_line = b'{"x": "' + b'y' * MAX_ROW_BYTES + b'"}\n'
+    rows = [row async for row in iter_rows(body(b'{"a": 1}\n', long_line[:100], long_line[100:], b'{"b": 2}\n'))]
+    assert rows[0] == {'a': 1}
+    assert rows[1].errors[0]['type'] == "row_too_long"
+    assert rows[2] == {'b': 2}
+    assert [row async for row in iter_rows(body(b'  \n'))] == []
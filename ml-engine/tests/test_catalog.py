@@ -0,0 +1,73 @@
+"""
+Precomputed catalog response tests (event types, model info)
+"""
+
+import pytest
+
+from src.grpc_servicer import ModelServiceImpl
+from src.models import trained_predictor
+from src.models.pricing_engine import PricingEngine
+from src.models.schemas import EventType
+from src.models.trained_predictor import TrainedPredictor
+
+
+@pytest.fixture
+def rates(monkeypatch):
+    """Rate tables that the test may change."""
+    monkeypatch.setattr(PricingEngine, 'BASE_RATES', dict(PricingEngine.BASE_RATES))
+    return PricingEngine.BASE_RATES
+
+
+def test_event_types_etag(client, rates):
+    response = client.get("/api/v1/event-types")
+    assert response.status_code == 200
+    assert response.json()['concert'] == {'name': "Concert", 'base_rate': 45.0, 'risk_weight': 0.7}
+    etag = response.headers['etag']
+
+    for if_none_match in (etag, f'"other", W/{etag}', "*"):
+        cached = client.get("/api/v1/event-types", headers={'if-none-match': if_none_match})
+        assert cached.status_code == 304
+        assert cached.content == b''
+        assert cached.headers['etag'] == etag
+    other = client.get("/api/v1/event-types", headers={'if-none-match': '"other"'})
+    assert other.status_code == 200
+
+    # A rate change is a new version of the catalog
+    rates[EventType.CONCERT] = 47.5
+    changed = client.get("/api/v1/event-types", headers={'if-none-match': etag})
+    assert changed.status_code == 200
+    assert changed.json()['concert']['base_rate'] == 47.5
+    assert changed.headers['etag'] != etag
+
+
+def test_model_info_follows_reload(client, monkeypatch):
+    response = client.get("/api/v1/model-info")
+    assert response.json()['status'] == "loaded"
+    etag = response.headers['etag']
+    assert client.get("/api/v1/model-info", headers={'if-none-match': etag}).status_code == 304
+
+    fallback = TrainedPredictor(model_dir="/nonexistent", version="0.0.0-test")
+    monkeypatch.setattr(trained_predictor, '_predictor', fallback)
+    response = client.get("/api/v1/model-info", headers={'if-none-match': etag})
+    assert response.status_code == 200
+    assert response.json() == {
+        'status': "not_loaded",
+        'message': "Models not loaded - using rule-based fallback",
+        'model_version': fallback.version,
+    }
+
+
+def test_grpc_messages_are_prebuilt(client, rates):
+    servicer = ModelServiceImpl()
+    first = servicer.GetEventTypes(None, None)
+    assert servicer.GetEventTypes(None, None) is first
+    assert len(first.event_types) == len(EventType)
+
+    rates[EventType.RETAIL] = 29.0
+    rebuilt = servicer.GetEventTypes(None, None)
+    assert rebuilt is not first
+    assert 29.0 in [info.base_rate for info in rebuilt.event_types]
+
+    info = servicer.GetModelInfo(None, None)
+    assert info.status == "loaded"
+    assert servicer.GetModelInfo(None, None) is info
@@ -0,0 +1,109 @@
+"""
+Parity tests: compiled tree evaluator vs sklearn.
+"""
+
+import numpy as np
+import pytest
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from src.models.compiled_trees import PRICE_MAX_ROWS, compile_models, save_compiled, load_compiled
+from src.models.trained_predictor import TrainedPredictor, RISK_FEATURE_INDEX, sample_quotes
+
+
+@pytest.fixture(scope="module")
+def sklearn_predictor():
+    predictor = TrainedPredictor(compiled=False)
+    if not predictor.loaded:
+        pytest.skip("trained models not available")
+    return predictor
+
+
+@pytest.fixture(scope="module")
+def compiled(sklearn_predictor):
+    return compile_models(sklearn_predictor.models, fallback=False)
+
+
+@pytest.fixture(scope="module")
+def features(sklearn_predictor):
+    encoded = sklearn_predictor.encode_features(sample_quotes(n=1500, seed=11))
+    # Off-distribution rows exercise thresholds the training data never hit
+    rng = np.random.default_rng(0)
+    noise = rng.uniform(-5, 5000, size=(200, encoded.shape[1]))
+    return np.vstack([encoded, noise])
+
+
+def test_price_parity(sklearn_predictor, compiled, features):
+    expected = sklearn_predictor.models['price_model'].predict(features)
+    np.testing.assert_array_equal(compiled['price_model'].predict(features), expected)
+
+
+def test_price_single_row_parity(sklearn_predictor, compiled, features):
+    expected = sklearn_predictor.models['price_model'].predict(features[:100])
+    single = [compiled['price_model'].predict(features[i:i + 1])[0] for i in range(100)]
+    np.testing.assert_array_equal(single, expected)
+
+
+def test_risk_parity(sklearn_predictor, compiled, features):
+    risk_features = features[:, RISK_FEATURE_INDEX]
+    model = sklearn_predictor.models['risk_model']
+    np.testing.assert_array_equal(
+        compiled['risk_model'].predict_proba(risk_features), model.predict_proba(risk_features)
+    )
+    np.testing.assert_array_equal(
+        compiled['risk_model'].predict(risk_features), model.predict(risk_features)
+    )
+
+
+def test_risk_single_row_parity(sklearn_predictor, compiled, features):
+    risk_features = features[:100, RISK_FEATURE_INDEX]
+    expected = sklearn_predictor.models['risk_model'].predict_proba(risk_features)
+    single = np.vstack([
+        compiled['risk_model'].predict_proba(risk_features[i:i + 1]) for i in range(100)
+    ])
+    np.testing.assert_array_equal(single, expected)
+
+
+def test_save_load_roundtrip(tmp_path, compiled, features):
+    path = tmp_path / "compiled.npz"
+    save_compiled(str(path), compiled)
+    loaded = load_compiled(str(path))
+    np.testing.assert_array_equal(
+        loaded['price_model'].predict(features), compiled['price_model'].predict(features)
+    )
+    risk_features = features[:, RISK_FEATURE_INDEX]
+    np.testing.assert_array_equal(
+        loaded['risk_model'].predict_proba(risk_features),
+        compiled['risk_model'].predict_proba(risk_features),
+    )
+
+
+def test_compiled_predictor_matches_sklearn(sklearn_predictor):
+    quotes = sample_quotes(n=100, seed=3)
+    compiled_predictor = TrainedPredictor(compiled=True)
+    assert compiled_predictor.compiled
+    assert compiled_predictor.predict_price_batch(quotes) == sklearn_predictor.predict_price_batch(quotes)
+    assert compiled_predictor.predict_risk_batch(quotes) == sklearn_predictor.predict_risk_batch(quotes)
+
+
+def test_large_batches_use_sklearn(sklearn_predictor, features, monkeypatch):
+    routed = compile_models(sklearn_predictor.models)
+    price, risk = routed['price_model'], routed['risk_model']
+    risk_features = features[:, RISK_FEATURE_INDEX]
+    calls = []
+    monkeypatch.setattr(price.ensemble, 'raw_predict', lambda X: calls.append(len(X)) or np.zeros((len(X), 1)))
+    monkeypatch.setattr(risk.ensemble, 'raw_predict', None)  # must not be reached
+    monkeypatch.setattr(risk, 'max_rows', 100)
+
+    price.predict(features[:PRICE_MAX_ROWS])
+    assert calls == [PRICE_MAX_ROWS]
+    np.testing.assert_array_equal(
+        price.predict(features), sklearn_predictor.models['price_model'].predict(features)
+    )
+    assert calls == [PRICE_MAX_ROWS]
+    np.testing.assert_array_equal(
+        risk.predict_proba(risk_features),
+        sklearn_predictor.models['risk_model'].predict_proba(risk_features),
+    )
@@ -20,6 +20,9 @@ from src.grpc_generated import (
     RiskResponse,
     HealthRequest,
     HealthResponse,
+    ModelInfoRequest,
+    ReloadModelRequest,
+    ColumnarQuoteRequest,
     EventType,
     RiskLevel,
     QuoteServiceStub,
@@ -27,6 +30,8 @@ from src.grpc_generated import (
     ModelServiceStub,
 )
 from src.grpc_servicer import create_grpc_server
+from src.models import trained_predictor
+from src.models.trained_predictor import start_warm_up, wait_ready
 
 
 class TestGrpcServer:
@@ -60,9 +65,20 @@ class TestGrpcServer:
 
     def test_health_check(self, model_stub):
         """Test health check endpoint."""
+        start_warm_up()
+        assert wait_ready(timeout=60)
         response = model_stub.HealthCheck(HealthRequest())
         assert response.status == "healthy"
         assert response.version is not None
+        assert response.model_loaded
+
+    def test_health_check_before_warm_up(self, model_stub, monkeypatch):
+        """HealthCheck reports "starting" until the warm-up has finished."""
+        import threading
+        monkeypatch.setattr(trained_predictor, '_ready', threading.Event())
+        response = model_stub.HealthCheck(HealthRequest())
+        assert response.status == "starting"
+        assert not response.model_loaded
 
     def test_generate_quote(self, quote_stub):
         """Test quote generation."""
@@ -89,6 +105,7 @@ class TestGrpcServer:
         assert response.confidence_score >= 0
         assert response.request_id == "test-001"
         assert response.processing_time_ms >= 0
+        assert response.model_version
 
     def test_assess_risk(self, risk_stub):
         """Test risk assessment."""
@@ -115,6 +132,146 @@ class TestGrpcServer:
         assert len(response.recommendations) > 0
         assert response.request_id == "test-002"
 
+    def test_generate_quotes_batch_matches_unary(self, quote_stub):
+        """Streamed quotes come back in order and match unary results."""
+        from google.protobuf.timestamp_pb2 import Timestamp
+
+        requests = []
+        for i in range(20):
+            ts = Timestamp()
+            ts.FromDatetime(datetime(2026, 7, 1 + i % 7, (i * 5) % 24))
+            requests.append(QuoteRequest(
+                event_type=EventType.EVENT_TYPE_CONCERT if i % 2 else EventType.EVENT_TYPE_RETAIL,
+                location_zip="90210",
+                num_guards=1 + i,
+                hours=4.0 + i % 8,
+                event_date=ts,
+                is_armed=i % 3 == 0,
+                crowd_size=100 * i,
+                request_id=f"batch-{i}",
+            ))
+
+        streamed = list(quote_stub.GenerateQuotesBatch(iter(requests)))
+
+        assert [r.request_id for r in streamed] == [r.request_id for r in requests]
+        for request, response in zip(requests, streamed):
+            unary = quote_stub.GenerateQuote(request)
+            assert response.final_price == unary.final_price
+            assert response.risk_level == unary.risk_level
+            assert list(response.breakdown.risk_factors) == list(unary.breakdown.risk_factors)
+
+    def test_assess_risk_batch(self, risk_stub):
+        """Streamed risk assessments come back in order."""
+        from google.protobuf.timestamp_pb2 import Timestamp
+
+        ts = Timestamp()
+        ts.FromDatetime(datetime.now())
+        requests = [
+            RiskRequest(
+                event_type=EventType.EVENT_TYPE_SPORTS,
+                location_zip="90210",
+                num_guards=2,
+                hours=6.0,
+                event_date=ts,
+                crowd_size=250 * i,
+                request_id=f"risk-{i}",
+            )
+            for i in range(10)
+        ]
+
+        streamed = list(risk_stub.AssessRiskBatch(iter(requests)))
+
+        assert [r.request_id for r in streamed] == [r.request_id for r in requests]
+        for request, response in zip(requests, streamed):
+            assert response.risk_score == risk_stub.AssessRisk(request).risk_score
+
+    def test_score_quotes_columnar_matches_unary(self, quote_stub):
+        """Columnar scoring returns the same prices and risk levels as unary quotes."""
+        from google.protobuf.timestamp_pb2 import Timestamp
+
+        rows = [
+            dict(
+                event_type=[EventType.EVENT_TYPE_CONCERT, EventType.EVENT_TYPE_RETAIL,
+                            EventType.EVENT_TYPE_CONSTRUCTION][i % 3],
+                num_guards=1 + i,
+                hours=4.0 + i % 8,
+                event_time=int(datetime(2026, 7, 1 + i % 7, (i * 5) % 24).timestamp()),
+                is_armed=i % 3 == 0,
+                requires_vehicle=i % 4 == 0,
+                crowd_size=100 * i,
+            )
+            for i in range(30)
+        ]
+        request = ColumnarQuoteRequest(
+            request_id="columnar-1", compress_response=True,
+            **{column: [row[column] for row in rows] for column in rows[0]},
+        )
+
+        response = quote_stub.ScoreQuotesColumnar(request)
+
+        assert response.request_id == "columnar-1"
+        assert len(response.final_price) == len(rows)
+        for i, row in enumerate(rows):
+            ts = Timestamp()
+            ts.FromSeconds(row['event_time'])
+            unary = quote_stub.GenerateQuote(QuoteRequest(
+                event_type=row['event_type'], location_zip="90210",
+                num_guards=row['num_guards'], hours=row['hours'], event_date=ts,
+                is_armed=row['is_armed'], requires_vehicle=row['requires_vehicle'],
+                crowd_size=row['crowd_size'],
+            ))
+            assert response.final_price[i] == unary.final_price
+            assert response.risk_level[i] == unary.risk_level
+            assert response.confidence[i] == unary.confidence_score
+        assert response.model_version == unary.model_version
+
+    def test_score_quotes_columnar_length_mismatch(self, quote_stub):
+        """Columns of different lengths are rejected with INVALID_ARGUMENT."""
+        request = ColumnarQuoteRequest(
+            event_type=[EventType.EVENT_TYPE_SPORTS] * 2, num_guards=[1, 2], hours=[4.0],
+            event_time=[0, 0], is_armed=[False] * 2, requires_vehicle=[False] * 2,
+            crowd_size=[0, 0],
+        )
+        with pytest.raises(grpc.RpcError) as error:
+            quote_stub.ScoreQuotesColumnar(request)
+        assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+        assert "hours" in error.value.details()
+
+    def test_model_info_reports_version(self, model_stub, quote_stub):
+        """GetModelInfo reports the version that serves quotes."""
+        from google.protobuf.timestamp_pb2 import Timestamp
+
+        ts = Timestamp()
+        ts.FromDatetime(datetime.now())
+        info = model_stub.GetModelInfo(ModelInfoRequest())
+        quote = quote_stub.GenerateQuote(QuoteRequest(
+            event_type=EventType.EVENT_TYPE_SPORTS, location_zip="90210",
+            num_guards=3, hours=5.0, event_date=ts,
+        ))
+        assert info.model_version
+        assert quote.model_version == info.model_version
+
+    def test_reload_unknown_version(self, model_stub):
+        """Reloading a version that does not exist fails with NOT_FOUND."""
+        with pytest.raises(grpc.RpcError) as error:
+            model_stub.ReloadModel(ReloadModelRequest(version="0.0.0-missing"))
+        assert error.value.code() == grpc.StatusCode.NOT_FOUND
+
+
+    def test_unknown_model_version_metadata(self, quote_stub):
+        """Requesting an unknown version via metadata fails with NOT_FOUND."""
+        from google.protobuf.timestamp_pb2 import Timestamp
+
+        ts = Timestamp()
+        ts.FromDatetime(datetime.now())
+        request = QuoteRequest(
+            event_type=EventType.EVENT_TYPE_CORPORATE, location_zip="90210",
+            num_guards=1, hours=4.0, event_date=ts,
+        )
+        with pytest.raises(grpc.RpcError) as error:
+            quote_stub.GenerateQuote(request, metadata=(('x-model-version', '0.0.0-missing'),))
+        assert error.value.code() == grpc.StatusCode.NOT_FOUND
+
 
 def quick_test():
     """Quick standalone test without pytest."""
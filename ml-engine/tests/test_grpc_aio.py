@@ -0,0 +1,177 @@
+"""
+grpc.aio server tests (GRPC_MODE=aio)
+"""
+
+import asyncio
+from datetime import datetime
+
+import grpc
+import pytest
+from google.protobuf.timestamp_pb2 import Timestamp
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from src.config import get_settings
+from src.grpc_aio_servicer import create_aio_grpc_server
+from src.grpc_servicer import quote_inputs
+from src.grpc_generated import (
+    QuoteRequest,
+    ColumnarQuoteRequest,
+    TableChunk,
+    TableFormat,
+    HealthRequest,
+    EventType,
+    QuoteServiceStub,
+    ModelServiceStub,
+)
+from src.models.trained_predictor import get_predictor, start_warm_up, wait_ready
+
+PORT = 50053
+
+
+def quote_request(i: int) -> QuoteRequest:
+    ts = Timestamp()
+    ts.FromDatetime(datetime(2026, 7, 1 + i % 7, (i * 5) % 24))
+    return QuoteRequest(
+        event_type=EventType.EVENT_TYPE_CONCERT if i % 2 else EventType.EVENT_TYPE_RETAIL,
+        location_zip="90210",
+        num_guards=1 + i,
+        hours=4.0 + i % 8,
+        event_date=ts,
+        is_armed=i % 3 == 0,
+        crowd_size=100 * i,
+        request_id=f"aio-{i}",
+    )
+
+
+@pytest.fixture
+async def channel():
+    start_warm_up()
+    assert wait_ready(timeout=60)
+    server = create_aio_grpc_server(port=PORT)
+    await server.start()
+    async with grpc.aio.insecure_channel(f'localhost:{PORT}') as channel:
+        yield channel
+    await server.stop(grace=0)
+
+
+async def test_health_and_unary_quote(channel):
+    health = await ModelServiceStub(channel).HealthCheck(HealthRequest())
+    assert health.status == "healthy"
+
+    request = quote_request(3)
+    response = await QuoteServiceStub(channel).GenerateQuote(request)
+    expected = get_predictor().predict_quote(**quote_inputs(request))
+    assert response.request_id == "aio-3"
+    assert response.final_price == pytest.approx(expected.predicted_price, rel=1e-6)
+    assert response.model_version == expected.model_version
+
+
+async def test_stream_matches_unary(channel):
+    stub = QuoteServiceStub(channel)
+    requests = [quote_request(i) for i in range(20)]
+
+    streamed = [response async for response in stub.GenerateQuotesBatch(iter(requests))]
+
+    assert [r.request_id for r in streamed] == [r.request_id for r in requests]
+    for request, response in zip(requests, streamed):
+        assert response.final_price == (await stub.GenerateQuote(request)).final_price
+
+
+async def test_columnar_matches_stream(channel):
+    stub = QuoteServiceStub(channel)
+    requests = [quote_request(i) for i in range(20)]
+    columnar = await stub.ScoreQuotesColumnar(ColumnarQuoteRequest(
+        event_type=[r.event_type for r in requests],
+        num_guards=[r.num_guards for r in requests],
+        hours=[r.hours for r in requests],
+        event_time=[r.event_date.seconds for r in requests],
+        is_armed=[r.is_armed for r in requests],
+        requires_vehicle=[r.requires_vehicle for r in requests],
+        crowd_size=[r.crowd_size for r in requests],
+    ))
+
+    streamed = [response async for response in stub.GenerateQuotesBatch(iter(requests))]
+    assert list(columnar.final_price) == [r.final_price for r in streamed]
+    assert list(columnar.risk_level) == [r.risk_level for r in streamed]
+
+
+async def test_score_table(channel):
+    pa = pytest.importorskip("pyarrow")
+    from src.models.trained_predictor import sample_quotes
+    from src.serving.tables import table_columns
+
+    quotes = sample_quotes(50)
+    table = pa.table({name: [q[name] for q in quotes] for name in quotes[0]})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    responses = [r async for r in QuoteServiceStub(channel).ScoreTable(iter([
+        TableChunk(data=sink.getvalue().to_pybytes(), format=TableFormat.TABLE_FORMAT_ARROW_STREAM),
+    ]))]
+    scored = pa.ipc.open_stream(b''.join(r.data for r in responses)).read_all()
+    expected = get_predictor().predict_quote_arrays(table_columns(table.to_batches()[0]))
+    assert responses[-1].rows == 50
+    assert scored.column('predicted_price').to_pylist() == expected.predicted_price.tolist()
+
+
+async def test_idle_streams_do_not_hold_threads(channel):
+    """More open streams than thread-mode workers, and unary calls still get through."""
+    stub = QuoteServiceStub(channel)
+    release = asyncio.Event()
+
+    async def idle_requests():
+        await release.wait()
+        yield quote_request(0)
+
+    n_streams = 4 * get_settings().grpc_max_workers
+    calls = [stub.GenerateQuotesBatch(idle_requests()) for _ in range(n_streams)]
+    await asyncio.sleep(0.2)
+
+    response = await asyncio.wait_for(stub.GenerateQuote(quote_request(1)), timeout=10)
+    assert response.final_price > 0
+
+    release.set()
+    for call in calls:
+        assert [r.request_id async for r in call] == ["aio-0"]
+
+
+async def test_unknown_version_stream_aborts(channel):
+    async def no_requests():
+        # Keep the request side open without writing, so the client never
+        # races a message send against the server's abort
+        await asyncio.Event().wait()
+        yield quote_request(0)
+
+    call = QuoteServiceStub(channel).GenerateQuotesBatch(
+        no_requests(), metadata=(('x-model-version', '0.0.0-missing'),)
+    )
+    with pytest.raises(grpc.aio.AioRpcError) as error:
+        async for _ in call:
+            pass
+    assert error.value.code() == grpc.StatusCode.NOT_FOUND
+
+
+async def test_full_inference_queue_is_resource_exhausted(channel, monkeypatch):
+    import threading
+    from src.serving import executor
+    from src.serving.executor import InferenceExecutor
+
+    pool = InferenceExecutor(workers=1, max_queue=0)
+    release = threading.Event()
+    blocked = pool.submit_call(release.wait)
+    monkeypatch.setattr(executor, '_executor', pool)
+    request = quote_request(0)
+    request.request_id = "aio-queue-full"  # not a retry of an already scored call
+    try:
+        with pytest.raises(grpc.aio.AioRpcError) as error:
+            await QuoteServiceStub(channel).GenerateQuote(request)
+        assert error.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+        assert dict(error.value.trailing_metadata())['retry-after'] == "1"
+    finally:
+        release.set()
+        blocked.result()
+        pool.shutdown()
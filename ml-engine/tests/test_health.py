@@ -14,3 +14,41 @@ def test_imports():
 def test_placeholder():
     """Placeholder test to ensure pytest runs."""
     assert True
+
+
+def _client():
+    import sys
+    sys.path.insert(0, '.')
+    from fastapi.testclient import TestClient
+    from src.main import app
+    return TestClient(app)
+
+
+def test_liveness_does_not_need_model(monkeypatch):
+    """Liveness answers before the model is ready; readiness returns 503."""
+    import threading
+    from src.models import trained_predictor
+
+    monkeypatch.setattr(trained_predictor, '_ready', threading.Event())
+    client = _client()
+    assert client.get("/health/live").json()["status"] == "alive"
+
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+    assert client.get("/health").json()["status"] == "starting"
+
+
+def test_ready_after_warm_up():
+    """Readiness flips to 200 once the background warm-up has finished."""
+    from src.models.trained_predictor import start_warm_up, wait_ready
+
+    start_warm_up()
+    assert wait_ready(timeout=60)
+    client = _client()
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["model_version"]
+    assert "load_ms" in body["startup"]
+    assert client.get("/api/v1/health").json()["ready"] is True
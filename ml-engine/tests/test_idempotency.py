@@ -0,0 +1,179 @@
+"""
+Request-id idempotency cache tests (gRPC retry replay / joining)
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from google.protobuf.timestamp_pb2 import Timestamp
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from src.grpc_generated import EventType, QuoteRequest, RiskRequest
+from src.grpc_servicer import QuoteServiceImpl, RiskServiceImpl
+from src.models.trained_predictor import start_warm_up, wait_ready
+from src.serving import idempotency
+from src.serving.idempotency import IdempotencyCache
+
+
+class FakeContext:
+    def __init__(self, metadata=()):
+        self.metadata = metadata
+        self.code = None
+
+    def invocation_metadata(self):
+        return self.metadata
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        pass
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(idempotency, '_cache', IdempotencyCache(max_size=100, window_s=60))
+    return idempotency.get_idempotency_cache()
+
+
+def quote_request(request_id: str, num_guards: int = 2) -> QuoteRequest:
+    ts = Timestamp()
+    ts.FromDatetime(datetime(2026, 8, 14, 20))
+    return QuoteRequest(
+        event_type=EventType.EVENT_TYPE_CONCERT,
+        location_zip="10001",
+        num_guards=num_guards,
+        hours=6.0,
+        event_date=ts,
+        crowd_size=800,
+        request_id=request_id,
+        client_id="backend",
+    )
+
+
+def test_replay_conflict_and_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(idempotency.time, 'monotonic', lambda: now[0])
+    cache = IdempotencyCache(max_size=2, window_s=10)
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return value
+
+    assert cache.run(('m', 'c', 'r1'), b'a', lambda: compute(1)) == 1
+    assert cache.run(('m', 'c', 'r1'), b'a', lambda: compute(2)) == 1
+    # Same id, different payload: scored, entry kept
+    assert cache.run(('m', 'c', 'r1'), b'b', lambda: compute(3)) == 3
+    assert cache.run(('m', 'c', 'r1'), b'a', lambda: compute(4)) == 1
+    # Another client's request id is another call
+    assert cache.run(('m', 'd', 'r1'), b'a', lambda: compute(5)) == 5
+    assert cache.run(None, b'', lambda: compute(6)) == 6
+    assert calls == [1, 3, 5, 6]
+
+    now[0] += 11
+    assert cache.run(('m', 'c', 'r1'), b'a', lambda: compute(7)) == 7
+    cache.run(('m', 'c', 'r2'), b'a', lambda: compute(8))
+    cache.run(('m', 'c', 'r3'), b'a', lambda: compute(9))  # bounded: evicts r1
+    assert cache.run(('m', 'c', 'r1'), b'a', lambda: compute(10)) == 10
+    assert cache.stats() == {
+        'size': 2, 'max_size': 2, 'window_s': 10, 'computed': 6, 'replayed': 2, 'joined': 0,
+        'conflicts': 1,
+    }
+
+
+def test_in_flight_calls_are_joined():
+    cache = IdempotencyCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "quote"
+
+    with ThreadPoolExecutor(4) as pool:
+        owner = pool.submit(cache.run, ('m', 'c', 'r'), b'a', slow)
+        assert started.wait(5)
+        retries = [pool.submit(cache.run, ('m', 'c', 'r'), b'a', slow) for _ in range(3)]
+        release.set()
+        assert owner.result() == "quote"
+        assert [retry.result() for retry in retries] == ["quote"] * 3
+    assert calls == [1]
+    assert cache.stats()['joined'] == 3
+
+
+def test_failures_reach_waiters_but_are_not_stored():
+    cache = IdempotencyCache()
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("model crashed")
+
+    with ThreadPoolExecutor(2) as pool:
+        owner = pool.submit(cache.run, ('m', 'c', 'r'), b'a', failing)
+        assert started.wait(5)
+        retry = pool.submit(cache.run, ('m', 'c', 'r'), b'a', failing)
+        release.set()
+        for call in (owner, retry):
+            with pytest.raises(RuntimeError):
+                call.result()
+    assert cache.run(('m', 'c', 'r'), b'a', lambda: "recovered") == "recovered"
+
+
+async def test_async_join_and_owner_cancellation():
+    cache = IdempotencyCache()
+    calls = []
+
+    async def slow(value):
+        calls.append(value)
+        await asyncio.sleep(0.05)
+        return value
+
+    results = await asyncio.gather(
+        *(cache.run_async(('m', 'c', 'r'), b'a', lambda: slow(1)) for _ in range(5))
+    )
+    assert results == [1] * 5 and calls == [1]
+
+    # A cancelled owner does not take its waiters down with it
+    owner = asyncio.create_task(cache.run_async(('m', 'c', 'x'), b'a', lambda: slow(2)))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.run_async(('m', 'c', 'x'), b'a', lambda: slow(3)))
+    await asyncio.sleep(0)
+    owner.cancel()
+    assert await waiter == 3
+
+
+def test_servicers_replay_retries(cache):
+    start_warm_up()
+    assert wait_ready(timeout=60)
+    quotes = QuoteServiceImpl()
+
+    first = quotes.GenerateQuote(quote_request("q-1"), FakeContext())
+    retry = quotes.GenerateQuote(quote_request("q-1"), FakeContext())
+    assert retry is first
+    other = quotes.GenerateQuote(quote_request("q-1", num_guards=5), FakeContext())
+    assert other.final_price != first.final_price
+
+    # Metadata selecting another model version changes the call
+    context = FakeContext((('x-model-version', "0.0.0-missing"),))
+    quotes.GenerateQuote(quote_request("q-1"), context)
+    assert context.code is not None
+
+    risks = RiskServiceImpl()
+    request = RiskRequest(
+        event_type=EventType.EVENT_TYPE_CONCERT, location_zip="10001", num_guards=2, hours=6.0,
+        event_date=quote_request("").event_date, crowd_size=800, request_id="r-1",
+    )
+    context = FakeContext((('x-client-id', "backend"),))
+    assert risks.AssessRisk(request, context) is risks.AssessRisk(request, context)
+    assert cache.stats()['replayed'] == 2
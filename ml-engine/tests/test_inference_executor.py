@@ -0,0 +1,87 @@
+"""
+Inference executor admission / backpressure tests.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from src.serving import MicroBatcher, executor
+from src.serving.executor import InferenceExecutor, InferenceQueueFull
+
+
+@pytest.fixture
+def full_executor(monkeypatch):
+    """Shared executor with one worker, no queue, and that worker blocked."""
+    pool = InferenceExecutor(workers=1, max_queue=0, retry_after_s=2.5)
+    release = threading.Event()
+    blocked = pool.submit_call(release.wait)
+    monkeypatch.setattr(executor, '_executor', pool)
+    yield pool
+    release.set()
+    blocked.result()
+    pool.shutdown()
+
+
+async def test_rejects_beyond_capacity():
+    pool = InferenceExecutor(workers=1, max_queue=1)
+    release = threading.Event()
+    running = asyncio.ensure_future(pool.run(release.wait))
+    queued = asyncio.ensure_future(pool.run(lambda: 42))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(InferenceQueueFull):
+        await pool.run(lambda: 0)
+    stats = pool.stats()
+    assert stats['in_flight'] == 2
+    assert stats['queue_depth'] == 1
+    assert stats['rejected'] == 1
+
+    release.set()
+    assert await queued == 42
+    await running
+    assert pool.stats()['in_flight'] == 0
+    pool.shutdown()
+
+
+async def test_batcher_submissions_count_as_in_flight():
+    pool = InferenceExecutor(workers=1, max_queue=0)
+    release = threading.Event()
+
+    def slow_double(items):
+        release.wait()
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(slow_double, max_wait_ms=0)
+    pending = asyncio.ensure_future(pool.submit(batcher, 21))
+    await asyncio.sleep(0.05)
+    with pytest.raises(InferenceQueueFull):
+        await pool.submit(batcher, 1)
+
+    release.set()
+    assert await pending == 42
+    assert pool.stats()['in_flight'] == 0
+    batcher.close()
+    pool.shutdown()
+
+
+def test_rest_returns_503_with_retry_after(full_executor):
+    from src.main import app
+    client = TestClient(app)
+
+    response = client.post("/api/v1/quote/rule-based", json={
+        "event_type": "corporate", "location_zip": "90210", "num_guards": 2,
+        "hours": 8, "date": "2026-07-04T18:00:00",
+    })
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "3"
+
+    # Probes and stats never wait on inference
+    assert client.get("/health/live").status_code == 200
+    assert client.get("/api/v1/stats").json()["inference"]["rejected"] == 1
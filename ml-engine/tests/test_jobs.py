@@ -0,0 +1,224 @@
+"""
+Repricing job tests (chunked, resumable table scoring)
+"""
+
+import io
+import os
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+from src.config import get_settings  # noqa: E402
+from src.models.trained_predictor import (  # noqa: E402
+    get_predictor, sample_quotes, start_warm_up, wait_ready,
+)
+from src.serving import jobs  # noqa: E402
+from src.serving.jobs import JobManager, JobNotFinished, chunk_ranges  # noqa: E402
+from tests.test_tables import PARQUET_TYPE, arrow_stream, assert_scored, quotes_table  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    start_warm_up()
+    assert wait_ready(timeout=60)
+    return get_predictor()
+
+
+@pytest.fixture
+def manager(tmp_path, predictor):
+    manager = JobManager(
+        root=str(tmp_path / "jobs"), input_dir=str(tmp_path / "exports"), chunk_rows=100, nice=0
+    )
+    os.makedirs(manager.input_dir)
+    yield manager
+    manager.stop()
+
+
+def wait_for(manager: JobManager, job_id: str, timeout: float = 60) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job['status'] not in jobs.ACTIVE:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} still {job['status']}")
+
+
+def write_parquet(path: str, quotes: list[dict], row_group_size: int = 60):
+    pq.write_table(quotes_table(quotes), path, row_group_size=row_group_size)
+
+
+def test_chunk_ranges():
+    assert chunk_ranges('arrow', [70, 70, 70], 100) == [[0, 100], [100, 200], [200, 210]]
+    # Parquet chunks are runs of whole row groups
+    assert chunk_ranges('parquet', [60, 60, 60, 30], 100) == [[0, 120], [120, 210]]
+    assert chunk_ranges('parquet', [], 100) == []
+
+
+def test_path_job_runs_in_chunks(manager, predictor):
+    quotes = sample_quotes(500, seed=6)
+    write_parquet(os.path.join(manager.input_dir, "quotes.parquet"), quotes)
+
+    job = manager.submit_path("quotes.parquet", 'parquet', predictor.version)
+    assert job['status'] == 'queued'
+    assert (job['total_rows'], job['chunks_total']) == (500, 5)
+    manager.start()
+    job = wait_for(manager, job['job_id'])
+
+    assert job['status'] == 'completed', job['error']
+    assert (job['rows_done'], job['progress']) == (500, 1.0)
+    assert job['rows_per_s'] > 0
+    assert_scored(pq.read_table(manager.result_path(job['job_id'])), quotes)
+
+
+def test_resume_from_checkpoints(manager, predictor, caplog):
+    """The runner scores only the chunks without a checkpoint (as after a restart)."""
+    quotes = sample_quotes(350, seed=7)
+    job_id, input_path = manager.create('arrow')
+    with open(input_path, 'wb') as f:
+        f.write(arrow_stream(quotes_table(quotes), batch_rows=64))
+    manager.submit(job_id, 'arrow', predictor.version)
+
+    # Chunks scored before the "restart"
+    job = manager._read(job_id)
+    for k in range(2):
+        start, stop = job['chunks'][k]
+        jobs._score_chunk(
+            jobs.worker_spec(predictor), input_path, 'arrow', start, stop, manager._part_path(job, k)
+        )
+    assert manager.get(job_id)['chunks_done'] == 2
+
+    path, rows = manager.partial_result(job_id)
+    assert rows == 200
+    assert_scored(pa.ipc.open_stream(pa.memory_map(path)).read_all(), quotes[:200])
+    os.remove(path)
+
+    with caplog.at_level('INFO', logger=jobs.__name__):
+        manager.start()
+        job = wait_for(manager, job_id)
+    assert job['status'] == 'completed', job['error']
+    assert f"Job {job_id}: 2 of 4 chunks to score" in caplog.text
+    result = pa.ipc.open_stream(pa.memory_map(manager.result_path(job_id))).read_all()
+    assert_scored(result, quotes)
+    assert not os.path.exists(os.path.join(manager.root, job_id, jobs.PARTS_DIR))
+
+
+class DeadPool:
+    """Executor whose workers have died: every chunk fails with BrokenProcessPool."""
+
+    def submit(self, *args, **kwargs):
+        future = Future()
+        future.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_dead_chunk_worker_requeues_the_job(manager, predictor):
+    quotes = sample_quotes(200, seed=8)
+    write_parquet(os.path.join(manager.input_dir, "quotes.parquet"), quotes)
+    # A job that keeps killing its workers eventually fails
+    doomed = manager.submit_path("quotes.parquet", 'parquet', predictor.version)['job_id']
+    for _ in range(jobs.MAX_WORKER_CRASHES):
+        manager._executor = DeadPool()
+        manager._process(doomed)
+    job = manager.get(doomed)
+    assert job['status'] == 'failed' and "died 3 times" in job['error']
+
+    job_id = manager.submit_path("quotes.parquet", 'parquet', predictor.version)['job_id']
+    manager._executor = DeadPool()
+    manager._process(job_id)
+    assert manager.get(job_id)['status'] == 'queued'
+    assert manager._executor is None
+
+    # The next run starts a fresh pool and resumes
+    manager.start()
+    job = wait_for(manager, job_id)
+    assert job['status'] == 'completed', job['error']
+    assert_scored(pq.read_table(manager.result_path(job_id)), quotes)
+
+
+def test_runner_survives_job_errors(manager, predictor, monkeypatch):
+    quotes = sample_quotes(50, seed=9)
+    write_parquet(os.path.join(manager.input_dir, "quotes.parquet"), quotes)
+    first = manager.submit_path("quotes.parquet", 'parquet', predictor.version)['job_id']
+    second = manager.submit_path("quotes.parquet", 'parquet', predictor.version)['job_id']
+    process = manager._process
+
+    def flaky(job_id):
+        if job_id == first:
+            raise FileNotFoundError("job directory removed")
+        process(job_id)
+
+    monkeypatch.setattr(manager, '_process', flaky)
+    manager.start()
+    assert wait_for(manager, second)['status'] == 'completed'
+    assert manager._thread.is_alive()
+
+
+def test_invalid_jobs(manager, predictor):
+    with pytest.raises(PermissionError):
+        manager.submit_path("../outside.parquet", 'parquet', predictor.version)
+    with pytest.raises(FileNotFoundError):
+        manager.submit_path("missing.parquet", 'parquet', predictor.version)
+
+    table = quotes_table(sample_quotes(10)).drop_columns(['num_guards'])
+    pq.write_table(table, os.path.join(manager.input_dir, "bad.parquet"))
+    with pytest.raises(ValueError, match="num_guards"):
+        manager.submit_path("bad.parquet", 'parquet', predictor.version)
+    assert manager.list_jobs() == []
+
+    job_id, input_path = manager.create('parquet')
+    write_parquet(input_path, sample_quotes(10))
+    manager.submit(job_id, 'parquet', predictor.version)
+    with pytest.raises(JobNotFinished):
+        manager.result_path(job_id)
+    with pytest.raises(JobNotFinished):
+        manager.partial_result(job_id)
+
+
+def test_rest_upload_and_download(client, manager, predictor, monkeypatch):
+    monkeypatch.setattr(jobs, '_manager', manager)
+    quotes = sample_quotes(250, seed=8)
+    sink = io.BytesIO()
+    pq.write_table(quotes_table(quotes), sink, row_group_size=50)
+
+    response = client.post(
+        "/api/v1/jobs", content=sink.getvalue(), headers={'content-type': PARQUET_TYPE}
+    )
+    assert response.status_code == 202
+    job_id = response.json()['job_id']
+    assert client.get(f"/api/v1/jobs/{job_id}/result").status_code == 409
+
+    manager.start()
+    wait_for(manager, job_id)
+    assert client.get(f"/api/v1/jobs/{job_id}").json()['status'] == 'completed'
+    assert [job['job_id'] for job in client.get("/api/v1/jobs").json()['jobs']] == [job_id]
+    response = client.get(f"/api/v1/jobs/{job_id}/result")
+    assert response.status_code == 200
+    assert response.headers['x-rows-scored'] == "250"
+    assert_scored(pq.read_table(io.BytesIO(response.content)), quotes)
+
+    assert client.post(
+        "/api/v1/jobs", json={'path': "../etc/passwd", 'format': "parquet"}
+    ).status_code == 403
+    assert client.delete(f"/api/v1/jobs/{job_id}").status_code == 200
+    assert client.get(f"/api/v1/jobs/{job_id}").status_code == 404
+
+
+def test_rest_rejects_jobs_when_disabled(client, manager, monkeypatch):
+    monkeypatch.setattr(jobs, '_manager', manager)
+    monkeypatch.setattr(get_settings(), 'jobs_enabled', False)
+    sink = io.BytesIO()
+    pq.write_table(quotes_table(sample_quotes(10)), sink)
+    response = client.post(
+        "/api/v1/jobs", content=sink.getvalue(), headers={'content-type': PARQUET_TYPE}
+    )
+    assert response.status_code == 503
+    assert manager.list_jobs() == []
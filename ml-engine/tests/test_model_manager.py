@@ -0,0 +1,202 @@
+"""
+Multi-version model manager tests.
+"""
+
+import shutil
+import threading
+import time
+
+import pytest
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from src.config import get_settings
+from src.models import manager as manager_module, trained_predictor
+from src.models.manager import ModelManager
+from src.models.registry import UnknownModelVersion
+from src.models.trained_predictor import MODEL_PATH, get_predictor, sample_quotes
+from src.serving import VERSION_KEY, ItemError, MicroBatcher, score_quotes
+
+
+class FakePredictor:
+    """Stand-in with the attributes the manager and warm-up use."""
+
+    loaded = True
+    scorer = None
+
+    def __init__(self, version: str, source_path: str | None = None):
+        self.version = version
+        self.source_path = source_path
+
+    def predict_quote_batch(self, quotes, use_cache=True):
+        return []
+
+    def predict_risk_batch(self, quotes, use_cache=True):
+        return []
+
+    def predict_quote(self, **quote):
+        return None
+
+
+class CountingLoader:
+    def __init__(self, delay: float = 0.0, sizes: dict | None = None, tmp_path=None):
+        self.calls = []
+        self.delay = delay
+        self.sizes = sizes or {}
+        self.tmp_path = tmp_path
+
+    def __call__(self, version):
+        self.calls.append(version)
+        time.sleep(self.delay)
+        if version == "broken":
+            raise RuntimeError("corrupt model")
+        if version.startswith("missing"):
+            raise UnknownModelVersion(version)
+        source = None
+        if version in self.sizes:
+            source = self.tmp_path / f"{version}.pkl"
+            source.write_bytes(b"x" * self.sizes[version])
+        return FakePredictor(version, str(source) if source else None)
+
+
+def test_lazy_load_and_hits():
+    loader = CountingLoader()
+    manager = ModelManager(loader=loader)
+    first = manager.get("v1")
+    assert manager.get("v1") is first
+    assert loader.calls == ["v1"]
+    stats = manager.stats()['versions']['v1']
+    assert stats['loads'] == 1 and stats['hits'] == 1
+
+
+def test_default_version_uses_serving_predictor():
+    manager = ModelManager(loader=CountingLoader())
+    default = get_predictor()
+    assert manager.get(None) is default
+    assert manager.get(default.version) is default
+    assert manager.loaded_versions() == []
+
+
+def test_concurrent_first_requests_share_one_load():
+    loader = CountingLoader(delay=0.2)
+    manager = ModelManager(loader=loader)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(manager.get("v1"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert loader.calls == ["v1"]
+    assert all(r is results[0] for r in results)
+    stats = manager.stats()['versions']['v1']
+    assert stats['loads'] == 1
+    assert stats['coalesced'] + stats['hits'] == 7
+
+
+def test_lru_eviction_by_count():
+    loader = CountingLoader()
+    manager = ModelManager(max_versions=2, loader=loader)
+    for version in ("v1", "v2", "v1", "v3"):
+        manager.get(version)
+    assert manager.loaded_versions() == ["v1", "v3"]
+    assert manager.stats()['versions']['v2']['evictions'] == 1
+
+    manager.get("v2")
+    assert loader.calls.count("v2") == 2
+
+
+def test_memory_cap_evicts_least_recent(tmp_path):
+    loader = CountingLoader(sizes={"a": 600, "b": 600, "c": 300}, tmp_path=tmp_path)
+    manager = ModelManager(max_versions=10, max_bytes=1000, loader=loader)
+    manager.get("a")
+    manager.get("b")
+    assert manager.loaded_versions() == ["b"]
+    manager.get("c")
+    assert manager.loaded_versions() == ["b", "c"]
+
+
+def test_failed_load_is_not_cached():
+    loader = CountingLoader()
+    manager = ModelManager(loader=loader)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            manager.get("broken")
+    assert loader.calls == ["broken", "broken"]
+    assert manager.stats()['versions']['broken']['load_errors'] == 2
+
+
+def test_unknown_versions_get_no_stats_entry():
+    manager = ModelManager(loader=CountingLoader())
+    for i in range(50):
+        with pytest.raises(UnknownModelVersion):
+            manager.get(f"missing-{i}")
+    stats = manager.stats()
+    assert not any(version.startswith("missing") for version in stats['versions'])
+    assert stats['unknown_version_requests'] == 50
+
+
+def test_stats_loads_default_outside_the_lock(monkeypatch):
+    manager = ModelManager(loader=CountingLoader())
+    manager.get("v1")
+
+    def cold_default():
+        # Another thread can still use the manager while the default loads
+        assert manager._lock.acquire(blocking=False)
+        manager._lock.release()
+        return FakePredictor("2.0.0")
+
+    monkeypatch.setattr(manager_module, 'get_predictor', cold_default)
+    stats = manager.stats()
+    assert stats['default_version'] == "2.0.0"
+    assert stats['cached_versions'] == ["v1"]
+
+
+def test_resolve_routes():
+    manager = ModelManager(routes={"acme": "2.3.0-west"}, loader=CountingLoader())
+    assert manager.resolve(client_id="acme") == "2.3.0-west"
+    assert manager.resolve(client_id="other") is None
+    assert manager.resolve(requested="2.4.0", client_id="acme") == "2.4.0"
+
+
+def test_score_quotes_mixes_versions(tmp_path, monkeypatch):
+    (tmp_path / "1.0.0").mkdir()
+    shutil.copy(MODEL_PATH, tmp_path / "1.0.0" / "guardquote_models.pkl")
+    (tmp_path / "2.0.0").mkdir()
+    shutil.copy(MODEL_PATH, tmp_path / "2.0.0" / "guardquote_models.pkl")
+    monkeypatch.setattr(get_settings(), 'model_registry_path', str(tmp_path))
+    monkeypatch.setattr(trained_predictor, '_predictor', None)
+    monkeypatch.setattr(manager_module, '_manager', ModelManager())
+
+    quotes = sample_quotes(n=6, seed=9)
+    tagged = [dict(q, **{VERSION_KEY: "1.0.0"}) if i % 2 else q for i, q in enumerate(quotes)]
+    results = score_quotes(tagged)
+
+    assert [r.model_version for r in results] == ["2.0.0", "1.0.0"] * 3
+    expected = get_predictor().predict_quote_batch(quotes)
+    assert [r._replace(model_version="") for r in results] == \
+        [r._replace(model_version="") for r in expected]
+
+    # An unknown version fails only its own items, even through a batcher
+    mixed = [dict(quotes[0], **{VERSION_KEY: "9.9.9"})] + quotes[1:4]
+    results = score_quotes(mixed)
+    assert isinstance(results[0], ItemError)
+    assert isinstance(results[0].error, UnknownModelVersion)
+    assert results[1:] == expected[1:4]
+
+    batcher = MicroBatcher(score_quotes, max_batch_size=4, max_wait_ms=200)
+    try:
+        futures = [batcher.submit(q) for q in mixed]
+        with pytest.raises(UnknownModelVersion):
+            futures[0].result(timeout=5)
+        assert [f.result(timeout=5) for f in futures[1:]] == expected[1:4]
+    finally:
+        batcher.close()
@@ -0,0 +1,152 @@
+"""
+Pre-fork master tests: workers serve REST and gRPC, crashed workers are
+replaced, SIGHUP rolls every worker, SIGTERM stops everything.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+import grpc
+import pytest
+import uvicorn
+
+# Add src to path for imports
+sys.path.insert(0, '.')
+
+from src.grpc_generated import HealthRequest, ModelServiceStub
+from src.prefork import PreforkMaster, open_listener
+
+REST_PORT = 18123
+GRPC_PORT = 50061
+
+
+def live_pid() -> int | None:
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{REST_PORT}/health/live", timeout=2) as response:
+            return json.load(response)["pid"]
+    except OSError:
+        return None
+
+
+def wait_for(condition, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = condition()
+        if result:
+            return result
+        time.sleep(0.1)
+    raise AssertionError("condition not met in time")
+
+
+def seen_pids(n: int = 40) -> set[int]:
+    return {pid for pid in (live_pid() for _ in range(n)) if pid is not None}
+
+
+def gone(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    return False
+
+
+@pytest.fixture(scope="module")
+def master():
+    process = subprocess.Popen(
+        [sys.executable, "-W", "ignore", "-c",
+         "import sys; from src.prefork import PreforkMaster; "
+         f"sys.exit(PreforkMaster(2, host='127.0.0.1', rest_port={REST_PORT}, "
+         f"grpc_port={GRPC_PORT}).run())"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(live_pid)
+        yield process
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def test_workers_serve_rest_and_grpc(master):
+    pid = live_pid()
+    assert pid != master.pid
+    with urllib.request.urlopen(f"http://127.0.0.1:{REST_PORT}/health/ready", timeout=5) as response:
+        assert json.load(response)["status"] == "ready"
+    with grpc.insecure_channel(f"127.0.0.1:{GRPC_PORT}") as channel:
+        health = ModelServiceStub(channel).HealthCheck(HealthRequest(), timeout=10)
+    assert health.status == "healthy"
+
+
+def test_crashed_worker_is_replaced(master):
+    victim = live_pid()
+    os.kill(victim, signal.SIGKILL)
+    wait_for(lambda: gone(victim))
+    # Still served, eventually by a replacement
+    wait_for(lambda: seen_pids() - {victim})
+    assert master.poll() is None
+
+
+def test_sighup_rolls_every_worker(master):
+    before = seen_pids()
+    os.kill(master.pid, signal.SIGHUP)
+    wait_for(lambda: all(gone(pid) for pid in before))
+    after = wait_for(seen_pids)
+    assert not after & before
+
+
+def test_roll_aborts_when_a_successor_fails(monkeypatch):
+    local = PreforkMaster(2)
+
+    def serve(ready_w):
+        os.write(ready_w, b"1")
+        time.sleep(60)
+        os._exit(0)
+
+    monkeypatch.setattr(local, '_worker_main', serve)
+    old = {local._spawn() for _ in range(2)}
+    try:
+        assert all(local._wait_ready(pid, 10) for pid in old)
+        # The successor crashes during startup: its pipe hits EOF without b"1"
+        monkeypatch.setattr(local, '_worker_main', lambda ready_w: os._exit(3))
+        assert local.roll() is False
+        wait_for(lambda: local._reap() or set(local.children) == old)
+        assert not local._stopping & old
+        assert not any(gone(pid) for pid in old)
+    finally:
+        for pid in list(local.children):
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+
+def test_worker_that_fails_startup_is_not_ready(monkeypatch):
+    async def aborted_startup(self, sockets=None):
+        # Shutdown requested mid-startup: should_exit is set, started never is
+        self.should_exit = True
+        await asyncio.sleep(0.5)
+
+    monkeypatch.setattr(uvicorn.Server, 'startup', aborted_startup)
+    local = PreforkMaster(1)
+    local.listener = open_listener('127.0.0.1', REST_PORT + 1)
+    try:
+        pid = local._spawn()
+        local._probation.add(pid)
+        assert local._wait_ready(pid, 30) is False
+    finally:
+        for pid in list(local.children):
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        local.listener.close()
+
+
+def test_sigterm_stops_master_and_workers(master):
+    workers = seen_pids()
+    master.send_signal(signal.SIGTERM)
+    assert master.wait(timeout=30) == 0
+    assert all(gone(pid) for pid in workers)
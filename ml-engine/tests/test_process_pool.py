@@ -0,0 +1,120 @@
+"""
+Process-pool inference backend tests.
+"""
+
+import os
+import signal
+import threading
+
+import pytest
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from src.config import get_settings
+from src.models import process_pool
+from src.models.process_pool import ProcessScorer
+from src.models.trained_predictor import TrainedPredictor, load_predictor, sample_quotes
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    return TrainedPredictor()
+
+
+@pytest.fixture(scope="module")
+def scorer(predictor):
+    # Small chunks so one batch spans several slots and both workers
+    scorer = ProcessScorer(workers=2, chunk_rows=64, min_rows=1)
+    scorer.warm(predictor)
+    yield scorer
+    scorer.close()
+
+
+@pytest.fixture(scope="module")
+def quotes():
+    return sample_quotes(n=500, seed=13)
+
+
+@pytest.fixture
+def pooled(predictor, scorer, monkeypatch):
+    monkeypatch.setattr(predictor, 'scorer', scorer)
+    return predictor
+
+
+def test_pool_matches_in_process(predictor, scorer, quotes, monkeypatch):
+    def score_all():
+        return (
+            predictor.predict_quote_batch(quotes),
+            predictor.predict_risk_batch(quotes),
+            predictor.predict_price_batch(quotes),
+        )
+
+    expected = score_all()
+    monkeypatch.setattr(predictor, 'scorer', scorer)
+    assert score_all() == expected
+
+
+def test_concurrent_callers_get_their_own_results(pooled, quotes):
+    expected = {i: pooled.predict_quote_batch(quotes[i * 50:(i + 1) * 50]) for i in range(10)}
+    results = {}
+
+    def client(i):
+        results[i] = pooled.predict_quote_batch(quotes[i * 50:(i + 1) * 50])
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == expected
+
+
+def test_closed_scorer_scores_in_process(predictor, quotes):
+    scorer = ProcessScorer(workers=1, chunk_rows=64)
+    scorer.close()
+    expected = predictor.predict_quote_batch(quotes[:40])
+    predictor.scorer = scorer
+    try:
+        assert predictor.predict_quote_batch(quotes[:40]) == expected
+    finally:
+        predictor.scorer = None
+
+
+def test_process_backend_setting_attaches_scorer(scorer, monkeypatch):
+    monkeypatch.setattr(get_settings(), 'inference_backend', 'process')
+    monkeypatch.setattr(process_pool, '_scorer', scorer)
+    assert load_predictor().scorer is scorer
+
+
+def test_worker_spec_tracks_retrained_models(predictor, monkeypatch):
+    spec = process_pool.worker_spec(predictor)
+    loaded = process_pool.worker_predictor(spec)
+    # Retrained under the same version: a new fingerprint, so a fresh load
+    monkeypatch.setattr(predictor, 'fingerprint', "retrained")
+    retrained = process_pool.worker_spec(predictor)
+    assert retrained != spec
+    assert process_pool.worker_predictor(retrained) is not loaded
+
+
+def test_dead_worker_restarts_the_pool(predictor, quotes):
+    scorer = ProcessScorer(workers=1, chunk_rows=64, min_rows=1)
+    expected = predictor.predict_quote_batch(quotes)
+    predictor.scorer = scorer
+    try:
+        scorer.warm(predictor)
+        broken = scorer._pool
+        for pid in list(broken.executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        # The batch that sees the dead worker is scored in-process
+        assert predictor.predict_quote_batch(quotes) == expected
+        assert scorer.pool_restarts == 1 and scorer._pool is not broken
+        assert broken.slots == []
+        # Later batches use the fresh workers again
+        scorer.warm(predictor)
+        assert predictor.predict_quote_batch(quotes) == expected
+        assert scorer.pool_restarts == 1
+    finally:
+        predictor.scorer = None
+        scorer.close()
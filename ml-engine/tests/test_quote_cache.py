@@ -0,0 +1,233 @@
+"""
+Score cache tests (feature-keyed price / risk cache)
+"""
+
+import pickle
+from datetime import datetime
+
+import numpy as np
+
+import pytest
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from fastapi.testclient import TestClient
+
+from src.config import get_settings
+from src.main import app
+from src.models import quote_cache, trained_predictor
+from src.models.quote_cache import (
+    LFU, LRU, ScoreCache, SnapshotWriter, load_snapshot, read_snapshot, save_snapshot,
+)
+from src.models.trained_predictor import (
+    MODEL_PATH, RISK_FEATURE_INDEX, get_predictor, reload_predictor, restore_score_cache,
+    sample_quotes, start_warm_up, wait_ready,
+)
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    start_warm_up()
+    assert wait_ready(timeout=60)
+    return get_predictor()
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """A fresh shared score cache, enabled for the test."""
+    monkeypatch.setattr(get_settings(), 'quote_cache_enabled', True)
+    monkeypatch.setattr(quote_cache, '_cache', ScoreCache(max_size=1000))
+    return quote_cache.get_score_cache()
+
+
+def test_lru_and_lfu_eviction():
+    lru = ScoreCache(max_size=2, policy=LRU)
+    lru.put('a', 1)
+    lru.put('b', 2)
+    assert lru.get('a') == 1
+    lru.put('c', 3)  # evicts b, the least recently used
+    assert (lru.get('a'), lru.get('b'), lru.get('c')) == (1, None, 3)
+
+    lfu = ScoreCache(max_size=2, policy=LFU)
+    lfu.put('a', 1)
+    lfu.put('b', 2)
+    for _ in range(3):
+        lfu.get('a')
+    lfu.get('b')
+    lfu.put('c', 3)  # evicts b, the least frequently used
+    lfu.put('d', 4)  # evicts c: a new entry competes on its own use count
+    assert (lfu.get('a'), lfu.get('b'), lfu.get('c'), lfu.get('d')) == (1, None, None, 4)
+    assert lfu.stats()['evictions'] == 2
+
+    with pytest.raises(ValueError):
+        ScoreCache(policy="fifo")
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(quote_cache.time, 'monotonic', lambda: now[0])
+    for policy in (LRU, LFU):
+        cache = ScoreCache(max_size=4, ttl_s=10, policy=policy)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        now[0] += 11
+        assert cache.get('a') is None
+        cache.put('c', 3)
+        cache.put('d', 4)
+        cache.put('e', 5)
+        cache.put('f', 6)  # evicts b, which has expired but was never looked up
+        stats = cache.stats()
+        assert (stats['expirations'], stats['misses'], stats['size']) == (1, 1, 4)
+
+
+def test_cached_scores_match_uncached(predictor, cache):
+    quotes = sample_quotes(64, seed=11)
+    expected = predictor.predict_quote_batch(quotes, use_cache=False)
+    assert cache.stats()['size'] == 0
+
+    assert predictor.predict_quote_batch(quotes) == expected
+    misses = cache.stats()['misses']
+    assert predictor.predict_quote_batch(quotes) == expected
+    assert cache.stats()['misses'] == misses
+    assert cache.stats()['hits'] >= 2 * len(quotes)
+
+    # Single-quote and standalone paths share the entries
+    hits = cache.stats()['hits']
+    assert predictor.predict_quote(**quotes[0]) == expected[0]
+    risk = predictor.predict_risk(
+        **{k: v for k, v in quotes[0].items() if k not in ('risk_zone', 'has_vehicle')}
+    )
+    assert risk['risk_score'] == expected[0].risk_score
+    assert cache.stats()['hits'] == hits + 3
+
+
+def test_date_buckets_and_versions_share_keys(predictor, cache):
+    quote = sample_quotes(1, seed=12)[0]
+    quote['event_date'] = datetime(2026, 7, 4, 21, 15)  # Saturday 21:00, July
+    predictor.predict_quote_batch([quote])
+    misses = cache.stats()['misses']
+
+    # Same weekday, hour and month: a hit
+    predictor.predict_quote_batch([dict(quote, event_date=datetime(2026, 7, 18, 21, 50))])
+    assert cache.stats()['misses'] == misses
+    # Another hour: a miss
+    predictor.predict_quote_batch([dict(quote, event_date=datetime(2026, 7, 18, 22, 0))])
+    assert cache.stats()['misses'] == misses + 2
+
+    # The model version is part of the key
+    features = predictor.encode_features([quote])
+    calls = []
+
+    def score(rows, price, risk):
+        calls.append(len(rows))
+        return predictor._score_uncached(rows, price, risk)
+
+    cache.scores(predictor.cache_version, features, True, True, score, RISK_FEATURE_INDEX)
+    assert calls == []
+    cache.scores("9.9.9-other", features, True, True, score, RISK_FEATURE_INDEX)
+    assert calls == [1]
+
+
+def test_retrained_model_with_same_version_misses(predictor, cache, monkeypatch, tmp_path):
+    # No registry: models/trained, whose version string training hardcodes
+    monkeypatch.setattr(get_settings(), 'model_registry_path', str(tmp_path / "registry"))
+    model_path = tmp_path / "guardquote_models.pkl"
+    for name, path in (('MODEL_PATH', model_path), ('SERVING_MODEL_PATH', tmp_path / "serving.pkl"),
+                       ('ARTIFACT_PATH', tmp_path / "models.artifact")):
+        monkeypatch.setattr(trained_predictor, name, str(path))
+    monkeypatch.setattr(trained_predictor, '_predictor', predictor)
+    with open(MODEL_PATH, 'rb') as f:
+        models = pickle.load(f)
+    model_path.write_bytes(pickle.dumps(models))
+    old, _ = reload_predictor()
+
+    quotes = sample_quotes(8, seed=14)
+    old.predict_quote_batch(quotes)
+    model_path.write_bytes(pickle.dumps(dict(models, trained_at="2026-10-01T00:00:00")))
+    new, _ = reload_predictor()
+    assert new.version == old.version
+    assert new.cache_version != old.cache_version
+
+    misses = cache.stats()['misses']
+    new.predict_quote_batch(quotes)
+    assert cache.stats()['misses'] == misses + 2 * len(quotes)
+    # Nor does its snapshot warm the retrained model
+    path = str(tmp_path / "cache.snap")
+    assert save_snapshot(cache, path, old.cache_version, limit=100) > 0
+    assert load_snapshot(ScoreCache(max_size=100), path, new.cache_version) == 0
+
+
+def test_bypass_and_stats(predictor, cache):
+    client = TestClient(app)
+    body = {
+        'event_type': "sports", 'location_zip': "90210", 'num_guards': 3, 'hours': 5,
+        'date': "2026-09-12T19:00:00",
+    }
+    first = client.post("/api/v1/quote", json=body).json()
+    lookups = cache.stats()['hits'] + cache.stats()['misses']
+    bypassed = client.post("/api/v1/quote", json=body, headers={'cache-control': "no-cache"})
+    assert bypassed.json() == first
+    assert cache.stats()['hits'] + cache.stats()['misses'] == lookups
+
+    client.post("/api/v1/quote", json=body)
+    stats = client.get("/api/v1/stats").json()['score_cache']
+    assert stats['enabled'] is True
+    # Price and risk: missed once, then hit by the repeated quote
+    assert (stats['misses'], stats['hits'], stats['hit_rate']) == (2, 2, 0.5)
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "score_cache.snap")
+    cache = ScoreCache(max_size=100)
+    assert save_snapshot(cache, path, "1.0.0", limit=10) == 0  # nothing to keep
+    rows = np.arange(60, dtype=np.float64).reshape(4, 15)
+    for i, row in enumerate(rows):
+        cache.put(("1.0.0", 'price', row.tobytes()), 100.0 + i)
+        cache.put(("1.0.0", 'risk', row[:11].tobytes()), np.array([0.1 * i, 1 - 0.1 * i]))
+    cache.put(("0.9.0", 'price', rows[0].tobytes()), 1.0)  # another version: not saved
+    cache.get(("1.0.0", 'price', rows[0].tobytes()))  # now the hottest price entry
+
+    assert save_snapshot(cache, path, "1.0.0", limit=6) == 6
+    header, arrays = read_snapshot(path)
+    assert header['cache_version'] == "1.0.0"
+    assert isinstance(arrays['price_rows'], np.memmap)
+    np.testing.assert_array_equal(arrays['price_values'], [100.0, 103.0, 102.0])
+
+    restored = ScoreCache(max_size=100)
+    assert load_snapshot(restored, path, "2.0.0") == 0
+    assert load_snapshot(restored, path, "1.0.0") == 6
+    assert restored.get(("1.0.0", 'price', rows[3].tobytes())) == 103.0
+    np.testing.assert_array_equal(
+        restored.get(("1.0.0", 'risk', rows[2][:11].tobytes())), [0.2, 0.8]
+    )
+    assert restored.get(("1.0.0", 'price', rows[1].tobytes())) is None
+
+    # A smaller cache keeps the hottest entries
+    small = ScoreCache(max_size=2)
+    load_snapshot(small, path, "1.0.0")
+    assert small.get(("1.0.0", 'price', rows[0].tobytes())) == 100.0
+
+    (tmp_path / "bad.snap").write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError):
+        read_snapshot(str(tmp_path / "bad.snap"))
+
+
+def test_restart_restores_steady_state(predictor, cache, monkeypatch, tmp_path):
+    monkeypatch.setattr(get_settings(), 'quote_cache_snapshot_path', str(tmp_path / "cache.snap"))
+    quotes = sample_quotes(32, seed=13)
+    expected = predictor.predict_quote_batch(quotes)
+
+    writer = SnapshotWriter(lambda: quote_cache.save_score_snapshot(predictor.cache_version), 0)
+    writer.start()
+    writer.stop()  # final snapshot on shutdown
+
+    # Restart: an empty cache, warmed before the replica reports ready
+    monkeypatch.setattr(quote_cache, '_cache', ScoreCache(max_size=1000))
+    assert restore_score_cache(predictor.cache_version) == 2 * len(quotes)
+    assert predictor.predict_quote_batch(quotes) == expected
+    stats = quote_cache.score_cache_stats()
+    assert (stats['hits'], stats['misses']) == (2 * len(quotes), 0)
+
+    assert restore_score_cache("0.0.0-other") == 0
@@ -0,0 +1,133 @@
+"""
+Model registry and hot reload tests.
+"""
+
+import asyncio
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from src.config import get_settings
+from src.main import app
+from src.models import trained_predictor
+from src.models.artifact import export_artifact
+from src.models.registry import ModelRegistry, RegistryWatcher, UnknownModelVersion
+from src.models.trained_predictor import (
+    MODEL_PATH,
+    TrainedPredictor,
+    get_predictor,
+    reload_predictor,
+    sample_quotes,
+)
+
+
+@pytest.fixture(scope="module")
+def source_models():
+    predictor = TrainedPredictor(compiled=False, model_format='pickle')
+    if not predictor.loaded:
+        pytest.skip("trained models not available")
+    return predictor.models
+
+
+@pytest.fixture
+def registry(source_models, tmp_path, monkeypatch):
+    """Registry with a pickle version (2.9.0) and an artifact version (2.10.0)."""
+    (tmp_path / "2.9.0").mkdir()
+    shutil.copy(MODEL_PATH, tmp_path / "2.9.0" / "guardquote_models.pkl")
+    export_artifact(source_models, str(tmp_path / "2.10.0" / "guardquote_models.artifact"))
+    (tmp_path / ".staging").mkdir()
+
+    monkeypatch.setattr(get_settings(), 'model_registry_path', str(tmp_path))
+    monkeypatch.setattr(get_settings(), 'model_version', "")
+    # Restore the process-wide predictor after each test
+    monkeypatch.setattr(trained_predictor, '_predictor', None)
+    return ModelRegistry(str(tmp_path))
+
+
+def test_versions_and_current(registry):
+    assert registry.versions() == ["2.9.0", "2.10.0"]
+    assert registry.current() == "2.10.0"
+    registry.set_current("2.9.0")
+    assert registry.current() == "2.9.0"
+    with pytest.raises(UnknownModelVersion):
+        registry.set_current("3.0.0")
+
+
+def test_get_predictor_serves_registry_current(registry):
+    predictor = get_predictor()
+    assert predictor.version == "2.10.0"
+    assert predictor.compiled  # artifact version
+    assert predictor.predict_quote(**sample_quotes(n=1)[0]).model_version == "2.10.0"
+
+
+def test_reload_swaps_atomically(registry):
+    old = get_predictor()
+    quotes = sample_quotes(n=20, seed=4)
+    expected = [p._replace(model_version="") for p in old.predict_quote_batch(quotes)]
+
+    new, previous = reload_predictor("2.9.0")
+    assert previous is old
+    assert get_predictor() is new
+    assert new.version == "2.9.0"
+
+    # A request still holding the old predictor finishes on it
+    assert {p.model_version for p in old.predict_quote_batch(quotes)} == {"2.10.0"}
+    results = new.predict_quote_batch(quotes)
+    assert {p.model_version for p in results} == {"2.9.0"}
+    assert [p._replace(model_version="") for p in results] == expected
+    assert {r['model_version'] for r in new.predict_risk_batch(quotes)} == {"2.9.0"}
+
+
+def test_reload_unknown_version_keeps_serving(registry):
+    current = get_predictor()
+    with pytest.raises(UnknownModelVersion):
+        reload_predictor("0.0.1")
+    assert get_predictor() is current
+
+
+def test_watcher_reloads_on_current_change(registry):
+    watcher = RegistryWatcher(registry, on_change=reload_predictor, poll_s=60,
+                              version=get_predictor().version)
+    watcher.check()
+    assert get_predictor().version == "2.10.0"
+
+    registry.set_current("2.9.0")
+    watcher.check()
+    assert get_predictor().version == "2.9.0"
+
+
+def test_rest_api_cannot_reload(registry):
+    response = TestClient(app).post("/api/v1/models/reload", json={"version": "2.9.0"})
+    assert response.status_code in (404, 405)
+    assert get_predictor().version == "2.10.0"
+
+
+def test_cold_model_loads_off_the_event_loop(registry, monkeypatch):
+    load = trained_predictor.load_predictor
+    on_loop = []
+
+    def checked_load(version=None):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return load(version)
+
+    monkeypatch.setattr(trained_predictor, 'load_predictor', checked_load)
+    client = TestClient(app)
+    assert client.get("/api/v1/models").json()['serving'] == "2.10.0"
+    monkeypatch.setattr(trained_predictor, '_predictor', None)
+    assert client.get("/api/v1/model-info").status_code == 200
+    assert on_loop == [False, False]
+
+
+def test_missing_model_reports_its_own_path(tmp_path, capsys):
+    predictor = TrainedPredictor(model_dir=str(tmp_path))
+    assert not predictor.loaded
+    assert f"Model file not found: {tmp_path / 'guardquote_models.pkl'}" in capsys.readouterr().out
@@ -0,0 +1,55 @@
+"""
+Fast response mode tests (FAST_RESPONSES)
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.api import responses
+from src.config import get_settings
+
+QUOTE = {
+    'event_type': "concert",
+    'location_zip': "90210",
+    'num_guards': 6,
+    'hours': 8,
+    'date': "2026-07-04T21:00:00",
+    'is_armed': True,
+    'crowd_size': 1500,
+}
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("POST", "/api/v1/quote", QUOTE),
+    ("POST", "/api/v1/risk-assessment", QUOTE),
+    ("GET", "/api/v1/health", None),
+])
+def test_fast_matches_validated(client, monkeypatch, method, path, body):
+    """Both modes send the same body; only the fast one skips the response model."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'fast_responses', True)
+    fast = client.request(method, path, json=body)
+    monkeypatch.setattr(settings, 'fast_responses', False)
+    validated = client.request(method, path, json=body)
+
+    assert fast.status_code == validated.status_code == 200
+    assert fast.headers['content-type'] == "application/json"
+    assert fast.json() == validated.json()
+    assert list(fast.json()) == list(validated.json())  # same field order
+
+
+@pytest.mark.parametrize("encoder", ["orjson", "pydantic-core"])
+def test_json_bytes(monkeypatch, encoder):
+    if encoder == "pydantic-core":
+        monkeypatch.setattr(responses, 'orjson', None)
+    elif responses.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    value = {
+        'price': np.float64(1234.5), 'guards': np.int64(3), 'level': "high", 'factors': ["Night event"]
+    }
+    assert json.loads(responses.json_bytes(value)) == {
+        'price': 1234.5, 'guards': 3, 'level': "high", 'factors': ["Night event"]
+    }
@@ -0,0 +1,70 @@
+"""
+Slim serving bundle tests.
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from src.models import trained_predictor
+from src.models.serving_bundle import FIT_ONLY_ATTRIBUTES, export_serving_bundle, slim_models
+from src.models.trained_predictor import TrainedPredictor, sample_quotes
+
+
+@pytest.fixture(scope="module")
+def full_models():
+    predictor = TrainedPredictor(compiled=False, model_format='pickle')
+    if not predictor.loaded or 'encoders' not in predictor.models:
+        pytest.skip("training pickle not available")
+    return predictor.models
+
+
+def test_bundle_drops_training_only_objects(full_models):
+    bundle = slim_models(full_models)
+    for key in ('price_scaler', 'risk_scaler', 'accept_model', 'accept_scaler', 'encoders'):
+        assert key not in bundle
+    assert bundle['price_metrics'] == {'r2': float(full_models['price_metrics']['r2'])}
+    for model in (bundle['price_model'], bundle['risk_model']):
+        assert not any(attr in model.__dict__ for attr in FIT_ONLY_ATTRIBUTES)
+    # Source estimators are left intact
+    assert hasattr(full_models['price_model'], 'train_score_')
+
+
+def test_bundle_predictions_match(full_models):
+    bundle = slim_models(full_models)
+    features = np.random.default_rng(0).uniform(0, 50, size=(50, len(full_models['price_features'])))
+    np.testing.assert_array_equal(
+        bundle['price_model'].predict(features), full_models['price_model'].predict(features)
+    )
+    risk_features = features[:, :len(full_models['risk_features'])]
+    np.testing.assert_array_equal(
+        bundle['risk_model'].predict_proba(risk_features),
+        full_models['risk_model'].predict_proba(risk_features),
+    )
+
+
+def test_predictor_prefers_serving_bundle(full_models, tmp_path, monkeypatch):
+    path = tmp_path / "guardquote_serving.pkl"
+    result = export_serving_bundle(full_models, str(path))
+    assert result['size_bytes'] == os.path.getsize(path)
+    assert 'encoders' in result['dropped_keys']
+    with open(path, 'rb') as f:
+        assert 'accept_model' not in pickle.load(f)
+
+    # Reference scored from the full training pickle, loaded before the patch
+    monkeypatch.setattr(trained_predictor, 'SERVING_MODEL_PATH', str(tmp_path / "absent.pkl"))
+    reference = TrainedPredictor(compiled=False, model_format='pickle')
+    assert 'encoders' in reference.models
+
+    monkeypatch.setattr(trained_predictor, 'SERVING_MODEL_PATH', str(path))
+    predictor = TrainedPredictor(compiled=False, model_format='pickle')
+    assert 'encoders' not in predictor.models
+
+    quotes = sample_quotes(n=50, seed=2)
+    assert predictor.predict_quote_batch(quotes) == reference.predict_quote_batch(quotes)
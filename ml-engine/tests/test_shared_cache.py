@@ -0,0 +1,154 @@
+"""
+Shared-memory score cache tests (QUOTE_CACHE_BACKEND=shared)
+"""
+
+import os
+import signal
+import time
+
+import numpy as np
+import pytest
+
+# Add src to path for imports
+import sys
+sys.path.insert(0, '.')
+
+from src.config import get_settings
+from src.models import quote_cache, shared_cache
+from src.models.quote_cache import ScoreCache, load_snapshot, save_snapshot
+from src.models.shared_cache import KEY, SEQ, SharedScoreCache
+from src.models.trained_predictor import (
+    RISK_FEATURE_INDEX, get_predictor, sample_quotes, start_warm_up, wait_ready,
+)
+
+
+def fake_score(features, price, risk):
+    return features.sum(axis=1), np.stack([features[:, 0], 1 - features[:, 0]], axis=1)
+
+
+@pytest.fixture
+def table():
+    cache = SharedScoreCache(max_size=4096, stripes=4)
+    yield cache
+    cache.close()
+
+
+def test_round_trip_versions_and_replacement(table):
+    rows = np.random.default_rng(1).random((20, 15))
+    first = table.scores("1.0", rows, True, True, fake_score, RISK_FEATURE_INDEX)
+    calls = []
+
+    def counting(features, price, risk):
+        calls.append(len(features))
+        return fake_score(features, price, risk)
+
+    again = table.scores("1.0", rows, True, True, counting, RISK_FEATURE_INDEX)
+    assert calls == []
+    np.testing.assert_array_equal(again[0], first[0])
+    np.testing.assert_array_equal(again[1], first[1])
+    # Price-only and risk-only lookups use the same entries
+    assert table.scores("1.0", rows, True, False, counting, RISK_FEATURE_INDEX)[1] is None
+    table.scores("1.0", rows, False, True, counting, RISK_FEATURE_INDEX)
+    assert calls == []
+    # Another model version is another key
+    table.scores("2.0", rows[:3], True, True, counting, RISK_FEATURE_INDEX)
+    assert calls == [3]
+
+    # A full bucket replaces its oldest entry
+    bucket = SharedScoreCache(max_size=4, stripes=1)
+    try:
+        for i in range(5):
+            bucket.store("1.0", 'price', np.full(15, float(i)), float(i))
+        hit, values, _ = bucket.lookup("1.0", 'price', np.full((5, 15), np.arange(5.0)[:, None]))
+        assert hit.tolist() == [False, True, True, True, True]
+        assert values[:, 0].tolist() == [1.0, 2.0, 3.0, 4.0]
+        assert bucket.stats()['evictions'] == 1
+    finally:
+        bucket.close()
+
+
+def test_busy_and_expired_slots_miss(table, monkeypatch):
+    row = np.arange(15, dtype=np.float64)
+    table.store("1.0", 'price', row, 42.0)
+    slot = int(np.flatnonzero(table._table[:, KEY])[0])
+    table._table[slot, SEQ] += np.uint64(1)  # a writer is in the slot
+    assert not table.lookup("1.0", 'price', row[None, :])[0][0]
+    table._table[slot, SEQ] += np.uint64(1)
+    assert table.lookup("1.0", 'price', row[None, :])[0][0]
+    # A slot left odd by a writer that died is usable again after a write
+    table._table[slot, SEQ] += np.uint64(1)
+    table.store("1.0", 'price', row, 43.0)
+    assert table._table[slot, SEQ] % 2 == 0
+    assert table.lookup("1.0", 'price', row[None, :])[1][0, 0] == 43.0
+
+    table.ttl_s = 10
+    now = shared_cache.time.time_ns()
+    monkeypatch.setattr(shared_cache.time, 'time_ns', lambda: now + 11 * 10**9)
+    assert not table.lookup("1.0", 'price', row[None, :])[0][0]
+
+
+def test_writer_killed_holding_a_stripe_lock():
+    table = SharedScoreCache(max_size=64, stripes=1)
+    row = np.arange(15, dtype=np.float64)
+    pid = os.fork()
+    if pid == 0:
+        table._locks[0].acquire()
+        os.kill(os.getpid(), signal.SIGKILL)
+    os.waitpid(pid, 0)
+    try:
+        started = time.perf_counter()
+        table.store("1.0", 'price', row, 42.0)  # skipped, not hung
+        assert time.perf_counter() - started < 1
+        assert not table.lookup("1.0", 'price', row[None, :])[0][0]
+        assert table.stats()['lock_timeouts'] == 1
+    finally:
+        table.close()
+
+
+def test_entries_are_shared_with_forked_workers():
+    table = SharedScoreCache(max_size=4096, stripes=4)
+    rows = np.random.default_rng(2).random((50, 15))
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            table.scores("1.0", rows, True, True, fake_score, RISK_FEATURE_INDEX)
+            code = 0
+        finally:
+            os._exit(code)
+    assert os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]) == 0
+
+    def unreachable(features, price, risk):
+        raise AssertionError("scored rows a worker already cached")
+
+    try:
+        prices, proba = table.scores("1.0", rows, True, True, unreachable, RISK_FEATURE_INDEX)
+        np.testing.assert_array_equal(prices, rows.sum(axis=1))
+        assert table.stats()['size'] == 100
+    finally:
+        table.close()
+
+
+def test_predictor_and_snapshot_with_shared_backend(table, monkeypatch, tmp_path):
+    start_warm_up()
+    assert wait_ready(timeout=60)
+    predictor = get_predictor()
+    monkeypatch.setattr(get_settings(), 'quote_cache_enabled', True)
+    monkeypatch.setattr(quote_cache, '_cache', table)
+
+    quotes = sample_quotes(40, seed=21)
+    expected = predictor.predict_quote_batch(quotes, use_cache=False)
+    assert predictor.predict_quote_batch(quotes) == expected
+    assert predictor.predict_quote_batch(quotes) == expected
+    assert predictor.predict_quote(**quotes[0]) == expected[0]
+    stats = quote_cache.score_cache_stats()
+    assert (stats['policy'], stats['hits'], stats['misses']) == ("shared", 82, 80)
+
+    # Snapshots move entries between either backend
+    path = str(tmp_path / "shared.snap")
+    assert save_snapshot(table, path, predictor.cache_version, limit=1000) == 80
+    restored = ScoreCache(max_size=1000)
+    assert load_snapshot(restored, path, predictor.cache_version) == 80
+    monkeypatch.setattr(quote_cache, '_cache', restored)
+    assert predictor.predict_quote_batch(quotes) == expected
+    assert restored.stats()['misses'] == 0
@@ -0,0 +1,150 @@
+"""
+Arrow IPC / Parquet table scoring tests
+"""
+
+import datetime
+import decimal
+import io
+import time
+
+import grpc
+import numpy as np
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+from src.grpc_generated import QuoteServiceStub, TableChunk, TableFormat  # noqa: E402
+from src.grpc_servicer import create_grpc_server  # noqa: E402
+from src.models.trained_predictor import (  # noqa: E402
+    get_predictor, sample_quotes, start_warm_up, wait_ready,
+)
+from src.serving.tables import table_columns  # noqa: E402
+
+ARROW_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_TYPE = "application/vnd.apache.parquet"
+
+
+def quotes_table(quotes: list[dict]) -> "pa.Table":
+    """The quotes as a quotes-table export: DECIMAL hours, tz-aware timestamps, old scores."""
+    phoenix = datetime.timezone(datetime.timedelta(hours=-7))  # no DST in America/Phoenix
+    return pa.table({
+        'quote_number': [f"Q-{i}" for i in range(len(quotes))],
+        'event_type': pa.array([q['event_type'] for q in quotes]).dictionary_encode(),
+        'state': [q['state'] for q in quotes],
+        'risk_zone': [q['risk_zone'] for q in quotes],
+        'num_guards': pa.array([q['num_guards'] for q in quotes], pa.int32()),
+        'hours_per_guard': pa.array(
+            [decimal.Decimal(str(q['hours'])) for q in quotes], pa.decimal128(5, 2)
+        ),
+        'crowd_size': [q['crowd_size'] for q in quotes],
+        'event_date': pa.array(
+            [q['event_date'].replace(tzinfo=phoenix) for q in quotes],
+            pa.timestamp('us', tz="America/Phoenix"),
+        ),
+        'is_armed': [q['is_armed'] for q in quotes],
+        'requires_vehicle': [q['has_vehicle'] for q in quotes],
+        'risk_level': ["low"] * len(quotes),
+    })
+
+
+def arrow_stream(table: "pa.Table", batch_rows: int = 100) -> bytes:
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=batch_rows):
+            writer.write_batch(batch)
+    return sink.getvalue()
+
+
+def assert_scored(table: "pa.Table", quotes: list[dict]):
+    expected = get_predictor().predict_quote_batch(quotes)
+    assert table.column('quote_number').to_pylist() == [f"Q-{i}" for i in range(len(quotes))]
+    assert table.schema.names.count('risk_level') == 1
+    np.testing.assert_array_equal(
+        table.column('predicted_price').to_numpy(), [p.predicted_price for p in expected]
+    )
+    assert table.column('risk_level').to_pylist() == [p.risk_level for p in expected]
+    np.testing.assert_array_equal(table.column('risk_score').to_numpy(), [p.risk_score for p in expected])
+    np.testing.assert_array_equal(table.column('confidence').to_numpy(), [p.confidence for p in expected])
+
+
+def test_arrow_stream_matches_batch_predictions(client):
+    quotes = sample_quotes(500, seed=3)
+    response = client.post(
+        "/api/v1/quotes/table", content=arrow_stream(quotes_table(quotes)),
+        headers={'content-type': ARROW_TYPE},
+    )
+    assert response.status_code == 200
+    assert response.headers['content-type'] == ARROW_TYPE
+    assert response.headers['x-rows-scored'] == "500"
+    assert_scored(pa.ipc.open_stream(response.content).read_all(), quotes)
+
+
+def test_parquet_round_trip(client):
+    quotes = sample_quotes(300, seed=4)
+    sink = io.BytesIO()
+    pq.write_table(quotes_table(quotes), sink, row_group_size=64)
+    response = client.post(
+        "/api/v1/quotes/table", content=sink.getvalue(), headers={'content-type': PARQUET_TYPE}
+    )
+    assert response.status_code == 200
+    assert_scored(pq.read_table(io.BytesIO(response.content)), quotes)
+
+
+def test_table_errors(client):
+    table = quotes_table(sample_quotes(10)).drop_columns(['num_guards'])
+    response = client.post(
+        "/api/v1/quotes/table", content=arrow_stream(table), headers={'content-type': ARROW_TYPE}
+    )
+    assert response.status_code == 400
+    assert "num_guards" in response.json()['detail']
+
+    response = client.post(
+        "/api/v1/quotes/table", content=b"not parquet", headers={'content-type': PARQUET_TYPE}
+    )
+    assert response.status_code == 400
+    assert client.post(
+        "/api/v1/quotes/table", content=b"{}", headers={'content-type': "application/json"}
+    ).status_code == 415
+
+
+def test_epoch_seconds_use_local_time(monkeypatch):
+    monkeypatch.setenv('TZ', "America/Phoenix")
+    time.tzset()
+    try:
+        seconds = [1783208400, 1783229400]  # 2026-07-05 00:40 / 06:30 UTC
+        table = quotes_table(sample_quotes(2)).set_column(
+            7, 'event_date', pa.array(seconds, pa.int64())
+        )
+        columns = table_columns(table.to_batches()[0])
+        expected = [np.datetime64(datetime.datetime.fromtimestamp(s), 's') for s in seconds]
+        assert list(columns['event_date']) == expected
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_grpc_score_table():
+    start_warm_up()
+    assert wait_ready(timeout=60)
+    server = create_grpc_server(port=50054)
+    server.start()
+    try:
+        quotes = sample_quotes(200, seed=5)
+        data = arrow_stream(quotes_table(quotes))
+        pieces = [data[i:i + 1000] for i in range(0, len(data), 1000)]
+        requests = [TableChunk(data=pieces[0], format=TableFormat.TABLE_FORMAT_ARROW_STREAM)]
+        requests += [TableChunk(data=piece) for piece in pieces[1:]]
+
+        with grpc.insecure_channel('localhost:50054') as channel:
+            stub = QuoteServiceStub(channel)
+            responses = list(stub.ScoreTable(iter(requests)))
+            assert responses[-1].rows == 200
+            output = b''.join(r.data for r in responses)
+            assert_scored(pa.ipc.open_stream(output).read_all(), quotes)
+
+            with pytest.raises(grpc.RpcError) as error:
+                list(stub.ScoreTable(iter([TableChunk(data=data)])))
+            assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+    finally:
+        server.stop(grace=None)